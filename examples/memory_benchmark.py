@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+This is an example measuring the memory used per object by the small Neo
+objects (Event, Epoch, Spike, RecordingChannel and Unit).
+
+These classes store their fixed attributes in slots and only allocate their
+annotations dict when it is used.  For comparison, the same attribute values
+are stored in the layout used before, a plain object holding an instance
+__dict__, filled in the order of the former BaseNeo.__init__, with an
+(empty) annotations dict.
+
+The memory is measured with tracemalloc (Python 3.4 or later) over many
+copies of each object sharing the same attribute values, so only the storage
+owned by each object is counted: the attribute values themselves
+(quantities, strings, lists of children) are shared by both layouts and are
+left out.
+"""
+from __future__ import division, print_function
+
+import tracemalloc
+
+import quantities as pq
+
+import neo
+
+
+class DictLayout(object):
+    """
+    Emulates the layout of Neo objects without slots.
+    """
+    def __init__(self, obj):
+        self.annotations = {}
+        for name in obj._slot_names():
+            if name != '_annotations':
+                setattr(self, name, getattr(obj, name))
+
+
+def slots_layout(obj):
+    """
+    A new object of the class of :attr:`obj` with the same attribute values,
+    stored as the constructor of the class stores them.
+    """
+    new_obj = type(obj).__new__(type(obj))
+    for name in obj._slot_names():
+        setattr(new_obj, name, getattr(obj, name))
+    return new_obj
+
+
+def allocated_bytes(factory, n_objects):
+    """
+    Mean number of bytes allocated by each of :attr:`n_objects` calls of
+    :attr:`factory`, with the objects kept alive.
+    """
+    objects = [None] * n_objects
+    tracemalloc.start()
+    try:
+        start = tracemalloc.get_traced_memory()[0]
+        for i in range(n_objects):
+            objects[i] = factory()
+        size = tracemalloc.get_traced_memory()[0] - start
+    finally:
+        tracemalloc.stop()
+    return size / n_objects
+
+
+def make_objects():
+    return [neo.Event(1 * pq.s, 'trigger'),
+            neo.Epoch(1 * pq.s, 2 * pq.s, 'trial'),
+            neo.Spike(1 * pq.s),
+            neo.RecordingChannel(index=0),
+            neo.Unit(name='unit')]
+
+
+def main(n_objects=100000):
+    print('%-18s %10s %10s %8s' % ('class', 'dict (B)', 'slots (B)',
+                                   'saving'))
+    for obj in make_objects():
+        before = allocated_bytes(lambda: DictLayout(obj), n_objects)
+        after = allocated_bytes(lambda: slots_layout(obj), n_objects)
+        print('%-18s %10.0f %10.0f %7.0f%%' % (type(obj).__name__, before,
+                                               after,
+                                               100 * (1 - after / before)))
+        print('%-18s %10.1f %10.1f  (MiB for 1000000 objects)' %
+              ('', before * 1e6 / 2 ** 20, after * 1e6 / 2 ** 20))
+
+
+if __name__ == '__main__':
+    main()
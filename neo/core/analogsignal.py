@@ -26,10 +26,15 @@ the old object.
 # needed for python 3 compatibility
 from __future__ import absolute_import, division, print_function
 
+import os
+
 import numpy as np
 import quantities as pq
 
 from neo.core.baseneo import BaseNeo
+from neo.core.envelope import EnvelopePyramid
+from neo.core.streaming import (chunked_reduce, MinReducer, MaxReducer,
+                                MeanReducer, StdReducer)
 
 
 def _get_sampling_rate(sampling_rate, sampling_period):
@@ -137,12 +142,14 @@ class BaseAnalogSignal(BaseNeo, pq.Quantity):
         '''
         Map the __new__ function onto _new_BaseAnalogSignal, so that pickle
         works
+
+        The array is not copied again when unpickled, it is a copy already.
         '''
         return _new_BaseAnalogSignal, (self.__class__,
                                        np.array(self),
                                        self.units,
                                        self.dtype,
-                                       True,
+                                       False,
                                        self.t_start,
                                        self.sampling_rate,
                                        self.sampling_period,
@@ -303,6 +310,133 @@ class BaseAnalogSignal(BaseNeo, pq.Quantity):
         '''
         return self.t_start + np.arange(self.shape[0]) / self.sampling_rate
 
+    @property
+    def envelope(self):
+        '''
+        The :class:`EnvelopePyramid` attached to the signal by
+        :meth:`build_envelope`, or None.
+
+        It is not kept when slicing or copying the signal.
+        '''
+        return self.__dict__.get('_envelope')
+
+    @envelope.setter
+    def envelope(self, pyramid):
+        '''
+        Setter for :attr:`envelope`
+        '''
+        if pyramid is not None and pyramid.n_samples != self.shape[0]:
+            raise ValueError("The envelope has %d samples, the signal %d" %
+                             (pyramid.n_samples, self.shape[0]))
+        self.__dict__['_envelope'] = pyramid
+
+    def build_envelope(self, base=64, factor=4, chunk_size=2 ** 20,
+                       cache_file=None):
+        '''
+        Build the min/max :class:`EnvelopePyramid` of the signal, reading
+        it once by chunks of :attr:`chunk_size` samples, and attach it to
+        the signal as :attr:`envelope`.
+
+        If :attr:`cache_file` is given (for instance next to the data file)
+        and exists, the pyramid is loaded from it instead, and it is saved
+        there after being built.  The pyramid can also be stored with the
+        signal by :class:`NeoHdf5IO`.
+
+        Returns the pyramid.
+        '''
+        pyramid = None
+        if cache_file is not None and os.path.exists(cache_file):
+            pyramid = EnvelopePyramid.load(cache_file)
+            if pyramid.n_samples != self.shape[0]:
+                pyramid = None
+        if pyramid is None:
+            pyramid = EnvelopePyramid(self.magnitude, base=base,
+                                      factor=factor, chunk_size=chunk_size)
+            if cache_file is not None:
+                pyramid.save(cache_file)
+        self.envelope = pyramid
+        return pyramid
+
+    def get_envelope(self, t_start=None, t_stop=None, n_pixels=1000):
+        '''
+        Return the min/max envelope of the signal between :attr:`t_start`
+        and :attr:`t_stop` (by default the whole signal) in at most
+        :attr:`n_pixels` pixels, for display.
+
+        The :attr:`envelope` pyramid is built first if needed.  The cost is
+        then proportional to :attr:`n_pixels`, not to the number of samples
+        shown.
+
+        Returns the times of the left edges of the pixels, and the min and
+        max of each pixel, as quantity arrays.
+
+        Example::
+
+            >>> times, mins, maxs = sig.get_envelope(10*pq.s, 3600*pq.s,
+            ...                                      n_pixels=1920)
+        '''
+        if self.envelope is None:
+            self.build_envelope()
+        period = self.sampling_period
+        if t_start is None:
+            start = 0
+        else:
+            start = int(np.floor(((t_start - self.t_start) /
+                                  period).simplified.magnitude))
+        if t_stop is None:
+            stop = self.shape[0]
+        else:
+            stop = int(np.ceil(((t_stop - self.t_start) /
+                                period).simplified.magnitude))
+        edges, mins, maxs = self.envelope.envelope(start, stop, n_pixels,
+                                                   data=self.magnitude)
+        times = self.t_start + edges[:-1] * period
+        return (times.rescale(self.t_start.units),
+                pq.Quantity(mins, units=self.units, copy=False),
+                pq.Quantity(maxs, units=self.units, copy=False))
+
+    def reduce_chunks(self, reducer, chunk_size=None, workers=None):
+        '''
+        Apply :attr:`reducer` (a :class:`neo.core.streaming.ChunkReducer`)
+        to the signal read by chunks of :attr:`chunk_size` samples, with
+        :attr:`workers` threads, and return the result in the units of the
+        signal.  See :func:`neo.core.streaming.chunked_reduce`.
+
+        Memory-mapped signals are never fully loaded, and the working memory
+        is bounded by :attr:`workers` chunks.
+        '''
+        result = chunked_reduce(self.magnitude, reducer,
+                                chunk_size=chunk_size, workers=workers)
+        return pq.Quantity(result, units=self.units, copy=False)
+
+    def chunked_min(self, chunk_size=None, workers=None):
+        '''
+        Minimum of each channel, computed by chunks (see
+        :meth:`reduce_chunks`).
+        '''
+        return self.reduce_chunks(MinReducer(), chunk_size, workers)
+
+    def chunked_max(self, chunk_size=None, workers=None):
+        '''
+        Maximum of each channel, computed by chunks (see
+        :meth:`reduce_chunks`).
+        '''
+        return self.reduce_chunks(MaxReducer(), chunk_size, workers)
+
+    def chunked_mean(self, chunk_size=None, workers=None):
+        '''
+        Mean of each channel, computed by chunks in float64 (see
+        :meth:`reduce_chunks`).
+        '''
+        return self.reduce_chunks(MeanReducer(), chunk_size, workers)
+
+    def chunked_std(self, ddof=0, chunk_size=None, workers=None):
+        '''
+        Standard deviation of each channel, computed by chunks in float64
+        (see :meth:`reduce_chunks`).
+        '''
+        return self.reduce_chunks(StdReducer(ddof), chunk_size, workers)
+
     def rescale(self, units):
         '''
         Return a copy of the AnalogSignal(Array) converted to the specified
@@ -525,6 +659,17 @@ class AnalogSignal(BaseAnalogSignal):
         :times: (quantity 1D) The time points of each sample of the signal,
             read-only.
             (:attr:`t_start` + arange(:attr:`shape`)/:attr:`sampling_rate`)
+        :envelope: (:class:`EnvelopePyramid`) Multi-resolution min/max
+            envelope used by :meth:`get_envelope`, or None.
+
+    *Methods available on this object*:
+        :build_envelope(base, factor, chunk_size, cache_file): Build (or
+            load) the :attr:`envelope` pyramid.
+        :get_envelope(t_start, t_stop, n_pixels): Min/max envelope for
+            display, at a cost proportional to the number of pixels.
+        :chunked_min(), chunked_max(), chunked_mean(), chunked_std(ddof):
+            Reductions computed by chunks, optionally with several
+            threads, so memory-mapped signals are never fully loaded.
 
     *Slicing*:
         :class:`AnalogSignal` objects can be sliced. When this occurs, a new
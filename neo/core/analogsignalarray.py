@@ -30,10 +30,50 @@ import quantities as pq
 from neo.core.analogsignal import (BaseAnalogSignal, AnalogSignal,
                                    _get_sampling_rate)
 from neo.core.baseneo import BaseNeo, merge_annotations
+from neo.core.spiketrain import SpikeTrain
+from neo.core.streaming import (chunk_bounds, default_chunk_size,
+                                map_threads, Pipeline)
 
 logger = logging.getLogger("Neo")
 
 
+def _threshold_crossings(data, start, threshold, sign):
+    '''
+    Find the samples where the columns of :attr:`data` cross
+    :attr:`threshold`.
+
+    The first row of :attr:`data` is the last sample of the previous chunk,
+    so that crossings at the chunk boundary are found.  Returns one array of
+    sample indexes per column, offset by :attr:`start`.
+    '''
+    if sign == 'below':
+        beyond = data <= threshold
+    else:
+        beyond = data >= threshold
+    rows, cols = np.nonzero(beyond[1:] & ~beyond[:-1])
+    # rows are sorted within each column since np.nonzero is row-major
+    return [rows[cols == col] + start for col in range(data.shape[1])]
+
+
+def _apply_refractory(indexes, n_refractory):
+    '''
+    Drop crossings closer than :attr:`n_refractory` samples to the last
+    kept crossing.
+    '''
+    if n_refractory <= 0 or indexes.size < 2:
+        return indexes
+    if (np.diff(indexes) >= n_refractory).all():
+        return indexes
+    keep = np.ones(indexes.size, dtype=bool)
+    last = indexes[0]
+    for i in range(1, indexes.size):
+        if indexes[i] - last < n_refractory:
+            keep[i] = False
+        else:
+            last = indexes[i]
+    return indexes[keep]
+
+
 class AnalogSignalArray(BaseAnalogSignal):
     '''
     Several continuous analog signals
@@ -106,6 +146,8 @@ class AnalogSignalArray(BaseAnalogSignal):
             (:attr:`t_start` + arange(:attr:`shape`[0])/:attr:`sampling_rate`)
         :channel_indexes: (numpy array 1D dtype='i') The same as
             :attr:`channel_index`, read-only.
+        :envelope: (:class:`EnvelopePyramid`) Multi-resolution min/max
+            envelope used by :meth:`get_envelope`, or None.
 
     *Slicing*:
         :class:`AnalogSignalArray` objects can be sliced. When taking a single
@@ -119,6 +161,22 @@ class AnalogSignalArray(BaseAnalogSignal):
     *Operations available on this object*:
         == != + * /
 
+    *Methods available on this object*:
+        :detect_spikes(threshold, sign, refractory_period): Chunked
+            threshold-crossing detection, returning one :class:`SpikeTrain`
+            per channel.
+        :build_envelope(base, factor, chunk_size, cache_file): Build (or
+            load) the :attr:`envelope` pyramid.
+        :get_envelope(t_start, t_stop, n_pixels): Min/max envelope of each
+            channel for display, at a cost proportional to the number of
+            pixels.
+        :chunked_min(), chunked_max(), chunked_mean(), chunked_std(ddof):
+            Per-channel reductions computed by chunks, optionally with
+            several threads, so memory-mapped signals are never fully
+            loaded.
+        :process_chunks(stages, chunk_size, out): Streaming filtering,
+            decimation and re-referencing, see :mod:`neo.core.streaming`.
+
     '''
 
     _single_parent_objects = ('Segment', 'RecordingChannelGroup')
@@ -242,6 +300,156 @@ class AnalogSignalArray(BaseAnalogSignal):
 
         return obj
 
+    def detect_spikes(self, threshold, sign='below',
+                      refractory_period=1 * pq.ms, channels=None,
+                      waveforms=None, segment=None, chunk_duration=1 * pq.s,
+                      workers=None):
+        '''
+        Detect threshold crossings on each channel and return them as a list
+        of :class:`SpikeTrain` objects, one per channel.
+
+        :attr:`threshold` is a quantity scalar, or a quantity array with one
+        value per channel.  With :attr:`sign` 'below' a spike is the first
+        sample at or below the threshold, with 'above' the first sample at or
+        above it.  Crossings less than :attr:`refractory_period` after the
+        previous spike of the same channel are dropped.  :attr:`channels`
+        restricts the detection to some columns of the array.
+
+        The signal is read in chunks of :attr:`chunk_duration` overlapping by
+        one sample, so the memory used does not depend on the length of the
+        recording and memory-mapped signals are never fully loaded.  With
+        :attr:`workers` > 1, chunks are processed by a pool of threads.
+
+        If :attr:`waveforms` is a (left_sweep, right_sweep) tuple, the
+        waveforms of the spikes are extracted too (see
+        :meth:`SpikeTrain.extract_waveforms`).  If :attr:`segment` is given,
+        the :class:`SpikeTrain` objects are appended to it.
+
+        Example::
+
+            >>> trains = sigarr.detect_spikes(-40*pq.uV, workers=4,
+            ...                               waveforms=(.5*pq.ms, 1*pq.ms),
+            ...                               segment=seg)
+        '''
+        if sign not in ('below', 'above'):
+            raise ValueError("sign must be 'below' or 'above', not %r" % sign)
+        if channels is None:
+            channels = np.arange(self.shape[1])
+        channels = np.atleast_1d(np.asarray(channels, dtype=np.intp))
+
+        rate = float(self.sampling_rate.rescale(pq.Hz).magnitude)
+        threshold = np.asarray(threshold.rescale(self.units).magnitude)
+        if threshold.ndim:
+            if threshold.size == self.shape[1] != channels.size:
+                threshold = threshold[channels]
+            if threshold.size != channels.size:
+                raise ValueError("threshold must be a scalar or have one "
+                                 "value per channel")
+        n_refractory = int(round(float(refractory_period.rescale(pq.s)) *
+                                 rate))
+        chunk_size = max(int(round(float(chunk_duration.rescale(pq.s)) *
+                                   rate)), 1)
+
+        data = self.magnitude
+        n_samples = data.shape[0]
+
+        def detect_chunk(start):
+            stop = min(start + chunk_size, n_samples)
+            first = max(start - 1, 0)
+            chunk = data[first:stop, channels]
+            if start == 0:
+                # no previous sample, a crossing can't happen at sample 0
+                chunk = np.concatenate([chunk[:1], chunk])
+            return _threshold_crossings(chunk, start, threshold, sign)
+
+        results = map_threads(detect_chunk, range(0, n_samples, chunk_size),
+                              workers)
+
+        t_start = self.t_start
+        t_stop = self.t_stop.rescale(t_start.units)
+        trains = []
+        for i, channel in enumerate(channels):
+            if results:
+                indexes = np.concatenate([res[i] for res in results])
+            else:
+                indexes = np.array([], dtype=np.intp)
+            indexes = _apply_refractory(indexes, n_refractory)
+            times = (indexes / self.sampling_rate).rescale(t_start.units)
+            if self.channel_index is not None:
+                channel_index = int(self.channel_index[channel])
+            else:
+                channel_index = int(channel)
+            train = SpikeTrain(times + t_start, t_start=t_start,
+                               t_stop=t_stop,
+                               sampling_rate=self.sampling_rate,
+                               name='Channel %d' % channel_index,
+                               channel_index=channel_index)
+            if waveforms is not None:
+                train.extract_waveforms(self, waveforms[0], waveforms[1],
+                                        channels=[channel])
+            if segment is not None:
+                segment.spiketrains.append(train)
+                train.segment = segment
+            trains.append(train)
+        return trains
+
+    def process_chunks(self, stages, chunk_size=None, out=None):
+        '''
+        Pass the signal through :attr:`stages` (a list of
+        :class:`neo.core.streaming.SignalStage` objects or a
+        :class:`neo.core.streaming.Pipeline`) by chunks of
+        :attr:`chunk_size` samples, so the working memory does not depend on
+        the length of the signal and memory-mapped signals are never fully
+        loaded.  The state of the filters is carried across chunks.
+
+        By default a new :class:`AnalogSignalArray` is returned, with the
+        same units, :attr:`t_start` and channels, and the sampling rate
+        divided by the decimation of the stages.  :attr:`out` may be an
+        array (for instance a :class:`numpy.memmap`) of the right shape in
+        which the result is written and which backs the returned signal, or
+        a callable which is given each output chunk in turn, in which case
+        None is returned.
+
+        Example::
+
+            >>> rate = sigarr.sampling_rate
+            >>> stages = [FilterStage.butter(4, 200*pq.Hz, rate),
+            ...           DecimateStage(50), CommonAverageReference()]
+            >>> lfp = sigarr.process_chunks(stages)
+        '''
+        pipeline = stages if isinstance(stages, Pipeline) else \
+            Pipeline(stages)
+        pipeline.reset()
+        data = self.magnitude
+        if chunk_size is None:
+            chunk_size = default_chunk_size(self.shape)
+        shape = (pipeline.output_length(self.shape[0]), self.shape[1])
+        if out is None:
+            out = np.empty(shape, dtype=np.float64)
+        elif not callable(out) and out.shape != shape:
+            raise ValueError("out has shape %s instead of %s" %
+                             (out.shape, shape))
+
+        position = 0
+        for start, stop in chunk_bounds(self.shape[0], chunk_size):
+            chunk = pipeline.process(data[start:stop])
+            if callable(out):
+                out(chunk)
+            else:
+                out[position:position + len(chunk)] = chunk
+            position += len(chunk)
+        if callable(out):
+            return None
+        return AnalogSignalArray(out, units=self.units, copy=False,
+                                 t_start=self.t_start,
+                                 sampling_rate=(self.sampling_rate /
+                                                pipeline.decimation),
+                                 channel_index=self.channel_index,
+                                 name=self.name,
+                                 file_origin=self.file_origin,
+                                 description=self.description,
+                                 **self.annotations)
+
     def merge(self, other):
         '''
         Merge the another :class:`AnalogSignalArray` into this one.
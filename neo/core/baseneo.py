@@ -355,3 +355,76 @@ class BaseNeo(object):
         See :meth:`merge_annotations` for details of the merge operation.
         """
         self.merge_annotations(other)
+
+
+class CompactNeo(object):
+    """
+    Mixin giving a Neo class a compact, :attr:`__slots__`-based layout.
+
+    Objects such as :class:`Event` or :class:`Spike` may exist by the
+    millions in a single :class:`Block`, so the per-instance :attr:`__dict__`
+    and the :attr:`annotations` dict dominate their memory use.  Classes using
+    this mixin store their fixed attributes in slots.  Each class lists its
+    own fixed attributes (including its parent and child containers) in its
+    :attr:`__slots__`, and must come before :class:`BaseNeo` (or
+    :class:`Container`) in its bases.
+
+    :attr:`annotations` is only allocated when it is first used.  Setting
+    other attributes is still possible, they are stored in the instance
+    :attr:`__dict__`, which is only created when needed.
+
+    *Usage*::
+
+        >>> class Tag(CompactNeo, BaseNeo):
+        ...     __slots__ = ('time',)
+    """
+
+    __slots__ = ('name', 'description', 'file_origin', '_annotations')
+
+    @property
+    def annotations(self):
+        """
+        Non-standardized metadata, allocated on first access.
+        """
+        annotations = getattr(self, '_annotations', None)
+        if annotations is None:
+            annotations = self._annotations = {}
+        return annotations
+
+    @annotations.setter
+    def annotations(self, value):
+        # an empty dict is not kept, it is recreated when needed
+        self._annotations = value if value else None
+
+    def _slot_names(self):
+        """
+        Names of all slots holding attributes of this object.
+        """
+        names = []
+        for cls in type(self).__mro__:
+            slots = cls.__dict__.get('__slots__', ())
+            if isinstance(slots, basestring):
+                slots = (slots,)
+            names.extend(name for name in slots
+                         if name not in ('__dict__', '__weakref__'))
+        return names
+
+    def __getstate__(self):
+        """
+        Return the object state for pickling and copying.
+        """
+        state = dict(getattr(self, '__dict__', {}))
+        for name in self._slot_names():
+            if hasattr(self, name):
+                state[name] = getattr(self, name)
+        return state
+
+    def __setstate__(self, state):
+        """
+        Restore the object state when unpickling or copying.
+
+        States from objects pickled before the compact layout, which store
+        'annotations' directly, are also supported.
+        """
+        for name, value in state.items():
+            setattr(self, name, value)
@@ -13,7 +13,96 @@ from __future__ import absolute_import, division, print_function
 
 from datetime import datetime
 
+import numpy as np
+import quantities as pq
+
+from neo.core.analogsignalarray import AnalogSignalArray
 from neo.core.container import Container, unique_objs
+from neo.core.recordingchannelgroup import RecordingChannelGroup
+from neo.core.segment import Segment
+from neo.core.spiketrain import (SpikeTrain, check_has_dimensions_time,
+                                 _bin_spiketrains, _concatenate_times,
+                                 _correlograms, _n_bins, _sorted_magnitude,
+                                 _spiketrain_statistics)
+from neo.core.unit import Unit
+
+
+def _segment_columns(seg):
+    '''
+    Return a dict giving, for each channel of the analog signals of
+    :attr:`seg`, its signal and column (None for an :class:`AnalogSignal`),
+    and the list of the channels in order.
+
+    Channels without a channel_index are numbered by their position.
+    '''
+    columns = {}
+    order = []
+    position = 0
+    for sig in seg.analogsignals:
+        channel = sig.channel_index
+        channel = position if channel is None else int(channel)
+        position += 1
+        if channel not in columns:
+            columns[channel] = (sig, None)
+            order.append(channel)
+    for sigarr in seg.analogsignalarrays:
+        for column in range(sigarr.shape[1]):
+            if sigarr.channel_index is None:
+                channel = position
+            else:
+                channel = int(sigarr.channel_index[column])
+            position += 1
+            if channel not in columns:
+                columns[channel] = (sigarr, column)
+                order.append(channel)
+    return columns, order
+
+
+def _root_array(arr):
+    '''
+    The array owning the memory of :attr:`arr`.
+    '''
+    while isinstance(arr.base, np.ndarray):
+        arr = arr.base
+    return arr
+
+
+def _strided_stack(columns):
+    '''
+    Return a (sweep, sample, channel) view of the 1D arrays of
+    :attr:`columns` (a list of lists, by sweep then channel), or None if
+    they are not regularly spaced in the same buffer.
+    '''
+    first = columns[0][0]
+    root = _root_array(first)
+    addresses = np.empty((len(columns), len(columns[0])), dtype=np.int64)
+    for i, sweep in enumerate(columns):
+        for j, col in enumerate(sweep):
+            if (col.dtype != first.dtype or col.strides != first.strides or
+                    _root_array(col) is not root):
+                return None
+            addresses[i, j] = col.__array_interface__['data'][0]
+    sweep_step = addresses[1, 0] - addresses[0, 0] if len(columns) > 1 else 0
+    channel_step = (addresses[0, 1] - addresses[0, 0]
+                    if len(columns[0]) > 1 else 0)
+    expected = (addresses[0, 0] +
+                sweep_step * np.arange(len(columns))[:, np.newaxis] +
+                channel_step * np.arange(len(columns[0])))
+    if not (addresses == expected).all():
+        return None
+    return np.lib.stride_tricks.as_strided(
+        first, shape=(len(columns), len(first), len(columns[0])),
+        strides=(int(sweep_step), first.strides[0], int(channel_step)))
+
+
+def _has_column(table, name):
+    '''
+    True if :attr:`table`, a dict or a structured array, has a column
+    :attr:`name`.
+    '''
+    if hasattr(table, 'dtype'):
+        return table.dtype.names is not None and name in table.dtype.names
+    return name in table
 
 
 class Block(Container):
@@ -72,6 +161,27 @@ class Block(Container):
         :list_recordingchannels: descends through hierarchy and returns
             a list of :class:`RecordingChannel` objects existing in the block.
 
+    *Methods available on this object*:
+        :consolidate: Convert the :class:`Event`, :class:`Epoch` and
+            :class:`Spike` objects in every :class:`Segment` into
+            :class:`EventArray`, :class:`EpochArray` and :class:`SpikeTrain`
+            objects.
+        :bin_spiketrains(bin_size, t_start, t_stop): Count the spikes of
+            every :class:`SpikeTrain` in the :class:`Block` in time bins, as
+            a sparse matrix.
+        :correlograms(bin_size, max_lag): Cross- and autocorrelograms of
+            all pairs of :class:`SpikeTrain` objects in each
+            :class:`Segment`.
+        :spike_statistics(refractory_period): Spike count, rate, ISI CV and
+            refractory violations of every :class:`SpikeTrain`.
+        :to_spike_table(units, structured): All the spikes as columns of
+            times and segment, unit and channel indexes.
+        :from_spike_table(table) (class method): Build a :class:`Block`
+            from such columns.
+        :stack_segments(channel_index, align): Stack the analog signals of
+            all the :class:`Segment` objects into a (segment, sample,
+            channel) array.
+
     Note: Any other additional arguments are assumed to be user-specific
             metadata and stored in :attr:`annotations`.
 
@@ -144,3 +254,436 @@ class Block(Container):
         :class:`Block`.
         '''
         return self.list_children_by_class('recordingchannels')
+
+    def consolidate(self, t_start=None, t_stop=None):
+        '''
+        Convert the single :class:`Event`, :class:`Epoch` and :class:`Spike`
+        objects in every :class:`Segment` of the :class:`Block` into
+        :class:`EventArray`, :class:`EpochArray` and :class:`SpikeTrain`
+        objects.
+
+        See :meth:`Segment.consolidate` for details.  :class:`Spike` objects
+        that are only linked to their :class:`Unit` from the
+        :class:`Unit` side are found using :attr:`list_units`.
+        '''
+        units = self.list_units
+        # all the Segments are checked before any of them is modified
+        applies = [seg._consolidation(t_start=t_start, t_stop=t_stop,
+                                      units=units)
+                   for seg in self.segments]
+        for apply in applies:
+            apply()
+
+    def bin_spiketrains(self, bin_size, t_start=None, t_stop=None,
+                        dense=False):
+        '''
+        Count the spikes of every :class:`SpikeTrain` in the :class:`Block`
+        in bins of :attr:`bin_size` from :attr:`t_start` to :attr:`t_stop`.
+
+        The rows of the count matrix follow the order of the
+        :class:`SpikeTrain` objects in
+        :meth:`list_children_by_class('SpikeTrain')`.  This only makes sense
+        if the :class:`Segment` objects share a common time base.
+
+        See :meth:`Segment.bin_spiketrains` for details.
+        '''
+        return _bin_spiketrains(self.list_children_by_class('SpikeTrain'),
+                                bin_size, t_start=t_start, t_stop=t_stop,
+                                dense=dense)
+
+    def correlograms(self, bin_size=1 * pq.ms, max_lag=50 * pq.ms,
+                     auto=True, workers=None):
+        '''
+        Compute the correlograms of all pairs of :class:`SpikeTrain` objects
+        recorded in the same :class:`Segment`.
+
+        For each :class:`Segment`, the pairs (i, j) with i < j of
+        :attr:`spiketrains` are used, plus the autocorrelograms (i, i) if
+        :attr:`auto` is True.  See :meth:`SpikeTrain.correlogram` for the
+        definition of the counts.  With :attr:`workers` > 1 the pairs are
+        computed in batches by a pool of processes.
+
+        Returns an :class:`AnalogSignalArray` with one column per pair,
+        whose :attr:`times` are the left edges of the lag bins.  The pairs
+        are described by the annotations 'segment_index', 'first_index' and
+        'second_index', arrays giving the index of the :class:`Segment` in
+        :attr:`segments` and of the two trains in its :attr:`spiketrains`.
+
+        Example::
+
+            >>> ccgs = blk.correlograms(1*pq.ms, 20*pq.ms, workers=4)
+            >>> peak_lags = ccgs.times[np.argmax(ccgs, axis=0)]
+        '''
+        check_has_dimensions_time(bin_size, max_lag)
+        units = bin_size.units
+        width = float(bin_size.magnitude)
+        if width <= 0:
+            raise ValueError("bin_size and max_lag must be positive")
+        n_half = _n_bins(float(max_lag.rescale(units).magnitude), width)
+        if n_half <= 0:
+            raise ValueError("bin_size and max_lag must be positive")
+
+        times = []
+        pairs = []
+        segment_index = []
+        first_index = []
+        second_index = []
+        for iseg, seg in enumerate(self.segments):
+            offset = len(times)
+            times.extend(_sorted_magnitude(train, units)
+                         for train in seg.spiketrains)
+            n_trains = len(seg.spiketrains)
+            for i in range(n_trains):
+                for j in range(i if auto else i + 1, n_trains):
+                    pairs.append((offset + i, offset + j))
+                    segment_index.append(iseg)
+                    first_index.append(i)
+                    second_index.append(j)
+
+        counts = _correlograms(times, pairs, width, n_half, workers=workers)
+        return AnalogSignalArray(counts, units=pq.dimensionless, copy=False,
+                                 t_start=-n_half * bin_size,
+                                 sampling_period=bin_size,
+                                 name='correlograms',
+                                 segment_index=np.array(segment_index,
+                                                        dtype='i'),
+                                 first_index=np.array(first_index, dtype='i'),
+                                 second_index=np.array(second_index,
+                                                       dtype='i'))
+
+    def stack_segments(self, channel_index=None, align='t_start'):
+        '''
+        Stack the analog signals of every :class:`Segment` (for instance
+        the sweeps of an episodic recording) into a single
+        (segment, sample, channel) array.
+
+        The channels are given by :attr:`channel_index` (by default those
+        of the first :class:`Segment`), and found in the
+        :class:`AnalogSignal` and :class:`AnalogSignalArray` objects of each
+        :class:`Segment` by their channel_index, or by their position if
+        they have none.  All the signals must have the same sampling rate.
+
+        With :attr:`align` 't_start', each sweep starts at its own
+        :attr:`t_start` and the time axis is relative to it.  With
+        'absolute', the sweeps are cut to the time range covered by all of
+        them and the time axis is absolute.  In both cases the sweeps are
+        truncated to the shortest one.
+
+        The array is allocated once and filled with one copy per sweep, in
+        the units of the first signal.  If the signals are already regularly
+        laid out in one buffer (e.g. an episodic file read as a memmap),
+        a view of this buffer is returned and nothing is copied.
+
+        Returns the quantity array, the times of the samples (quantity 1D)
+        and the channel indexes.
+
+        Example::
+
+            >>> trials, times, channels = blk.stack_segments()
+            >>> mean_response = trials.mean(axis=0)
+        '''
+        if align not in ('t_start', 'absolute'):
+            raise ValueError("align must be 't_start' or 'absolute', not %r"
+                             % align)
+        if not self.segments:
+            raise ValueError("the Block has no Segment")
+        layouts = [_segment_columns(seg) for seg in self.segments]
+        if channel_index is None:
+            channel_index = layouts[0][1]
+        channel_index = np.atleast_1d(np.asarray(channel_index, dtype='i'))
+        if not channel_index.size:
+            raise ValueError("no channel to stack")
+
+        sweeps = []
+        for iseg, (columns, order) in enumerate(layouts):
+            try:
+                sweeps.append([columns[channel] for channel in channel_index])
+            except KeyError as err:
+                raise ValueError("Segment %d has no channel %s" %
+                                 (iseg, err.args[0]))
+
+        first = sweeps[0][0][0]
+        rate = first.sampling_rate
+        units = first.units
+        for sweep in sweeps:
+            for sig, column in sweep:
+                if sig.sampling_rate.rescale(rate.units) != rate:
+                    raise ValueError("The signals have different sampling "
+                                     "rates: %s and %s" %
+                                     (rate, sig.sampling_rate))
+
+        t_units = first.t_start.units
+        t_starts = np.array([float(sweep[0][0].t_start.rescale(t_units))
+                             for sweep in sweeps])
+        for sweep, t_start in zip(sweeps, t_starts):
+            for sig, column in sweep:
+                if float(sig.t_start.rescale(t_units)) != t_start:
+                    raise ValueError("The signals of a Segment must start "
+                                     "at the same time")
+        rate_value = float(rate.rescale(1 / t_units).magnitude)
+        if align == 'absolute':
+            start_time = t_starts.max()
+            offsets = np.rint((start_time - t_starts) *
+                              rate_value).astype(int)
+        else:
+            start_time = 0.
+            offsets = np.zeros(len(sweeps), dtype=int)
+        n_samples = min(min(len(sig) for sig, column in sweep) - offset
+                        for sweep, offset in zip(sweeps, offsets))
+        if n_samples <= 0:
+            raise ValueError("The Segments do not overlap in time")
+        times = (start_time + np.arange(n_samples) / rate_value) * t_units
+
+        columns = []
+        for sweep, offset in zip(sweeps, offsets):
+            columns.append([(sig.magnitude if column is None else
+                             sig.magnitude[:, column])[offset:
+                                                       offset + n_samples]
+                            for sig, column in sweep])
+
+        same_units = all(sig.units == units
+                         for sweep in sweeps for sig, column in sweep)
+        stack = _strided_stack(columns) if same_units else None
+        if stack is None:
+            dtype = np.result_type(*[col for sweep in columns
+                                     for col in sweep])
+            if not same_units:
+                dtype = np.result_type(dtype, np.float64)
+            stack = np.empty((len(sweeps), n_samples, len(channel_index)),
+                             dtype=dtype)
+            for i, sweep in enumerate(sweeps):
+                for j, (sig, column) in enumerate(sweep):
+                    stack[i, :, j] = columns[i][j]
+                    if sig.units != units:
+                        stack[i, :, j] *= float(
+                            sig.units.rescale(units).magnitude)
+        return pq.Quantity(stack, units=units, copy=False), times, \
+            channel_index
+
+    def spike_statistics(self, refractory_period=2 * pq.ms):
+        '''
+        Compute summary statistics of every :class:`SpikeTrain` in the
+        :class:`Block` in one batch.
+
+        Returns a dict of arrays with one row per :class:`SpikeTrain`, in
+        the order of :meth:`list_children_by_class('SpikeTrain')`:
+            :segment_index: index of the :class:`Segment` of the train in
+                :attr:`segments`, or -1.
+            :unit_index: index of the :class:`Unit` of the train in
+                :attr:`list_units`, or -1.
+            :channel_index: the 'channel_index' annotation of the train if
+                it has one, otherwise the first of the
+                :attr:`channel_indexes` of its :class:`Unit`, or -1.
+            :count: number of spikes.
+            :rate: (quantity array) mean firing rate over
+                [:attr:`t_start`, :attr:`t_stop`].
+            :isi_cv: coefficient of variation of the inter-spike intervals,
+                NaN with less than 2 intervals.
+            :refractory_violations: number of inter-spike intervals shorter
+                than :attr:`refractory_period`.
+
+        Example::
+
+            >>> stats = blk.spike_statistics(refractory_period=1.5*pq.ms)
+            >>> good = stats['unit_index'][stats['refractory_violations']
+            ...                            == 0]
+        '''
+        trains = self.list_children_by_class('SpikeTrain')
+        stats = _spiketrain_statistics(trains, refractory_period)
+        stats['segment_index'], stats['unit_index'], \
+            stats['channel_index'] = self._spiketrain_indexes(trains)
+        return stats
+
+    def _spiketrain_indexes(self, trains):
+        '''
+        Index of the :class:`Segment` in :attr:`segments`, of the
+        :class:`Unit` in :attr:`list_units` and channel index of each of
+        :attr:`trains`, -1 when unknown.  See :meth:`spike_statistics`.
+        '''
+        units = self.list_units
+
+        segment_of = {}
+        for iseg, seg in enumerate(self.segments):
+            for train in seg.spiketrains:
+                segment_of[id(train)] = iseg
+        unit_of = {}
+        for iunit, unit in enumerate(units):
+            for train in unit.spiketrains:
+                unit_of[id(train)] = iunit
+
+        segment_index = np.array([segment_of.get(id(train), -1)
+                                  for train in trains], dtype='i')
+        unit_index = np.array([unit_of.get(id(train), -1)
+                               for train in trains], dtype='i')
+        channel_index = np.empty(len(trains), dtype='i')
+        for i, train in enumerate(trains):
+            channel = train.annotations.get('channel_index')
+            if channel is None and unit_index[i] >= 0:
+                indexes = units[unit_index[i]].channel_indexes
+                if indexes is not None and len(indexes):
+                    channel = indexes[0]
+            channel_index[i] = -1 if channel is None else channel
+        return segment_index, unit_index, channel_index
+
+    def to_spike_table(self, units=pq.s, structured=False):
+        '''
+        Flatten all the spikes of the :class:`Block` into columns, with one
+        row per spike.
+
+        Returns a dict of arrays:
+            :time: (quantity array) spike times in :attr:`units`.
+            :segment_index, unit_index, channel_index: see
+                :meth:`spike_statistics`.
+            :train_index: index of the :class:`SpikeTrain` in
+                :meth:`list_children_by_class('SpikeTrain')`.
+
+        The rows follow the order of the trains, then of the spikes in each
+        train.  Each column is allocated once and filled train by train.
+        With :attr:`structured` True, a numpy structured array with the
+        same fields is returned instead, the times being floats in
+        :attr:`units`.
+
+        Example::
+
+            >>> table = blk.to_spike_table(units=pq.ms)
+            >>> unit_rows = table['unit_index'] == 3
+            >>> first = table['time'][unit_rows].min()
+        '''
+        trains = self.list_children_by_class('SpikeTrain')
+        times, counts, scales = _concatenate_times(trains, units)
+        columns = [('time', times),
+                   ('segment_index', None), ('unit_index', None),
+                   ('channel_index', None),
+                   ('train_index', np.repeat(np.arange(len(trains),
+                                                       dtype='i'), counts))]
+        indexes = self._spiketrain_indexes(trains)
+        for i, column in enumerate(indexes):
+            columns[i + 1] = (columns[i + 1][0], np.repeat(column, counts))
+
+        if structured:
+            table = np.empty(len(times), dtype=[(name, column.dtype)
+                                                for name, column in columns])
+            for name, column in columns:
+                table[name] = column
+            return table
+        table = dict(columns)
+        table['time'] = pq.Quantity(times, units=units, copy=False)
+        return table
+
+    @classmethod
+    def from_spike_table(cls, table, units=None, t_start=None, t_stop=None,
+                         **kwargs):
+        '''
+        Build a new :class:`Block` from spike rows, as given by
+        :meth:`to_spike_table`.
+
+        :attr:`table` is a dict of arrays or a structured array with the
+        columns 'time', 'segment_index' and 'unit_index', and optionally
+        'channel_index'.  The rows are grouped by (segment, unit) in one
+        sort, and each group becomes a :class:`SpikeTrain` of the
+        :class:`Segment` and of the :class:`Unit` with these indexes.  The
+        units are gathered in one :class:`RecordingChannelGroup`.  Rows with
+        a unit_index of -1 give trains without a :class:`Unit`.  Trains
+        without spikes cannot be represented in a table and are not
+        created.
+
+        The times are in :attr:`units` if they are not a quantity array.
+        By default the trains of each :class:`Segment` start at its first
+        spike and stop at its last spike.  Other keyword arguments are
+        passed to :class:`Block`.
+
+        Example::
+
+            >>> blk2 = Block.from_spike_table(blk.to_spike_table(),
+            ...                               t_start=0*pq.s,
+            ...                               t_stop=10*pq.s)
+        '''
+        times = table['time']
+        if units is None:
+            units = getattr(times, 'units', None)
+        if units is None:
+            raise ValueError("units must be given with unitless times")
+        times = np.asarray(getattr(times, 'magnitude', times),
+                           dtype=np.float64)
+        segment_index = np.asarray(table['segment_index'], dtype=np.intp)
+        unit_index = np.asarray(table['unit_index'], dtype=np.intp)
+        if _has_column(table, 'channel_index'):
+            channel_index = np.asarray(table['channel_index'], dtype='i')
+        else:
+            channel_index = None
+        if segment_index.size and segment_index.min() < 0:
+            raise ValueError("segment_index must not be negative")
+
+        blk = cls(**kwargs)
+        n_segments = segment_index.max() + 1 if segment_index.size else 0
+        blk.segments = [Segment(index=i) for i in range(n_segments)]
+        for seg in blk.segments:
+            seg.block = blk
+        n_units = unit_index.max() + 1 if unit_index.size else 0
+        unit_objs = [Unit(name='unit %d' % i) for i in range(n_units)]
+        if unit_objs:
+            rcg = RecordingChannelGroup(name='units')
+            rcg.units = unit_objs
+            for unit in unit_objs:
+                unit.recordingchannelgroup = rcg
+            rcg.block = blk
+            blk.recordingchannelgroups.append(rcg)
+
+        # group by (segment, unit), the times being sorted in each group;
+        # a stable sort is fast on tables grouped already, as those made by
+        # to_spike_table, and the times only need sorting if they are not
+        group = segment_index * (n_units + 1) + unit_index + 1
+        order = np.argsort(group, kind='mergesort')
+        if (np.diff(times[order])[np.diff(group[order]) == 0] < 0).any():
+            order = np.lexsort((times, group))
+        group = group[order]
+        times = times[order]
+        segment_index = segment_index[order]
+        unit_index = unit_index[order]
+        bounds = np.flatnonzero(np.diff(group) != 0) + 1
+        bounds = np.concatenate([[0], bounds, [len(times)]]) \
+            if len(times) else np.zeros(1, dtype=np.intp)
+
+        if channel_index is not None:
+            channel_index = channel_index[order]
+        if len(times):
+            starts = np.searchsorted(segment_index, np.arange(n_segments))
+            segment_min = np.minimum.reduceat(times, starts)
+            segment_max = np.maximum.reduceat(times, starts)
+        for start, stop in zip(bounds[:-1], bounds[1:]):
+            iseg = segment_index[start]
+            iunit = unit_index[start]
+            train_start = t_start
+            if train_start is None:
+                train_start = segment_min[iseg] * units
+            train_stop = t_stop
+            if train_stop is None:
+                train_stop = segment_max[iseg] * units
+            annotations = {}
+            if channel_index is not None:
+                channels = np.unique(channel_index[start:stop])
+                if len(channels) == 1 and channels[0] >= 0:
+                    annotations['channel_index'] = int(channels[0])
+            train = SpikeTrain(times[start:stop], units=units, copy=False,
+                               t_start=train_start, t_stop=train_stop,
+                               **annotations)
+            seg = blk.segments[iseg]
+            seg.spiketrains.append(train)
+            train.segment = seg
+            if iunit >= 0:
+                unit_objs[iunit].spiketrains.append(train)
+                train.unit = unit_objs[iunit]
+
+        if channel_index is not None and unit_objs:
+            # distinct (unit, channel) pairs, grouped by unit
+            valid = (unit_index >= 0) & (channel_index >= 0)
+            n_channels = channel_index[valid].max() + 1 if valid.any() else 1
+            pairs = np.unique(unit_index[valid].astype(np.int64) *
+                              n_channels + channel_index[valid])
+            pair_units = pairs // n_channels
+            pair_channels = (pairs % n_channels).astype('i')
+            splits = np.searchsorted(pair_units, np.arange(1, n_units))
+            for unit, channels in zip(unit_objs,
+                                      np.split(pair_channels, splits)):
+                unit.channel_indexes = channels
+        return blk
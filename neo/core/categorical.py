@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+'''
+This module defines :class:`CategoricalLabelsMixin`, the storage of the
+labels of :class:`EventArray` and :class:`EpochArray` as categorical data:
+an array of integer codes into a table of the unique labels.
+'''
+
+# needed for python 3 compatibility
+from __future__ import absolute_import, division, print_function
+
+import numpy as np
+
+
+def _label_code_dtype(n_labels):
+    '''
+    Return the smallest signed integer dtype able to index a label table
+    with :attr:`n_labels` entries.
+    '''
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_labels <= np.iinfo(dtype).max + 1:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+
+def _encode_labels(labels):
+    '''
+    Split an array of labels into integer codes and a table of the unique
+    labels, so that label_names[label_codes] == labels.
+    '''
+    labels = np.asarray(labels, dtype='S')
+    label_names, label_codes = np.unique(labels, return_inverse=True)
+    return (label_codes.astype(_label_code_dtype(len(label_names))),
+            label_names)
+
+
+def _merge_label_tables(codes1, names1, codes2, names2):
+    '''
+    Concatenate two categorical label arrays, building a single label table
+    and remapping the codes of both arrays onto it.
+    '''
+    label_names = np.union1d(names1, names2).astype('S')
+    dtype = _label_code_dtype(len(label_names))
+    codes1 = np.searchsorted(label_names, names1).astype(dtype)[codes1]
+    codes2 = np.searchsorted(label_names, names2).astype(dtype)[codes2]
+    return np.hstack([codes1, codes2]), label_names
+
+
+class CategoricalLabelsMixin(object):
+    '''
+    Labels of the elements of an array object (one per time), stored either
+    as an array of strings or as categorical data.
+
+    The class using it calls :meth:`_init_labels` in its ``__init__``, and
+    builds its slices and merges with :meth:`_sliced_labels` and
+    :meth:`_merged_labels`.
+    '''
+
+    # Attributes storing categorical labels, used instead of labels by IOs
+    _categorical_attrs = (('label_codes', np.ndarray, 1, np.dtype('i')),
+                          ('label_names', np.ndarray, 1, np.dtype('S')))
+
+    def _init_labels(self, labels, label_codes, label_names, categorical):
+        '''
+        Store the labels given to ``__init__``.
+        '''
+        self.label_codes = None
+        self.label_names = None
+        if label_codes is not None:
+            self.set_label_codes(label_codes, label_names)
+        else:
+            if labels is None:
+                labels = np.array([], dtype='S')
+            if categorical:
+                self.set_label_codes(*_encode_labels(labels))
+            else:
+                self.labels = labels
+
+    # labels attribute is handled as a property so categorical labels can be
+    # decoded on demand
+    @property
+    def labels(self):
+        '''
+        Names or labels for the elements.
+
+        For categorical labels this is decoded from :attr:`label_codes` and
+        :attr:`label_names` each time it is accessed.
+        '''
+        if self.label_codes is None:
+            return self._labels
+        return self.label_names[self.label_codes]
+
+    @labels.setter
+    def labels(self, labels):
+        '''
+        Setter for :attr:`labels`.
+
+        If the labels are categorical, the new labels are encoded again.
+        '''
+        if self.label_codes is None:
+            self._labels = labels
+        else:
+            self.set_label_codes(*_encode_labels(labels))
+
+    @property
+    def is_categorical(self):
+        '''
+        True if the labels are stored as categorical data.
+        '''
+        return self.label_codes is not None
+
+    def set_label_codes(self, label_codes, label_names):
+        '''
+        Store the labels as categorical data, with :attr:`label_codes` the
+        index of each label in :attr:`label_names`.
+
+        The codes are stored with the smallest integer dtype that can index
+        :attr:`label_names`.
+        '''
+        if label_names is None:
+            raise ValueError('label_names must be given with label_codes')
+        label_codes = np.asarray(label_codes)
+        if label_codes.dtype.kind not in 'iu':
+            raise ValueError('label_codes must be integers, not %s' %
+                             label_codes.dtype)
+        label_names = np.asarray(label_names, dtype='S')
+        self._labels = None
+        self.label_codes = label_codes.astype(
+            _label_code_dtype(len(label_names)), copy=False)
+        self.label_names = label_names
+
+    def to_categorical(self):
+        '''
+        Encode the labels as categorical data, in place.
+        '''
+        if self.label_codes is None:
+            self.set_label_codes(*_encode_labels(self._labels))
+
+    def _get_label_codes(self):
+        '''
+        Return the label codes and the label table, encoding the labels if
+        they are not categorical already.
+        '''
+        if self.label_codes is None:
+            return _encode_labels(self.labels)
+        return self.label_codes, self.label_names
+
+    def label_mask(self, labels):
+        '''
+        Return a boolean array that is True for the elements whose label is
+        :attr:`labels`, which can be a single label or a list of labels.
+
+        With categorical labels only the small label table is compared to
+        the requested labels; the per-element test is done on the integer
+        codes.
+        '''
+        labels = np.asarray(labels, dtype='S').ravel()
+        if self.label_codes is None:
+            return np.in1d(self.labels, labels)
+        wanted = np.flatnonzero(np.in1d(self.label_names, labels))
+        if len(wanted) == 1:
+            return self.label_codes == wanted[0]
+        return np.in1d(self.label_codes, wanted)
+
+    def select_labels(self, labels):
+        '''
+        Return a new object with only the elements whose label is
+        :attr:`labels`, which can be a single label or a list of labels.
+        '''
+        return self[self.label_mask(labels)]
+
+    def time_slice(self, t_start, t_stop):
+        '''
+        Return a new object with the elements whose time is between (and
+        including) :attr:`t_start` and :attr:`t_stop`.  Either parameter can
+        also be None to use infinite endpoints for the time interval.
+        '''
+        mask = np.ones(self.times.shape, dtype=bool)
+        if t_start is not None:
+            mask &= self.times >= t_start
+        if t_stop is not None:
+            mask &= self.times <= t_stop
+        return self[mask]
+
+    def _check_index(self, i):
+        '''
+        Return the index :attr:`i` of ``__getitem__`` as an index of arrays.
+        An integer is turned into a slice of length 1, so that indexing
+        always returns an object of the same class.
+        '''
+        if isinstance(i, (int, np.integer)):
+            if not -len(self.times) <= i < len(self.times):
+                raise IndexError("index %s is out of range" % i)
+            i = slice(i, i + 1 or None)
+        return i
+
+    def _sliced_labels(self, i):
+        '''
+        Keyword arguments giving the labels of the elements selected by the
+        array index :attr:`i`.  Categorical labels share the label table.
+        '''
+        if self.label_codes is None:
+            return {'labels': np.asarray(self._labels)[i]}
+        return {'label_codes': self.label_codes[i],
+                'label_names': self.label_names}
+
+    def _merged_labels(self, other):
+        '''
+        Keyword arguments giving the labels of the elements of this object
+        followed by those of :attr:`other`.  If either has categorical
+        labels, so does the result, with a single label table.
+        '''
+        if self.is_categorical or other.is_categorical:
+            label_codes, label_names = _merge_label_tables(
+                *(self._get_label_codes() + other._get_label_codes()))
+            return {'label_codes': label_codes, 'label_names': label_names}
+        return {'labels': np.hstack([self.labels, other.labels])}
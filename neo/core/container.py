@@ -10,7 +10,10 @@ defined in :module:`neo.core.analogsignalarray`.
 # needed for python 3 compatibility
 from __future__ import absolute_import, division, print_function
 
+import numpy as np
+
 from neo.core.baseneo import BaseNeo
+from neo.core.filters import MetadataTable
 
 
 def unique_objs(objs):
@@ -33,6 +36,15 @@ def filterdata(data, targdict=None, objects=None, **kwargs):
     sequentially.  If targdict and kwargs are both supplied, the
     targdict filters are applied first, followed by the kwarg filters.
 
+    The value of a search term can be a plain value (equality), or a
+    :class:`neo.core.filters.FilterCondition` such as
+    GreaterThan(10*pq.kHz), InRange(200, 400) or Satisfies(func), func
+    being given the value and returning True for the objects to keep.
+    targdict (or an item of the list) can also be a callable which is given
+    each object.
+
+    data can be a :class:`neo.core.filters.MetadataTable`, whose columns
+    are then reused.
 
     objects (optional) should be the name of a Neo object type,
     a neo object class, or a list of one or both of these.  If specified,
@@ -51,39 +63,49 @@ def filterdata(data, targdict=None, objects=None, **kwargs):
         targdict = kwargs
     elif not kwargs:
         pass
-    elif hasattr(targdict, 'keys'):
+    elif hasattr(targdict, 'keys') or callable(targdict):
         targdict = [targdict, kwargs]
     else:
-        targdict += [kwargs]
+        targdict = list(targdict) + [kwargs]
 
     if not targdict:
         return []
+    if hasattr(targdict, 'keys') or callable(targdict):
+        targdict = [targdict]
 
-    # if multiple dicts are provided, apply each filter sequentially
-    if not hasattr(targdict, 'keys'):
-        # for performance reasons, only do the object filtering on the first
-        # iteration
-        results = filterdata(data, targdict=targdict[0], objects=objects)
-        for targ in targdict[1:]:
-            results = filterdata(results, targdict=targ)
-        return results
-
-    # do the actual filtering
-    results = []
-    for key, value in sorted(targdict.items()):
-        for obj in data:
-            if (hasattr(obj, key) and getattr(obj, key) == value and
-                    all([obj is not res for res in results])):
-                results.append(obj)
-            elif (key in obj.annotations and obj.annotations[key] == value and
-                    all([obj is not res for res in results])):
-                results.append(obj)
+    if isinstance(data, MetadataTable):
+        table = data
+    else:
+        table = MetadataTable(data)
+    indexes = np.arange(len(table))
 
     # keep only objects of the correct classes
     if objects:
-        results = [result for result in results if
-                   result.__class__ in objects or
-                   result.__class__.__name__ in objects]
+        indexes = np.array([i for i in indexes if
+                            table.objects[i].__class__ in objects or
+                            table.objects[i].__class__.__name__ in objects],
+                           dtype=np.intp)
+
+    # if multiple dicts are provided, apply each filter sequentially
+    for targ in targdict:
+        if not targ:
+            return []
+        if callable(targ) and not hasattr(targ, 'keys'):
+            keep = [bool(targ(table.objects[i])) for i in indexes]
+            indexes = indexes[np.array(keep, dtype=bool)]
+            continue
+        # objects matching any of the terms, in the order of the terms
+        found = np.zeros(len(indexes), dtype=bool)
+        order = []
+        for key, value in sorted(targ.items()):
+            mask = table.match(key, value, indexes) & ~found
+            order.extend(np.flatnonzero(mask))
+            found |= mask
+        indexes = indexes[np.array(order, dtype=np.intp)]
+
+    results = [table.objects[i] for i in indexes]
+    if not table.unique:
+        results = unique_objs(results)
     return results
 
 
@@ -172,6 +194,10 @@ class Container(BaseNeo):
         :filter(**args): Retrieves children of the current object that
                          have particular properties.
 
+        :metadata_table(**args): Columns of the attributes and annotations
+                                 of the children, reused by successive
+                                 searches.
+
         :list_children_by_class(**args): Retrieves all children of the current
                                          object recursively that are of a
                                          particular class.
@@ -393,9 +419,34 @@ class Container(BaseNeo):
         This overrides data and container.
 
 
+        The value of a search term can also be a condition from
+        :mod:`neo.core.filters`, see :func:`filterdata`.
+
         Examples::
 
             >>> obj.filter(name="Vm")
+            >>> obj.filter(size=GreaterThan(1000), objects='SpikeTrain')
+            >>> obj.filter(depth=InRange(200, 400), objects=Unit)
+        """
+        return filterdata(self.metadata_table(data=data, container=container,
+                                              recursive=recursive,
+                                              objects=objects),
+                          objects=objects, targdict=targdict, **kwargs)
+
+    def metadata_table(self, data=True, container=False, recursive=True,
+                       objects=None):
+        """
+        Return a :class:`neo.core.filters.MetadataTable` of the child
+        objects, selected as in :meth:`filter`.  The table can be filtered
+        several times with :meth:`MetadataTable.filter`, each attribute or
+        annotation being read from the objects only once, as long as the
+        objects are not modified.
+
+        Examples::
+
+            >>> table = blk.metadata_table(objects='SpikeTrain')
+            >>> busy = table.filter(size=GreaterThan(1000))
+            >>> named = table.filter(name=IsNot(None))
         """
         # if objects are specified, get the classes
         if objects:
@@ -415,8 +466,14 @@ class Container(BaseNeo):
             else:
                 children.extend(self.container_children)
 
-        return filterdata(children, objects=objects,
-                          targdict=targdict, **kwargs)
+        # keep only objects of the correct classes
+        if objects:
+            if hasattr(objects, 'lower') or isinstance(objects, type):
+                objects = [objects]
+            children = [child for child in children if
+                        child.__class__ in objects or
+                        child.__class__.__name__ in objects]
+        return MetadataTable(children)
 
     def list_children_by_class(self, cls):
         """
@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+'''
+This module implements :class:`EnvelopePyramid`, a multi-resolution min/max
+envelope of an :class:`AnalogSignal` or :class:`AnalogSignalArray`, used to
+display long signals at any zoom level without reading all their samples.
+
+It is normally used through :meth:`BaseAnalogSignal.build_envelope` and
+:meth:`BaseAnalogSignal.get_envelope`.
+'''
+
+# needed for python 3 compatibility
+from __future__ import absolute_import, division, print_function
+
+import numpy as np
+
+
+def _reduce_blocks(data, size):
+    '''
+    Min and max of :attr:`data` along axis 0 over consecutive blocks of
+    :attr:`size` rows, the last block being possibly shorter.
+    '''
+    n_full = data.shape[0] // size
+    full = data[:n_full * size].reshape((n_full, size) + data.shape[1:])
+    mins = [full.min(axis=1)]
+    maxs = [full.max(axis=1)]
+    if data.shape[0] > n_full * size:
+        tail = data[n_full * size:]
+        mins.append(tail.min(axis=0)[np.newaxis])
+        maxs.append(tail.max(axis=0)[np.newaxis])
+    return np.concatenate(mins), np.concatenate(maxs)
+
+
+class EnvelopePyramid(object):
+    '''
+    Multi-resolution min/max envelope of a signal.
+
+    Level k holds the minimum and maximum of each channel over bins of
+    :attr:`base` * :attr:`factor` ** k samples.  The first level is built by
+    reading the signal once, by chunks of :attr:`chunk_size` samples, so
+    memory-mapped signals are never fully loaded.  The following levels are
+    built from the previous one.  The pyramid takes about
+    2 / :attr:`base` of the memory of the signal.
+
+    *Usage*::
+
+        >>> pyramid = EnvelopePyramid(sigarr)
+        >>> edges, mins, maxs = pyramid.envelope(0, len(sigarr), 1000,
+        ...                                      data=sigarr.magnitude)
+
+    *Required attributes/properties*:
+        :signal: (:class:`AnalogSignal` or :class:`AnalogSignalArray` or
+            numpy array) The signal, time along axis 0.
+
+    *Recommended attributes/properties*:
+        :base: (int) Number of samples in the bins of the first level.
+            Default: 64.
+        :factor: (int) Ratio between the bin sizes of two consecutive
+            levels.  Default: 4.
+        :chunk_size: (int) Number of samples read at once while building the
+            pyramid, rounded to a multiple of :attr:`base`.
+            Default: 2**20.
+
+    '''
+
+    def __init__(self, signal, base=64, factor=4, chunk_size=2 ** 20):
+        '''
+        Build the pyramid of :attr:`signal`.
+        '''
+        if base < 1 or factor < 2:
+            raise ValueError("base must be at least 1 and factor at least 2")
+        data = np.asarray(signal)
+        self.base = int(base)
+        self.factor = int(factor)
+        self.n_samples = data.shape[0]
+        self.ndim = data.ndim
+        if data.ndim == 1:
+            data = data[:, np.newaxis]
+
+        chunk_size = max(chunk_size // self.base, 1) * self.base
+        mins = []
+        maxs = []
+        for start in range(0, self.n_samples, chunk_size):
+            chunk_min, chunk_max = _reduce_blocks(
+                data[start:start + chunk_size], self.base)
+            mins.append(chunk_min)
+            maxs.append(chunk_max)
+        if mins:
+            self.mins = [np.concatenate(mins)]
+            self.maxs = [np.concatenate(maxs)]
+        else:
+            self.mins = [np.zeros((0, data.shape[1]), dtype=data.dtype)]
+            self.maxs = [np.zeros((0, data.shape[1]), dtype=data.dtype)]
+
+        while len(self.mins[-1]) > 1:
+            self.mins.append(_reduce_blocks(self.mins[-1], self.factor)[0])
+            self.maxs.append(_reduce_blocks(self.maxs[-1], self.factor)[1])
+
+    def bin_size(self, level):
+        '''
+        Number of samples in the bins of :attr:`level`.
+        '''
+        return self.base * self.factor ** level
+
+    def envelope(self, start, stop, n_pixels, data=None):
+        '''
+        Min/max envelope of the samples from :attr:`start` to :attr:`stop`
+        in at most :attr:`n_pixels` pixels.
+
+        The coarsest level whose bins are not larger than a pixel is used,
+        so the cost is proportional to :attr:`n_pixels` and not to the
+        number of samples.  When a pixel holds less than :attr:`base`
+        samples, the samples are read from :attr:`data` instead (which must
+        then be given), which also costs O(:attr:`n_pixels`).
+
+        Returns the sample indexes of the pixel edges, and the (pixel,
+        channel) min and max arrays (1D if the signal is 1D).  The edges are
+        aligned on the bins of the level used.
+        '''
+        start = max(int(start), 0)
+        stop = min(int(stop), self.n_samples)
+        n_samples = max(stop - start, 0)
+        n_pixels = min(int(n_pixels), n_samples)
+        if n_pixels <= 0:
+            empty = np.zeros((0,) + self.mins[0].shape[1:],
+                             dtype=self.mins[0].dtype)
+            return self._output(np.array([start]), empty, empty.copy())
+
+        per_pixel = n_samples / n_pixels
+        if per_pixel < self.base:
+            if data is None:
+                raise ValueError("data is needed to get an envelope finer "
+                                 "than %d samples per pixel" % self.base)
+            samples = np.asarray(data[start:stop])
+            if samples.ndim == 1:
+                samples = samples[:, np.newaxis]
+            edges = (np.arange(n_pixels + 1) * n_samples) // n_pixels
+            mins = np.minimum.reduceat(samples, edges[:-1], axis=0)
+            maxs = np.maximum.reduceat(samples, edges[:-1], axis=0)
+            return self._output(edges + start, mins, maxs)
+
+        level = 0
+        while (level + 1 < len(self.mins) and
+               self.bin_size(level + 1) <= per_pixel):
+            level += 1
+        size = self.bin_size(level)
+        first = start // size
+        last = min(-(-stop // size), len(self.mins[level]))
+        n_bins = last - first
+        n_pixels = min(n_pixels, n_bins)
+        bounds = (np.arange(n_pixels + 1) * n_bins) // n_pixels
+        mins = np.minimum.reduceat(self.mins[level][first:last],
+                                   bounds[:-1], axis=0)
+        maxs = np.maximum.reduceat(self.maxs[level][first:last],
+                                   bounds[:-1], axis=0)
+        edges = np.minimum((bounds + first) * size, self.n_samples)
+        return self._output(edges, mins, maxs)
+
+    def _output(self, edges, mins, maxs):
+        '''
+        Give the envelope the dimensionality of the signal.
+        '''
+        if self.ndim == 1:
+            mins = mins[:, 0]
+            maxs = maxs[:, 0]
+        return edges, mins, maxs
+
+    def to_arrays(self):
+        '''
+        Return the pyramid as a dict of arrays, for storage.
+        '''
+        arrays = {'header': np.array([self.base, self.factor,
+                                      self.n_samples, self.ndim])}
+        for level, (mins, maxs) in enumerate(zip(self.mins, self.maxs)):
+            arrays['min_%d' % level] = mins
+            arrays['max_%d' % level] = maxs
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        '''
+        Rebuild a pyramid from the dict of arrays given by
+        :meth:`to_arrays`.
+        '''
+        obj = cls.__new__(cls)
+        obj.base, obj.factor, obj.n_samples, obj.ndim = \
+            [int(value) for value in arrays['header']]
+        obj.mins = []
+        obj.maxs = []
+        while 'min_%d' % len(obj.mins) in arrays:
+            level = len(obj.mins)
+            obj.mins.append(np.asarray(arrays['min_%d' % level]))
+            obj.maxs.append(np.asarray(arrays['max_%d' % level]))
+        return obj
+
+    def save(self, filename):
+        '''
+        Save the pyramid to :attr:`filename`, in numpy .npz format.
+        '''
+        with open(filename, 'wb') as fobj:
+            np.savez(fobj, **self.to_arrays())
+
+    @classmethod
+    def load(cls, filename):
+        '''
+        Load a pyramid saved with :meth:`save`.
+        '''
+        arrays = np.load(filename)
+        try:
+            return cls.from_arrays(dict((key, arrays[key])
+                                        for key in arrays.files))
+        finally:
+            arrays.close()
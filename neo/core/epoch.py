@@ -11,10 +11,10 @@ from __future__ import absolute_import, division, print_function
 
 import quantities as pq
 
-from neo.core.baseneo import BaseNeo
+from neo.core.baseneo import BaseNeo, CompactNeo
 
 
-class Epoch(BaseNeo):
+class Epoch(CompactNeo, BaseNeo):
     '''
     A period of time with a start point and duration.
 
@@ -50,6 +50,8 @@ class Epoch(BaseNeo):
 
     '''
 
+    __slots__ = ('time', 'duration', 'label', 'segment')
+
     _single_parent_objects = ('Segment',)
     _necessary_attrs = (('time', pq.Quantity, 0),
                        ('duration', pq.Quantity, 0),
@@ -16,11 +16,12 @@ import numpy as np
 import quantities as pq
 
 from neo.core.baseneo import BaseNeo, merge_annotations
+from neo.core.categorical import CategoricalLabelsMixin
 
 PY_VER = sys.version_info[0]
 
 
-class EpochArray(BaseNeo):
+class EpochArray(CategoricalLabelsMixin, BaseNeo):
     '''
     Array of epochs. Introduced for performance reason.
 
@@ -45,6 +46,9 @@ class EpochArray(BaseNeo):
         array(['btn0', 'btn1', 'btn2'],
               dtype='|S4')
 
+    Labels can also be stored as categorical data, see
+    :class:`EventArray`.
+
     *Required attributes/properties*:
         :times: (quantity array 1D) The starts of the time periods.
         :durations: (quantity array 1D) The length of the time period.
@@ -56,9 +60,30 @@ class EpochArray(BaseNeo):
         :description: (str) Text description,
         :file_origin: (str) Filesystem path or URL of the original data file.
 
+    *Optional attributes/properties*:
+        :label_codes: (numpy.array 1D dtype='i') Index of the label of each
+            time period in :attr:`label_names`.  If given, :attr:`labels` is
+            ignored and the labels are stored as categorical data.
+        :label_names: (numpy.array 1D dtype='S') Table of the unique labels,
+            required with :attr:`label_codes`.
+        :categorical: (bool) If True, encode :attr:`labels` as categorical
+            data.  False by default.
+
     Note: Any other additional arguments are assumed to be user-specific
             metadata and stored in :attr:`annotations`,
 
+    *Properties available on this object*:
+        :is_categorical: (bool) True if the labels are stored as
+            categorical data, read-only.
+
+    *Slicing*:
+        :class:`EpochArray` objects can be indexed with a slice, an index
+        array or a boolean mask.  This returns a new :class:`EpochArray` with
+        the same metadata.  Categorical labels stay categorical and share the
+        label table of the original.
+        An integer index also returns a new :class:`EpochArray`, of length 1,
+        not a single element.
+
     '''
 
     _single_parent_objects = ('Segment',)
@@ -67,7 +92,9 @@ class EpochArray(BaseNeo):
                        ('labels', np.ndarray, 1, np.dtype('S')))
 
     def __init__(self, times=None, durations=None, labels=None,
-                 name=None, description=None, file_origin=None, **annotations):
+                 name=None, description=None, file_origin=None,
+                 label_codes=None, label_names=None, categorical=False,
+                 **annotations):
         '''
         Initialize a new :class:`EpochArray` instance.
         '''
@@ -78,15 +105,27 @@ class EpochArray(BaseNeo):
             times = np.array([]) * pq.s
         if durations is None:
             durations = np.array([]) * pq.s
-        if labels is None:
-            labels = np.array([], dtype='S')
 
         self.times = times
         self.durations = durations
-        self.labels = labels
+        self._init_labels(labels, label_codes, label_names, categorical)
 
         self.segment = None
 
+    def __getitem__(self, i):
+        '''
+        Get a new :class:`EpochArray` with the time periods selected by
+        :attr:`i`.
+        '''
+        i = self._check_index(i)
+        labelkw = self._sliced_labels(i)
+        obj = EpochArray(times=self.times[i], durations=self.durations[i],
+                         name=self.name, description=self.description,
+                         file_origin=self.file_origin, **labelkw)
+        obj.annotations = self.annotations.copy()
+        obj.segment = self.segment
+        return obj
+
     def __repr__(self):
         '''
         Returns a string representing the :class:`EpochArray`.
@@ -108,6 +147,9 @@ class EpochArray(BaseNeo):
         The :class:`EpochArray` objects are concatenated horizontally
         (column-wise), :func:`np.hstack`).
 
+        If either :class:`EpochArray` has categorical labels, the result
+        has categorical labels as well, with a single label table.
+
         If the attributes of the two :class:`EpochArray` are not
         compatible, and Exception is raised.
         '''
@@ -116,8 +158,7 @@ class EpochArray(BaseNeo):
         times = np.hstack([self.times, othertimes]) * self.times.units
         durations = np.hstack([self.durations,
                                otherdurations]) * self.durations.units
-        labels = np.hstack([self.labels, other.labels])
-        kwargs = {}
+        kwargs = self._merged_labels(other)
         for name in ("name", "description", "file_origin"):
             attr_self = getattr(self, name)
             attr_other = getattr(other, name)
@@ -129,5 +170,4 @@ class EpochArray(BaseNeo):
         merged_annotations = merge_annotations(self.annotations,
                                                other.annotations)
         kwargs.update(merged_annotations)
-        return EpochArray(times=times, durations=durations, labels=labels,
-                          **kwargs)
+        return EpochArray(times=times, durations=durations, **kwargs)
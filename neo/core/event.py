@@ -11,10 +11,10 @@ from __future__ import absolute_import, division, print_function
 
 import quantities as pq
 
-from neo.core.baseneo import BaseNeo
+from neo.core.baseneo import BaseNeo, CompactNeo
 
 
-class Event(BaseNeo):
+class Event(CompactNeo, BaseNeo):
     '''
     An event occuring at a particular point in time.
 
@@ -46,6 +46,8 @@ class Event(BaseNeo):
 
     '''
 
+    __slots__ = ('time', 'label', 'segment')
+
     _single_parent_objects = ('Segment',)
     _necessary_attrs = (('time', pq.Quantity, 0),
                        ('label', str))
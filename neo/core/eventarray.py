@@ -16,11 +16,12 @@ import numpy as np
 import quantities as pq
 
 from neo.core.baseneo import BaseNeo, merge_annotations
+from neo.core.categorical import CategoricalLabelsMixin
 
 PY_VER = sys.version_info[0]
 
 
-class EventArray(BaseNeo):
+class EventArray(CategoricalLabelsMixin, BaseNeo):
     '''
     Array of events. Introduced for performance reasons.
 
@@ -42,6 +43,21 @@ class EventArray(BaseNeo):
         array(['trig0', 'trig1', 'trig2'],
               dtype='|S5')
 
+    Labels can also be stored as categorical data, an array of integer codes
+    into a table of the unique labels.  This is much more compact when a few
+    labels are repeated many times::
+
+        >>> evtarr = EventArray(np.arange(0, 40, 10)*s,
+        ...                     labels=['on', 'off', 'on', 'off'],
+        ...                     categorical=True)
+        >>> evtarr.label_codes
+        array([1, 0, 1, 0], dtype=int8)
+        >>> evtarr.label_names
+        array(['off', 'on'],
+              dtype='|S3')
+        >>> evtarr.select_labels('on').times
+        array([  0.,  20.]) * s
+
     *Required attributes/properties*:
         :times: (quantity array 1D) The time of the events.
         :labels: (numpy.array 1D dtype='S') Names or labels for the events.
@@ -51,9 +67,30 @@ class EventArray(BaseNeo):
         :description: (str) Text description.
         :file_origin: (str) Filesystem path or URL of the original data file.
 
+    *Optional attributes/properties*:
+        :label_codes: (numpy.array 1D dtype='i') Index of the label of each
+            event in :attr:`label_names`.  If given, :attr:`labels` is
+            ignored and the labels are stored as categorical data.
+        :label_names: (numpy.array 1D dtype='S') Table of the unique labels,
+            required with :attr:`label_codes`.
+        :categorical: (bool) If True, encode :attr:`labels` as categorical
+            data.  False by default.
+
     Note: Any other additional arguments are assumed to be user-specific
             metadata and stored in :attr:`annotations`.
 
+    *Properties available on this object*:
+        :is_categorical: (bool) True if the labels are stored as
+            categorical data, read-only.
+
+    *Slicing*:
+        :class:`EventArray` objects can be indexed with a slice, an index
+        array or a boolean mask.  This returns a new :class:`EventArray` with
+        the same metadata.  Categorical labels stay categorical and share the
+        label table of the original.
+        An integer index also returns a new :class:`EventArray`, of length 1,
+        not a single element.
+
     '''
 
     _single_parent_objects = ('Segment',)
@@ -61,7 +98,8 @@ class EventArray(BaseNeo):
                        ('labels', np.ndarray, 1, np.dtype('S')))
 
     def __init__(self, times=None, labels=None, name=None, description=None,
-                 file_origin=None, **annotations):
+                 file_origin=None, label_codes=None, label_names=None,
+                 categorical=False, **annotations):
         '''
         Initialize a new :class:`EventArray` instance.
         '''
@@ -69,14 +107,25 @@ class EventArray(BaseNeo):
                          description=description, **annotations)
         if times is None:
             times = np.array([]) * pq.s
-        if labels is None:
-            labels = np.array([], dtype='S')
 
         self.times = times
-        self.labels = labels
+        self._init_labels(labels, label_codes, label_names, categorical)
 
         self.segment = None
 
+    def __getitem__(self, i):
+        '''
+        Get a new :class:`EventArray` with the events selected by :attr:`i`.
+        '''
+        i = self._check_index(i)
+        labelkw = self._sliced_labels(i)
+        obj = EventArray(times=self.times[i], name=self.name,
+                         description=self.description,
+                         file_origin=self.file_origin, **labelkw)
+        obj.annotations = self.annotations.copy()
+        obj.segment = self.segment
+        return obj
+
     def __repr__(self):
         '''
         Returns a string representing the :class:`EventArray`.
@@ -97,13 +146,15 @@ class EventArray(BaseNeo):
         The :class:`EventArray` objects are concatenated horizontally
         (column-wise), :func:`np.hstack`).
 
+        If either :class:`EventArray` has categorical labels, the result
+        has categorical labels as well, with a single label table.
+
         If the attributes of the two :class:`EventArray` are not
         compatible, and Exception is raised.
         '''
         othertimes = other.times.rescale(self.times.units)
         times = np.hstack([self.times, othertimes]) * self.times.units
-        labels = np.hstack([self.labels, other.labels])
-        kwargs = {}
+        kwargs = self._merged_labels(other)
         for name in ("name", "description", "file_origin"):
             attr_self = getattr(self, name)
             attr_other = getattr(other, name)
@@ -115,4 +166,4 @@ class EventArray(BaseNeo):
         merged_annotations = merge_annotations(self.annotations,
                                                other.annotations)
         kwargs.update(merged_annotations)
-        return EventArray(times=times, labels=labels, **kwargs)
+        return EventArray(times=times, **kwargs)
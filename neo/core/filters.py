@@ -0,0 +1,391 @@
+# -*- coding: utf-8 -*-
+'''
+This module implements the conditions and the metadata table used by
+:meth:`Container.filter` and :func:`neo.core.container.filterdata`.
+
+A search term of :meth:`Container.filter` can be a plain value (the objects
+whose attribute or annotation is equal to it match, even if it is a class
+or a function), or a :class:`FilterCondition` (:class:`Equals`,
+:class:`IsNot`, :class:`LessThan`, :class:`LessThanOrEquals`,
+:class:`GreaterThan`, :class:`GreaterThanOrEquals`, :class:`IsIn`,
+:class:`InRange`, or :class:`Satisfies`, which wraps a callable given the
+value and returning True for the objects to keep).
+
+The values of the attributes and annotations searched are gathered once per
+key in a :class:`MetadataTable`, and numeric conditions are then evaluated
+on arrays.  Quantities are compared in the units of the condition.  A table
+can be kept and filtered several times as long as the objects are not
+modified.
+
+*Usage*::
+
+    >>> from neo.core.filters import (GreaterThan, GreaterThanOrEquals,
+    ...                               InRange, Satisfies)
+    >>> blk.filter(size=GreaterThan(1000), objects='SpikeTrain')
+    >>> blk.filter(sampling_rate=GreaterThanOrEquals(10*pq.kHz))
+    >>> blk.filter(depth=InRange(200, 400), objects='Unit')
+    >>> table = blk.metadata_table(objects='SpikeTrain')
+    >>> table.filter(size=GreaterThan(1000))
+    >>> table.filter(name=Satisfies(lambda name: name.startswith('Ch')))
+'''
+
+# needed for python 3 compatibility
+from __future__ import absolute_import, division, print_function
+
+import numbers
+
+import numpy as np
+import quantities as pq
+
+
+def _is_numeric(value):
+    '''
+    True if :attr:`value` is a number or a quantity scalar.
+    '''
+    if isinstance(value, pq.Quantity):
+        return value.size == 1
+    return (isinstance(value, (numbers.Number, np.number)) and
+            not isinstance(value, (bool, np.bool_)))
+
+
+def _is_dimensionless(units):
+    '''
+    True if :attr:`units` are dimensionless.
+    '''
+    return units.dimensionality == pq.dimensionless.dimensionality
+
+
+class FilterCondition(object):
+    '''
+    Base class of the conditions used as search terms of
+    :meth:`Container.filter`.
+
+    :meth:`evaluate` tests one value.  When the control values are numbers
+    or quantity scalars, :meth:`evaluate_array` tests an array of floats at
+    once, the values being expressed in :attr:`units` first.
+    '''
+
+    def __init__(self, control):
+        self.control = control
+
+    @property
+    def controls(self):
+        '''
+        The values the condition compares to.
+        '''
+        return [self.control]
+
+    @property
+    def numeric(self):
+        '''
+        True if the condition can be evaluated on arrays of floats.
+        '''
+        return all(_is_numeric(value) for value in self.controls)
+
+    @property
+    def units(self):
+        '''
+        Units in which the values are compared, None for plain numbers.
+        '''
+        for value in self.controls:
+            if isinstance(value, pq.Quantity):
+                return value.units
+        return None
+
+    def _magnitude(self, value):
+        '''
+        Float value of a control in :attr:`units`.
+        '''
+        if isinstance(value, pq.Quantity):
+            return float(value.rescale(self.units).magnitude)
+        return float(value)
+
+    def evaluate(self, compare):
+        '''
+        True if :attr:`compare` satisfies the condition.
+        '''
+        raise NotImplementedError
+
+    def evaluate_array(self, values):
+        '''
+        Boolean array, True where :attr:`values` satisfy the condition.
+        '''
+        return np.array([bool(self.evaluate(value)) for value in values],
+                        dtype=bool)
+
+    def __repr__(self):
+        return '%s(%s)' % (self.__class__.__name__,
+                           ', '.join(repr(value) for value in self.controls))
+
+
+class Equals(FilterCondition):
+    '''
+    The value is equal to the control.
+    '''
+
+    def evaluate(self, compare):
+        return compare == self.control
+
+    def evaluate_array(self, values):
+        return values == self._magnitude(self.control)
+
+
+class IsNot(FilterCondition):
+    '''
+    The value is not equal to the control.
+    '''
+
+    def evaluate(self, compare):
+        return compare != self.control
+
+    def evaluate_array(self, values):
+        return values != self._magnitude(self.control)
+
+
+class LessThan(FilterCondition):
+    '''
+    The value is strictly less than the control.
+    '''
+
+    def evaluate(self, compare):
+        return compare < self.control
+
+    def evaluate_array(self, values):
+        return values < self._magnitude(self.control)
+
+
+class LessThanOrEquals(FilterCondition):
+    '''
+    The value is less than or equal to the control.
+    '''
+
+    def evaluate(self, compare):
+        return compare <= self.control
+
+    def evaluate_array(self, values):
+        return values <= self._magnitude(self.control)
+
+
+class GreaterThan(FilterCondition):
+    '''
+    The value is strictly greater than the control.
+    '''
+
+    def evaluate(self, compare):
+        return compare > self.control
+
+    def evaluate_array(self, values):
+        return values > self._magnitude(self.control)
+
+
+class GreaterThanOrEquals(FilterCondition):
+    '''
+    The value is greater than or equal to the control.
+    '''
+
+    def evaluate(self, compare):
+        return compare >= self.control
+
+    def evaluate_array(self, values):
+        return values >= self._magnitude(self.control)
+
+
+class IsIn(FilterCondition):
+    '''
+    The value is one of the values of the control (a list or an array).
+    '''
+
+    def __init__(self, control):
+        if isinstance(control, pq.Quantity):
+            control = [value for value in control.flatten()]
+        super(IsIn, self).__init__(list(control))
+
+    @property
+    def controls(self):
+        return self.control
+
+    def evaluate(self, compare):
+        return any(compare == value for value in self.control)
+
+    def evaluate_array(self, values):
+        return np.in1d(values, [self._magnitude(value)
+                                for value in self.control])
+
+
+class InRange(FilterCondition):
+    '''
+    The value is between :attr:`lower_bound` and :attr:`upper_bound`,
+    which are included unless :attr:`left_closed` or :attr:`right_closed`
+    is False.
+    '''
+
+    def __init__(self, lower_bound, upper_bound, left_closed=True,
+                 right_closed=True):
+        super(InRange, self).__init__((lower_bound, upper_bound))
+        self.left_closed = left_closed
+        self.right_closed = right_closed
+
+    @property
+    def controls(self):
+        return list(self.control)
+
+    def evaluate(self, compare):
+        lower, upper = self.control
+        above = compare >= lower if self.left_closed else compare > lower
+        below = compare <= upper if self.right_closed else compare < upper
+        return above and below
+
+    def evaluate_array(self, values):
+        lower, upper = [self._magnitude(value) for value in self.control]
+        above = values >= lower if self.left_closed else values > lower
+        below = values <= upper if self.right_closed else values < upper
+        return above & below
+
+
+class Satisfies(FilterCondition):
+    '''
+    The control, a callable, returns True for the value.
+    '''
+
+    def evaluate(self, compare):
+        return self.control(compare)
+
+
+class MetadataTable(object):
+    '''
+    Columns of the attributes and annotations of a list of Neo objects, used
+    to filter them.
+
+    A column is extracted from the objects the first time its key is
+    searched, and kept for the next searches, so a table should not be
+    reused after the objects are modified.  Tables are normally made by
+    :meth:`Container.metadata_table`.
+
+    *Usage*::
+
+        >>> table = MetadataTable(blk.list_children_by_class('SpikeTrain'))
+        >>> table.filter(size=GreaterThan(1000))
+
+    *Required attributes/properties*:
+        :objects: (list) The Neo objects.
+
+    *Properties available on this object*:
+        :unique: (bool) True if no object appears twice in :attr:`objects`.
+    '''
+
+    def __init__(self, objects):
+        self.objects = list(objects)
+        self.unique = len(set(id(obj) for obj in self.objects)) == \
+            len(self.objects)
+        self._columns = {}
+        self._numeric = {}
+
+    def __len__(self):
+        return len(self.objects)
+
+    def __iter__(self):
+        return iter(self.objects)
+
+    def column(self, key):
+        '''
+        Return the attribute and the annotation columns of :attr:`key`,
+        each a (present, values) pair of a boolean array and an object
+        array.
+        '''
+        if key not in self._columns:
+            n_objects = len(self.objects)
+            attr_present = np.zeros(n_objects, dtype=bool)
+            attr_values = np.empty(n_objects, dtype=object)
+            ann_present = np.zeros(n_objects, dtype=bool)
+            ann_values = np.empty(n_objects, dtype=object)
+            for i, obj in enumerate(self.objects):
+                if hasattr(obj, key):
+                    attr_present[i] = True
+                    attr_values[i] = getattr(obj, key)
+                annotations = obj.annotations
+                if key in annotations:
+                    ann_present[i] = True
+                    ann_values[i] = annotations[key]
+            self._columns[key] = ((attr_present, attr_values),
+                                  (ann_present, ann_values))
+        return self._columns[key]
+
+    def numeric_column(self, key, units=None):
+        '''
+        Return the attribute and the annotation columns of :attr:`key` as
+        (valid, values) pairs of a boolean array and a float array, the
+        quantities being converted to :attr:`units`.  Values that are not
+        numbers, or are in units not convertible to :attr:`units`, are not
+        valid.
+        '''
+        units_key = None if units is None else str(units.dimensionality)
+        if (key, units_key) not in self._numeric:
+            columns = []
+            factors = {}
+            for present, values in self.column(key):
+                valid = np.zeros(len(values), dtype=bool)
+                floats = np.zeros(len(values))
+                for i in np.flatnonzero(present):
+                    value = values[i]
+                    if not _is_numeric(value):
+                        continue
+                    if isinstance(value, pq.Quantity):
+                        magnitude = float(value.magnitude)
+                        if units is not None:
+                            dims = value.dimensionality.string
+                            if dims not in factors:
+                                try:
+                                    factors[dims] = float(
+                                        value.units.rescale(units).magnitude)
+                                except ValueError:
+                                    factors[dims] = None
+                            if factors[dims] is None:
+                                continue
+                            magnitude *= factors[dims]
+                    elif units is not None and not _is_dimensionless(units):
+                        continue
+                    else:
+                        magnitude = float(value)
+                    valid[i] = True
+                    floats[i] = magnitude
+                columns.append((valid, floats))
+            self._numeric[(key, units_key)] = tuple(columns)
+        return self._numeric[(key, units_key)]
+
+    def match(self, key, value, indexes=None):
+        '''
+        Boolean array, True for the objects at :attr:`indexes` (by default
+        all of them) whose attribute or annotation :attr:`key` matches
+        :attr:`value` (a plain value or a :class:`FilterCondition`).
+        '''
+        if indexes is None:
+            indexes = np.arange(len(self.objects))
+        mask = np.zeros(len(indexes), dtype=bool)
+        if isinstance(value, FilterCondition) and value.numeric:
+            for valid, floats in self.numeric_column(key, value.units):
+                valid = valid[indexes]
+                if valid.any():
+                    mask[valid] |= value.evaluate_array(
+                        floats[indexes][valid])
+            return mask
+
+        if isinstance(value, FilterCondition):
+            def test(compare):
+                # unset attributes are never compared to a condition
+                return compare is not None and value.evaluate(compare)
+        else:
+            def test(compare):
+                return compare == value
+        for present, values in self.column(key):
+            for i in np.flatnonzero(present[indexes] & ~mask):
+                if test(values[indexes[i]]):
+                    mask[i] = True
+        return mask
+
+    def filter(self, targdict=None, objects=None, **kwargs):
+        '''
+        Return the list of the objects matching the search terms, see
+        :func:`neo.core.container.filterdata`.
+        '''
+        from neo.core.container import filterdata
+        return filterdata(self, targdict=targdict, objects=objects, **kwargs)
@@ -26,6 +26,22 @@ import numpy as np
 import quantities as pq
 
 from neo.core.baseneo import BaseNeo
+from neo.core.streaming import chunked_reduce, ChunkReducer
+
+
+class _StepIntegralReducer(ChunkReducer):
+    '''
+    Integral of a signal whose values change stepwise at its sampling
+    times, see :meth:`IrregularlySampledSignal.mean`.
+    '''
+
+    overlap = 1
+
+    def partial(self, values, times):
+        return (values[:-1] * np.diff(times)).sum()
+
+    def combine(self, first, second):
+        return first + second
 
 
 def _new_IrregularlySampledSignal(cls, times, signal, units=None, time_units=None, dtype=None,
@@ -160,6 +176,8 @@ class IrregularlySampledSignal(BaseNeo, pq.Quantity):
         '''
         Map the __new__ function onto _new_IrregularlySampledSignal, so that pickle
         works
+
+        The array is not copied again when unpickled, it is a copy already.
         '''
         return _new_IrregularlySampledSignal, (self.__class__,
                                                self.times, 
@@ -167,7 +185,7 @@ class IrregularlySampledSignal(BaseNeo, pq.Quantity):
                                                self.units, 
                                                self.times.units, 
                                                self.dtype,
-                                               True, 
+                                               False, 
                                                self.name, 
                                                self.description, 
                                                self.file_origin,
@@ -356,16 +374,25 @@ class IrregularlySampledSignal(BaseNeo, pq.Quantity):
         '''
         return self.times[1:] - self.times[:-1]
 
-    def mean(self, interpolation=None):
+    def mean(self, interpolation=None, chunk_size=None, workers=None):
         '''
         Calculates the mean, optionally using interpolation between sampling
         times.
 
         If :attr:`interpolation` is None, we assume that values change
         stepwise at sampling times.
+
+        The signal is read by chunks of :attr:`chunk_size` samples, with
+        :attr:`workers` threads (see
+        :func:`neo.core.streaming.chunked_reduce`), so memory-mapped signals
+        are never fully loaded.
         '''
         if interpolation is None:
-            return (self[:-1]*self.sampling_intervals).sum()/self.duration
+            integral = chunked_reduce((self.magnitude, self.times.magnitude),
+                                      _StepIntegralReducer(),
+                                      chunk_size=chunk_size, workers=workers)
+            return pq.Quantity(integral / self.duration.magnitude,
+                               units=self.units)
         else:
             raise NotImplementedError
 
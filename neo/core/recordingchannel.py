@@ -12,10 +12,11 @@ from __future__ import absolute_import, division, print_function
 
 import quantities as pq
 
+from neo.core.baseneo import CompactNeo
 from neo.core.container import Container
 
 
-class RecordingChannel(Container):
+class RecordingChannel(CompactNeo, Container):
     '''
     A container for recordings coming from a single data channel.
 
@@ -82,6 +83,9 @@ class RecordingChannel(Container):
 
     '''
 
+    __slots__ = ('index', 'coordinate', 'analogsignals',
+                 'irregularlysampledsignals', 'recordingchannelgroups')
+
     _data_child_objects = ('AnalogSignal', 'IrregularlySampledSignal')
     _multi_parent_objects = ('RecordingChannelGroup',)
     _necessary_attrs = (('index', int),)
@@ -13,8 +13,150 @@ from __future__ import absolute_import, division, print_function
 from datetime import datetime
 
 import numpy as np
+import quantities as pq
 
 from neo.core.container import Container
+from neo.core.epocharray import EpochArray
+from neo.core.eventarray import EventArray
+from neo.core.analogsignalarray import AnalogSignalArray
+from neo.core.spiketrain import (SpikeTrain, _bin_spiketrains,
+                                 _instantaneous_rates)
+
+
+def _group_by(objs, key):
+    '''
+    Split :attr:`objs` into lists of objects with the same :attr:`key`,
+    preserving the order of the objects and of the first appearance of each
+    key.
+    '''
+    groups = {}
+    keys = []
+    for obj in objs:
+        value = key(obj)
+        if value not in groups:
+            groups[value] = []
+            keys.append(value)
+        groups[value].append(obj)
+    return [groups[value] for value in keys]
+
+
+def _stack_quantities(values, units=None):
+    '''
+    Stack a list of :class:`Quantity` scalars or arrays into one
+    :class:`Quantity` array with the units of the first value.
+    '''
+    if units is None:
+        units = values[0].units
+    dim = units.dimensionality
+    mags = [value.magnitude if value.dimensionality == dim else
+            value.rescale(units).magnitude for value in values]
+    return pq.Quantity(np.array(mags), units=units, copy=False)
+
+
+def _common_attr(objs, attr):
+    '''
+    Return the value of :attr:`attr` if it is the same for all :attr:`objs`,
+    or None otherwise.
+    '''
+    value = getattr(objs[0], attr)
+    for obj in objs[1:]:
+        if getattr(obj, attr) != value:
+            return None
+    return value
+
+
+def _array_annotations(objs, order=None):
+    '''
+    Turn the annotations of each object in :attr:`objs` into annotations
+    holding one value per object.
+
+    Values are stored in a NumPy array where possible and in a list
+    otherwise.  Objects without a given annotation get None.
+    '''
+    keys = []
+    for obj in objs:
+        for key in obj.annotations:
+            if key not in keys:
+                keys.append(key)
+    annotations = {}
+    for key in keys:
+        values = [obj.annotations.get(key, None) for obj in objs]
+        if order is not None:
+            values = [values[i] for i in order]
+        try:
+            arr = np.array(values)
+        except ValueError:  # ragged nested values
+            arr = None
+        if arr is not None and arr.dtype.kind in 'biufcSU' and arr.ndim == 1:
+            annotations[key] = arr
+        else:
+            annotations[key] = values
+    return annotations
+
+
+def _consolidate_events(events):
+    '''
+    Convert a list of :class:`Event` objects into one :class:`EventArray`.
+    '''
+    return EventArray(times=_stack_quantities([evt.time for evt in events]),
+                      labels=np.array([evt.label for evt in events],
+                                      dtype='S'),
+                      name=events[0].name,
+                      description=_common_attr(events, 'description'),
+                      file_origin=_common_attr(events, 'file_origin'),
+                      **_array_annotations(events))
+
+
+def _consolidate_epochs(epochs):
+    '''
+    Convert a list of :class:`Epoch` objects into one :class:`EpochArray`.
+    '''
+    times = _stack_quantities([epc.time for epc in epochs])
+    durations = _stack_quantities([epc.duration for epc in epochs])
+    return EpochArray(times=times, durations=durations,
+                      labels=np.array([epc.label for epc in epochs],
+                                      dtype='S'),
+                      name=epochs[0].name,
+                      description=_common_attr(epochs, 'description'),
+                      file_origin=_common_attr(epochs, 'file_origin'),
+                      **_array_annotations(epochs))
+
+
+def _consolidate_spikes(spikes, t_start, t_stop):
+    '''
+    Convert a list of :class:`Spike` objects into one :class:`SpikeTrain`,
+    sorted by time.
+
+    The waveforms are stacked if every :class:`Spike` has a waveform of the
+    same shape.
+    '''
+    times = _stack_quantities([spk.time for spk in spikes])
+    order = np.argsort(times.magnitude, kind='mergesort')
+    times = times[order]
+
+    waveforms = None
+    if all(spk.waveform is not None for spk in spikes):
+        shapes = set(spk.waveform.shape for spk in spikes)
+        if len(shapes) == 1:
+            waveforms = _stack_quantities([spikes[i].waveform
+                                           for i in order])
+
+    for attr in ('sampling_rate', 'left_sweep'):
+        values = [getattr(spk, attr) for spk in spikes
+                  if getattr(spk, attr) is not None]
+        if values and any(value != values[0] for value in values[1:]):
+            raise ValueError('Cannot consolidate Spike objects with ' +
+                             'different values of %s' % attr)
+
+    kwargs = {}
+    if spikes[0].sampling_rate is not None:
+        kwargs['sampling_rate'] = spikes[0].sampling_rate
+    return SpikeTrain(times=times, t_start=t_start, t_stop=t_stop,
+                      waveforms=waveforms, left_sweep=spikes[0].left_sweep,
+                      name=spikes[0].name,
+                      description=_common_attr(spikes, 'description'),
+                      file_origin=_common_attr(spikes, 'file_origin'),
+                      **dict(kwargs, **_array_annotations(spikes, order)))
 
 
 class Segment(Container):
@@ -65,6 +207,16 @@ class Segment(Container):
     *Properties available on this object*:
         :all_data: (list) A list of all child objects in the :class:`Segment`.
 
+    *Methods available on this object*:
+        :consolidate: Convert the :class:`Event`, :class:`Epoch` and
+            :class:`Spike` objects in the :class:`Segment` into
+            :class:`EventArray`, :class:`EpochArray` and :class:`SpikeTrain`
+            objects.
+        :bin_spiketrains(bin_size, t_start, t_stop): Count the spikes of
+            every :class:`SpikeTrain` in time bins, as a sparse matrix.
+        :instantaneous_rates(kernel, sampling_period): Firing rates of every
+            :class:`SpikeTrain`, estimated by kernel convolution.
+
     *Container of*:
         :class:`Epoch`
         :class:`EpochArray`
@@ -238,3 +390,145 @@ class Segment(Container):
             self.take_slice_of_analogsignalarray_by_unit(unit_list)
         #TODO copy others attributes
         return seg
+
+    def bin_spiketrains(self, bin_size, t_start=None, t_stop=None,
+                        dense=False):
+        '''
+        Count the spikes of every :class:`SpikeTrain` in the :class:`Segment`
+        in bins of :attr:`bin_size` from :attr:`t_start` to :attr:`t_stop`
+        (by default the earliest start and the latest stop of the trains).
+
+        Returns the count matrix, with one row per :class:`SpikeTrain` in
+        the order of :attr:`spiketrains` and one column per bin, and the bin
+        edges as a quantity array.  The matrix is a
+        :class:`scipy.sparse.csr_matrix`, or a dense :class:`numpy.ndarray`
+        if :attr:`dense` is True (which does not need scipy, but should only
+        be used when the matrix is small).
+
+        Example::
+
+            >>> counts, edges = seg.bin_spiketrains(1*pq.ms)
+            >>> rates = counts.sum(axis=1) / (edges[-1] - edges[0])
+        '''
+        return _bin_spiketrains(self.spiketrains, bin_size, t_start=t_start,
+                                t_stop=t_stop, dense=dense)
+
+    def instantaneous_rates(self, kernel, sampling_period, t_start=None,
+                            t_stop=None):
+        '''
+        Estimate the firing rate of every :class:`SpikeTrain` in the
+        :class:`Segment` at once.
+
+        All trains are binned together with :meth:`bin_spiketrains` (sparse
+        if scipy is available) and the counts are convolved with
+        :attr:`kernel` by chunks of bins, using FFTs and overlap-add.  See
+        :meth:`SpikeTrain.instantaneous_rate` for the kernel definitions.
+
+        Returns an :class:`AnalogSignalArray` in Hz with one column per
+        :class:`SpikeTrain`, in the order of :attr:`spiketrains`.
+        '''
+        rates, start = _instantaneous_rates(self.spiketrains, kernel,
+                                            sampling_period,
+                                            t_start=t_start, t_stop=t_stop)
+        return AnalogSignalArray(rates, units=pq.Hz, copy=False,
+                                 t_start=start,
+                                 sampling_period=sampling_period,
+                                 name='instantaneous rates')
+
+    def consolidate(self, t_start=None, t_stop=None, units=None):
+        '''
+        Convert the single :class:`Event`, :class:`Epoch` and :class:`Spike`
+        objects in the :class:`Segment` into :class:`EventArray`,
+        :class:`EpochArray` and :class:`SpikeTrain` objects, which take much
+        less memory.
+
+        :class:`Event` and :class:`Epoch` objects are grouped by name, and
+        :class:`Spike` objects by :class:`Unit`.  The annotations of the
+        single objects are kept as annotations of the new object holding
+        one value per event, epoch or spike.  The waveforms of the spikes
+        are kept if they all have the same shape.
+
+        :attr:`t_start` and :attr:`t_stop` are used for the new
+        :class:`SpikeTrain` objects.  They default to the time of the first
+        and last :class:`Spike` in the :class:`Segment`.
+
+        The :class:`Unit` of a :class:`Spike` is taken from its
+        :attr:`unit` attribute, or looked up in the :attr:`units` provided.
+        The new :class:`SpikeTrain` objects are added to their
+        :class:`Unit`, and the :class:`Spike` objects are removed from it.
+
+        *Example*::
+
+            >>> from neo.core import Segment, Event
+            >>> from quantities import s
+            >>>
+            >>> seg = Segment()
+            >>> seg.events = [Event(i*s, label='trig%d' % i, name='trigger')
+            ...               for i in range(3)]
+            >>> seg.consolidate()
+            >>> seg.events
+            []
+            >>> seg.eventarrays
+            [<EventArray: trig0@0.0 s, trig1@1.0 s, trig2@2.0 s>]
+
+        If the objects cannot be consolidated a :class:`ValueError` is
+        raised and the :class:`Segment` is left unchanged.
+        '''
+        self._consolidation(t_start, t_stop, units)()
+
+    def _consolidation(self, t_start=None, t_stop=None, units=None):
+        '''
+        Build the new objects of :meth:`consolidate`, and return a function
+        adding them to the :class:`Segment`.
+
+        Everything that can raise an exception is done before the
+        :class:`Segment` is modified, so that a failed :meth:`consolidate`
+        leaves it unchanged.
+        '''
+        unit_of = {}
+        for unit in units or []:
+            for spike in unit.spikes:
+                unit_of[id(spike)] = unit
+
+        def get_unit(spike):
+            if spike.unit is not None:
+                return spike.unit
+            return unit_of.get(id(spike))
+
+        evtarrs = [_consolidate_events(events)
+                   for events in _group_by(self.events, lambda evt: evt.name)]
+        epcarrs = [_consolidate_epochs(epochs)
+                   for epochs in _group_by(self.epochs, lambda epc: epc.name)]
+        trains = []
+        if self.spikes:
+            alltimes = _stack_quantities([spk.time for spk in self.spikes])
+            if t_start is None:
+                t_start = alltimes.min()
+            if t_stop is None:
+                t_stop = alltimes.max()
+            for spikes in _group_by(self.spikes,
+                                    lambda spk: id(get_unit(spk))):
+                trains.append((_consolidate_spikes(spikes, t_start, t_stop),
+                               spikes, get_unit(spikes[0])))
+
+        def apply():
+            for evtarr in evtarrs:
+                evtarr.segment = self
+                self.eventarrays.append(evtarr)
+            self.events = []
+            for epcarr in epcarrs:
+                epcarr.segment = self
+                self.epocharrays.append(epcarr)
+            self.epochs = []
+            for train, spikes, unit in trains:
+                train.segment = self
+                self.spiketrains.append(train)
+                if unit is not None:
+                    ids = set(id(spk) for spk in spikes)
+                    unit.spikes = [spk for spk in unit.spikes
+                                   if id(spk) not in ids]
+                    train.unit = unit
+                    unit.spiketrains.append(train)
+            self.spikes = []
+
+        return apply
@@ -10,10 +10,10 @@ from __future__ import absolute_import, division, print_function
 
 import quantities as pq
 
-from neo.core.baseneo import BaseNeo
+from neo.core.baseneo import BaseNeo, CompactNeo
 
 
-class Spike(BaseNeo):
+class Spike(CompactNeo, BaseNeo):
     '''
     A single spike.
 
@@ -54,6 +54,9 @@ class Spike(BaseNeo):
 
     '''
 
+    __slots__ = ('time', 'waveform', 'left_sweep', 'sampling_rate',
+                 'segment', 'unit')
+
     _single_parent_objects = ('Segment', 'Unit')
     _necessary_attrs = (('time', pq.Quantity, 0),)
     _recommended_attrs = ((('waveform', pq.Quantity, 2),
@@ -24,6 +24,13 @@ from __future__ import absolute_import, division, print_function
 import numpy as np
 import quantities as pq
 
+try:
+    import scipy.sparse
+except ImportError:
+    HAVE_SCIPY = False
+else:
+    HAVE_SCIPY = True
+
 from neo.core.baseneo import BaseNeo
 
 
@@ -69,6 +76,454 @@ def _check_time_in_range(value, t_start, t_stop, view=False):
                          (value, t_stop))
 
 
+def _extract_snippets(data, sample_indexes, offsets, channels=None,
+                      chunk_size=10000, fill_value=np.nan):
+    '''
+    Gather the samples of the 2D (time, channel) array :attr:`data` at
+    :attr:`sample_indexes` + :attr:`offsets`, for the columns in
+    :attr:`channels`, into a (index, channel, offset) array.
+
+    The read is done with one fancy-indexing operation per chunk of
+    :attr:`chunk_size` indexes, so that only the rows needed are read when
+    :attr:`data` is a :class:`numpy.memmap`.  Samples outside :attr:`data`
+    are set to :attr:`fill_value`.
+    '''
+    data = np.asarray(data)
+    if data.ndim == 1:
+        data = data[:, np.newaxis]
+    if channels is None:
+        channels = np.arange(data.shape[1])
+    channels = np.atleast_1d(np.asarray(channels, dtype=np.intp))
+    sample_indexes = np.asarray(sample_indexes, dtype=np.intp)
+    offsets = np.asarray(offsets, dtype=np.intp)
+
+    # keep float data as it is, and use the smallest float type that can
+    # hold integer data exactly
+    if data.dtype.kind in 'fc':
+        dtype = data.dtype
+    elif data.dtype.itemsize <= 2:
+        dtype = np.dtype('float32')
+    else:
+        dtype = np.dtype('float64')
+    snippets = np.empty((sample_indexes.size, channels.size, offsets.size),
+                        dtype=dtype)
+    n_samples = data.shape[0]
+    for start in range(0, sample_indexes.size, chunk_size):
+        rows = (sample_indexes[start:start + chunk_size, np.newaxis] +
+                offsets[np.newaxis, :])
+        outside = (rows < 0) | (rows >= n_samples)
+        rows = np.clip(rows, 0, max(n_samples - 1, 0))
+        # (index, offset, channel) -> (index, channel, offset)
+        chunk = data[rows[:, :, np.newaxis], channels[np.newaxis, np.newaxis]]
+        chunk = chunk.transpose(0, 2, 1)
+        if outside.any():
+            chunk = chunk.astype(dtype)
+            spike_idx, offset_idx = np.nonzero(outside)
+            chunk[spike_idx, :, offset_idx] = fill_value
+        snippets[start:start + chunk_size] = chunk
+    return snippets
+
+
+def _n_bins(duration, width):
+    '''
+    Number of bins of :attr:`width` needed to cover :attr:`duration`,
+    ignoring floating point rounding errors.
+    '''
+    n_bins = duration / width
+    if abs(n_bins - round(n_bins)) < 1e-9 * max(n_bins, 1):
+        return int(round(n_bins))
+    return int(np.ceil(n_bins))
+
+
+def _bin_indexes(offsets, width, n_bins):
+    '''
+    Index of the bin of :attr:`width` holding each of :attr:`offsets` from
+    the first edge, clipped to the :attr:`n_bins` bins.
+
+    Positions within rounding error of an integer are snapped to it, so that
+    a value falling on an edge is always counted in the bin starting at this
+    edge.
+    '''
+    position = np.asarray(offsets, dtype=np.float64) / width
+    nearest = np.rint(position)
+    snap = np.abs(position - nearest) < 1e-9
+    position[snap] = nearest[snap]
+    return np.clip(np.floor(position).astype(np.intp), 0, n_bins - 1)
+
+
+def _correlogram_counts(times1, times2, width, n_half, auto=False,
+                        chunk_size=10000):
+    '''
+    Histogram of the lags :attr:`times2` - :attr:`times1` within
+    [-:attr:`n_half` * :attr:`width`, :attr:`n_half` * :attr:`width`), in
+    2 * :attr:`n_half` bins of :attr:`width`.
+
+    Both time arrays must be sorted.  The window of :attr:`times2` around
+    each spike of :attr:`times1` is found with :func:`numpy.searchsorted` on
+    the sorted arrays (the vectorized form of a two-pointer sweep), so only
+    the lags within the window are ever computed.  If :attr:`auto` is True,
+    :attr:`times1` and :attr:`times2` are the same train and the zero lag
+    of each spike with itself is left out.
+    '''
+    n_bins = 2 * n_half
+    max_lag = n_half * width
+    counts = np.zeros(n_bins, dtype=np.int64)
+    if not times1.size or not times2.size:
+        return counts
+    lower = np.searchsorted(times2, times1 - max_lag, side='left')
+    upper = np.searchsorted(times2, times1 + max_lag, side='left')
+    for start in range(0, times1.size, chunk_size):
+        stop = min(start + chunk_size, times1.size)
+        n_lags = upper[start:stop] - lower[start:stop]
+        total = n_lags.sum()
+        if not total:
+            continue
+        first = np.repeat(np.arange(start, stop), n_lags)
+        within = np.arange(total) - np.repeat(np.cumsum(n_lags) - n_lags,
+                                              n_lags)
+        second = np.repeat(lower[start:stop], n_lags) + within
+        if auto:
+            keep = first != second
+            first = first[keep]
+            second = second[keep]
+        lags = times2[second] - times1[first]
+        bins = _bin_indexes(lags + max_lag, width, n_bins)
+        counts += np.bincount(bins, minlength=n_bins)
+    return counts
+
+
+def _sorted_magnitude(train, units):
+    '''
+    The times of :attr:`train` in :attr:`units`, as a sorted float array.
+    '''
+    times = train.view(pq.Quantity).rescale(units).magnitude
+    return np.sort(np.asarray(times, dtype=np.float64).ravel())
+
+
+_WORKER_TIMES = None
+
+
+def _init_correlogram_worker(times):
+    '''
+    Store the spike times shared by all tasks of a worker process.
+    '''
+    global _WORKER_TIMES
+    _WORKER_TIMES = times
+
+
+def _correlogram_task(args):
+    '''
+    Compute the correlograms of a batch of pairs of :data:`_WORKER_TIMES`.
+    '''
+    pairs, width, n_half = args
+    return [_correlogram_counts(_WORKER_TIMES[i], _WORKER_TIMES[j], width,
+                                n_half, auto=i == j)
+            for i, j in pairs]
+
+
+def _correlograms(times, pairs, width, n_half, workers=None,
+                  batch_size=256):
+    '''
+    Correlogram counts for each (i, j) in :attr:`pairs` of the sorted time
+    arrays in :attr:`times`, as a (bin, pair) array.
+
+    With :attr:`workers` > 1 the pairs are split in batches computed by a
+    process pool; the time arrays are sent once to each worker.
+    '''
+    pairs = [(int(i), int(j)) for i, j in pairs]
+    batches = [pairs[k:k + batch_size]
+               for k in range(0, len(pairs), batch_size)]
+    tasks = [(batch, width, n_half) for batch in batches]
+    if workers is not None and workers > 1 and len(batches) > 1:
+        from multiprocessing import Pool
+        pool = Pool(workers, initializer=_init_correlogram_worker,
+                    initargs=(times,))
+        try:
+            results = pool.map(_correlogram_task, tasks)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        _init_correlogram_worker(times)
+        try:
+            results = [_correlogram_task(task) for task in tasks]
+        finally:
+            _init_correlogram_worker(None)
+    counts = np.zeros((2 * n_half, len(pairs)), dtype=np.int64)
+    col = 0
+    for result in results:
+        for hist in result:
+            counts[:, col] = hist
+            col += 1
+    return counts
+
+
+def _bin_spiketrains(spiketrains, bin_size, t_start=None, t_stop=None,
+                     dense=False):
+    '''
+    Count the spikes of each of :attr:`spiketrains` in bins of
+    :attr:`bin_size` from :attr:`t_start` to :attr:`t_stop`.
+
+    Returns the (train, bin) count matrix, as a
+    :class:`scipy.sparse.csr_matrix` or, if :attr:`dense` is True, as a
+    :class:`numpy.ndarray`, and the bin edges as a quantity array.
+
+    The times of all trains are concatenated and binned in one pass.  The
+    bin of each spike is computed by integer division, ignoring floating
+    point rounding errors, so a spike falling on an edge is always counted
+    in the bin starting at this edge.  As with :func:`numpy.histogram`,
+    spikes at :attr:`t_stop` are counted in the last bin.
+    '''
+    if not dense and not HAVE_SCIPY:
+        raise ImportError("scipy is needed for sparse binning, "
+                          "use dense=True instead")
+    check_has_dimensions_time(bin_size)
+    if t_start is None:
+        t_start = min(train.t_start.rescale(pq.s) for train in spiketrains)
+    if t_stop is None:
+        t_stop = max(train.t_stop.rescale(pq.s) for train in spiketrains)
+    units = bin_size.units
+    width = float(bin_size.magnitude)
+    start = float(t_start.rescale(units).magnitude)
+    stop = float(t_stop.rescale(units).magnitude)
+    if width <= 0:
+        raise ValueError("bin_size must be positive")
+    if stop <= start:
+        raise ValueError("t_stop must be after t_start")
+
+    n_bins = _n_bins(stop - start, width)
+    edges = start + np.arange(n_bins + 1) * width
+    n_trains = len(spiketrains)
+
+    if n_trains:
+        times = np.concatenate([
+            train.view(pq.Quantity).rescale(units).magnitude.ravel()
+            for train in spiketrains]).astype(np.float64)
+        rows = np.repeat(np.arange(n_trains),
+                         [train.size for train in spiketrains])
+    else:
+        times = np.zeros(0)
+        rows = np.zeros(0, dtype=np.intp)
+    inside = (times >= start) & (times <= stop)
+    times = times[inside]
+    rows = rows[inside]
+
+    bins = _bin_indexes(times - start, width, n_bins)
+
+    keys = rows * n_bins + bins
+    if keys.size > 1 and (keys[1:] < keys[:-1]).any():
+        keys = np.sort(keys, kind='mergesort')
+    if keys.size:
+        firsts = np.concatenate([[0], np.nonzero(np.diff(keys))[0] + 1])
+        counts = np.diff(np.concatenate([firsts, [keys.size]]))
+        keys = keys[firsts]
+    else:
+        counts = np.zeros(0, dtype=np.intp)
+    rows, bins = np.divmod(keys, n_bins)
+
+    edges = pq.Quantity(edges, units=units, copy=False)
+    if dense:
+        matrix = np.zeros((n_trains, n_bins), dtype=counts.dtype)
+        matrix[rows, bins] = counts
+        return matrix, edges
+    indptr = np.concatenate([[0], np.cumsum(np.bincount(rows,
+                                                        minlength=n_trains))])
+    matrix = scipy.sparse.csr_matrix((counts, bins, indptr),
+                                     shape=(n_trains, n_bins))
+    return matrix, edges
+
+
+def _rate_kernel(kernel, sampling_period):
+    '''
+    Samples of a smoothing :attr:`kernel` at :attr:`sampling_period`, as a
+    centered array of odd length summing to 1.
+
+    :attr:`kernel` is either a quantity scalar, the standard deviation of a
+    gaussian kernel, a (shape, width) tuple, or an array of samples.  The
+    shapes are 'gaussian' (width is the standard deviation), 'rectangular'
+    (width is the full width, made an odd number of samples), 'triangular'
+    (width is the half base) and 'exponential' (causal, width is the time
+    constant).
+    '''
+    if isinstance(kernel, pq.Quantity) and not kernel.ndim:
+        kernel = ('gaussian', kernel)
+    if isinstance(kernel, tuple):
+        shape, width = kernel
+        check_has_dimensions_time(width)
+        width = float(width.rescale(sampling_period.units).magnitude /
+                      sampling_period.magnitude)
+        if width <= 0:
+            raise ValueError("the kernel width must be positive")
+        if shape == 'gaussian':
+            half = int(np.ceil(5 * width))
+            lags = np.arange(-half, half + 1)
+            samples = np.exp(-lags ** 2 / (2. * width ** 2))
+        elif shape == 'rectangular':
+            half = int(np.floor(width / 2.))
+            samples = np.ones(2 * half + 1)
+        elif shape == 'triangular':
+            half = int(np.ceil(width))
+            lags = np.arange(-half, half + 1)
+            samples = np.maximum(1 - np.abs(lags) / width, 0)
+        elif shape == 'exponential':
+            half = int(np.ceil(10 * width))
+            lags = np.arange(-half, half + 1)
+            samples = np.where(lags >= 0, np.exp(-np.abs(lags) / width), 0)
+        else:
+            raise ValueError("unknown kernel shape %r" % (shape,))
+    else:
+        samples = np.asarray(kernel, dtype=np.float64).ravel()
+        if not samples.size % 2:
+            samples = np.append(samples, 0)
+    total = samples.sum()
+    if not total:
+        raise ValueError("the kernel must not sum to 0")
+    return samples / total
+
+
+def _convolve_rows(counts, kernel, chunk_size=None):
+    '''
+    Convolve each row of the (row, bin) :attr:`counts` with the centered
+    :attr:`kernel`, keeping the central part (like 'same' mode).
+
+    :attr:`counts` may be a :class:`numpy.ndarray` or a
+    :class:`scipy.sparse.csr_matrix`.  The bins are processed by chunks with
+    FFT convolution and overlap-add, so only one dense chunk of
+    :attr:`counts` is built at a time.
+    '''
+    n_rows, n_bins = counts.shape
+    n_kernel = kernel.size
+    if chunk_size is None:
+        chunk_size = max(4 * n_kernel, 2 ** 14)
+    n_fft = 1
+    while n_fft < chunk_size + n_kernel - 1:
+        n_fft *= 2
+    kernel_fft = np.fft.rfft(kernel, n_fft)
+
+    # overlap-add straight into the central part, the only one kept
+    center = n_kernel // 2
+    out = np.zeros((n_rows, n_bins))
+    for start in range(0, n_bins, chunk_size):
+        stop = min(start + chunk_size, n_bins)
+        chunk = counts[:, start:stop]
+        if not isinstance(chunk, np.ndarray):
+            chunk = chunk.toarray()
+        conv = np.fft.irfft(np.fft.rfft(chunk, n_fft, axis=1) * kernel_fft,
+                            n_fft, axis=1)
+        first = max(start - center, 0)
+        last = min(stop + n_kernel - 1 - center, n_bins)
+        out[:, first:last] += conv[:, first - start + center:
+                                   last - start + center]
+    return out
+
+
+def _instantaneous_rates(spiketrains, kernel, sampling_period, t_start=None,
+                         t_stop=None):
+    '''
+    Firing rate of each of :attr:`spiketrains`, estimated by convolving its
+    spike counts in bins of :attr:`sampling_period` with :attr:`kernel`.
+
+    Returns a (bin, train) array of rates in Hz, and the time of the first
+    bin.
+    '''
+    check_has_dimensions_time(sampling_period)
+    samples = _rate_kernel(kernel, sampling_period)
+    counts, edges = _bin_spiketrains(spiketrains, sampling_period,
+                                     t_start=t_start, t_stop=t_stop,
+                                     dense=not HAVE_SCIPY)
+    scale = float((1 / sampling_period).rescale(pq.Hz).magnitude)
+    samples *= scale
+    rates = _convolve_rows(counts, samples).T
+    # FFT round-off leaves tiny values where there is no spike, negative
+    # ones too, while a kernel with negative samples gives real negative
+    # rates
+    max_count = counts.max() if min(counts.shape) else 0
+    tol = 1e-12 * np.abs(samples).max() * max(max_count, 1)
+    if (samples >= 0).all():
+        rates[rates < tol] = 0
+    else:
+        rates[np.abs(rates) < tol] = 0
+    return rates, edges[0]
+
+
+def _concatenate_times(spiketrains, units):
+    '''
+    Concatenate the times of :attr:`spiketrains` in :attr:`units`, into a
+    float64 array allocated once.
+
+    Returns the times, the number of spikes of each train and the factor
+    converting the units of each train to :attr:`units`.
+    '''
+    n_trains = len(spiketrains)
+    counts = np.array([train.size for train in spiketrains], dtype=np.intp)
+    # rescaling each train is slow, so only compute one conversion factor
+    # per distinct unit
+    factors = {}
+    scales = np.empty(n_trains)
+    for i, train in enumerate(spiketrains):
+        key = train.dimensionality.string
+        if key not in factors:
+            factors[key] = float(pq.Quantity(1., train.units).rescale(
+                units).magnitude)
+        scales[i] = factors[key]
+    times = np.empty(counts.sum(), dtype=np.float64)
+    position = 0
+    for train, count, scale in zip(spiketrains, counts, scales):
+        np.multiply(train.magnitude.ravel(), scale,
+                    out=times[position:position + count])
+        position += count
+    return times, counts, scales
+
+
+def _spiketrain_statistics(spiketrains, refractory_period):
+    '''
+    Spike count, mean rate, coefficient of variation of the inter-spike
+    intervals and number of refractory period violations of each of
+    :attr:`spiketrains`, as a dict of arrays.
+
+    The times of all trains are concatenated, so the intervals and their
+    per-train sums come from single :func:`numpy.diff` and
+    :func:`numpy.bincount` calls over all spikes instead of a loop over the
+    trains.  The CV is NaN for trains with less than 2 intervals.
+    '''
+    check_has_dimensions_time(refractory_period)
+    n_trains = len(spiketrains)
+    times, counts, _ = _concatenate_times(spiketrains, pq.s)
+    durations = np.array([float((train.t_stop - train.t_start).rescale(
+        pq.s).magnitude) for train in spiketrains])
+    owner = np.repeat(np.arange(n_trains), counts)
+
+    intervals = np.diff(times)
+    # an interval is only valid between two spikes of the same train
+    valid = owner[1:] == owner[:-1]
+    if (intervals[valid] < 0).any():
+        # some trains are not sorted, sort the times within each train
+        times = times[np.lexsort((times, owner))]
+        intervals = np.diff(times)
+    intervals = intervals[valid]
+    interval_owner = owner[1:][valid]
+
+    n_intervals = np.bincount(interval_owner, minlength=n_trains)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = (np.bincount(interval_owner, weights=intervals,
+                            minlength=n_trains) / n_intervals)
+        deviations = (intervals - mean[interval_owner]) ** 2
+        std = np.sqrt(np.bincount(interval_owner, weights=deviations,
+                                  minlength=n_trains) / n_intervals)
+        cv = std / mean
+        rates = counts / durations
+    cv[n_intervals < 2] = np.nan
+
+    limit = float(refractory_period.rescale(pq.s).magnitude)
+    violations = np.bincount(interval_owner[intervals < limit],
+                             minlength=n_trains)
+
+    return {'count': counts,
+            'rate': pq.Quantity(rates, units=pq.Hz, copy=False),
+            'isi_cv': cv,
+            'refractory_violations': violations}
+
+
 def _new_spiketrain(cls, signal, t_stop, units=None, dtype=None,
                     copy=True, sampling_rate=1.0 * pq.Hz,
                     t_start=0.0 * pq.s, waveforms=None, left_sweep=None,
@@ -150,6 +605,15 @@ class SpikeTrain(BaseNeo, pq.Quantity):
     Note: Any other additional arguments are assumed to be user-specific
             metadata and stored in :attr:`annotations`.
 
+    *Methods available on this object*:
+        :extract_waveforms(signal_array, left_sweep, right_sweep, channels):
+            Fill :attr:`waveforms` with the snippets of
+            :attr:`signal_array` around each spike.
+        :correlogram(other, bin_size, max_lag): Cross-correlogram with
+            another :class:`SpikeTrain`, or autocorrelogram.
+        :instantaneous_rate(kernel, sampling_period): Firing rate estimated
+            by kernel convolution.
+
     *Properties available on this object*:
         :sampling_period: (quantity scalar) Interval between two samples.
             (1/:attr:`sampling_rate`)
@@ -314,10 +778,12 @@ class SpikeTrain(BaseNeo, pq.Quantity):
         '''
         Map the __new__ function onto _new_BaseAnalogSignal, so that pickle
         works
+
+        The array is not copied again when unpickled, it is a copy already.
         '''
         import numpy
         return _new_spiketrain, (self.__class__, numpy.array(self),
-                                 self.t_stop, self.units, self.dtype, True,
+                                 self.t_stop, self.units, self.dtype, False,
                                  self.sampling_rate, self.t_start,
                                  self.waveforms, self.left_sweep,
                                  self.name, self.file_origin, self.description,
@@ -458,6 +924,140 @@ class SpikeTrain(BaseNeo, pq.Quantity):
 
         return new_st
 
+    def extract_waveforms(self, signal_array, left_sweep, right_sweep,
+                          channels=None, chunk_size=10000):
+        '''
+        Cut the waveform of every spike out of :attr:`signal_array`, and
+        store them in :attr:`waveforms`.
+
+        :attr:`signal_array` is an :class:`AnalogSignalArray` (or an
+        :class:`AnalogSignal`) recorded at the same time as the spikes.  For
+        each spike, the samples from :attr:`left_sweep` before the spike time
+        to :attr:`right_sweep` after it are read, from the columns of
+        :attr:`signal_array` given by :attr:`channels` (all columns if None,
+        for instance the 4 channels of a tetrode).  Samples falling outside
+        of :attr:`signal_array` are set to NaN.
+
+        All snippets are gathered with vectorized indexed reads, by chunks of
+        :attr:`chunk_size` spikes, so that only the needed samples are read
+        when :attr:`signal_array` is memory-mapped.
+
+        :attr:`waveforms`, :attr:`left_sweep` and :attr:`sampling_rate` are
+        set from the result, and the waveforms are returned as a quantity
+        array 3D (spike, channel_index, time).
+
+        Example::
+
+            >>> train.extract_waveforms(sig, 0.5*pq.ms, 1.0*pq.ms,
+            ...                         channels=[0, 1, 2, 3])
+        '''
+        check_has_dimensions_time(left_sweep, right_sweep)
+        sampling_rate = signal_array.sampling_rate.rescale(pq.Hz)
+        rate = float(sampling_rate.magnitude)
+        n_left = int(round(float(left_sweep.rescale(pq.s).magnitude) * rate))
+        n_right = int(round(float(right_sweep.rescale(pq.s).magnitude) *
+                            rate))
+        if n_left + n_right <= 0:
+            raise ValueError("left_sweep + right_sweep must be at least one "
+                             "sampling period")
+
+        t_start = float(signal_array.t_start.rescale(pq.s).magnitude)
+        times = self.times.view(pq.Quantity).rescale(pq.s).magnitude
+        sample_indexes = np.round((times - t_start) * rate).astype(np.intp)
+        offsets = np.arange(-n_left, n_right)
+
+        snippets = _extract_snippets(signal_array.magnitude, sample_indexes,
+                                     offsets, channels=channels,
+                                     chunk_size=chunk_size)
+
+        self.waveforms = pq.Quantity(snippets, units=signal_array.units,
+                                     copy=False)
+        self.sampling_rate = sampling_rate
+        self.left_sweep = (n_left / sampling_rate).rescale(self.units)
+        return self.waveforms
+
+    def correlogram(self, other=None, bin_size=1 * pq.ms,
+                    max_lag=50 * pq.ms):
+        '''
+        Cross-correlogram of this :class:`SpikeTrain` with :attr:`other`, or
+        autocorrelogram if :attr:`other` is None (or this train).
+
+        The number of spikes of :attr:`other` at each lag from a spike of
+        this train, for lags from -:attr:`max_lag` to :attr:`max_lag`
+        (excluded) in bins of :attr:`bin_size`.  In an autocorrelogram the
+        zero lag of each spike with itself is not counted.  The lags are
+        found by a sweep over the sorted spike times, so the cost is linear
+        in the number of spikes and lags within :attr:`max_lag`.
+
+        Returns an :class:`AnalogSignal` of counts, whose :attr:`times` are
+        the left edges of the lag bins.
+
+        Example::
+
+            >>> ccg = train1.correlogram(train2, 1*pq.ms, 20*pq.ms)
+            >>> ccg.times[np.argmax(ccg)]
+        '''
+        from neo.core.analogsignal import AnalogSignal
+
+        check_has_dimensions_time(bin_size, max_lag)
+        auto = other is None or other is self
+        if other is None:
+            other = self
+        units = bin_size.units
+        width = float(bin_size.magnitude)
+        if width <= 0:
+            raise ValueError("bin_size and max_lag must be positive")
+        n_half = _n_bins(float(max_lag.rescale(units).magnitude), width)
+        if n_half <= 0:
+            raise ValueError("bin_size and max_lag must be positive")
+
+        counts = _correlogram_counts(_sorted_magnitude(self, units),
+                                     _sorted_magnitude(other, units),
+                                     width, n_half, auto=auto)
+        return AnalogSignal(counts, units=pq.dimensionless,
+                            t_start=-n_half * bin_size,
+                            sampling_period=bin_size,
+                            name='autocorrelogram' if auto else
+                            'cross-correlogram')
+
+    def instantaneous_rate(self, kernel, sampling_period, t_start=None,
+                           t_stop=None):
+        '''
+        Estimate the firing rate by convolving the spikes with
+        :attr:`kernel`.
+
+        :attr:`kernel` is either a quantity scalar, the standard deviation
+        of a gaussian kernel, a (shape, width) tuple with shape 'gaussian',
+        'rectangular', 'triangular' or 'exponential', or an array of kernel
+        samples at :attr:`sampling_period` (centered on the middle sample).
+        The kernel is normalized to unit area.
+
+        The spikes are counted in bins of :attr:`sampling_period` from
+        :attr:`t_start` to :attr:`t_stop` (by default those of the
+        :class:`SpikeTrain`), and the counts are convolved with FFTs.
+
+        Returns an :class:`AnalogSignal` in Hz, whose samples start at
+        :attr:`t_start`.
+
+        Example::
+
+            >>> rate = train.instantaneous_rate(20*pq.ms, 1*pq.ms)
+            >>> rate = train.instantaneous_rate(('exponential', 5*pq.ms),
+            ...                                 1*pq.ms)
+        '''
+        from neo.core.analogsignal import AnalogSignal
+
+        if t_start is None:
+            t_start = self.t_start
+        if t_stop is None:
+            t_stop = self.t_stop
+        rates, start = _instantaneous_rates([self], kernel, sampling_period,
+                                            t_start=t_start, t_stop=t_stop)
+        return AnalogSignal(rates[:, 0], units=pq.Hz, copy=False,
+                            t_start=start.rescale(self.units),
+                            sampling_period=sampling_period,
+                            name='instantaneous rate')
+
     @property
     def times(self):
         '''
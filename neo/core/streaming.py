@@ -0,0 +1,453 @@
+# -*- coding: utf-8 -*-
+'''
+This module implements the machinery used to process signals chunk by chunk,
+so that memory-mapped signals (as returned by :class:`RawBinarySignalIO`,
+:class:`BlackrockIO`, :class:`AxonIO`...) are never fully loaded and the
+working memory does not depend on the length of the recording.
+
+:func:`chunked_reduce` applies a :class:`ChunkReducer` to consecutive chunks
+of one or several arrays, optionally with a pool of threads, and combines the
+partial results in order.  The reducers available are :class:`MinReducer`,
+:class:`MaxReducer`, :class:`MeanReducer` and :class:`StdReducer`, which
+reduce along axis 0 and so give one value per channel.  Other streaming
+reductions are written by subclassing :class:`ChunkReducer`.
+
+A :class:`Pipeline` chains :class:`SignalStage` objects which transform a
+stream of (sample, channel) chunks, carrying their state from one chunk to
+the next so the output does not depend on where the chunks are cut:
+:class:`FilterStage` (IIR or FIR filtering, requires scipy),
+:class:`DecimateStage` and :class:`CommonAverageReference`.
+
+*Usage*::
+
+    >>> from neo.core.streaming import chunked_reduce, StdReducer
+    >>> std = chunked_reduce(sigarr.magnitude, StdReducer(), workers=4)
+    >>> from neo.core.streaming import (FilterStage, DecimateStage,
+    ...                                 CommonAverageReference)
+    >>> stages = [FilterStage.butter(4, [300, 3000]*pq.Hz,
+    ...                              sigarr.sampling_rate, workers=4),
+    ...           CommonAverageReference()]
+    >>> filtered = sigarr.process_chunks(stages)
+'''
+
+# needed for python 3 compatibility
+from __future__ import absolute_import, division, print_function
+
+import numpy as np
+import quantities as pq
+
+try:
+    import scipy.signal
+except ImportError:
+    HAVE_SCIPY = False
+else:
+    HAVE_SCIPY = True
+
+# default number of values (samples * channels) in a chunk: 16 MiB of float64
+CHUNK_VALUES = 2 ** 21
+
+
+def default_chunk_size(shape):
+    '''
+    Number of samples per chunk for an array of :attr:`shape`, so that a
+    chunk converted to float64 takes about 16 MiB.
+    '''
+    n_channels = int(np.prod(shape[1:])) if len(shape) > 1 else 1
+    return max(CHUNK_VALUES // max(n_channels, 1), 1)
+
+
+def chunk_bounds(n_samples, chunk_size, overlap=0):
+    '''
+    Return the (start, stop) sample bounds of the chunks of an array of
+    :attr:`n_samples` samples.  Each chunk is extended by :attr:`overlap`
+    samples on the right.  There is always at least one (maybe empty) chunk.
+    '''
+    chunk_size = max(int(chunk_size), 1)
+    starts = range(0, n_samples, chunk_size) or [0]
+    return [(start, min(start + chunk_size + overlap, n_samples))
+            for start in starts]
+
+
+def map_threads(func, items, workers=None):
+    '''
+    Return [func(item) for item in items], computed by a pool of
+    :attr:`workers` threads if :attr:`workers` > 1, in the order of
+    :attr:`items`.
+
+    numpy releases the GIL in most array operations, so threads are enough
+    to use several cores while sharing memory-mapped arrays.  The IOs use
+    it to decode independent channels concurrently: :attr:`func` must then
+    not share a file position with the other calls, and opens its own file
+    object or reads from a memmap.
+    '''
+    items = list(items)
+    if workers is None or workers <= 1 or len(items) <= 1:
+        return [func(item) for item in items]
+    from multiprocessing.pool import ThreadPool
+    pool = ThreadPool(min(workers, len(items)))
+    try:
+        # one item at a time, as the items may take very different times
+        return pool.map(func, items, chunksize=1)
+    finally:
+        pool.close()
+        pool.join()
+
+
+class ChunkReducer(object):
+    '''
+    Base class of the reductions computed by :func:`chunked_reduce`.
+
+    :meth:`partial` reduces one chunk, :meth:`combine` merges the partial
+    results of two consecutive chunks (the first one being on the left) and
+    :meth:`finalize` turns the result of the whole array into the value
+    returned.  :attr:`overlap` is the number of samples each chunk shares
+    with the next one.
+    '''
+
+    overlap = 0
+
+    def partial(self, *chunks):
+        '''
+        Reduce one chunk of each of the arrays given to
+        :func:`chunked_reduce`.
+        '''
+        raise NotImplementedError
+
+    def combine(self, first, second):
+        '''
+        Merge the partial results of two consecutive chunks.
+        '''
+        raise NotImplementedError
+
+    def finalize(self, result):
+        '''
+        Return the final value from the combined partial results.
+        '''
+        return result
+
+
+class MinReducer(ChunkReducer):
+    '''
+    Minimum along axis 0.
+    '''
+
+    def partial(self, chunk):
+        return chunk.min(axis=0)
+
+    def combine(self, first, second):
+        return np.minimum(first, second)
+
+
+class MaxReducer(ChunkReducer):
+    '''
+    Maximum along axis 0.
+    '''
+
+    def partial(self, chunk):
+        return chunk.max(axis=0)
+
+    def combine(self, first, second):
+        return np.maximum(first, second)
+
+
+class MeanReducer(ChunkReducer):
+    '''
+    Mean along axis 0, accumulated in float64.
+
+    The partial results are (count, mean, sum of squared deviations), merged
+    with the pairwise formula of Chan et al., which is also what
+    :class:`StdReducer` needs.
+    '''
+
+    def partial(self, chunk):
+        chunk = np.asarray(chunk, dtype=np.float64)
+        mean = chunk.mean(axis=0)
+        return chunk.shape[0], mean, ((chunk - mean) ** 2).sum(axis=0)
+
+    def combine(self, first, second):
+        count1, mean1, m2_1 = first
+        count2, mean2, m2_2 = second
+        count = count1 + count2
+        if not count1 or not count2:
+            return first if count1 else second
+        delta = mean2 - mean1
+        mean = mean1 + delta * (count2 / count)
+        m2 = m2_1 + m2_2 + delta ** 2 * (count1 * count2 / count)
+        return count, mean, m2
+
+    def finalize(self, result):
+        return result[1]
+
+
+class StdReducer(MeanReducer):
+    '''
+    Standard deviation along axis 0, with :attr:`ddof` delta degrees of
+    freedom as in :func:`numpy.std`.
+    '''
+
+    def __init__(self, ddof=0):
+        self.ddof = ddof
+
+    def finalize(self, result):
+        count, mean, m2 = result
+        return np.sqrt(m2 / max(count - self.ddof, 0))
+
+
+def chunked_reduce(arrays, reducer, chunk_size=None, workers=None):
+    '''
+    Apply :attr:`reducer` (a :class:`ChunkReducer`) to :attr:`arrays` chunk
+    by chunk and return the result.
+
+    :attr:`arrays` is an array, or a tuple of arrays of the same length
+    along axis 0 which are cut at the same places.  Chunks hold
+    :attr:`chunk_size` samples (by default, see :func:`default_chunk_size`)
+    plus :attr:`reducer.overlap`.  With :attr:`workers` > 1 the chunks are
+    reduced by a pool of threads; the partial results are always combined in
+    order, so the result does not depend on :attr:`workers`.
+    '''
+    if not isinstance(arrays, tuple):
+        arrays = (arrays,)
+    n_samples = len(arrays[0])
+    if chunk_size is None:
+        chunk_size = default_chunk_size(np.shape(arrays[0]))
+
+    def reduce_chunk(bounds):
+        start, stop = bounds
+        return reducer.partial(*[arr[start:stop] for arr in arrays])
+
+    partials = map_threads(reduce_chunk,
+                           chunk_bounds(n_samples, chunk_size,
+                                        reducer.overlap),
+                           workers)
+    result = partials[0]
+    for part in partials[1:]:
+        result = reducer.combine(result, part)
+    return reducer.finalize(result)
+
+
+class SignalStage(object):
+    '''
+    Base class of the stages of a :class:`Pipeline`.
+
+    :meth:`process` takes a (sample, channel) float chunk and returns the
+    corresponding output chunk, which may be shorter if the stage decimates
+    the signal by :attr:`decimation`.  Stages keeping a state between chunks
+    set it up on the first chunk and clear it in :meth:`reset`.
+    '''
+
+    decimation = 1
+
+    def reset(self):
+        '''
+        Forget the state carried from the previous chunks.
+        '''
+        pass
+
+    def process(self, chunk):
+        '''
+        Process the next chunk of the stream.
+        '''
+        raise NotImplementedError
+
+
+class FilterStage(SignalStage):
+    '''
+    Causal IIR or FIR filter, applied to each channel with
+    :func:`scipy.signal.sosfilt` or :func:`scipy.signal.lfilter`.  The
+    filter state is carried across chunks, so the result is the same as
+    filtering the whole signal at once.
+
+    *Usage*::
+
+        >>> stage = FilterStage(sos=scipy.signal.butter(4, 0.1,
+        ...                                             output='sos'))
+        >>> stage = FilterStage(b=fir_taps)
+        >>> stage = FilterStage.butter(4, 300*pq.Hz, 30*pq.kHz,
+        ...                            btype='highpass')
+
+    *Recommended attributes/properties*:
+        :b, a: (numpy array 1D) Numerator and denominator coefficients,
+            a defaults to [1] (FIR filter).
+        :sos: (numpy array 2D) Second-order sections, used instead of
+            :attr:`b` and :attr:`a`.
+        :workers: (int) The channels are split into :attr:`workers` groups
+            filtered by a pool of threads.  Default: None.
+    '''
+
+    def __init__(self, b=None, a=None, sos=None, workers=None):
+        if not HAVE_SCIPY:
+            raise ImportError("scipy is needed for filtering")
+        if (sos is None) == (b is None):
+            raise ValueError("give either b (and a) or sos")
+        if sos is not None:
+            self.sos = np.atleast_2d(np.asarray(sos, dtype=np.float64))
+            self.b = self.a = None
+        else:
+            self.sos = None
+            self.b = np.atleast_1d(np.asarray(b, dtype=np.float64))
+            if a is None:
+                a = [1.]
+            self.a = np.atleast_1d(np.asarray(a, dtype=np.float64))
+        self.workers = workers
+        self.reset()
+
+    @classmethod
+    def butter(cls, order, frequency, sampling_rate, btype=None,
+               workers=None):
+        '''
+        Butterworth filter of :attr:`order`, with the cutoff
+        :attr:`frequency` (a quantity scalar, or a pair of them for band
+        filters) for a signal sampled at :attr:`sampling_rate`.
+
+        :attr:`btype` is 'lowpass', 'highpass', 'bandpass' or 'bandstop';
+        by default 'lowpass' for one frequency and 'bandpass' for two.
+        '''
+        if not HAVE_SCIPY:
+            raise ImportError("scipy is needed for filtering")
+        nyquist = float(sampling_rate.rescale(pq.Hz).magnitude) / 2
+        wn = np.asarray(frequency.rescale(pq.Hz).magnitude) / nyquist
+        if btype is None:
+            btype = 'bandpass' if wn.size == 2 else 'lowpass'
+        sos = scipy.signal.butter(order, wn, btype=btype, output='sos')
+        return cls(sos=sos, workers=workers)
+
+    def reset(self):
+        self.zi = None
+
+    def _init_state(self, n_channels):
+        '''
+        Zero initial conditions, as when filtering the whole signal.
+        '''
+        if self.sos is not None:
+            return np.zeros((self.sos.shape[0], 2, n_channels))
+        order = max(len(self.a), len(self.b)) - 1
+        return np.zeros((order, n_channels))
+
+    def process(self, chunk):
+        if self.zi is None:
+            self.zi = self._init_state(chunk.shape[1])
+        out = np.empty(chunk.shape, dtype=np.float64)
+
+        def filter_channels(channels):
+            if self.sos is not None:
+                out[:, channels], self.zi[..., channels] = \
+                    scipy.signal.sosfilt(self.sos, chunk[:, channels],
+                                         axis=0, zi=self.zi[..., channels])
+            elif self.zi.shape[0]:
+                out[:, channels], self.zi[..., channels] = \
+                    scipy.signal.lfilter(self.b, self.a, chunk[:, channels],
+                                         axis=0, zi=self.zi[..., channels])
+            else:
+                # zero-order filter, lfilter refuses an empty state
+                out[:, channels] = (chunk[:, channels] *
+                                    (self.b[0] / self.a[0]))
+
+        n_groups = min(self.workers or 1, chunk.shape[1])
+        groups = [slice(group[0], group[-1] + 1) for group in
+                  np.array_split(np.arange(chunk.shape[1]), n_groups)
+                  if len(group)]
+        map_threads(filter_channels, groups, self.workers)
+        return out
+
+
+class DecimateStage(SignalStage):
+    '''
+    Keep one sample out of :attr:`factor`, starting with the first sample of
+    the stream, whatever the size of the chunks.
+
+    There is no anti-aliasing, put a low-pass :class:`FilterStage` before
+    this stage (for instance with a cutoff at 0.8 times the new Nyquist
+    frequency).
+    '''
+
+    def __init__(self, factor):
+        if int(factor) < 1:
+            raise ValueError("factor must be a positive integer")
+        self.decimation = int(factor)
+        self.reset()
+
+    def reset(self):
+        self.offset = 0
+
+    def process(self, chunk):
+        out = chunk[self.offset::self.decimation]
+        self.offset = (self.offset - len(chunk)) % self.decimation
+        return out
+
+
+class CommonAverageReference(SignalStage):
+    '''
+    Subtract from every channel the mean (or with :attr:`median` the
+    median) of the :attr:`channels` (by default all of them) at each sample.
+    '''
+
+    def __init__(self, channels=None, median=False):
+        self.channels = channels
+        self.median = median
+
+    def process(self, chunk):
+        reference = chunk if self.channels is None else \
+            chunk[:, self.channels]
+        if self.median:
+            reference = np.median(reference, axis=1)
+        else:
+            reference = reference.mean(axis=1)
+        return chunk - reference[:, np.newaxis]
+
+
+class Pipeline(object):
+    '''
+    Chain of :class:`SignalStage` objects applied to a stream of
+    (sample, channel) chunks, for instance the chunks of a memory-mapped
+    signal or those given by an IO, with a constant working memory.
+
+    *Usage*::
+
+        >>> pipeline = Pipeline([FilterStage(sos=sos), DecimateStage(10)])
+        >>> for chunk in pipeline.run(chunks):
+        ...     writer(chunk)
+    '''
+
+    def __init__(self, stages):
+        self.stages = list(stages)
+
+    @property
+    def decimation(self):
+        '''
+        Ratio between the input and the output sampling rates.
+        '''
+        decimation = 1
+        for stage in self.stages:
+            decimation *= stage.decimation
+        return decimation
+
+    def output_length(self, n_samples):
+        '''
+        Number of output samples for :attr:`n_samples` input samples.
+        '''
+        return -(-n_samples // self.decimation)
+
+    def reset(self):
+        '''
+        Reset all the stages, to process a new stream.
+        '''
+        for stage in self.stages:
+            stage.reset()
+
+    def process(self, chunk):
+        '''
+        Process the next chunk of the stream through all the stages.
+        '''
+        chunk = np.asarray(chunk, dtype=np.float64)
+        if chunk.ndim == 1:
+            chunk = chunk[:, np.newaxis]
+        for stage in self.stages:
+            chunk = stage.process(chunk)
+        return chunk
+
+    def run(self, chunks):
+        '''
+        Generator processing the chunks of :attr:`chunks` in order.
+        '''
+        for chunk in chunks:
+            yield self.process(chunk)
@@ -12,10 +12,11 @@ from __future__ import absolute_import, division, print_function
 
 import numpy as np
 
+from neo.core.baseneo import CompactNeo
 from neo.core.container import Container
 
 
-class Unit(Container):
+class Unit(CompactNeo, Container):
     '''
     A container of :class:`Spike` and :class:`SpikeTrain` objects from a unit.
 
@@ -65,6 +66,9 @@ class Unit(Container):
 
     '''
 
+    __slots__ = ('channel_indexes', 'spikes', 'spiketrains',
+                 'recordingchannelgroup')
+
     _data_child_objects = ('Spike', 'SpikeTrain')
     _single_parent_objects = ('RecordingChannelGroup',)
     _recommended_attrs = ((('channel_indexes', np.ndarray, 1, np.dtype('i')),)
@@ -88,6 +88,7 @@ from neo.io.neomatlabio import NeoMatlabIO
 from neo.io.neuroexplorerio import NeuroExplorerIO
 from neo.io.neuroscopeio import NeuroScopeIO
 from neo.io.neuroshareio import NeuroshareIO
+from neo.io.parallel import read_many
 from neo.io.pickleio import PickleIO
 from neo.io.plexonio import PlexonIO
 from neo.io.pynnio import PyNNNumpyIO
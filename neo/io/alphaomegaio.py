@@ -83,7 +83,9 @@ import numpy as np
 import quantities as pq
 
 from neo.io.baseio import BaseIO
+from neo.io.resources import resource_pool
 from neo.core import Block, Segment, AnalogSignal
+from neo.core.streaming import map_threads
 from neo.io.tools import populate_RecordingChannel
 
 class AlphaOmegaIO(BaseIO):
@@ -148,10 +150,14 @@ class AlphaOmegaIO(BaseIO):
     def read_block(self,
                    # the 2 first keyword arguments are imposed by neo.io API
                    lazy = False,
-                   cascade = True):
+                   cascade = True,
+                   num_threads = 1):
         """
         Return a Block.
 
+        Arguments:
+            num_threads : number of threads decoding the channels, each
+                reading with its own file object (1 by default)
         """
 
         def count_samples(m_length):
@@ -300,11 +306,39 @@ class AlphaOmegaIO(BaseIO):
             # step 5: find channels for which data are available
             ind_valid_chan = np.nonzero(chan_len)[0]
 
+            def read_channel(ind_chan):
+                # read the data blocks of a channel with a file object of
+                # its own, lent by the pool, so that channels can be read by
+                # several threads
+                temp_array = np.empty(chan_len[ind_chan], dtype = np.int16)
+                # NOTE: we could directly create an empty AnalogSignal and
+                # load the data in it, but it is much faster to load data
+                # in a temporary numpy array and create the AnalogSignals
+                # from this temporary array
+                ind = 0 # index in the data vector
+                with resource_pool.open(self.filename) as chan_fid:
+                    for ind_block in list_data[ind_chan]:
+                        count = count_samples(
+                                file_blocks[ind_block]['m_length'])
+                        chan_fid.seek(file_blocks[ind_block]['pos']+6)
+                        temp_array[ind:ind+count] = \
+                            np.fromfile(chan_fid, dtype = np.int16,
+                                        count = count)
+                        ind += count
+                return temp_array
+
             # step 6: load the data
+            # WARNING: in the following blocks are read supposing taht they
+            # are all contiguous and sorted in time. I don't know if it's
+            # always the case. Maybe we should use the time stamp of each
+            # data block to choose where to put the read data in the array.
+            if not lazy:
+                signals = map_threads(read_channel, ind_valid_chan,
+                                      num_threads)
+
             # TODO give the possibility to load data as AnalogSignalArrays
-            for ind_chan in ind_valid_chan:
+            for pos_chan, ind_chan in enumerate(ind_valid_chan):
                 list_blocks = list_data[ind_chan]
-                ind = 0 # index in the data vector
 
                 # read time stamp for the beginning of the signal
                 form = '<l' # reading format
@@ -315,24 +349,6 @@ class AlphaOmegaIO(BaseIO):
                 val = struct.unpack(form , buf)
                 start_index = val[0]
 
-                # WARNING: in the following blocks are read supposing taht they
-                # are all contiguous and sorted in time. I don't know if it's
-                # always the case. Maybe we should use the time stamp of each
-                # data block to choose where to put the read data in the array.
-                if not lazy:
-                    temp_array = np.empty(chan_len[ind_chan], dtype = np.int16)
-                    # NOTE: we could directly create an empty AnalogSignal and
-                    # load the data in it, but it is much faster to load data
-                    # in a temporary numpy array and create the AnalogSignals
-                    # from this temporary array
-                    for ind_block in list_blocks:
-                        count = count_samples(
-                                file_blocks[ind_block]['m_length'])
-                        fid.seek(file_blocks[ind_block]['pos']+6)
-                        temp_array[ind:ind+count] = \
-                            np.fromfile(fid, dtype = np.int16, count = count)
-                        ind += count
-
                 sampling_rate = \
                     file_blocks[list_chan[ind_chan]]['m_SampleRate'] * pq.kHz
                 t_start = (start_index / sampling_rate).simplified
@@ -347,7 +363,7 @@ class AlphaOmegaIO(BaseIO):
                                            units = pq.dimensionless)
                     ana_sig.lazy_shape = chan_len[ind_chan]
                 else:
-                    ana_sig = AnalogSignal(temp_array,
+                    ana_sig = AnalogSignal(signals[pos_chan],
                                            sampling_rate = sampling_rate,
                                            t_start = t_start,
                                            name = file_blocks\
@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+"""
+Reading from :mod:`asyncio` code.
+
+The ``aread_block``, ``aread_segment`` and ``aiter_analogsignal_chunks``
+methods of :class:`BaseIO` run the reading methods of the IOs in an
+executor (the default thread pool of the event loop unless one is given),
+so that the parsing of a file does not block the event loop::
+
+    >>> async def load(filenames):
+    ...     readers = [get_io(filename) for filename in filenames]
+    ...     return await asyncio.gather(*[reader.aread_block(lazy=True)
+    ...                                   for reader in readers])
+
+    >>> async def stream(reader):
+    ...     async with reader.aiter_analogsignal_chunks(1*pq.s) as chunks:
+    ...         async for chunk in chunks:
+    ...             await send(chunk)
+
+Reads of different files run concurrently, but an IO object must not be
+read from by two coroutines at a time.  Cancelling a read drops its result;
+a read which has started in the executor still runs to its end.
+
+This module needs :mod:`asyncio` (Python 3.4, or 3.3 with the asyncio
+package), and is written without the ``async`` syntax so that it can be
+installed along with the rest of neo.
+"""
+
+# needed for python 3 compatibility
+from __future__ import absolute_import, division, print_function
+
+from collections import deque
+import functools
+
+import asyncio
+
+try:
+    StopAsyncIteration = StopAsyncIteration
+except NameError:  # Python < 3.5, without asynchronous iteration
+    StopAsyncIteration = StopIteration
+
+
+def _create_future(loop):
+    """
+    A new future attached to :attr:`loop`.
+    """
+    if hasattr(loop, 'create_future'):
+        return loop.create_future()
+    return asyncio.Future(loop=loop)
+
+
+def run_in_executor(func, executor=None, **kargs):
+    """
+    Run :attr:`func` with the keyword arguments :attr:`kargs` in
+    :attr:`executor` (the default executor of the event loop if None) and
+    return an :class:`asyncio.Future` of its result.
+    """
+    loop = asyncio.get_event_loop()
+    return loop.run_in_executor(executor, functools.partial(func, **kargs))
+
+
+class AsyncChunkIterator(object):
+    """
+    Asynchronous iterator over the items of a (blocking) iterator, each of
+    them produced in an executor.
+
+    *Usage*::
+
+        >>> chunks = AsyncChunkIterator(reader.iter_analogsignal_chunks(
+        ...     1*pq.s), prefetch=2)
+        >>> async with chunks:
+        ...     async for chunk in chunks:
+        ...         await send(chunk)
+
+    The items are produced one at a time, the iterator not being
+    thread-safe, and at most :attr:`prefetch` items ahead of the consumer:
+    a slow consumer holds back the reading, and does not pile up chunks in
+    memory.  With ``prefetch=0`` an item is only read when it is awaited.
+
+    The underlying iterator is closed by :meth:`close` (or at the end of an
+    ``async with`` block, including on cancellation), once the item being
+    read, if any, is produced.  A cancelled ``__anext__`` does not lose its
+    item, which is returned by the next call.
+    """
+
+    def __init__(self, iterator, executor=None, prefetch=1):
+        self._iterator = iterator
+        self._executor = executor
+        self._prefetch = max(int(prefetch), 0)
+        self._loop = None
+        # outcomes read but not consumed, and futures of the consumers
+        # waiting for one
+        self._outcomes = deque()
+        self._waiters = deque()
+        self._running = False
+        self._finished = False
+        self._closed = False
+
+    def __aiter__(self):
+        return self
+
+    def __anext__(self):
+        if self._loop is None:
+            self._loop = asyncio.get_event_loop()
+        waiter = _create_future(self._loop)
+        if self._outcomes:
+            self._resolve(waiter, self._outcomes.popleft())
+        elif self._finished or self._closed:
+            waiter.set_exception(StopAsyncIteration())
+        else:
+            self._waiters.append(waiter)
+        self._fill()
+        return waiter
+
+    def __aenter__(self):
+        waiter = _create_future(asyncio.get_event_loop())
+        waiter.set_result(self)
+        return waiter
+
+    def __aexit__(self, exc_type, exc_value, traceback):
+        self.close()
+        waiter = _create_future(asyncio.get_event_loop())
+        waiter.set_result(False)
+        return waiter
+
+    def close(self):
+        """
+        Stop the iteration and close the underlying iterator.
+        """
+        self._closed = True
+        self._outcomes.clear()
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_exception(StopAsyncIteration())
+        if not self._running:
+            self._close_iterator()
+
+    def _close_iterator(self):
+        # generators cannot be closed while they run in the executor
+        close = getattr(self._iterator, 'close', None)
+        if close is not None:
+            close()
+
+    def _fill(self):
+        """
+        Read the next item in the executor if it is awaited, or if fewer
+        than :attr:`prefetch` items are waiting to be consumed.
+        """
+        if self._running or self._finished or self._closed:
+            return
+        if not self._waiters and len(self._outcomes) >= self._prefetch:
+            return
+        self._running = True
+        future = self._loop.run_in_executor(self._executor, self._step)
+        future.add_done_callback(self._stepped)
+
+    def _step(self):
+        try:
+            return 'item', next(self._iterator)
+        except StopIteration:
+            return 'end', None
+
+    def _stepped(self, future):
+        self._running = False
+        if self._closed:
+            self._close_iterator()
+            return
+        if future.cancelled():
+            outcome = 'end', None
+        elif future.exception() is not None:
+            outcome = 'error', future.exception()
+        else:
+            outcome = future.result()
+        if outcome[0] != 'item':
+            self._finished = True
+        self._deliver(outcome)
+        self._fill()
+
+    def _deliver(self, outcome):
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.cancelled():
+                self._resolve(waiter, outcome)
+                if self._finished:
+                    # nothing more will come for the other waiters
+                    self.close()
+                return
+        self._outcomes.append(outcome)
+
+    @staticmethod
+    def _resolve(waiter, outcome):
+        kind, value = outcome
+        if kind == 'item':
+            waiter.set_result(value)
+        elif kind == 'error':
+            waiter.set_exception(value)
+        else:
+            waiter.set_exception(StopAsyncIteration())
@@ -45,6 +45,9 @@ import numpy as np
 import quantities as pq
 
 from neo.io.baseio import BaseIO
+from neo.io.proxyobjects import RawArray, AnalogSignalProxy, EventArrayProxy
+from neo.io.resources import resource_pool
+from neo.io.selection import DataSelection
 from neo.core import *
 from neo.io.tools import iteritems
 
@@ -95,6 +98,20 @@ def reformat_integer_V2(data, nbchannel, header):
         data[:, i] -= header['listADCInfo'][i]['fSignalOffset']
 
 
+def integer_scaling(nbchannel, header, version):
+    """
+    gain and offset of each channel applied by reformat_integer_V1 or
+    reformat_integer_V2, as two arrays
+    """
+    probe = np.zeros((2, nbchannel))
+    probe[1] = 1.
+    if version < 2.:
+        reformat_integer_V1(probe, nbchannel, header)
+    else:
+        reformat_integer_V2(probe, nbchannel, header)
+    return probe[1] - probe[0], probe[0]
+
+
 def clean_string(s):
     s = s.rstrip(b'\x00')
     s = s.rstrip(b' ')
@@ -129,7 +146,9 @@ class AxonIO(BaseIO):
     writeable_objects = []
 
     has_header = False
-    is_streameable = False
+    is_streameable = True
+    has_lazy_proxies = True
+    supported_selection = ['channel_indexes', 'time_range']
 
     read_params = {Block: []}
     write_params = None
@@ -150,8 +169,12 @@ class AxonIO(BaseIO):
         BaseIO.__init__(self)
         self.filename = filename
 
-    def read_block(self, lazy=False, cascade=True):
-
+    def read_block(self, lazy=False, cascade=True, channel_indexes=None,
+                   time_range=None):
+        """
+        Read the file, or the channels of :attr:`channel_indexes` between
+        the times of :attr:`time_range` (see :mod:`neo.io.selection`).
+        """
         header = self.read_header()
         version = header['fFileVersionNumber']
 
@@ -183,6 +206,27 @@ class AxonIO(BaseIO):
         if not cascade:
             return bl
 
+        bl.segments = list(self._iter_segments(
+            lazy=lazy, channel_indexes=channel_indexes,
+            time_range=time_range, header=header))
+        bl.create_many_to_one_relationship()
+        return bl
+
+    def _iter_segments(self, lazy=False, channel_indexes=None,
+                       time_range=None, header=None):
+        """
+        Generator of the Segments of the file, one per sweep, each read
+        when it is reached.  See :meth:`read_block` for the arguments.
+        """
+        selection = DataSelection(channel_indexes=channel_indexes,
+                                  time_range=time_range)
+        # the selected part of the data is read through the proxies
+        use_proxies = lazy or not selection.selects_all
+
+        if header is None:
+            header = self.read_header()
+        version = header['fFileVersionNumber']
+
         # file format
         if header['nDataFormat'] == 0:
             dt = np.dtype('i2')
@@ -200,8 +244,8 @@ class AxonIO(BaseIO):
                 BLOCKSIZE
             totalsize = header['sections']['DataSection']['llNumEntries']
 
-        data = np.memmap(self.filename, dt, 'r',
-                         shape=(totalsize,), offset=headOffset)
+        data = resource_pool.memmap(self.filename, dt, 'r',
+                                    shape=(totalsize,), offset=headOffset)
 
         # 3 possible modes
         if version < 2.:
@@ -224,9 +268,9 @@ class AxonIO(BaseIO):
                 nbepisod = SAS['llNumEntries']
                 offsetEpisod = SAS['uBlockIndex'] * BLOCKSIZE
             if nbepisod > 0:
-                episodArray = np.memmap(self.filename, [('offset', 'i4'),
-                                        ('len', 'i4')], 'r', shape=(nbepisod),
-                                        offset=offsetEpisod)
+                episodArray = resource_pool.memmap(
+                    self.filename, [('offset', 'i4'), ('len', 'i4')], 'r',
+                    shape=(nbepisod), offset=offsetEpisod)
             else:
                 episodArray = np.empty((1), [('offset', 'i4'), ('len', 'i4')],)
                 episodArray[0]['len'] = data.size
@@ -240,6 +284,30 @@ class AxonIO(BaseIO):
                 sampling_rate = 1.e6 / \
                     header['protocol']['fADCSequenceInterval'] * pq.Hz
 
+            tags = None
+            if mode in [3, 5]:  # TODO check if tags exits in other mode
+
+                # tag is EventArray that should be attached to Block
+                # It is attched to the first Segment
+                times = []
+                labels = []
+                comments = []
+                for i, tag in enumerate(header['listTag']):
+                    times.append(tag['lTagTime']/sampling_rate)
+                    labels.append(str(tag['nTagType']))
+                    comments.append(clean_string(tag['sComment']))
+                times = np.array(times)
+                labels = np.array(labels, dtype='S')
+                comments = np.array(comments, dtype='S')
+                if use_proxies:
+                    # the tags are in the header, already read
+                    tags = selection.read(
+                        EventArrayProxy(times, units=pq.s, labels=labels,
+                                        comments=comments), lazy)
+                else:
+                    tags = EventArray(times=times*pq.s,
+                                      labels=labels, comments=comments)
+
             # construct block
             # one sweep = one segment in a block
             pos = 0
@@ -255,15 +323,29 @@ class AxonIO(BaseIO):
 
                 if (fSynchTimeUnit != 0) and (mode == 1):
                     length /= fSynchTimeUnit
-                subdata = data[pos:pos+length]
-                pos += length
-                subdata = subdata.reshape((subdata.size/nbchannel,
-                                           nbchannel)).astype('f')
-                if dt == np.dtype('i2'):
-                    if version < 2.:
-                        reformat_integer_V1(subdata, nbchannel, header)
-                    elif version >= 2.:
-                        reformat_integer_V2(subdata, nbchannel, header)
+                if use_proxies:
+                    # the samples of the sweep are read only when the
+                    # proxies are loaded, with the scaling of
+                    # reformat_integer_Vx
+                    gain = offset = None
+                    if dt == np.dtype('i2'):
+                        gain, offset = integer_scaling(nbchannel, header,
+                                                       version)
+                    raw = RawArray(self.filename, dt,
+                                   (length // nbchannel, nbchannel),
+                                   byte_offset=headOffset + pos * dt.itemsize,
+                                   gain=gain, offset=offset)
+                    pos += length
+                else:
+                    subdata = data[pos:pos+length]
+                    pos += length
+                    subdata = subdata.reshape((subdata.size//nbchannel,
+                                               nbchannel)).astype('f')
+                    if dt == np.dtype('i2'):
+                        if version < 2.:
+                            reformat_integer_V1(subdata, nbchannel, header)
+                        elif version >= 2.:
+                            reformat_integer_V2(subdata, nbchannel, header)
 
                 if version < 2.:
                     chans = [chan_num for chan_num in
@@ -282,6 +364,8 @@ class AxonIO(BaseIO):
                         unit = lADCIi['ADCChUnits'].replace(b'\xb5', b'u').\
                             replace(b' ', b'').decode('utf-8')
                         num = header['listADCInfo'][i]['nADCNum']
+                    if not selection.keep_channel(num):
+                        continue
                     t_start = float(episodArray[j]['offset']) / sampling_rate
                     t_start = t_start.rescale('s')
                     try:
@@ -289,47 +373,27 @@ class AxonIO(BaseIO):
                     except:
                         unit = ''
 
-                    if lazy:
-                        signal = [] * pq.Quantity(1, unit)
-                    else:
-                        signal = pq.Quantity(subdata[:, n], unit)
-
+                    if use_proxies:
+                        proxy = AnalogSignalProxy(raw, units=unit,
+                                                  sampling_rate=sampling_rate,
+                                                  t_start=t_start,
+                                                  columns=[n],
+                                                  channel_indexes=[int(num)],
+                                                  name=name.decode('utf-8'))
+                        seg.analogsignals.append(selection.read(proxy, lazy))
+                        continue
+
+                    signal = pq.Quantity(subdata[:, n], unit)
                     anaSig = AnalogSignal(signal, sampling_rate=sampling_rate,
                                           t_start=t_start,
                                           name=name.decode('utf-8'),
                                           channel_index=int(num))
-                    if lazy:
-                        anaSig.lazy_shape = subdata.shape[0]
                     seg.analogsignals.append(anaSig)
-                bl.segments.append(seg)
-
-            if mode in [3, 5]:  # TODO check if tags exits in other mode
-
-                # tag is EventArray that should be attached to Block
-                # It is attched to the first Segment
-                times = []
-                labels = []
-                comments = []
-                for i, tag in enumerate(header['listTag']):
-                    times.append(tag['lTagTime']/sampling_rate)
-                    labels.append(str(tag['nTagType']))
-                    comments.append(clean_string(tag['sComment']))
-                times = np.array(times)
-                labels = np.array(labels, dtype='S')
-                comments = np.array(comments, dtype='S')
-                # attach all tags to the first segment.
-                seg = bl.segments[0]
-                if lazy:
-                    ea = EventArray(times=[] * pq.s,
-                                    labels=np.array([], dtype='S'))
-                    ea.lazy_shape = len(times)
-                else:
-                    ea = EventArray(times=times*pq.s,
-                                    labels=labels, comments=comments)
-                seg.eventarrays.append(ea)
-
-        bl.create_many_to_one_relationship()
-        return bl
+                if j == 0 and tags is not None:
+                    # attach all tags to the first segment.
+                    seg.eventarrays.append(tags)
+                seg.create_many_to_one_relationship()
+                yield seg
 
     def read_header(self,):
         """
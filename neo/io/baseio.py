@@ -15,17 +15,52 @@ If you want a model for developing a new IO start from exampleIO.
 import collections
 import logging
 
+import numpy as np
+import quantities as pq
+
 from neo import logging_handler
 from neo.core import (AnalogSignal, AnalogSignalArray, Block,
                       Epoch, EpochArray, Event, EventArray,
                       IrregularlySampledSignal,
                       RecordingChannel, RecordingChannelGroup,
                       Segment, Spike, SpikeTrain, Unit)
+from neo.core.streaming import chunk_bounds
+from neo.io.proxyobjects import AnalogSignalProxy, group_analogsignal_proxies
+from neo.io.resources import resource_pool
+from neo.io.selection import DataSelection
+from neo.io.summary import FileSummary
 
 read_error = "This type is not supported by this file format for reading"
 write_error = "This type is not supported by this file format for writing"
 
 
+def _n_samples(duration, sampling_rate):
+    """
+    Number of samples in :attr:`duration` (a quantity, or a number of
+    seconds) at :attr:`sampling_rate`.
+    """
+    if not isinstance(duration, pq.Quantity):
+        duration = duration * pq.s
+    return int(np.rint((duration * sampling_rate).simplified.magnitude))
+
+
+def _memory_proxy(sig, position):
+    """
+    Proxy of the AnalogSignal or AnalogSignalArray :attr:`sig`, already in
+    memory, at :attr:`position` in its Segment.
+    """
+    data = sig.magnitude
+    n_channels = data.shape[1] if data.ndim > 1 else 1
+    channel_indexes = getattr(sig, 'channel_index', None)
+    if channel_indexes is None:
+        channel_indexes = range(position, position + n_channels)
+    return AnalogSignalProxy(data, units=sig.units,
+                             sampling_rate=sig.sampling_rate,
+                             t_start=sig.t_start,
+                             channel_indexes=np.atleast_1d(channel_indexes),
+                             file_origin=sig.file_origin)
+
+
 class BaseIO(object):
     """
     Generic class to handle all the file read/write methods for the key objects
@@ -56,6 +91,45 @@ class BaseIO(object):
         - ``write_XXX(**params)``
         where XXX could be one of the objects supported by the IO
 
+    ``read()`` accepts the ``channel_indexes``, ``unit_ids`` and
+    ``time_range`` keyword arguments to read only part of the file (see
+    :mod:`neo.io.selection`).  Those listed in **supported_selection** are
+    also accepted by ``read_block()`` or ``read_segment()``, which skip the
+    unselected data, ``read()`` applies the others once the data are read.
+
+    ``iter_segments(lazy=False, **params)`` yields the Segments of a file
+    one at a time; IOs with a per-sweep structure read each Segment only
+    when it is reached, instead of building the whole Block.
+
+    The analog signals of a file can also be read by chunks with
+    ``iter_analogsignal_chunks(chunk_duration, channel_indexes=None,
+    overlap=0)``.  IOs of contiguous formats read each chunk directly from
+    the file (and have **is_streameable**), the others read the file
+    before cutting its signals.
+
+    ``describe()`` returns a summary of the contents of the file (channels,
+    sampling rates, durations, numbers of spikes and events) without
+    decoding its data, see :mod:`neo.io.summary`.
+
+    Objects read with ``lazy=True`` are empty and have a ``lazy_shape``
+    attribute.  IOs with **has_lazy_proxies** also give them a
+    ``lazy_proxy`` attribute (see :mod:`neo.io.proxyobjects`), with which
+    ``load_lazy_object(obj, time_slice=..., channel_indexes=...)`` reads
+    only the requested part of their data from the file.
+
+    IOs get the files and memory maps they keep open from
+    :data:`neo.io.resources.resource_pool`, bounded in size.  ``close()``
+    releases those of the file of an IO, which can also be used as a context
+    manager::
+
+        >>> with AxonIO(filename) as reader:
+        ...     blk = reader.read_block()
+
+    IOs should keep the headers they parse, which can be shared, apart from
+    the position and objects of a reading, which are local to each call (or
+    to each thread for IOs reading a file over several calls, such as
+    BrainwareSrcIO), so that one IO object can read in several threads.
+
     Each class is able to declare what can be accessed or written directly
     discribed by **readable_objects** and **readable_objects**.
     The object types can be one of the classes defined in neo.core
@@ -83,6 +157,8 @@ class BaseIO(object):
 
     has_header = False
     is_streameable = False
+    has_lazy_proxies = False
+    supported_selection = []
     read_params = {}
     write_params = {}
 
@@ -106,8 +182,31 @@ class BaseIO(object):
         if not corelogger.handlers and not rootlogger.handlers:
             corelogger.addHandler(logging_handler)
 
+    def close(self):
+        """
+        Close the file objects and drop the memory maps of the file of the
+        IO kept in :data:`neo.io.resources.resource_pool`.  IOs holding
+        other resources override this method.  The IO can still be read
+        from, reopening what it needs.
+        """
+        if self.filename is not None:
+            resource_pool.release(self.filename)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
     ######## General read/write methods #######################
     def read(self, lazy=False, cascade=True,  **kargs):
+        native, selection = DataSelection.pop(kargs).split(
+            self.supported_selection)
+        kargs.update(native)
+        if not selection.selects_all:
+            return [selection.select_block(blk, lazy=lazy)
+                    for blk in self.read(lazy=lazy, cascade=cascade,
+                                         **kargs)]
         if Block in self.readable_objects:
             if (hasattr(self, 'read_all_blocks') and
                     callable(getattr(self, 'read_all_blocks'))):
@@ -125,6 +224,17 @@ class BaseIO(object):
         else:
             raise NotImplementedError
 
+    def _read_blocks(self, **kargs):
+        """
+        The Blocks read by :meth:`read` with the keyword arguments
+        :attr:`kargs`, as a list even for the IOs whose :meth:`read` returns
+        a single Block.
+        """
+        blocks = self.read(**kargs)
+        if isinstance(blocks, Block):
+            return [blocks]
+        return blocks
+
     def write(self, bl, **kargs):
         if Block in self.writeable_objects:
             if isinstance(bl, collections.Sequence):
@@ -142,6 +252,195 @@ class BaseIO(object):
         else:
             raise NotImplementedError
 
+    def iter_segments(self, lazy=False, **kargs):
+        """
+        Generator of the Segments of the file, one at a time, so that they
+        can be processed and discarded without holding the whole file in
+        memory.  The keyword arguments are the reading parameters of the
+        IO and the ``channel_indexes``, ``unit_ids`` and ``time_range`` of
+        the data to read (see :mod:`neo.io.selection`).
+
+        IOs with a per-sweep structure read each Segment when it is
+        reached; the Segments are then not attached to a Block.  The other
+        IOs read the whole file first.
+        """
+        native, selection = DataSelection.pop(kargs).split(
+            self.supported_selection)
+        kargs.update(native)
+        for seg in self._iter_segments(lazy=lazy, **kargs):
+            if not selection.selects_all:
+                selection.select_segment(seg, lazy=lazy)
+            yield seg
+
+    def _iter_segments(self, lazy=False, **kargs):
+        """
+        Generator of the Segments of the file, with the keyword arguments
+        of :meth:`iter_segments` supported by the IO.  IOs which can read
+        their Segments one at a time override this method.
+        """
+        for blk in self._read_blocks(lazy=lazy, cascade=True, **kargs):
+            for seg in blk.segments:
+                yield seg
+
+    def load_lazy_object(self, obj, time_slice=None, channel_indexes=None):
+        """
+        Return the data of :attr:`obj`, an object read with ``lazy=True``,
+        between the times of :attr:`time_slice` (a (t_start, t_stop) pair)
+        and for the channels of :attr:`channel_indexes` (signals only).
+        Both default to all the data.
+        """
+        proxy = getattr(obj, 'lazy_proxy', None)
+        if proxy is None:
+            raise NotImplementedError('%s cannot load %s lazily' %
+                                      (self.__class__.__name__,
+                                       obj.__class__.__name__))
+        kwargs = {}
+        if channel_indexes is not None:
+            kwargs['channel_indexes'] = channel_indexes
+        return proxy.load(time_slice=time_slice, **kwargs)
+
+    def describe(self, **kargs):
+        """
+        Return a :class:`FileSummary` (see :mod:`neo.io.summary`) of the
+        contents of the file: its signals with their channel, sampling rate
+        and number of samples, and the number of spikes, events and epochs
+        of its other objects.  The keyword arguments are the reading
+        parameters of the IO.
+
+        IOs which can parse the headers of their format override this
+        method to decode no data at all.  This version reads the file with
+        ``lazy=True``, which only parses the headers for IOs with lazy
+        proxies.
+        """
+        summary = FileSummary.from_file(self.filename)
+        for blk in self._read_blocks(lazy=True, cascade=True, **kargs):
+            summary.add_block(blk)
+        return summary
+
+    def iter_analogsignal_chunks(self, chunk_duration, channel_indexes=None,
+                                 overlap=0, **kargs):
+        """
+        Generator of the analog signals of the file as AnalogSignalArray
+        chunks of :attr:`chunk_duration`.
+
+        The signals of each Segment sampled together (same sampling rate,
+        t_start, length and units) are cut in chunks starting every
+        :attr:`chunk_duration`, each extended by :attr:`overlap` (a
+        duration or a number of samples) so consecutive chunks share
+        samples.  Only the channels of :attr:`channel_indexes` are read
+        (all by default); the ``channel_index`` of each chunk gives its
+        channels, in the order of the file.  The other keyword arguments
+        are the reading parameters of the IO.
+
+        IOs with lazy proxies read each chunk from the file, the other IOs
+        read the whole file first.
+        """
+        for proxies in self._iter_analogsignal_proxies(**kargs):
+            for group in group_analogsignal_proxies(proxies):
+                selection = []
+                for proxy in group:
+                    channels = [ind for ind in proxy.channel_indexes
+                                if channel_indexes is None or
+                                ind in channel_indexes]
+                    if channels:
+                        selection.append((proxy, channels))
+                if not selection:
+                    continue
+                first = selection[0][0]
+                chunk_size = _n_samples(chunk_duration, first.sampling_rate)
+                if isinstance(overlap, pq.Quantity):
+                    n_overlap = _n_samples(overlap, first.sampling_rate)
+                else:
+                    n_overlap = int(overlap)
+                channels = np.array([ind for _, chans in selection
+                                     for ind in chans], dtype='i')
+                for start, stop in chunk_bounds(first.n_samples, chunk_size,
+                                                n_overlap):
+                    data = np.concatenate([proxy.read_samples(start, stop,
+                                                              chans)
+                                           for proxy, chans in selection],
+                                          axis=1)
+                    yield AnalogSignalArray(data, units=first.units,
+                                            copy=False,
+                                            t_start=first.sample_time(start),
+                                            sampling_rate=first.sampling_rate,
+                                            channel_index=channels,
+                                            file_origin=first.file_origin)
+
+    def _read_selected(self, method, lazy=False, **kargs):
+        """
+        The object read by :attr:`method` (``read_block`` or
+        ``read_segment``) with the keyword arguments :attr:`kargs`, keeping
+        only the data of the ``channel_indexes``, ``unit_ids`` and
+        ``time_range`` arguments (see :mod:`neo.io.selection`), as
+        :meth:`read` does.
+        """
+        native, selection = DataSelection.pop(kargs).split(
+            self.supported_selection)
+        kargs.update(native)
+        obj = getattr(self, method)(lazy=lazy, **kargs)
+        if selection.selects_all:
+            return obj
+        if method == 'read_block':
+            return selection.select_block(obj, lazy=lazy)
+        selection.select_segment(obj, lazy=lazy)
+        return obj
+
+    def aread_block(self, executor=None, **kargs):
+        """
+        Return an :class:`asyncio.Future` of the Block read by
+        :meth:`read_block` with the keyword arguments :attr:`kargs`, in
+        :attr:`executor` (the default executor of the event loop if None),
+        to be awaited from :mod:`asyncio` code (see
+        :mod:`neo.io.asynchronous`).  The ``channel_indexes``,
+        ``unit_ids`` and ``time_range`` arguments select the data to read,
+        as for :meth:`read`.
+        """
+        from neo.io.asynchronous import run_in_executor
+        return run_in_executor(self._read_selected, executor,
+                               method='read_block', **kargs)
+
+    def aread_segment(self, executor=None, **kargs):
+        """
+        Return an :class:`asyncio.Future` of the Segment read by
+        :meth:`read_segment`, as :meth:`aread_block`.
+        """
+        from neo.io.asynchronous import run_in_executor
+        return run_in_executor(self._read_selected, executor,
+                               method='read_segment', **kargs)
+
+    def aiter_analogsignal_chunks(self, chunk_duration, executor=None,
+                                  prefetch=1, **kargs):
+        """
+        Asynchronous iterator of the chunks of
+        :meth:`iter_analogsignal_chunks`, each read in :attr:`executor`
+        with at most :attr:`prefetch` chunks read ahead of the consumer
+        (see :class:`neo.io.asynchronous.AsyncChunkIterator`).
+        """
+        from neo.io.asynchronous import AsyncChunkIterator
+        return AsyncChunkIterator(
+            self.iter_analogsignal_chunks(chunk_duration, **kargs),
+            executor=executor, prefetch=prefetch)
+
+    def _iter_analogsignal_proxies(self, **kargs):
+        """
+        Generator of the proxies of the analog signals of each Segment of
+        the file, as one list per Segment.  The signals are read lazily if
+        the IO has lazy proxies, and in memory otherwise.
+        """
+        lazy = self.has_lazy_proxies
+        for block in self._read_blocks(lazy=lazy, cascade=True, **kargs):
+            for seg in block.segments:
+                proxies = []
+                n_channels = 0
+                for sig in seg.analogsignals + seg.analogsignalarrays:
+                    proxy = getattr(sig, 'lazy_proxy', None)
+                    if proxy is None:
+                        proxy = _memory_proxy(sig, n_channels)
+                    proxies.append(proxy)
+                    n_channels += len(proxy.columns)
+                yield proxies
+
     ######## All individual read methods #######################
     def read_block(self, **kargs):
         assert(Block in self.readable_objects), read_error
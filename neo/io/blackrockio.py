@@ -5,11 +5,15 @@ Module for reading binary file from Blackrock format.
 
 import logging
 import struct
+import threading
 
 import numpy as np
 import quantities as pq
 
 from neo.io.baseio import BaseIO
+from neo.io.proxyobjects import RawArray, AnalogSignalProxy
+from neo.io.resources import resource_pool
+from neo.io.selection import DataSelection
 from neo.core import (Block, Segment,
                       RecordingChannel, RecordingChannelGroup, AnalogSignal)
 from neo.io import tools
@@ -34,7 +38,9 @@ class BlackrockIO(BaseIO):
 
     # Not sure what these do, if anything
     has_header         = False
-    is_streameable     = False
+    is_streameable     = True
+    has_lazy_proxies   = True
+    supported_selection = ['channel_indexes', 'time_range']
 
     # The IO name and the file extensions it uses
     name               = 'Blackrock'
@@ -68,11 +74,35 @@ class BlackrockIO(BaseIO):
         BaseIO.__init__(self)
         self.filename = filename
         self.full_range = full_range
+        # the header is parsed once and then shared by all the readings,
+        # which may run in several threads
+        self.loader = None
+        self.header = None
+        self._loader_lock = threading.Lock()
+
+    def _get_loader(self):
+        """Returns the Loader of the file, parsing its header the first
+        time."""
+        with self._loader_lock:
+            if self.loader is None:
+                loader = Loader(self.filename)
+                loader.load_header()
+                self.header = loader.header
+                self.loader = loader
+        return self.loader
+
+    def close(self):
+        """Drops the parsed header and the memmaps of the file."""
+        with self._loader_lock:
+            self.loader = None
+            self.header = None
+        BaseIO.close(self)
 
     # The reading methods. The `lazy` and `cascade` parameters are imposed
     # by neo.io API
     def read_block(self, lazy=False, cascade=True,
-        n_starts=None, n_stops=None, channel_list=None):
+        n_starts=None, n_stops=None, channel_list=None,
+        channel_indexes=None, time_range=None):
         """Reads the file and returns contents as a Block.
 
         The Block contains one Segment for each entry in zip(n_starts,
@@ -87,9 +117,15 @@ class BlackrockIO(BaseIO):
         channel_list: list of channel numbers to get. The neural data channels
             are 1 - 128. The analog inputs are 129 - 144. The default
             is to acquire all channels.
+        channel_indexes: the channels of channel_list to read, see
+            neo.io.selection.
+        time_range: (t_start, t_stop) times of the samples to read, each
+            Segment is restricted to them.
 
         Returns: Block object containing the data.
         """
+        selection = DataSelection(channel_indexes=channel_indexes,
+                                  time_range=time_range)
 
 
         # Create block
@@ -98,18 +134,18 @@ class BlackrockIO(BaseIO):
         if not cascade:
             return block
 
-        self.loader = Loader(self.filename)
-        self.loader.load_file()
-        self.header = self.loader.header
+        loader = self._get_loader()
 
         # If channels not specified, get all
         if channel_list is None:
-            channel_list = self.loader.get_neural_channel_numbers()
+            channel_list = loader.get_neural_channel_numbers()
+        channel_list = [ch for ch in channel_list
+                        if selection.keep_channel(ch)]
 
         # If not specified, load all as one Segment
         if n_starts is None:
             n_starts = [0]
-            n_stops = [self.loader.header.n_samples]
+            n_stops = [loader.header.n_samples]
 
         #~ # Add channel hierarchy
         #~ rcg = RecordingChannelGroup(name='allchannels',
@@ -129,13 +165,18 @@ class BlackrockIO(BaseIO):
         # Iterate through n_starts and n_stops and add one Segment
         # per each.
         for n, (t1, t2) in enumerate(zip(n_starts, n_stops)):
+            # only the samples in the time range are read
+            start, stop = selection.sample_range(
+                t1 / loader.header.f_samp * pq.s,
+                loader.header.f_samp * pq.Hz, t2 - t1)
+            t1, t2 = t1 + start, t1 + stop
             # Create segment and add metadata
             seg = self.read_segment(n_start=t1, n_stop=t2, chlist=channel_list,
                 lazy=lazy, cascade=cascade)
             seg.name = 'Segment %d' % n
             seg.index = n
-            t1sec = t1 / self.loader.header.f_samp
-            t2sec = t2 / self.loader.header.f_samp
+            t1sec = t1 / loader.header.f_samp
+            t2sec = t2 / loader.header.f_samp
             seg.description = 'Segment %d from %f to %f' % (n, t1sec, t2sec)
 
             # Link to block
@@ -161,39 +202,51 @@ class BlackrockIO(BaseIO):
 
         Returns a Segment object containing the data.
         """
+        loader = self._get_loader()
+        header = loader.header
+
         # If no channel numbers provided, get all of them
         if chlist is None:
-            chlist = self.loader.get_neural_channel_numbers()
+            chlist = loader.get_neural_channel_numbers()
 
         # Conversion from bits to full_range units
-        conversion = self.full_range / 2**(8*self.header.sample_width)
+        conversion = self.full_range / 2**(8*header.sample_width)
 
         # Create the Segment
         seg = Segment(file_origin=self.filename)
-        t_start = float(n_start) / self.header.f_samp
-        t_stop = float(n_stop) / self.header.f_samp
+        t_start = float(n_start) / header.f_samp
+        t_stop = float(n_stop) / header.f_samp
         seg.annotate(t_start=t_start)
         seg.annotate(t_stop=t_stop)
 
         # Load data from each channel and store
         for ch in chlist:
             if lazy:
-                sig = np.array([]) * conversion
+                # the samples are read only when the proxy is loaded
+                proxy = AnalogSignalProxy(
+                    loader.get_raw_array(n_start, n_stop,
+                                         gain=conversion.magnitude),
+                    units=conversion.units,
+                    sampling_rate=header.f_samp*pq.Hz,
+                    t_start=t_start*pq.s,
+                    columns=[loader.get_column(ch)],
+                    channel_indexes=[int(ch)], file_origin=self.filename,
+                    description='Channel %d from %f to %f' % (ch, t_start,
+                                                              t_stop))
+                seg.analogsignals.append(proxy.lazy_object())
+                continue
             else:
                 # Get the data from the loader
                 sig = np.array(\
-                    self.loader._get_channel(ch)[n_start:n_stop]) * conversion
+                    loader._get_channel(ch)[n_start:n_stop]) * conversion
 
             # Create an AnalogSignal with the data in it
             anasig = AnalogSignal(signal=sig,
-                sampling_rate=self.header.f_samp*pq.Hz,
+                sampling_rate=header.f_samp*pq.Hz,
                 t_start=t_start*pq.s, file_origin=self.filename,
                 description='Channel %d from %f to %f' % (ch, t_start, t_stop),
                 channel_index=int(ch))
 
-            if lazy:
-                anasig.lazy_shape = n_stop-n_start
-
 
             # Link the signal to the segment
             seg.analogsignals.append(anasig)
@@ -230,6 +283,10 @@ class BlackrockIO(BaseIO):
 
         Variable names are consistent with the Neuroshare specification.
         """
+        # the header parsed before, if any, is no longer the file's, and
+        # the file must not be mapped while it is written
+        self.close()
+
         fi = open(self.filename, 'wb')
         self._write_header(block, fi)
 
@@ -300,9 +357,16 @@ class Loader(object):
         existing in the file.
     get_neural_channel_ids : Returns an array of neural channel numbers
         existing in the file.
+    get_column : Returns the column of a channel in the data.
+    get_raw_array : Returns a RawArray describing the data between two
+        samples, used for lazy loading.
     regenerate_memmap : Deletes and restores the underlying memmap, which
         may free up memory.
 
+    Once the header is loaded, the channels can be read from several
+    threads: each reading maps the file anew, and nothing but the header
+    is kept in the Loader.
+
     Issues
     ------
     Memory leaks may exist
@@ -432,7 +496,12 @@ class Loader(object):
         except AttributeError:
             pass
 
-        self._mm = np.memmap(\
+        self._mm = self._memmap()
+
+    def _memmap(self):
+        """Returns a memmap of the data of its own, viewing the mapping of
+        the file kept in the resource pool."""
+        return resource_pool.memmap(\
             self.filename, dtype='h', mode='r',
             offset=self.header.Header,
             shape=(self.header.n_samples, self.header.Channel_Count))
@@ -442,22 +511,36 @@ class Loader(object):
         if '_mm' in self.__dict__: del self._mm
         #else: logging.info( "gracefully skipping")
 
+    def get_column(self, channel_number):
+        """Returns the column of the requested channel in the data"""
+        return self.header.Channel_ID.index(channel_number)
+
+    def get_raw_array(self, n_start, n_stop, gain=None):
+        """Returns a RawArray describing the samples from n_start to n_stop
+        of all the channels, for lazy loading"""
+        n_start = min(max(n_start, 0), self.header.n_samples)
+        n_stop = min(max(n_stop, n_start), self.header.n_samples)
+        return RawArray(self.filename, 'h',
+                        (n_stop - n_start, self.header.Channel_Count),
+                        byte_offset=self.header.Header +
+                        2 * n_start * self.header.Channel_Count,
+                        gain=gain, scaled_dtype='f8')
+
     def _get_channel(self, channel_number):
-        """Returns slice into internal memmap for requested channel"""
+        """Returns slice into a new memmap for requested channel"""
         try:
             mm_index = self.header.Channel_ID.index(channel_number)
         except ValueError:
             logging.info( "Channel number %d does not exist" % channel_number)
             return np.array([])
 
-        self.regenerate_memmap()
-        return self._mm[:, mm_index]
+        # a memmap of its own rather than the internal one, which other
+        # threads may be regenerating
+        return self._memmap()[:, mm_index]
 
     def get_channel_as_array(self, channel_number):
         """Returns data from requested channel as a 1d numpy array."""
-        data = np.array(self._get_channel(channel_number))
-        self.regenerate_memmap()
-        return data
+        return np.array(self._get_channel(channel_number))
 
     def get_analog_channel_as_array(self, analog_chn):
         """Returns data from requested analog channel as a numpy array.
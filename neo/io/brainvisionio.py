@@ -16,6 +16,9 @@ import numpy as np
 import quantities as pq
 
 from neo.io.baseio import BaseIO
+from neo.io.proxyobjects import RawArray, AnalogSignalProxy, EventArrayProxy
+from neo.io.resources import resource_pool
+from neo.io.selection import DataSelection
 from neo.core import Segment, AnalogSignal, EventArray
 
 
@@ -40,7 +43,9 @@ class BrainVisionIO(BaseIO):
     writeable_objects  = [ ]
 
     has_header         = False
-    is_streameable     = False
+    is_streameable     = True
+    has_lazy_proxies   = True
+    supported_selection = ['channel_indexes', 'time_range']
 
     read_params        = { Segment : [ ] }
     write_params       = { Segment : [ ] }
@@ -62,7 +67,16 @@ class BrainVisionIO(BaseIO):
         self.filename = filename
 
 
-    def read_segment(self, lazy = False, cascade = True):
+    def read_segment(self, lazy = False, cascade = True,
+                     channel_indexes = None, time_range = None):
+        """
+        Read the file, or the channels of :attr:`channel_indexes` between
+        the times of :attr:`time_range` (see :mod:`neo.io.selection`).
+        """
+        selection = DataSelection(channel_indexes=channel_indexes,
+                                  time_range=time_range)
+        # the selected part of the data is read through the proxies
+        use_proxies = lazy or not selection.selects_all
 
         ## Read header file (vhdr)
         header = readBrainSoup(self.filename)
@@ -81,30 +95,40 @@ class BrainVisionIO(BaseIO):
         if not cascade : return seg
 
         # read binary
-        if not lazy:
-            binary_file = os.path.splitext(self.filename)[0]+'.eeg'
-            sigs = np.memmap(binary_file , dt, 'r', ).astype('f')
+        binary_file = os.path.splitext(self.filename)[0]+'.eeg'
+        if use_proxies:
+            # the samples are read only when the proxies are loaded
+            n = os.path.getsize(binary_file) // np.dtype(dt).itemsize // \
+                nb_channel
+            gain = None
+            if dt == np.int16 or dt == np.int32:
+                gain = [float(header['Channel Infos']['Ch%d' % (c+1,)].
+                              split(',')[2]) for c in range(nb_channel)]
+            raw = RawArray(binary_file, dt, (n, nb_channel), gain=gain)
+        else:
+            sigs = resource_pool.memmap(binary_file , dt, 'r', ).astype('f')
 
             n = int(sigs.size/nb_channel)
             sigs = sigs[:n*nb_channel]
             sigs = sigs.reshape(n, nb_channel)
 
-        for c in range(nb_channel):
+        for c in selection.channels(range(nb_channel)):
             name, ref, res, units = header['Channel Infos']['Ch%d' % (c+1,)].split(',')
             units = pq.Quantity(1, units.replace('µ', 'u') )
-            if lazy:
-                signal = [ ]*units
-            else:
-                signal = sigs[:,c]*units
-                if dt == np.int16 or dt == np.int32:
-                    signal *= np.float(res) 
+            if use_proxies:
+                proxy = AnalogSignalProxy(raw, units=units.units,
+                                          sampling_rate=sampling_rate,
+                                          columns=[c], name=name)
+                seg.analogsignals.append(selection.read(proxy, lazy))
+                continue
+            signal = sigs[:,c]*units
+            if dt == np.int16 or dt == np.int32:
+                signal *= np.float(res) 
             anasig = AnalogSignal(signal = signal,
                                                 channel_index = c,
                                                 name = name,
                                                 sampling_rate = sampling_rate,
                                                 )
-            if lazy:
-                anasig.lazy_shape = -1
             seg.analogsignals.append(anasig)
 
         # read marker
@@ -123,9 +147,13 @@ class BrainVisionIO(BaseIO):
         labels = np.array(labels, dtype = 'S')
         for type_ in np.unique(all_types):
             ind = type_  == all_types
-            if lazy:
-                ea = EventArray(name = str(type_))
-                ea.lazy_shape = -1
+            if use_proxies:
+                # the markers are in the text file, already read
+                ea = selection.read(EventArrayProxy(times[ind].magnitude,
+                                                    units=pq.s,
+                                                    labels=labels[ind],
+                                                    name=str(type_)),
+                                    lazy)
             else:
                 ea = EventArray( times = times[ind],
                                     labels  = labels[ind],
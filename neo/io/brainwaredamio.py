@@ -43,6 +43,7 @@ from neo.core import (AnalogSignal, Block, RecordingChannel,
 
 # need to subclass BaseI
 from neo.io.baseio import BaseIO
+from neo.io.selection import DataSelection
 
 
 class BrainwareDamIO(BaseIO):
@@ -118,7 +119,11 @@ class BrainwareDamIO(BaseIO):
         '''
         Reads raw data file "fname" generated with BrainWare
         '''
-        return self.read_block(lazy=lazy, cascade=cascade)
+        selection = DataSelection.pop(kargs)
+        block = self.read_block(lazy=lazy, cascade=cascade)
+        if not selection.selects_all:
+            block = selection.select_block(block, lazy=lazy)
+        return block
 
     def read_block(self, lazy=False, cascade=True, **kargs):
         '''
@@ -151,6 +156,22 @@ class BrainwareDamIO(BaseIO):
         rcg.channel_indexes = np.array([1])
         rcg.channel_names = np.array(['Chan1'], dtype='S')
 
+        for seg in self._iter_segments(lazy):
+            # store the segment and signals
+            block.segments.append(seg)
+            rchan.analogsignals.append(seg.analogsignals[0])
+
+        # remove the file object
+        self._fsrc = None
+
+        block.create_many_to_one_relationship()
+        return block
+
+    def _iter_segments(self, lazy=False):
+        '''
+        Generator of the Segments of the raw data file "fname" generated
+        with BrainWare, each read when it is reached
+        '''
         # open the file
         with open(self._path, 'rb') as fobject:
             # while the file is not done keep reading segments
@@ -159,16 +180,8 @@ class BrainwareDamIO(BaseIO):
                 # if there are no more Segments, stop
                 if not seg:
                     break
-
-                # store the segment and signals
-                block.segments.append(seg)
-                rchan.analogsignals.append(seg.analogsignals[0])
-
-        # remove the file object
-        self._fsrc = None
-
-        block.create_many_to_one_relationship()
-        return block
+                seg.create_many_to_one_relationship()
+                yield seg
 
     # -------------------------------------------------------------------------
     # -------------------------------------------------------------------------
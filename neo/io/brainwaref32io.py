@@ -40,6 +40,24 @@ from neo.core import Block, RecordingChannelGroup, Segment, SpikeTrain, Unit
 
 # need to subclass BaseIO
 from neo.io.baseio import BaseIO
+from neo.io.selection import DataSelection
+
+
+class _ReadState(object):
+    """
+    The reading position in a BrainwareF32IO file and the objects being
+    built, for one reading.
+    """
+    def __init__(self, fsrc, lazy, blk, unit):
+        self.fsrc = fsrc
+        self.lazy = lazy
+        self.blk = blk
+        self.unit = unit
+
+        self.t_stop = None
+        self.params = None
+        self.seg = None
+        self.spiketimes = None
 
 
 class BrainwareF32IO(BaseIO):
@@ -118,22 +136,15 @@ class BrainwareF32IO(BaseIO):
         self._path = filename
         self._filename = path.basename(filename)
 
-        self._fsrc = None
-        self.__lazy = False
-
-        self._blk = None
-        self.__unit = None
-
-        self.__t_stop = None
-        self.__params = None
-        self.__seg = None
-        self.__spiketimes = None
-
     def read(self, lazy=False, cascade=True, **kargs):
         '''
         Reads simple spike data file "fname" generated with BrainWare
         '''
-        return self.read_block(lazy=lazy, cascade=cascade)
+        selection = DataSelection.pop(kargs)
+        block = self.read_block(lazy=lazy, cascade=cascade)
+        if not selection.selects_all:
+            block = selection.select_block(block, lazy=lazy)
+        return block
 
     def read_block(self, lazy=False, cascade=True, **kargs):
         '''
@@ -147,11 +158,7 @@ class BrainwareF32IO(BaseIO):
         if kargs:
             raise NotImplementedError('This method does not have any '
                                       'argument implemented yet')
-        self._fsrc = None
-        self.__lazy = lazy
-
-        self._blk = Block(file_origin=self._filename)
-        block = self._blk
+        block = Block(file_origin=self._filename)
 
         # if we aren't doing cascade, don't load anything
         if not cascade:
@@ -159,38 +166,24 @@ class BrainwareF32IO(BaseIO):
 
         # create the objects to store other objects
         rcg = RecordingChannelGroup(file_origin=self._filename)
-        self.__unit = Unit(file_origin=self._filename)
+        unit = Unit(file_origin=self._filename)
 
         # load objects into their containers
         block.recordingchannelgroups.append(rcg)
-        rcg.units.append(self.__unit)
-
-        # initialize values
-        self.__t_stop = None
-        self.__params = None
-        self.__seg = None
-        self.__spiketimes = None
+        rcg.units.append(unit)
 
         # open the file
-        with open(self._path, 'rb') as self._fsrc:
+        with open(self._path, 'rb') as fsrc:
+            # the reading position is kept in a state of its own, not in the
+            # IO object, so that the same object can read in several threads
+            state = _ReadState(fsrc, lazy, block, unit)
             res = True
             # while the file is not done keep reading segments
             while res:
-                res = self.__read_id()
+                res = self.__read_id(state)
 
         block.create_many_to_one_relationship()
 
-        # cleanup attributes
-        self._fsrc = None
-        self.__lazy = False
-
-        self._blk = None
-
-        self.__t_stop = None
-        self.__params = None
-        self.__seg = None
-        self.__spiketimes = None
-
         return block
 
     # -------------------------------------------------------------------------
@@ -204,7 +197,7 @@ class BrainwareF32IO(BaseIO):
     # -------------------------------------------------------------------------
     # -------------------------------------------------------------------------
 
-    def __read_id(self):
+    def __read_id(self, state):
         '''
         Read the next ID number and do the appropriate task with it.
 
@@ -212,97 +205,97 @@ class BrainwareF32IO(BaseIO):
         '''
         try:
             # float32 -- ID of the first data sequence
-            objid = np.fromfile(self._fsrc, dtype=np.float32, count=1)[0]
+            objid = np.fromfile(state.fsrc, dtype=np.float32, count=1)[0]
         except IndexError:
             # if we have a previous segment, save it
-            self.__save_segment()
+            self.__save_segment(state)
 
             # if there are no more Segments, return
             return False
 
         if objid == -2:
-            self.__read_condition()
+            self.__read_condition(state)
         elif objid == -1:
-            self.__read_segment()
+            self.__read_segment(state)
         else:
-            self.__spiketimes.append(objid)
+            state.spiketimes.append(objid)
         return True
 
-    def __read_condition(self):
+    def __read_condition(self, state):
         '''
         Read the parameter values for a single stimulus condition.
 
         Returns nothing.
         '''
         # float32 -- SpikeTrain length in ms
-        self.__t_stop = np.fromfile(self._fsrc, dtype=np.float32, count=1)[0]
+        state.t_stop = np.fromfile(state.fsrc, dtype=np.float32, count=1)[0]
 
         # float32 -- number of stimulus parameters
-        numelements = int(np.fromfile(self._fsrc, dtype=np.float32,
+        numelements = int(np.fromfile(state.fsrc, dtype=np.float32,
                                       count=1)[0])
 
         # [float32] * numelements -- stimulus parameter values
-        paramvals = np.fromfile(self._fsrc, dtype=np.float32,
+        paramvals = np.fromfile(state.fsrc, dtype=np.float32,
                                 count=numelements).tolist()
 
         # organize the parameers into a dictionary with arbitrary names
         paramnames = ['Param%s' % i for i in range(len(paramvals))]
-        self.__params = dict(zip(paramnames, paramvals))
+        state.params = dict(zip(paramnames, paramvals))
 
-    def __read_segment(self):
+    def __read_segment(self, state):
         '''
         Setup the next Segment.
 
         Returns nothing.
         '''
         # if we have a previous segment, save it
-        self.__save_segment()
+        self.__save_segment(state)
 
         # create the segment
-        self.__seg = Segment(file_origin=self._filename,
-                             **self.__params)
+        state.seg = Segment(file_origin=self._filename,
+                            **state.params)
 
         # create an empy array to save the spike times
         # this needs to be converted to a SpikeTrain before it can be used
-        self.__spiketimes = []
+        state.spiketimes = []
 
-    def __save_segment(self):
+    def __save_segment(self, state):
         '''
         Write the segment to the Block if it exists
         '''
         # if this is the beginning of the first condition, then we don't want
         # to save, so exit
-        # but set __seg from None to False so we know next time to create a
+        # but set seg from None to False so we know next time to create a
         # segment even if there are no spike in the condition
-        if self.__seg is None:
-            self.__seg = False
+        if state.seg is None:
+            state.seg = False
             return
 
-        if not self.__seg:
+        if not state.seg:
             # create dummy values if there are no SpikeTrains in this condition
-            self.__seg = Segment(file_origin=self._filename,
-                                 **self.__params)
-            self.__spiketimes = []
+            state.seg = Segment(file_origin=self._filename,
+                                **state.params)
+            state.spiketimes = []
 
-        if self.__lazy:
+        if state.lazy:
             train = SpikeTrain(pq.Quantity([], dtype=np.float32,
                                            units=pq.ms),
-                               t_start=0*pq.ms, t_stop=self.__t_stop * pq.ms,
+                               t_start=0*pq.ms, t_stop=state.t_stop * pq.ms,
                                file_origin=self._filename)
-            train.lazy_shape = len(self.__spiketimes)
+            train.lazy_shape = len(state.spiketimes)
         else:
-            times = pq.Quantity(self.__spiketimes, dtype=np.float32,
+            times = pq.Quantity(state.spiketimes, dtype=np.float32,
                                 units=pq.ms)
             train = SpikeTrain(times,
-                               t_start=0*pq.ms, t_stop=self.__t_stop * pq.ms,
+                               t_start=0*pq.ms, t_stop=state.t_stop * pq.ms,
                                file_origin=self._filename)
 
-        self.__seg.spiketrains = [train]
-        self.__unit.spiketrains.append(train)
-        self._blk.segments.append(self.__seg)
+        state.seg.spiketrains = [train]
+        state.unit.spiketrains.append(train)
+        state.blk.segments.append(state.seg)
 
         # set an empty segment
-        # from now on, we need to set __seg to False rather than None so
+        # from now on, we need to set seg to False rather than None so
         # that if there is a condition with no SpikeTrains we know
         # to create an empty Segment
-        self.__seg = False
+        state.seg = False
@@ -40,6 +40,7 @@ from itertools import chain
 import logging
 import os.path
 import sys
+import threading
 
 # numpy and quantities are already required by neo
 import numpy as np
@@ -51,12 +52,61 @@ from neo.core import (Block, EventArray, RecordingChannel,
 
 # need to subclass BaseIO
 from neo.io.baseio import BaseIO
+from neo.io.selection import DataSelection
 
 LOGHANDLER = logging.StreamHandler()
 
 PY_VER = sys.version_info[0]
 
 
+class _ReadState(threading.local):
+    """
+    The reading position in a BrainwareSrcIO file and the objects being
+    built, one set for each thread.
+    """
+    def __init__(self, filename=None):
+        # this store the filename without the path
+        self.file_origin = filename
+
+        # This stores the file object for the current file
+        self.fsrc = None
+
+        # This stores the current Block
+        self.blk = None
+
+        # This stores the current RecordingChannelGroup for easy access
+        # It is equivalent to self.blk.recordingchannelgroups[0]
+        self.rcg = None
+
+        # This stores the current Segment for easy access
+        # It is equivalent to self.blk.segments[-1]
+        self.seg0 = None
+
+        # this stores a dictionary of the Block's Units by name,
+        # making it easier and faster to retrieve Units by name later
+        # UnassignedSpikes and Units accessed by index are not stored here
+        self.unitdict = {}
+
+        # this stores the current Unit
+        self.unit0 = None
+
+        # if the file has a list with negative length, the rest of the
+        # file's list lengths are unreliable, so we need to store this value
+        # for the whole file
+        self.damaged = False
+
+        # this stores whether the current file is lazy loaded
+        self.lazy = False
+
+        # this stores whether the current file is cascading
+        # this is false by default so if we use read_block on its own it
+        # works
+        self.cascade = False
+
+        # this stores an empty SpikeTrain which is used in various places.
+        self.default_spiketrain = None
+
+
 class BrainwareSrcIO(BaseIO):
     """
     Class for reading Brainware Spike ReCord files with the extension '.src'
@@ -155,45 +205,15 @@ class BrainwareSrcIO(BaseIO):
         # provided when the instance is initialized.
         self._filename = filename
 
-        # this store the filename without the path
-        self._file_origin = filename
-
-        # This stores the file object for the current file
-        self._fsrc = None
+        # this stores the reading position and the objects being built,
+        # which are private to each thread, so that the same object can be
+        # read from several threads
+        self._state = _ReadState(filename)
 
-        # This stores the current Block
-        self._blk = None
-
-        # This stores the current RecordingChannelGroup for easy access
-        # It is equivalent to self._blk.recordingchannelgroups[0]
-        self._rcg = None
-
-        # This stores the current Segment for easy access
-        # It is equivalent to self._blk.segments[-1]
-        self._seg0 = None
-
-        # this stores a dictionary of the Block's Units by name,
-        # making it easier and faster to retrieve Units by name later
-        # UnassignedSpikes and Units accessed by index are not stored here
-        self._unitdict = {}
-
-        # this stores the current Unit
-        self._unit0 = None
-
-        # if the file has a list with negative length, the rest of the file's
-        # list lengths are unreliable, so we need to store this value for the
-        # whole file
-        self._damaged = False
-
-        # this stores whether the current file is lazy loaded
-        self._lazy = False
-
-        # this stores whether the current file is cascading
-        # this is false by default so if we use read_block on its own it works
-        self._cascade = False
-
-        # this stores an empty SpikeTrain which is used in various places.
-        self._default_spiketrain = None
+        # this stores the file objects opened by all the threads, so that
+        # close can close all of them
+        self._files = set()
+        self._files_lock = threading.Lock()
 
     @property
     def _isopen(self):
@@ -201,35 +221,55 @@ class BrainwareSrcIO(BaseIO):
         This property tells whether the SRC file associated with the IO object
         is open.
         """
-        return self._fsrc is not None
+        return self._state.fsrc is not None
 
     def _opensrc(self):
         """
         Open the file if it isn't already open.
         """
         # if the file isn't already open, open it and clear the Blocks
-        if not self._fsrc or self._fsrc.closed:
-            self._fsrc = open(self._filename, 'rb')
+        if not self._state.fsrc or self._state.fsrc.closed:
+            self._state.fsrc = open(self._filename, 'rb')
+            with self._files_lock:
+                self._files.add(self._state.fsrc)
 
             # figure out the filename of the current file
-            self._file_origin = os.path.basename(self._filename)
+            self._state.file_origin = os.path.basename(self._filename)
 
     def close(self):
         """
-        Close the currently-open file and reset the current reading point.
+        Close the files opened by all threads and reset the current reading
+        point of the calling thread.
+
+        The other threads must have finished reading, their files being
+        closed under them.
         """
         self.logger.info('close')
-        if self._isopen and not self._fsrc.closed:
-            self._fsrc.close()
+        with self._files_lock:
+            files = list(self._files)
+            self._files.clear()
+        for fsrc in files:
+            fsrc.close()
+        self._closesrc()
+
+    def _closesrc(self):
+        """
+        Close the file of the calling thread and reset its reading point.
+        """
+        if self._isopen:
+            with self._files_lock:
+                self._files.discard(self._state.fsrc)
+            if not self._state.fsrc.closed:
+                self._state.fsrc.close()
 
         # we also need to reset all per-file attributes
-        self._damaged = False
-        self._fsrc = None
-        self._seg0 = None
-        self._cascade = False
-        self._file_origin = None
-        self._lazy = False
-        self._default_spiketrain = None
+        self._state.damaged = False
+        self._state.fsrc = None
+        self._state.seg0 = None
+        self._state.cascade = False
+        self._state.file_origin = None
+        self._state.lazy = False
+        self._state.default_spiketrain = None
 
     def read(self, lazy=False, cascade=True, **kargs):
         """
@@ -238,7 +278,11 @@ class BrainwareSrcIO(BaseIO):
 
         If you wish to read more than one Block, please use read_all_blocks.
         """
-        return self.read_block(lazy=lazy, cascade=cascade, **kargs)
+        selection = DataSelection.pop(kargs)
+        block = self.read_block(lazy=lazy, cascade=cascade, **kargs)
+        if not selection.selects_all:
+            block = selection.select_block(block, lazy=lazy)
+        return block
 
     def read_block(self, lazy=False, cascade=True, **kargs):
         """
@@ -256,7 +300,7 @@ class BrainwareSrcIO(BaseIO):
                                       'argument implemented yet')
 
         blockobj = self.read_next_block(cascade=cascade, lazy=lazy)
-        self.close()
+        self._closesrc()
         return blockobj
 
     def read_next_block(self, cascade=True, lazy=False, **kargs):
@@ -277,28 +321,28 @@ class BrainwareSrcIO(BaseIO):
             raise NotImplementedError('This method does not have any '
                                       'argument implemented yet')
 
-        self._lazy = lazy
+        self._state.lazy = lazy
         self._opensrc()
 
         # create _default_spiketrain here for performance reasons
-        self._default_spiketrain = self._init_default_spiketrain.copy()
-        self._default_spiketrain.file_origin = self._file_origin
+        self._state.default_spiketrain = self._init_default_spiketrain.copy()
+        self._state.default_spiketrain.file_origin = self._state.file_origin
         if lazy:
-            self._default_spiketrain.lazy_shape = (0,)
+            self._state.default_spiketrain.lazy_shape = (0,)
 
         # create the Block and the contents all Blocks of from IO share
-        self._blk = Block(file_origin=self._file_origin)
+        self._state.blk = Block(file_origin=self._state.file_origin)
         if not cascade:
-            return self._blk
-        self._rcg = RecordingChannelGroup(file_origin=self._file_origin)
-        self._seg0 = Segment(name='Comments', file_origin=self._file_origin)
-        self._unit0 = Unit(name='UnassignedSpikes',
-                           file_origin=self._file_origin,
+            return self._state.blk
+        self._state.rcg = RecordingChannelGroup(file_origin=self._state.file_origin)
+        self._state.seg0 = Segment(name='Comments', file_origin=self._state.file_origin)
+        self._state.unit0 = Unit(name='UnassignedSpikes',
+                           file_origin=self._state.file_origin,
                            elliptic=[], boundaries=[],
                            timestamp=[], max_valid=[])
-        self._blk.recordingchannelgroups.append(self._rcg)
-        self._rcg.units.append(self._unit0)
-        self._blk.segments.append(self._seg0)
+        self._state.blk.recordingchannelgroups.append(self._state.rcg)
+        self._state.rcg.units.append(self._state.unit0)
+        self._state.blk.segments.append(self._state.seg0)
 
         # this actually reads the contents of the Block
         result = []
@@ -306,30 +350,30 @@ class BrainwareSrcIO(BaseIO):
             try:
                 result = self._read_by_id()
             except:
-                self.close()
+                self._closesrc()
                 raise
 
         # set the recorging channel group names and indices
-        chans = self._rcg.recordingchannels
+        chans = self._state.rcg.recordingchannels
         chan_inds = np.arange(len(chans), dtype='int')
         chan_names = np.array(['Chan'+str(i) for i in chan_inds],
                               dtype='string_')
-        self._rcg.channel_indexes = chan_inds
-        self._rcg.channel_names = chan_names
+        self._state.rcg.channel_indexes = chan_inds
+        self._state.rcg.channel_names = chan_names
 
         # since we read at a Block level we always do this
-        self._blk.create_many_to_one_relationship()
+        self._state.blk.create_many_to_one_relationship()
 
         # put the Block in a local object so it can be gargabe collected
-        blockobj = self._blk
+        blockobj = self._state.blk
 
         # reset the per-Block attributes
-        self._blk = None
-        self._rcg = None
-        self._unitdict = {}
+        self._state.blk = None
+        self._state.rcg = None
+        self._state.unitdict = {}
 
         # combine the comments into one big eventarray
-        self._combine_segment_eventarrays(self._seg0)
+        self._combine_segment_eventarrays(self._state.seg0)
 
         # result is None iff the end of the file is reached, so we can
         # close the file
@@ -338,7 +382,7 @@ class BrainwareSrcIO(BaseIO):
         # returns a value
         if result is None:
             self.logger.info('Last Block read.  Closing file.')
-            self.close()
+            self._closesrc()
 
         return blockobj
 
@@ -360,10 +404,10 @@ class BrainwareSrcIO(BaseIO):
             raise NotImplementedError('This method does not have any '
                                       'argument implemented yet')
 
-        self._lazy = lazy
-        self._cascade = True
+        self._state.lazy = lazy
+        self._state.cascade = True
 
-        self.close()
+        self._closesrc()
         self._opensrc()
 
         # Read each Block.
@@ -375,11 +419,36 @@ class BrainwareSrcIO(BaseIO):
                 blocks.append(self.read_next_block(cascade=cascade,
                                                    lazy=lazy))
             except:
-                self.close()
+                self._closesrc()
                 raise
 
         return blocks
 
+    def _iter_segments(self, lazy=False, **kargs):
+        """
+        Yields the Segments of the Spike ReCording file "filename"
+        generated with BrainWare, reading one Block at a time with
+        read_next_block.
+
+        The progress in the file is reset and the file closed then opened again
+        prior to reading.
+
+        The file is automatically closed after reading completes.
+        """
+        self._state.lazy = lazy
+        self._state.cascade = True
+
+        self._closesrc()
+        self._opensrc()
+        try:
+            while self._isopen:
+                blockobj = self.read_next_block(cascade=True, lazy=lazy,
+                                                **kargs)
+                for seg in blockobj.segments:
+                    yield seg
+        finally:
+            self._closesrc()
+
     def _convert_timestamp(self, timestamp, start_date=datetime(1899, 12, 30)):
         """
         _convert_timestamp(timestamp, start_date) - convert a timestamp in
@@ -428,7 +497,7 @@ class BrainwareSrcIO(BaseIO):
 
         try:
             # uint16 -- the ID code of the next sequence
-            seqid = np.asscalar(np.fromfile(self._fsrc,
+            seqid = np.asscalar(np.fromfile(self._state.fsrc,
                                             dtype=np.uint16, count=1))
         except ValueError:
             # return a None if at EOF.  Other methods use None to recognize
@@ -479,21 +548,21 @@ class BrainwareSrcIO(BaseIO):
         """
         if isinstance(data_obj, Unit):
             self.logger.warning('Unknown Unit found, adding to Units list')
-            self._rcg.units.append(data_obj)
+            self._state.rcg.units.append(data_obj)
             if data_obj.name:
-                self._unitdict[data_obj.name] = data_obj
+                self._state.unitdict[data_obj.name] = data_obj
         elif isinstance(data_obj, Segment):
             self.logger.warning('Unknown Segment found, '
                                  'adding to Segments list')
-            self._blk.segments.append(data_obj)
+            self._state.blk.segments.append(data_obj)
         elif isinstance(data_obj, EventArray):
             self.logger.warning('Unknown EventArray found, '
                                  'adding to comment Events list')
-            self._seg0.eventarrays.append(data_obj)
+            self._state.seg0.eventarrays.append(data_obj)
         elif isinstance(data_obj, SpikeTrain):
             self.logger.warning('Unknown SpikeTrain found, '
                                  'adding to the UnassignedSpikes Unit')
-            self._unit0.spiketrains.append(data_obj)
+            self._state.unit0.spiketrains.append(data_obj)
         elif hasattr(data_obj, '__iter__') and not isinstance(data_obj, str):
             for sub_obj in data_obj:
                 self._assign_sequence(sub_obj)
@@ -527,12 +596,12 @@ class BrainwareSrcIO(BaseIO):
         _combine_eventarrays(eventarrays) - combine a list of EventArrays
         with single events into one long EventArray
         """
-        if not eventarrays or self._lazy:
+        if not eventarrays or self._state.lazy:
             eventarray = EventArray(times=pq.Quantity([], units=pq.s),
                                     labels=np.array([], dtype='S'),
                                     senders=np.array([], dtype='S'),
                                     t_start=0)
-            if self._lazy:
+            if self._state.lazy:
                 eventarray.lazy_shape = len(eventarrays)
             return eventarray
 
@@ -574,11 +643,11 @@ class BrainwareSrcIO(BaseIO):
         """
 
         if not spiketrains:
-            return self._default_spiketrain.copy()
+            return self._state.default_spiketrain.copy()
 
         if hasattr(spiketrains[0], 'waveforms') and len(spiketrains) == 1:
             train = spiketrains[0]
-            if self._lazy and not hasattr(train, 'lazy_shape'):
+            if self._state.lazy and not hasattr(train, 'lazy_shape'):
                 train.lazy_shape = train.shape
                 train = train[:0]
             return train
@@ -597,7 +666,7 @@ class BrainwareSrcIO(BaseIO):
 
             spiketrains = [itrain for itrain in spiketrains if itrain.size > 0]
             if not spiketrains:
-                return self._default_spiketrain.copy()
+                return self._state.default_spiketrain.copy()
 
             # get the times of the spiketrains and combine them
             waveforms = [itrain.waveforms for itrain in spiketrains]
@@ -641,12 +710,12 @@ class BrainwareSrcIO(BaseIO):
                                 units=pq.ms, copy=False)
 
         if not times.size:
-            return self._default_spiketrain.copy()
+            return self._state.default_spiketrain.copy()
 
         # get the maximum time
         t_stop = times[-1] * 2.
 
-        if self._lazy:
+        if self._state.lazy:
             timesshape = times.shape
             times = pq.Quantity([], units=pq.ms, copy=False)
             waveforms = pq.Quantity([[[]]], units=pq.mV)
@@ -655,12 +724,12 @@ class BrainwareSrcIO(BaseIO):
 
         train = SpikeTrain(times=times, copy=False,
                            t_start=self._default_t_start.copy(), t_stop=t_stop,
-                           file_origin=self._file_origin,
+                           file_origin=self._state.file_origin,
                            waveforms=waveforms,
                            timestamp=self._default_datetime,
                            respwin=np.array([], dtype=np.int32),
                            dama_index=-1, trig2=trig2, side='')
-        if self._lazy:
+        if self._state.lazy:
             train.lazy_shape = timesshape
         return train
 
@@ -681,7 +750,7 @@ class BrainwareSrcIO(BaseIO):
 
         This is compatible with python 2 and python 3.
         """
-        rawstr = np.asscalar(np.fromfile(self._fsrc,
+        rawstr = np.asscalar(np.fromfile(self._state.fsrc,
                                          dtype='S%s' % numchars, count=1))
         if utf or (utf is None and PY_VER == 3):
             return rawstr.decode('utf-8')
@@ -701,7 +770,7 @@ class BrainwareSrcIO(BaseIO):
         """
 
         # int16 -- number of stimulus parameters
-        numelements = np.fromfile(self._fsrc, dtype=np.int16, count=1)[0]
+        numelements = np.fromfile(self._state.fsrc, dtype=np.int16, count=1)[0]
         if not numelements:
             return {}
 
@@ -709,10 +778,10 @@ class BrainwareSrcIO(BaseIO):
         names = []
         for i in range(numelements):
             # {skip} = byte (char) -- skip one byte
-            self._fsrc.seek(1, 1)
+            self._state.fsrc.seek(1, 1)
 
             # uint8 -- length of next string
-            numchars = np.asscalar(np.fromfile(self._fsrc,
+            numchars = np.asscalar(np.fromfile(self._state.fsrc,
                                                dtype=np.uint8, count=1))
 
             # if there is no name, make one up
@@ -730,7 +799,7 @@ class BrainwareSrcIO(BaseIO):
             names.append(name)
 
         # float32 * numelements -- an array of parameter values
-        values = np.fromfile(self._fsrc, dtype=np.float32,
+        values = np.fromfile(self._state.fsrc, dtype=np.float32,
                              count=numelements)
 
         # combine the names and values into a dict
@@ -756,7 +825,7 @@ class BrainwareSrcIO(BaseIO):
         """
 
         # int16 * 14 -- an array of parameter values
-        values = np.fromfile(self._fsrc, dtype=np.int16, count=14)
+        values = np.fromfile(self._state.fsrc, dtype=np.int16, count=14)
 
         # create dummy names and combine them with the values in a dict
         # the dict will be added to the annotations
@@ -781,17 +850,17 @@ class BrainwareSrcIO(BaseIO):
         """
 
         # float64 -- timestamp (number of days since dec 30th 1899)
-        time = np.fromfile(self._fsrc, dtype=np.double, count=1)[0]
+        time = np.fromfile(self._state.fsrc, dtype=np.double, count=1)[0]
 
         # int16 -- length of next string
-        numchars1 = np.asscalar(np.fromfile(self._fsrc,
+        numchars1 = np.asscalar(np.fromfile(self._state.fsrc,
                                             dtype=np.int16, count=1))
 
         # char * numchars -- the one who sent the comment
         sender = self.__read_str(numchars1)
 
         # int16 -- length of next string
-        numchars2 = np.asscalar(np.fromfile(self._fsrc,
+        numchars2 = np.asscalar(np.fromfile(self._state.fsrc,
                                             dtype=np.int16, count=1))
 
         # char * numchars -- comment text
@@ -799,9 +868,9 @@ class BrainwareSrcIO(BaseIO):
 
         comment = EventArray(times=pq.Quantity(time, units=pq.d), labels=text,
                              sender=sender,
-                             file_origin=self._file_origin)
+                             file_origin=self._state.file_origin)
 
-        self._seg0.eventarrays.append(comment)
+        self._state.seg0.eventarrays.append(comment)
 
         return []
 
@@ -836,20 +905,20 @@ class BrainwareSrcIO(BaseIO):
         """
 
         # int16 -- number of sequences to read
-        numelements = np.fromfile(self._fsrc, dtype=np.int16, count=1)[0]
+        numelements = np.fromfile(self._state.fsrc, dtype=np.int16, count=1)[0]
 
         # {skip} = bytes * 4 (int16 * 2) -- skip four bytes
-        self._fsrc.seek(4, 1)
+        self._state.fsrc.seek(4, 1)
 
         if numelements == 0:
             return []
 
-        if not self._damaged and numelements < 0:
-            self._damaged = True
+        if not self._state.damaged and numelements < 0:
+            self._state.damaged = True
             self.logger.error('Negative sequence count %s, file damaged',
                                numelements)
 
-        if not self._damaged:
+        if not self._state.damaged:
             # read the sequences into a list
             seq_list = [self._read_by_id() for _ in range(numelements)]
         else:
@@ -857,18 +926,18 @@ class BrainwareSrcIO(BaseIO):
             seq_list = []
 
             # uint16 -- the ID of the next sequence
-            seqidinit = np.fromfile(self._fsrc, dtype=np.uint16, count=1)[0]
+            seqidinit = np.fromfile(self._state.fsrc, dtype=np.uint16, count=1)[0]
 
             # {rewind} = byte * 2 (int16) -- move back 2 bytes, i.e. go back to
             # before the beginning of the seqid
-            self._fsrc.seek(-2, 1)
+            self._state.fsrc.seek(-2, 1)
             while 1:
                 # uint16 -- the ID of the next sequence
-                seqid = np.fromfile(self._fsrc, dtype=np.uint16, count=1)[0]
+                seqid = np.fromfile(self._state.fsrc, dtype=np.uint16, count=1)[0]
 
                 # {rewind} = byte * 2 (int16) -- move back 2 bytes, i.e. go
                 # back to before the beginning of the seqid
-                self._fsrc.seek(-2, 1)
+                self._state.fsrc.seek(-2, 1)
 
                 # if we come across a new sequence, we are at the end of the
                 # list so we should stop
@@ -906,7 +975,7 @@ class BrainwareSrcIO(BaseIO):
         # (data_obj) -- SpikeTrain list of unassigned spikes
         # these go in the first Unit since it is for unassigned spikes
         unassigned_spikes = self._read_by_id()
-        self._unit0.spiketrains.extend(unassigned_spikes)
+        self._state.unit0.spiketrains.extend(unassigned_spikes)
 
         # read a list of units and grab the second return value, which is the
         # SpikeTrains from this Segment (if we use the Unit we will get all the
@@ -921,7 +990,7 @@ class BrainwareSrcIO(BaseIO):
             else:
                 # if there are no spiketrains at all,
                 # create an empty spike train
-                trains = [[self._default_spiketrain.copy()]]
+                trains = [[self._state.default_spiketrain.copy()]]
         elif hasattr(trains[0], 'dtype'):
             #workaround for some broken files
             trains = [unassigned_spikes +
@@ -934,16 +1003,16 @@ class BrainwareSrcIO(BaseIO):
             trains = zip(*trains)
 
         # int32 -- SpikeTrain length in ms
-        spiketrainlen = pq.Quantity(np.fromfile(self._fsrc, dtype=np.int32,
+        spiketrainlen = pq.Quantity(np.fromfile(self._state.fsrc, dtype=np.int32,
                                     count=1)[0], units=pq.ms, copy=False)
 
         segments = []
         for train in trains:
             # create the Segment and add everything to it
-            segment = Segment(file_origin=self._file_origin,
+            segment = Segment(file_origin=self._state.file_origin,
                               **annotations)
             segment.spiketrains = train
-            self._blk.segments.append(segment)
+            self._state.blk.segments.append(segment)
             segments.append(segment)
 
             for itrain in train:
@@ -971,7 +1040,7 @@ class BrainwareSrcIO(BaseIO):
         """
 
         # uint8 --  number of electrode channels in the Segment
-        numchannels = np.fromfile(self._fsrc, dtype=np.uint8, count=1)[0]
+        numchannels = np.fromfile(self._state.fsrc, dtype=np.uint8, count=1)[0]
 
         # [list of sequences] -- individual Segments
         segments = self.__read_list()
@@ -982,7 +1051,7 @@ class BrainwareSrcIO(BaseIO):
         side = self.__read_str(1)
 
         # int16 -- number of comments
-        numelements = np.fromfile(self._fsrc, dtype=np.int16, count=1)[0]
+        numelements = np.fromfile(self._state.fsrc, dtype=np.int16, count=1)[0]
 
         # comment_obj * numelements -- comments about the Segments
         # we don't know which Segment specifically, though
@@ -991,9 +1060,9 @@ class BrainwareSrcIO(BaseIO):
 
         # create an empty RecordingChannel for each of the numchannels
         for i in range(numchannels):
-            chan = RecordingChannel(file_origin=self._file_origin,
+            chan = RecordingChannel(file_origin=self._state.file_origin,
                                     index=int(i), name='Chan'+str(int(i)))
-            self._rcg.recordingchannels.append(chan)
+            self._state.rcg.recordingchannels.append(chan)
 
         # store what side of the head we are dealing with
         for segment in segments:
@@ -1025,11 +1094,11 @@ class BrainwareSrcIO(BaseIO):
         segments = self.__read_segment_list_var()
 
         # uint16 -- the ID of the next sequence
-        seqid = np.fromfile(self._fsrc, dtype=np.uint16, count=1)[0]
+        seqid = np.fromfile(self._state.fsrc, dtype=np.uint16, count=1)[0]
 
         # {rewind} = byte * 2 (int16) -- move back 2 bytes, i.e. go back to
         # before the beginning of the seqid
-        self._fsrc.seek(-2, 1)
+        self._state.fsrc.seek(-2, 1)
 
         if seqid in self._ID_DICT:
             # if it is a valid seqid, read it and try to figure out where
@@ -1040,7 +1109,7 @@ class BrainwareSrcIO(BaseIO):
             self.__read_unit_list()
 
         # {skip} = byte * 2 (int16) -- skip 2 bytes
-        self._fsrc.seek(2, 1)
+        self._state.fsrc.seek(2, 1)
 
         return segments
 
@@ -1065,15 +1134,15 @@ class BrainwareSrcIO(BaseIO):
         segments = self.__read_segment_list_v8()
 
         # uint8
-        feature_type = np.fromfile(self._fsrc, dtype=np.uint8,
+        feature_type = np.fromfile(self._state.fsrc, dtype=np.uint8,
                                    count=1)[0]
 
         # uint8
-        go_by_closest_unit_center = np.fromfile(self._fsrc, dtype=np.bool8,
+        go_by_closest_unit_center = np.fromfile(self._state.fsrc, dtype=np.bool8,
                                                 count=1)[0]
 
         # uint8
-        include_unit_bounds = np.fromfile(self._fsrc, dtype=np.bool8,
+        include_unit_bounds = np.fromfile(self._state.fsrc, dtype=np.bool8,
                                           count=1)[0]
 
         # create a dictionary of the annotations
@@ -1104,7 +1173,7 @@ class BrainwareSrcIO(BaseIO):
         """
 
         # float32 -- DA conversion clock period in microsec
-        sampling_period = pq.Quantity(np.fromfile(self._fsrc,
+        sampling_period = pq.Quantity(np.fromfile(self._state.fsrc,
                                                   dtype=np.float32, count=1),
                                       units=pq.us, copy=False)[0]
 
@@ -1132,14 +1201,14 @@ class BrainwareSrcIO(BaseIO):
         """
 
         # float32 -- spike time stamp in ms since start of SpikeTrain
-        time = np.fromfile(self._fsrc, dtype=np.float32, count=1)
+        time = np.fromfile(self._state.fsrc, dtype=np.float32, count=1)
 
         # int8 * 40 -- spike shape -- use numpts for spike_var
-        waveform = np.fromfile(self._fsrc, dtype=np.int8,
+        waveform = np.fromfile(self._state.fsrc, dtype=np.int8,
                                count=numpts).reshape(1, 1, numpts)
 
         # uint8 -- point of return to noise
-        trig2 = np.fromfile(self._fsrc, dtype=np.uint8, count=1)
+        trig2 = np.fromfile(self._state.fsrc, dtype=np.uint8, count=1)
 
         return time, waveform, trig2
 
@@ -1160,13 +1229,13 @@ class BrainwareSrcIO(BaseIO):
         """
 
         # int32 -- spike time stamp in ms since start of SpikeTrain
-        time = np.fromfile(self._fsrc, dtype=np.int32, count=1) / 25.
+        time = np.fromfile(self._state.fsrc, dtype=np.int32, count=1) / 25.
         time = time.astype(np.float32)
 
         # int8 * 40 -- spike shape
         # This needs to be a 3D array, one for each channel.  BrainWare
         # only ever has a single channel per file.
-        waveform = np.fromfile(self._fsrc, dtype=np.int8,
+        waveform = np.fromfile(self._state.fsrc, dtype=np.int8,
                                count=40).reshape(1, 1, 40)
 
         # create a dummy trig2 value
@@ -1188,7 +1257,7 @@ class BrainwareSrcIO(BaseIO):
         """
 
         # uint8 -- number of points in spike shape
-        numpts = np.fromfile(self._fsrc, dtype=np.uint8, count=1)[0]
+        numpts = np.fromfile(self._state.fsrc, dtype=np.uint8, count=1)[0]
 
         # spike_fixed is the same as spike_var if you don't read the numpts
         # byte and set numpts = 40
@@ -1212,7 +1281,7 @@ class BrainwareSrcIO(BaseIO):
         """
 
         #int32 -- index of the analogsignalarray in corresponding .dam file
-        dama_index = np.fromfile(self._fsrc, dtype=np.int32,
+        dama_index = np.fromfile(self._state.fsrc, dtype=np.int32,
                                  count=1)[0]
 
         # spiketrain_timestamped -- this is based off a spiketrain_timestamped
@@ -1240,7 +1309,7 @@ class BrainwareSrcIO(BaseIO):
         """
 
         # float64 -- timeStamp (number of days since dec 30th 1899)
-        timestamp = np.fromfile(self._fsrc, dtype=np.double, count=1)[0]
+        timestamp = np.fromfile(self._state.fsrc, dtype=np.double, count=1)[0]
 
         # convert to datetime object
         timestamp = self._convert_timestamp(timestamp)
@@ -1277,13 +1346,13 @@ class BrainwareSrcIO(BaseIO):
         unit, trains = self.__read_unit_unsorted()
 
         # float32 * 18 -- Unit boundaries (IEEE 32-bit floats)
-        unit.annotations['boundaries'] = [np.fromfile(self._fsrc,
+        unit.annotations['boundaries'] = [np.fromfile(self._state.fsrc,
                                                       dtype=np.float32,
                                                       count=18)]
 
         # uint8 * 9 -- boolean values indicating elliptic feature boundary
         # dimensions
-        unit.annotations['elliptic'] = [np.fromfile(self._fsrc,
+        unit.annotations['elliptic'] = [np.fromfile(self._state.fsrc,
                                                     dtype=np.uint8,
                                                     count=9)]
 
@@ -1305,62 +1374,62 @@ class BrainwareSrcIO(BaseIO):
         maxunit = 1
 
         # int16 -- number of time slices
-        numelements = np.fromfile(self._fsrc, dtype=np.int16, count=1)[0]
+        numelements = np.fromfile(self._state.fsrc, dtype=np.int16, count=1)[0]
 
         # {sequence} * numelements1 -- the number of lists of Units to read
-        self._rcg.annotations['max_valid'] = []
+        self._state.rcg.annotations['max_valid'] = []
         for i in range(numelements):
 
             # {skip} = byte * 2 (int16) -- skip 2 bytes
-            self._fsrc.seek(2, 1)
+            self._state.fsrc.seek(2, 1)
 
             # double
-            max_valid = np.fromfile(self._fsrc, dtype=np.double, count=1)[0]
+            max_valid = np.fromfile(self._state.fsrc, dtype=np.double, count=1)[0]
 
             # int16 - the number of Units to read
-            numunits = np.fromfile(self._fsrc, dtype=np.int16, count=1)[0]
+            numunits = np.fromfile(self._state.fsrc, dtype=np.int16, count=1)[0]
 
             # update tha maximum Unit so far
             maxunit = max(maxunit, numunits + 1)
 
             # if there aren't enough Units, create them
             # remember we need to skip the UnassignedSpikes Unit
-            if numunits > len(self._rcg.units) + 1:
-                for ind1 in range(len(self._rcg.units), numunits + 1):
+            if numunits > len(self._state.rcg.units) + 1:
+                for ind1 in range(len(self._state.rcg.units), numunits + 1):
                     unit = Unit(name='unit%s' % ind1,
-                                file_origin=self._file_origin,
+                                file_origin=self._state.file_origin,
                                 elliptic=[], boundaries=[],
                                 timestamp=[], max_valid=[])
-                    self._rcg.units.append(unit)
+                    self._state.rcg.units.append(unit)
 
             # {Block} * numelements -- Units
             for ind1 in range(numunits):
                 # get the Unit with the given index
                 # remember we need to skip the UnassignedSpikes Unit
-                unit = self._rcg.units[ind1 + 1]
+                unit = self._state.rcg.units[ind1 + 1]
 
                 # {skip} = byte * 2 (int16) -- skip 2 bytes
-                self._fsrc.seek(2, 1)
+                self._state.fsrc.seek(2, 1)
 
                 # int16 -- a multiplier for the elliptic and boundaries
                 #          properties
-                numelements3 = np.fromfile(self._fsrc, dtype=np.int16,
+                numelements3 = np.fromfile(self._state.fsrc, dtype=np.int16,
                                            count=1)[0]
 
                 # uint8 * 10 * numelements3 -- boolean values indicating
                 # elliptic feature boundary dimensions
-                elliptic = np.fromfile(self._fsrc, dtype=np.uint8,
+                elliptic = np.fromfile(self._state.fsrc, dtype=np.uint8,
                                        count=10 * numelements3)
 
                 # float32 * 20 * numelements3 -- feature boundaries
-                boundaries = np.fromfile(self._fsrc, dtype=np.float32,
+                boundaries = np.fromfile(self._state.fsrc, dtype=np.float32,
                                          count=20 * numelements3)
 
                 unit.annotations['elliptic'].append(elliptic)
                 unit.annotations['boundaries'].append(boundaries)
                 unit.annotations['max_valid'].append(max_valid)
 
-        return self._rcg.units[1:maxunit]
+        return self._state.rcg.units[1:maxunit]
 
     def __read_unit_list_timestamped(self):
         """
@@ -1378,7 +1447,7 @@ class BrainwareSrcIO(BaseIO):
         """
 
         # double -- time zero (number of days since dec 30th 1899)
-        timestamp = np.fromfile(self._fsrc, dtype=np.double, count=1)[0]
+        timestamp = np.fromfile(self._state.fsrc, dtype=np.double, count=1)[0]
 
         # convert to to days since UNIX epoc time:
         timestamp = self._convert_timestamp(timestamp)
@@ -1419,11 +1488,11 @@ class BrainwareSrcIO(BaseIO):
 
         # bytes * 108 (float48 * 18) -- Unit boundaries (48-bit floating
         # point numbers are not supported so we skip them)
-        self._fsrc.seek(108, 1)
+        self._state.fsrc.seek(108, 1)
 
         # uint8 * 9 -- boolean values indicating elliptic feature boundary
         # dimensions
-        unit.annotations['elliptic'] = np.fromfile(self._fsrc, dtype=np.uint8,
+        unit.annotations['elliptic'] = np.fromfile(self._state.fsrc, dtype=np.uint8,
                                                    count=9).tolist()
 
         return unit, trains
@@ -1447,10 +1516,10 @@ class BrainwareSrcIO(BaseIO):
         """
 
         # {skip} = bytes * 2 (uint16) -- skip two bytes
-        self._fsrc.seek(2, 1)
+        self._state.fsrc.seek(2, 1)
 
         # uint16 -- number of characters in next string
-        numchars = np.asscalar(np.fromfile(self._fsrc,
+        numchars = np.asscalar(np.fromfile(self._state.fsrc,
                                            dtype=np.uint16, count=1))
 
         # char * numchars -- ID string of Unit
@@ -1458,7 +1527,7 @@ class BrainwareSrcIO(BaseIO):
 
         # int32 -- SpikeTrain length in ms
         # int32 * 4 -- response and spon period boundaries
-        parts = np.fromfile(self._fsrc, dtype=np.int32, count=5)
+        parts = np.fromfile(self._state.fsrc, dtype=np.int32, count=5)
         t_stop = pq.Quantity(parts[0].astype('float32'),
                              units=pq.ms, copy=False)
         respwin = parts[1:]
@@ -1467,13 +1536,13 @@ class BrainwareSrcIO(BaseIO):
         spikeslists = self._read_by_id()
 
         # use the Unit if it already exists, otherwise create it
-        if name in self._unitdict:
-            unit = self._unitdict[name]
+        if name in self._state.unitdict:
+            unit = self._state.unitdict[name]
         else:
-            unit = Unit(name=name, file_origin=self._file_origin,
+            unit = Unit(name=name, file_origin=self._state.file_origin,
                         elliptic=[], boundaries=[], timestamp=[], max_valid=[])
-            self._rcg.units.append(unit)
-            self._unitdict[name] = unit
+            self._state.rcg.units.append(unit)
+            self._state.unitdict[name] = unit
 
         # convert the individual spikes to SpikeTrains and add them to the Unit
         trains = [self._combine_spiketrains(spikes) for spikes in spikeslists]
@@ -1500,7 +1569,7 @@ class BrainwareSrcIO(BaseIO):
         """
 
         # {skip} char * 34 -- display information
-        self._fsrc.seek(34, 1)
+        self._state.fsrc.seek(34, 1)
 
         return []
 
@@ -1522,7 +1591,7 @@ class BrainwareSrcIO(BaseIO):
         """
 
         # {skip} char * 4 -- display information
-        self._fsrc.seek(4, 1)
+        self._state.fsrc.seek(4, 1)
 
         return []
 
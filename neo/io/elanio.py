@@ -28,6 +28,8 @@ import numpy as np
 import quantities as pq
 
 from neo.io.baseio import BaseIO
+from neo.io.proxyobjects import RawArray, AnalogSignalProxy, EventArrayProxy
+from neo.io.selection import DataSelection
 from neo.core import Segment, AnalogSignal, EventArray
 
 
@@ -67,7 +69,9 @@ class ElanIO(BaseIO):
     writeable_objects  = [ ]
 
     has_header         = False
-    is_streameable     = False
+    is_streameable     = True
+    has_lazy_proxies   = True
+    supported_selection = ['channel_indexes', 'time_range']
 
     read_params        = { Segment : [ ] }
     write_params       = { Segment : [ ] }
@@ -89,7 +93,16 @@ class ElanIO(BaseIO):
         self.filename = filename
 
 
-    def read_segment(self, lazy = False, cascade = True):
+    def read_segment(self, lazy = False, cascade = True,
+                     channel_indexes = None, time_range = None):
+        """
+        Read the file, or the channels of :attr:`channel_indexes` between
+        the times of :attr:`time_range` (see :mod:`neo.io.selection`).
+        """
+        selection = DataSelection(channel_indexes=channel_indexes,
+                                  time_range=time_range)
+        # the selected part of the data is read through the proxies
+        use_proxies = lazy or not selection.selects_all
 
         ## Read header file
 
@@ -198,25 +211,39 @@ class ElanIO(BaseIO):
 
         #raw data
         n = int(round(np.log(max_logic[0]-min_logic[0])/np.log(2))/8)
-        data = np.fromfile(self.filename,dtype = 'i'+str(n) )
-        data = data.byteswap().reshape( (data.size/(nbchannel+2) ,nbchannel+2) ).astype('f4')
-        for c in range(nbchannel) :
-            if lazy:
-                sig = [ ]
-            else:
-                sig = (data[:,c]-min_logic[c])/(max_logic[c]-min_logic[c])*\
-                                    (max_physic[c]-min_physic[c])+min_physic[c]
-
+        if use_proxies:
+            # the samples are read only when the proxies are loaded, the
+            # file is big endian
+            gain = [(max_physic[c]-min_physic[c])/(max_logic[c]-min_logic[c])
+                    for c in range(nbchannel+2)]
+            offset = [min_physic[c]-min_logic[c]*gain[c]
+                      for c in range(nbchannel+2)]
+            raw = RawArray(self.filename, '>i'+str(n),
+                           (os.path.getsize(self.filename)//n//(nbchannel+2),
+                            nbchannel+2), gain=gain, offset=offset)
+        else:
+            data = np.fromfile(self.filename,dtype = 'i'+str(n) )
+            data = data.byteswap().reshape( (data.size//(nbchannel+2) ,nbchannel+2) ).astype('f4')
+        for c in selection.channels(range(nbchannel)) :
             try:
                 unit = pq.Quantity(1, units[c] )
             except:
                 unit = pq.Quantity(1, '' )
 
+            if use_proxies:
+                proxy = AnalogSignalProxy(raw, units=unit.units,
+                                          sampling_rate=sampling_rate,
+                                          t_start=0. * pq.s, columns=[c],
+                                          name=labels[c],
+                                          channel_name=labels[c])
+                seg.analogsignals.append(selection.read(proxy, lazy))
+                continue
+
+            sig = (data[:,c]-min_logic[c])/(max_logic[c]-min_logic[c])*\
+                                (max_physic[c]-min_physic[c])+min_physic[c]
             anaSig = AnalogSignal(sig * unit, sampling_rate=sampling_rate,
                                   t_start=0. * pq.s, name=labels[c],
                                   channel_index=c)
-            if lazy:
-                anaSig.lazy_shape = data.shape[0]
             anaSig.annotate(channel_name= labels[c])
             seg.analogsignals.append( anaSig )
 
@@ -230,20 +257,19 @@ class ElanIO(BaseIO):
             times.append( float(r[0][0])/sampling_rate.magnitude )
             labels.append(str(r[0][1]) )
             reject_codes.append( str(r[0][2]) )
-        if lazy:
-            times = [ ]*pq.S
-            labels = np.array([ ], dtype = 'S')
-            reject_codes = [ ]
+        if use_proxies:
+            # the triggers are in the text file, already read
+            ea = selection.read(EventArrayProxy(
+                np.array(times), units=pq.s, labels=np.array(labels),
+                reject_codes=np.array(reject_codes)), lazy)
         else:
             times =  np.array(times) * pq.s
             labels  = np.array(labels)
             reject_codes = np.array(reject_codes)
-        ea = EventArray( times = times,
-                                    labels  = labels,
-                                    reject_codes = reject_codes,
-                                    )
-        if lazy:
-            ea.lazy_shape = len(times)
+            ea = EventArray( times = times,
+                                        labels  = labels,
+                                        reject_codes = reject_codes,
+                                        )
         seg.eventarrays.append(ea)
 
 
@@ -81,6 +81,7 @@ from fractions import gcd
 from os import path
 import re
 import struct
+import threading
 from time import time
 
 # note neo.core needs only numpy and quantities
@@ -93,6 +94,7 @@ from neo.io.baseio import BaseIO
 # to import from core
 from neo.core import (Block, Segment, RecordingChannelGroup, RecordingChannel,
                       AnalogSignal, AnalogSignalArray, EventArray, SpikeTrain)
+from neo.core.streaming import map_threads
 
 # --------------------------------------------------------
 # OBJECTS
@@ -1675,6 +1677,9 @@ class ElphyLayout(object):
         self.blocks = list()
         self.info_block = None
         self.data_blocks = None
+        # the file position is shared by the threads reading
+        # channels, so each seek is kept with its read
+        self.file_lock = threading.Lock()
     
     @property
     def file(self):
@@ -1826,8 +1831,9 @@ class ElphyLayout(object):
         # a size greater than zero
         blocks = [k for k in data_blocks if k.size > 0]
         for data_block in blocks :
-            self.file.seek(data_block.start)
-            raw = self.file.read(data_block.size)[0:expected_size]
+            with self.file_lock :
+                self.file.seek(data_block.start)
+                raw = self.file.read(data_block.size)[0:expected_size]
             databytes = np.frombuffer(raw, dtype=dtype)
             chunks.append(databytes)
         # concatenate all chunks and return
@@ -3738,7 +3744,8 @@ class ElphyIO(BaseIO):
     def read_block(self,
                    # the 2 first key arguments are imposed by neo.io API
                    lazy = False,
-                   cascade = True
+                   cascade = True,
+                   num_threads = 1
                    ):
         """
         Return :class:`Block` filled or not depending on 'cascade' parameter.
@@ -3746,6 +3753,7 @@ class ElphyIO(BaseIO):
         Parameters:
              lazy : postpone actual reading of the file.
              cascade : normally you want this True, otherwise method will only ready Block label.
+             num_threads : number of threads decoding the analog channels of each episode.
         """
         # basic
         block = Block(name=None)
@@ -3769,7 +3777,7 @@ class ElphyIO(BaseIO):
                 print("File '%s' appears to have no episodes" % (self.filename))
                 return block
             for episode in range(1, self.elphy_file.n_episodes+1) :
-                segment = self.read_segment(episode)
+                segment = self.read_segment(episode, num_threads=num_threads)
                 segment.block = block
                 block.segments.append(segment)
         # close file
@@ -4146,12 +4154,13 @@ class ElphyIO(BaseIO):
 
 
 
-    def read_segment( self, episode ):
+    def read_segment( self, episode, num_threads=1 ):
         """
         Internal method used to return :class:`Segment` data to the main read method.
         Parameters:
             elphy_file : is the elphy object.
             episode : number of elphy episode, roughly corresponding to a segment
+            num_threads : number of threads decoding the analog channels.
         """
         #print "name:",self.elphy_file.layout.get_episode_name(episode)
         episode_name = self.elphy_file.layout.get_episode_name(episode)
@@ -4159,10 +4168,14 @@ class ElphyIO(BaseIO):
         segment = Segment( name=name )
         # create an analog signal for
         # each channel in the episode
-        for channel in range(1, self.elphy_file.n_channels(episode)+1) :
-            signal = self.elphy_file.get_signal(episode, channel)
+        channels = range(1, self.elphy_file.n_channels(episode)+1)
+        signals = [self.elphy_file.get_signal(episode, channel) for channel in channels]
+        # the channels are decoded concurrently, only the reads of
+        # the file are serialized (see ElphyLayout.load_bytes)
+        data = map_threads(lambda signal: signal.data['y'], signals, num_threads)
+        for channel, signal, y_data in zip(channels, signals, data) :
             analog_signal = AnalogSignal(
-                signal.data['y'],
+                y_data,
                 units = signal.y_unit,
                 t_start = signal.t_start * getattr(pq, signal.x_unit.strip()),
                 t_stop = signal.t_stop * getattr(pq, signal.x_unit.strip()),
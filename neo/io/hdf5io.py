@@ -215,8 +215,10 @@ else:
         HAVE_TABLES = True
         TABLES_ERR = None
 
-from neo.core import Block, objectlist, objectnames, class_by_name
+from neo.core import Block, Segment, objectlist, objectnames, class_by_name
+from neo.core.envelope import EnvelopePyramid
 from neo.io.baseio import BaseIO
+from neo.io.summary import FileSummary
 from neo.io.tools import LazyList
 
 logger = logging.getLogger("Neo")
@@ -436,12 +438,32 @@ class NeoHdf5IO(BaseIO):
             for par_cont in obj._single_parent_containers:
                 node._f_setAttr(par_cont, '')
         # we checked already obj is compliant, loop over all safely
-        for attr in obj._all_attrs:
+        attrs = obj._all_attrs
+        if getattr(obj, 'is_categorical', False):
+            # store label codes and the label table instead of the labels
+            attrs = tuple(attr for attr in attrs if attr[0] != 'labels')
+            attrs += obj._categorical_attrs
+        for attr in getattr(obj, '_categorical_attrs', ()):
+            if attr not in attrs:
+                try:
+                    self._data.removeNode(path, attr[0])
+                except tb.NoSuchNodeError:
+                    pass  # labels were not categorical before either
+        for attr in attrs:
             if hasattr(obj, attr[0]): # save an attribute if exists
                 assign_attribute(getattr(obj, attr[0]), attr[0], path, node)
             # not forget to save AS, ASA or ST - NEO "stars"
         if hasattr(obj, '_quantity_attr'):
             assign_attribute(obj, obj._quantity_attr, path, node)
+        if getattr(obj, 'envelope', None) is not None and not lazy:
+            # min/max envelope pyramid of AS or ASA, see EnvelopePyramid
+            try:
+                self._data.removeNode(path, 'envelope', recursive=True)
+            except tb.NoSuchNodeError:
+                pass  # no envelope saved yet
+            env = self._data.createGroup(node, 'envelope')
+            for name, arr in obj.envelope.to_arrays().items():
+                self._data.createArray(env, name, arr)
         if hasattr(obj, "annotations"): # annotations should be just a dict
             node._f_setAttr("annotations", getattr(obj, "annotations"))
         node._f_setAttr("object_ref", uuid.uuid4().hex)
@@ -711,6 +733,10 @@ class NeoHdf5IO(BaseIO):
             kwargs = {}
             # load attributes (inherited *-ed attrs are also here)
             attrs = classname._necessary_attrs + classname._recommended_attrs
+            if 'label_codes' in node:
+                # categorical labels, see EventArray
+                attrs = tuple(attr for attr in attrs if attr[0] != 'labels')
+                attrs += classname._categorical_attrs
             for i, attr in enumerate(attrs):
                 attr_name = attr[0]
                 nattr = fetch_attribute(attr_name, attr, node)
@@ -719,6 +745,11 @@ class NeoHdf5IO(BaseIO):
             obj = class_by_name[obj_type](**kwargs)  # instantiate new object
             if lazy and obj_type in lazy_shape_arrays:
                 obj.lazy_shape = get_lazy_shape(obj, node)
+            if not lazy and 'envelope' in node:
+                env = self._data.getNode(node, 'envelope')
+                obj.envelope = EnvelopePyramid.from_arrays(
+                    dict((arr._v_name, arr.read())
+                         for arr in self._data.iterNodes(env)))
             self._update_path(obj, node)  # set up HDF attributes: name, path
             try:
                 setattr(obj, "annotations", node._f_getAttr("annotations"))
@@ -779,6 +810,22 @@ class NeoHdf5IO(BaseIO):
                 blocks.append(self.read_block(n._v_pathname, lazy=lazy, cascade=cascade, **kargs))
         return blocks
 
+    @_func_wrapper
+    def describe(self, **kargs):
+        """
+        Summary of the Segments of the blocks attached to the root, read
+        from the attributes of their nodes and the shapes of their arrays.
+        """
+        summary = FileSummary.from_file(self.filename)
+        for n in self._data.iterNodes(self._data.root):
+            if self._get_class_by_node(n) != Block:
+                continue
+            container = self._data.getNode(n, 'segments')
+            for seg in self._data.iterNodes(container):
+                if self._get_class_by_node(seg) == Segment:
+                    summary.add_segment(self.get(seg._v_pathname, lazy=True))
+        return summary
+
     @_func_wrapper
     def write_all_blocks(self, blocks, **kargs):
         """
@@ -25,6 +25,9 @@ import numpy as np
 import quantities as pq
 
 from neo.io.baseio import BaseIO
+from neo.io.proxyobjects import (RawArray, AnalogSignalProxy, EventArrayProxy,
+                                 EpochArrayProxy)
+from neo.io.selection import DataSelection
 from neo.core import Segment, AnalogSignal, EpochArray, EventArray
 
 
@@ -53,7 +56,9 @@ class MicromedIO(BaseIO):
     writeable_objects    = [ ]
 
     has_header         = False
-    is_streameable     = False
+    is_streameable     = True
+    has_lazy_proxies   = True
+    supported_selection = ['channel_indexes', 'time_range']
     read_params        = { Segment : [ ] }
     write_params       = None
 
@@ -73,10 +78,17 @@ class MicromedIO(BaseIO):
         self.filename = filename
 
 
-    def read_segment(self, cascade = True, lazy = False,):
+    def read_segment(self, cascade = True, lazy = False,
+                     channel_indexes = None, time_range = None):
         """
         Arguments:
+            channel_indexes : the channels to read (all by default)
+            time_range : (t_start, t_stop) of the data to read (all by default)
         """
+        selection = DataSelection(channel_indexes=channel_indexes,
+                                  time_range=time_range)
+        # the selected part of the data is read through the proxies
+        use_proxies = lazy or not selection.selects_all
         f = struct_file(self.filename, 'rb')
 
         #Name
@@ -125,10 +137,21 @@ class MicromedIO(BaseIO):
             #~ print zname2, pos, length
 
         # reading raw data
-        if not lazy:
+        if not use_proxies:
             f.seek(Data_Start_Offset,0)
             rawdata = np.fromstring(f.read() , dtype = 'u'+str(Bytes))
-            rawdata = rawdata.reshape(( rawdata.size/Num_Chan , Num_Chan))
+            rawdata = rawdata.reshape(( rawdata.size//Num_Chan , Num_Chan))
+            n_samples = rawdata.shape[0]
+        else:
+            # the samples are read only when the proxies are loaded, the
+            # scaling of each channel is filled below
+            n_samples = (os.path.getsize(self.filename) - Data_Start_Offset) \
+                // Bytes // Num_Chan
+            gain = np.ones(Num_Chan)
+            offset = np.zeros(Num_Chan)
+            raw = RawArray(self.filename, 'u'+str(Bytes),
+                           (n_samples, Num_Chan), byte_offset=Data_Start_Offset,
+                           gain=gain, offset=offset)
 
         # Reading Code Info
         zname2, pos, length = zones['ORDER']
@@ -137,6 +160,7 @@ class MicromedIO(BaseIO):
 
         units = {-1: pq.nano*pq.V, 0:pq.uV, 1:pq.mV, 2:1, 100: pq.percent,  101:pq.dimensionless, 102:pq.dimensionless}
 
+        sampling_rates = [ ]
         for c in range(Num_Chan):
             zname2, pos, length = zones['LABCOD']
             f.seek(pos+code[c]*128+2,0)
@@ -153,37 +177,48 @@ class MicromedIO(BaseIO):
             f.seek(8,1)
             sampling_rate, = f.read_f('H') * pq.Hz
             sampling_rate *= Rate_Min
-
-            if lazy:
-                signal = [ ]*unit
-            else:
-                factor = float(physical_max - physical_min) / float(logical_max-logical_min+1)
-                signal = ( rawdata[:,c].astype('f') - logical_ground )* factor*unit
-
+            sampling_rates.append(sampling_rate)
+            if not selection.keep_channel(c):
+                continue
+
+            factor = float(physical_max - physical_min) / float(logical_max-logical_min+1)
+            if use_proxies:
+                gain[c] = factor
+                offset[c] = -logical_ground * factor
+                proxy = AnalogSignalProxy(raw, units=getattr(unit, 'units', pq.dimensionless),
+                                          sampling_rate=sampling_rate,
+                                          columns=[c], name=label,
+                                          ground=ground)
+                seg.analogsignals.append(selection.read(proxy, lazy))
+                continue
+
+            signal = ( rawdata[:,c].astype('f') - logical_ground )* factor*unit
             anaSig = AnalogSignal(signal, sampling_rate=sampling_rate,
                                   name=label, channel_index=c)
-            if lazy:
-                anaSig.lazy_shape = None
             anaSig.annotate(ground = ground)
 
             seg.analogsignals.append( anaSig )
 
 
-        sampling_rate = np.mean([ anaSig.sampling_rate for anaSig in seg.analogsignals ])*pq.Hz
+        sampling_rate = np.mean(sampling_rates)*pq.Hz
 
         # Read trigger and notes
         for zname, label_dtype in [ ('TRIGGER', 'u2'), ('NOTE', 'S40') ]:
             zname2, pos, length = zones[zname]
             f.seek(pos,0)
             triggers = np.fromstring(f.read(length) , dtype = [('pos','u4'), ('label', label_dtype)] ,  )
-            ea = EventArray(name =zname[0]+zname[1:].lower())
-            if not lazy:
-                keep = (triggers['pos']>=triggers['pos'][0]) & (triggers['pos']<rawdata.shape[0]) & (triggers['pos']!=0)
-                triggers = triggers[keep]
+            keep = (triggers['pos']>=triggers['pos'][0]) & (triggers['pos']<n_samples) & (triggers['pos']!=0)
+            triggers = triggers[keep]
+            if use_proxies:
+                # the triggers are in the header, already read
+                ea = selection.read(EventArrayProxy(
+                    (triggers['pos']/sampling_rate).rescale('s').magnitude,
+                    units=pq.s, labels=triggers['label'].astype('S'),
+                    name=zname[0]+zname[1:].lower()), lazy)
+            else:
+                ea = EventArray(name =zname[0]+zname[1:].lower())
                 ea.labels = triggers['label'].astype('S')
                 ea.times = (triggers['pos']/sampling_rate).rescale('s')
-            else:
-                ea.lazy_shape = triggers.size
             seg.eventarrays.append(ea)
         
         # Read Event A and B
@@ -193,15 +228,21 @@ class MicromedIO(BaseIO):
             f.seek(pos,0)
             epochs = np.fromstring(f.read(length) , 
                             dtype = [('label','u4'),('start','u4'),('stop','u4'),]  )
-            ep = EpochArray(name =zname[0]+zname[1:].lower())
-            if not lazy:
-                keep = (epochs['start']>0) & (epochs['start']<rawdata.shape[0]) & (epochs['stop']<rawdata.shape[0])
-                epochs = epochs[keep]
+            keep = (epochs['start']>0) & (epochs['start']<n_samples) & (epochs['stop']<n_samples)
+            epochs = epochs[keep]
+            if use_proxies:
+                # the epochs are in the header, already read
+                ep = selection.read(EpochArrayProxy(
+                    (epochs['start']/sampling_rate).rescale('s').magnitude,
+                    units=pq.s,
+                    durations=((epochs['stop'] - epochs['start'])/sampling_rate).rescale('s').magnitude,
+                    labels=epochs['label'].astype('S'),
+                    name=zname[0]+zname[1:].lower()), lazy)
+            else:
+                ep = EpochArray(name =zname[0]+zname[1:].lower())
                 ep.labels = epochs['label'].astype('S')
                 ep.times = (epochs['start']/sampling_rate).rescale('s')
                 ep.durations = ((epochs['stop'] - epochs['start'])/sampling_rate).rescale('s')
-            else:
-                ep.lazy_shape = triggers.size
             seg.epocharrays.append(ep)
         
         
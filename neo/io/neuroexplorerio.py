@@ -21,6 +21,10 @@ import numpy as np
 import quantities as pq
 
 from neo.io.baseio import BaseIO
+from neo.io.proxyobjects import (RawArray, AnalogSignalProxy, SpikeTrainProxy,
+                                 EventArrayProxy, EpochArrayProxy)
+from neo.io.selection import DataSelection
+from neo.io.resources import resource_pool
 from neo.core import Segment, AnalogSignal, SpikeTrain, EpochArray, EventArray
 
 
@@ -52,6 +56,8 @@ class NeuroExplorerIO(BaseIO):
 
     has_header         = False
     is_streameable     = False
+    has_lazy_proxies   = True
+    supported_selection = ['channel_indexes', 'time_range']
 
     # This is for GUI stuf : a definition for parameters when reading.
     read_params        = {
@@ -81,8 +87,18 @@ class NeuroExplorerIO(BaseIO):
     def read_segment(self,
                                         lazy = False,
                                         cascade = True,
+                                        channel_indexes = None,
+                                        time_range = None,
                                         ):
-
+        """
+        Read the file, or the channels of :attr:`channel_indexes` between
+        the times of :attr:`time_range` (see :mod:`neo.io.selection`).
+        Events and intervals have no channel and are always read.
+        """
+        selection = DataSelection(channel_indexes=channel_indexes,
+                                  time_range=time_range)
+        # the selected part of the data is read through the proxies
+        use_proxies = lazy or not selection.selects_all
 
         fid = open(self.filename, 'rb')
         globalHeader = HeaderReader(fid , GlobalHeader ).read_f(offset = 0)
@@ -94,21 +110,36 @@ class NeuroExplorerIO(BaseIO):
         seg.annotate(comment = globalHeader['comment'])
 
         if not cascade :
+            fid.close()
             return seg
 
         offset = 544
         for i in range(globalHeader['nvar']):
             entityHeader = HeaderReader(fid , EntityHeader ).read_f(offset = offset+i*208)
             entityHeader['name'] = entityHeader['name'].replace('\x00','')
+            if (entityHeader['type'] in (0, 3, 5, 6) and
+                    not selection.keep_channel(entityHeader['WireNumber'])):
+                continue
 
             #print 'i',i, entityHeader['type']
 
+            # timestamps, read only when the proxies are loaded
+            times = RawArray(self.filename, 'i4', entityHeader['n'],
+                             byte_offset=entityHeader['offset'],
+                             gain=1. / globalHeader['freq'], scaled_dtype='f8')
+
             if entityHeader['type'] == 0:
                 # neuron
-                if lazy:
-                    spike_times = [ ]*pq.s
+                if use_proxies:
+                    proxy = SpikeTrainProxy(times, units=pq.s,
+                                            t_start=globalHeader['tbeg']/globalHeader['freq']*pq.s,
+                                            t_stop=globalHeader['tend']/globalHeader['freq']*pq.s,
+                                            name=entityHeader['name'],
+                                            channel_index=entityHeader['WireNumber'])
+                    seg.spiketrains.append(selection.read(proxy, lazy))
+                    continue
                 else:
-                    spike_times= np.memmap(self.filename , np.dtype('i4') ,'r' ,
+                    spike_times= resource_pool.memmap(self.filename , np.dtype('i4') ,'r' ,
                                                     shape = (entityHeader['n'] ),
                                                     offset = entityHeader['offset'],
                                                     )
@@ -118,39 +149,47 @@ class NeuroExplorerIO(BaseIO):
                                                     t_stop = globalHeader['tend']/globalHeader['freq']*pq.s,
                                                     name = entityHeader['name'],
                                                     )
-                if lazy:
-                    sptr.lazy_shape = entityHeader['n']
                 sptr.annotate(channel_index = entityHeader['WireNumber'])
                 seg.spiketrains.append(sptr)
 
             if entityHeader['type'] == 1:
                 # event
-                if lazy:
-                    event_times = [ ]*pq.s
+                if use_proxies:
+                    proxy = EventArrayProxy(times, units=pq.s,
+                                            channel_name=entityHeader['name'])
+                    seg.eventarrays.append(selection.read(proxy, lazy))
+                    continue
                 else:
-                    event_times= np.memmap(self.filename , np.dtype('i4') ,'r' ,
+                    event_times= resource_pool.memmap(self.filename , np.dtype('i4') ,'r' ,
                                                     shape = (entityHeader['n'] ),
                                                     offset = entityHeader['offset'],
                                                     )
                     event_times = event_times.astype('f8')/globalHeader['freq'] * pq.s
                 labels = np.array(['']*event_times.size, dtype = 'S')
                 evar = EventArray(times = event_times, labels=labels, channel_name = entityHeader['name'] )
-                if lazy:
-                    evar.lazy_shape = entityHeader['n']
                 seg.eventarrays.append(evar)
 
             if entityHeader['type'] == 2:
                 # interval
-                if lazy:
-                    start_times = [ ]*pq.s
-                    stop_times = [ ]*pq.s
+                if use_proxies:
+                    stop_times = RawArray(self.filename, 'i4',
+                                          entityHeader['n'],
+                                          byte_offset=entityHeader['offset'] +
+                                          entityHeader['n']*4,
+                                          gain=1. / globalHeader['freq'],
+                                          scaled_dtype='f8')
+                    proxy = EpochArrayProxy(times, units=pq.s,
+                                            stop_times=stop_times,
+                                            channel_name=entityHeader['name'])
+                    seg.epocharrays.append(selection.read(proxy, lazy))
+                    continue
                 else:
-                    start_times= np.memmap(self.filename , np.dtype('i4') ,'r' ,
+                    start_times= resource_pool.memmap(self.filename , np.dtype('i4') ,'r' ,
                                                     shape = (entityHeader['n'] ),
                                                     offset = entityHeader['offset'],
                                                     )
                     start_times = start_times.astype('f8')/globalHeader['freq']*pq.s
-                    stop_times= np.memmap(self.filename , np.dtype('i4') ,'r' ,
+                    stop_times= resource_pool.memmap(self.filename , np.dtype('i4') ,'r' ,
                                                     shape = (entityHeader['n'] ),
                                                     offset = entityHeader['offset']+entityHeader['n']*4,
                                                     )
@@ -159,24 +198,42 @@ class NeuroExplorerIO(BaseIO):
                                   durations =  stop_times - start_times,
                                   labels = np.array(['']*start_times.size, dtype = 'S'),
                                   channel_name = entityHeader['name'])
-                if lazy:
-                    epar.lazy_shape = entityHeader['n']
                 seg.epocharrays.append(epar)
 
             if entityHeader['type'] == 3:
                 # spiketrain and wavefoms
-                if lazy:
-                    spike_times = [ ]*pq.s
-                    waveforms = None
+                if use_proxies:
+                    waveforms = RawArray(self.filename, 'i2',
+                                         (entityHeader['n'], 1,
+                                          entityHeader['NPointsWave']),
+                                         byte_offset=entityHeader['offset'] +
+                                         entityHeader['n']*4,
+                                         gain=entityHeader['ADtoMV'],
+                                         offset=entityHeader['MVOffset'])
+                    t_stop = globalHeader['tend']/globalHeader['freq']*pq.s
+                    if entityHeader['n'] > 0:
+                        # only the last spike time is read
+                        t_stop = max(t_stop, times.read(-1) * pq.s)
+                    proxy = SpikeTrainProxy(times, units=pq.s,
+                                            t_start=globalHeader['tbeg']/globalHeader['freq']*pq.s,
+                                            t_stop=t_stop,
+                                            name=entityHeader['name'],
+                                            waveforms=waveforms,
+                                            waveform_units=pq.mV,
+                                            sampling_rate=entityHeader['WFrequency']*pq.Hz,
+                                            left_sweep=0*pq.ms,
+                                            channel_index=entityHeader['WireNumber'])
+                    seg.spiketrains.append(selection.read(proxy, lazy))
+                    continue
                 else:
 
-                    spike_times= np.memmap(self.filename , np.dtype('i4') ,'r' ,
+                    spike_times= resource_pool.memmap(self.filename , np.dtype('i4') ,'r' ,
                                                     shape = (entityHeader['n'] ),
                                                     offset = entityHeader['offset'],
                                                     )
                     spike_times = spike_times.astype('f8')/globalHeader['freq'] * pq.s
 
-                    waveforms = np.memmap(self.filename , np.dtype('i2') ,'r' ,
+                    waveforms = resource_pool.memmap(self.filename , np.dtype('i2') ,'r' ,
                                                 shape = (entityHeader['n'] ,  1,entityHeader['NPointsWave']),
                                                 offset = entityHeader['offset']+entityHeader['n'] *4,
                                                 )
@@ -193,8 +250,6 @@ class NeuroExplorerIO(BaseIO):
                                                 sampling_rate = entityHeader['WFrequency']*pq.Hz,
                                                 left_sweep = 0*pq.ms,
                                                 )
-                if lazy:
-                    sptr.lazy_shape = entityHeader['n']
                 sptr.annotate(channel_index = entityHeader['WireNumber'])
                 seg.spiketrains.append(sptr)
 
@@ -206,12 +261,12 @@ class NeuroExplorerIO(BaseIO):
                 # analog
 
 
-                timestamps= np.memmap(self.filename , np.dtype('i4') ,'r' ,
+                timestamps= resource_pool.memmap(self.filename , np.dtype('i4') ,'r' ,
                                                         shape = (entityHeader['n'] ),
                                                         offset = entityHeader['offset'],
                                                         )
                 timestamps = timestamps.astype('f8')/globalHeader['freq']
-                fragmentStarts = np.memmap(self.filename , np.dtype('i4') ,'r' ,
+                fragmentStarts = resource_pool.memmap(self.filename , np.dtype('i4') ,'r' ,
                                                         shape = (entityHeader['n'] ),
                                                         offset = entityHeader['offset'],
                                                         )
@@ -219,10 +274,23 @@ class NeuroExplorerIO(BaseIO):
                 t_start =  timestamps[0] - fragmentStarts[0]/float(entityHeader['WFrequency'])
                 del timestamps, fragmentStarts
 
-                if lazy :
-                    signal = [ ]*pq.mV
+                if use_proxies:
+                    raw = RawArray(self.filename, 'i2',
+                                   entityHeader['NPointsWave'],
+                                   byte_offset=entityHeader['offset'],
+                                   gain=entityHeader['ADtoMV'],
+                                   offset=entityHeader['MVOffset'])
+                    proxy = AnalogSignalProxy(raw, units=pq.mV,
+                                              t_start=t_start * pq.s,
+                                              sampling_rate=
+                                              entityHeader['WFrequency'] * pq.Hz,
+                                              channel_indexes=
+                                              [entityHeader['WireNumber']],
+                                              name=entityHeader['name'])
+                    seg.analogsignals.append(selection.read(proxy, lazy))
+                    continue
                 else:
-                    signal = np.memmap(self.filename , np.dtype('i2') ,'r' ,
+                    signal = resource_pool.memmap(self.filename , np.dtype('i2') ,'r' ,
                                                             shape = (entityHeader['NPointsWave'] ),
                                                             offset = entityHeader['offset'],
                                                             )
@@ -236,25 +304,33 @@ class NeuroExplorerIO(BaseIO):
                                       entityHeader['WFrequency'] * pq.Hz,
                                       name=entityHeader['name'],
                                       channel_index=entityHeader['WireNumber'])
-                if lazy:
-                    anaSig.lazy_shape = entityHeader['NPointsWave']
                 seg.analogsignals.append( anaSig )
 
             if entityHeader['type'] == 6:
                 # markers  : TO TEST
-                if lazy:
-                    times = [ ]*pq.s
-                    labels = np.array([ ], dtype = 'S')
-                    markertype = None
+                if use_proxies:
+                    fid.seek(entityHeader['offset'] + entityHeader['n']*4)
+                    markertype = fid.read(64).replace('\x00','')
+                    labels = RawArray(self.filename,
+                                      'S' + str(entityHeader['MarkerLength']),
+                                      entityHeader['n'],
+                                      byte_offset=entityHeader['offset'] +
+                                      entityHeader['n']*4 + 64)
+                    proxy = EventArrayProxy(times, units=pq.s, labels=labels,
+                                            name=entityHeader['name'],
+                                            channel_index=entityHeader['WireNumber'],
+                                            marker_type=markertype)
+                    seg.eventarrays.append(selection.read(proxy, lazy))
+                    continue
                 else:
-                    times= np.memmap(self.filename , np.dtype('i4') ,'r' ,
+                    times= resource_pool.memmap(self.filename , np.dtype('i4') ,'r' ,
                                                     shape = (entityHeader['n'] ),
                                                     offset = entityHeader['offset'],
                                                     )
                     times = times.astype('f8')/globalHeader['freq'] * pq.s
                     fid.seek(entityHeader['offset'] + entityHeader['n']*4)
                     markertype = fid.read(64).replace('\x00','')
-                    labels = np.memmap(self.filename, np.dtype('S' + str(entityHeader['MarkerLength'])) ,'r',
+                    labels = resource_pool.memmap(self.filename, np.dtype('S' + str(entityHeader['MarkerLength'])) ,'r',
                                                     shape = (entityHeader['n'] ),
                                                     offset = entityHeader['offset'] + entityHeader['n']*4 + 64
                                                     )
@@ -264,11 +340,9 @@ class NeuroExplorerIO(BaseIO):
                                             channel_index = entityHeader['WireNumber'],
                                             marker_type = markertype
                                             )
-                if lazy:
-                    ea.lazy_shape = entityHeader['n']
                 seg.eventarrays.append(ea)
 
-
+        fid.close()
         seg.create_many_to_one_relationship()
         return seg
 
@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+"""
+Reading of many files in parallel.
+
+:func:`read_many` reads a list of files with a pool of worker processes,
+each file with the IO guessed from its extension by :func:`neo.io.get_io`
+(or with a given IO class)::
+
+    >>> results = read_many(filenames, workers=8, lazy=True,
+    ...                     channel_indexes=[0, 1])
+    >>> for result in results:
+    ...     if result.error is not None:
+    ...         print(result.filename, result.error)
+    ...         continue
+    ...     blk = result.blocks[0]
+
+The Blocks are sent back to the calling process by pickling, with the
+relationships between their objects and the ``lazy_shape`` and
+``lazy_proxy`` attributes of lazy objects, which the pickling of the data
+objects does not keep, restored on arrival.
+
+With pickle protocol 5 (Python 3.8), the arrays of the signals and spike
+trains are pickled out-of-band into a block of shared memory, which the
+arrays of the calling process view: only the small in-band part of the
+pickle goes through the pipe of the pool, and the data are not copied on
+arrival.  The block is freed once these arrays are deleted.  Otherwise the
+Blocks are pickled in-band.
+"""
+
+# needed for python 3 compatibility
+from __future__ import absolute_import, division, print_function
+
+from collections import namedtuple
+import multiprocessing
+import traceback
+import weakref
+
+import numpy as np
+
+try:
+    import cPickle as pickle  # Python 2
+except ImportError:
+    import pickle  # Python 3
+
+try:
+    from multiprocessing import resource_tracker, shared_memory
+except ImportError:  # Python < 3.8
+    HAVE_OUT_OF_BAND = False
+else:
+    HAVE_OUT_OF_BAND = pickle.HIGHEST_PROTOCOL >= 5
+
+#: The result of the reading of one file by :func:`read_many`: its
+#: filename, the list of Blocks read (None if it failed) and the error
+#: message and traceback of the failure (None if it succeeded).
+ReadResult = namedtuple('ReadResult', ['filename', 'blocks', 'error'])
+
+# attributes of the data objects lost when they are pickled
+_lazy_attributes = ('lazy_shape', 'lazy_proxy')
+
+
+def _pack(blocks):
+    """
+    The lazy attributes of the data objects of :attr:`blocks`, in the order
+    of the objects, to send along with them.
+    """
+    return [[dict((attr, getattr(obj, attr)) for attr in _lazy_attributes
+                  if hasattr(obj, attr))
+             for obj in blk.data_children_recur]
+            for blk in blocks]
+
+
+def _unpack(blocks, lazy_attributes):
+    """
+    Restore the relationships of the objects of :attr:`blocks` and the
+    lazy attributes of their data objects after unpickling.
+    """
+    for blk, attributes in zip(blocks, lazy_attributes):
+        for obj, attrs in zip(blk.data_children_recur, attributes):
+            for attr, value in attrs.items():
+                setattr(obj, attr, value)
+        blk.create_many_to_one_relationship(force=True)
+
+
+def _dump(obj):
+    """
+    :attr:`obj` pickled, and the name of the block of shared memory holding
+    its out-of-band buffers and their sizes (None if they are in-band).
+    """
+    if not HAVE_OUT_OF_BAND:
+        return pickle.dumps(obj, pickle.HIGHEST_PROTOCOL), None
+    buffers = []
+    data = pickle.dumps(obj, 5, buffer_callback=buffers.append)
+    views = [buf.raw() for buf in buffers]
+    if not views:
+        return data, None
+    sizes = [view.nbytes for view in views]
+    # a block of shared memory cannot be empty
+    shm = shared_memory.SharedMemory(create=True, size=max(sum(sizes), 1))
+    try:
+        offset = 0
+        for view, size in zip(views, sizes):
+            shm.buf[offset:offset + size] = view
+            offset += size
+    except Exception:
+        shm.close()
+        shm.unlink()
+        raise
+    shm.close()
+    return data, (shm.name, sizes)
+
+
+class _SharedMemoryArray(object):
+    """
+    The bytes of a block of shared memory, exposed to numpy through the
+    array interface.  :func:`numpy.asarray` of it gives an array whose
+    views, whatever the version of numpy, keep this object alive: the block
+    is closed when it is deleted, after them.  No buffer of the block is
+    exported, so closing it cannot fail.
+    """
+
+    def __init__(self, shm):
+        view = np.frombuffer(shm.buf, dtype='u1')
+        self.__array_interface__ = view.__array_interface__
+        del view
+        weakref.finalize(self, shm.close)
+
+
+def _load(data, shared):
+    """
+    The object pickled by :func:`_dump`, its arrays viewing the block of
+    shared memory :attr:`shared`.  The name of the block is removed at
+    once, and its memory freed when the arrays are deleted.
+    """
+    if shared is None:
+        return pickle.loads(data)
+    name, sizes = shared
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        base = np.asarray(_SharedMemoryArray(shm))
+        offsets = np.cumsum([0] + sizes)
+        return pickle.loads(data, buffers=[base[start:stop] for start, stop
+                                           in zip(offsets[:-1], offsets[1:])])
+    finally:
+        shm.unlink()
+
+
+def _read(filename, io_class, kargs):
+    """
+    The list of the Blocks of :attr:`filename` read with :attr:`io_class`
+    (guessed from the extension if None) and the reading arguments
+    :attr:`kargs`.
+    """
+    if io_class is None:
+        # imported here as neo.io imports this module
+        from neo.io import get_io
+        reader = get_io(filename)
+    else:
+        reader = io_class(filename=filename)
+    return reader._read_blocks(**kargs)
+
+
+def _read_file(args):
+    """
+    Read the file of :attr:`args` (filename, IO class, reading arguments)
+    in a worker process, and return its Blocks pickled by :func:`_dump`.
+    Errors, including those of the pickling, are returned, not raised, so
+    that the other files are still read.
+    """
+    filename, io_class, kargs = args
+    try:
+        blocks = _read(filename, io_class, kargs)
+        return filename, _dump((blocks, _pack(blocks))), None
+    except Exception:
+        return filename, None, traceback.format_exc()
+
+
+def read_many(filenames, workers=None, io_class=None, lazy=False,
+              cascade=True, **kargs):
+    """
+    Read the files of :attr:`filenames` in :attr:`workers` processes (the
+    number of CPUs by default, no pool if it is 1) and return their
+    :class:`ReadResult` in the order of :attr:`filenames`.
+
+    The files are read with the IO guessed from their extension, or with
+    :attr:`io_class`.  :attr:`lazy`, :attr:`cascade` and the other keyword
+    arguments, e.g. the ``channel_indexes``, ``unit_ids`` and
+    ``time_range`` of the data to read (see :mod:`neo.io.selection`), are
+    passed to :meth:`BaseIO.read`.  A file which cannot be read gives a
+    result with the error and no Blocks, the others are still read.
+    """
+    kargs.update(lazy=lazy, cascade=cascade)
+    tasks = [(filename, io_class, kargs) for filename in filenames]
+    if workers is None:
+        workers = multiprocessing.cpu_count()
+    if workers <= 1 or len(tasks) <= 1:
+        # read in this process, nothing to pickle
+        results = []
+        for filename, io_class, kargs in tasks:
+            try:
+                blocks = _read(filename, io_class, kargs)
+            except Exception:
+                results.append(ReadResult(filename, None,
+                                          traceback.format_exc()))
+            else:
+                results.append(ReadResult(filename, blocks, None))
+        return results
+
+    if HAVE_OUT_OF_BAND:
+        # the workers share the resource tracker of this process, which
+        # takes the blocks of shared memory they create over
+        resource_tracker.ensure_running()
+    pool = multiprocessing.Pool(min(workers, len(tasks)))
+    try:
+        # one file at a time, so that a long file does not hold back
+        # a batch of others
+        outputs = pool.map(_read_file, tasks, chunksize=1)
+    finally:
+        pool.close()
+        pool.join()
+
+    results = []
+    for filename, pickled, error in outputs:
+        blocks = None
+        if pickled is not None:
+            try:
+                blocks, lazy_attributes = _load(*pickled)
+                _unpack(blocks, lazy_attributes)
+            except Exception:
+                blocks, error = None, traceback.format_exc()
+        results.append(ReadResult(filename, blocks, error))
+    return results
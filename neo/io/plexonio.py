@@ -25,8 +25,11 @@ import numpy as np
 import quantities as pq
 
 from neo.io.baseio import BaseIO
+from neo.io.resources import resource_pool
+from neo.io.selection import DataSelection
 from neo.core import Segment, AnalogSignal, SpikeTrain, EpochArray, EventArray
-from neo.io.tools import iteritems
+from neo.core.streaming import map_threads
+from neo.io.tools import iteritems, read_chunks
 
 
 class PlexonIO(BaseIO):
@@ -55,6 +58,7 @@ class PlexonIO(BaseIO):
 
     has_header         = False
     is_streameable     = False
+    supported_selection = ['channel_indexes', 'unit_ids', 'time_range']
 
     # This is for GUI stuf : a definition for parameters when reading.
     read_params        = {
@@ -88,10 +92,32 @@ class PlexonIO(BaseIO):
                                         lazy = False,
                                         cascade = True,
                                         load_spike_waveform = True,
+                                        channel_indexes = None,
+                                        unit_ids = None,
+                                        time_range = None,
+                                        num_threads = 1,
                                             ):
         """
-
+        Arguments:
+            load_spike_waveform : load or not waveform of spikes
+            channel_indexes : the channels to read (all by default)
+            unit_ids : the unit numbers of the spike trains to read, 0 being
+                the unsorted spikes (all by default)
+            time_range : (t_start, t_stop) of the data to read (all by default)
+            num_threads : number of threads decoding the channels (1 by
+                default)
+
+        The data blocks of the other channels, units and times are skipped
+        without being decoded.
+
+        With several threads, the positions of the data blocks are kept
+        while counting them, and each signal channel and unit is then
+        decoded at once from a memmap of the file, instead of block by
+        block in a second pass.
         """
+        selection = DataSelection(channel_indexes=channel_indexes,
+                                  unit_ids=unit_ids, time_range=time_range)
+        t_first, t_last = selection.time_limits(pq.s)
 
         fid = open(self.filename, 'rb')
         globalHeader = HeaderReader(fid , GlobalHeader ).read_f(offset = 0)
@@ -134,9 +160,9 @@ class PlexonIO(BaseIO):
 
         ## Step 2 : a first loop for counting size
         # signal
-        nb_samples = np.zeros(len(slowChannelHeaders))
-        sample_positions = np.zeros(len(slowChannelHeaders))
-        t_starts = np.zeros(len(slowChannelHeaders), dtype = 'f')
+        nb_samples = np.zeros(len(slowChannelHeaders), dtype = 'i8')
+        sample_positions = np.zeros(len(slowChannelHeaders), dtype = 'i8')
+        t_starts = np.zeros(len(slowChannelHeaders))
 
         #spiketimes and waveform
         nb_spikes = np.zeros((maxchan+1, maxunit+1) ,dtype='i')
@@ -149,6 +175,12 @@ class PlexonIO(BaseIO):
             nb_events[chan] = 0
             #maxstrsizeperchannel[chan] = 0
 
+        # positions of the selected data blocks, to decode with threads
+        indexed = not lazy and num_threads is not None and num_threads > 1
+        spike_blocks = { } # (chan, unit) : [(time, offset), ...]
+        event_blocks = { } # chan : [time, ...]
+        signal_blocks = { } # chan : [(offset, nb samples), ...]
+
         start = fid.tell()
         while fid.tell() !=-1 :
             # read block header
@@ -160,28 +192,97 @@ class PlexonIO(BaseIO):
             time = (dataBlockHeader['UpperByteOf5ByteTimestamp']*2.**32 +
                     dataBlockHeader['TimeStamp'])
 
+            in_range = t_first <= time/globalHeader['ADFrequency'] <= t_last
+
             if dataBlockHeader['Type'] == 1:
-                nb_spikes[chan,unit] +=1
+                if (in_range and selection.keep_channel(chan) and
+                        selection.keep_unit(unit)):
+                    nb_spikes[chan,unit] +=1
+                    if indexed:
+                        spike_blocks.setdefault((chan, unit), []).append((time, fid.tell()))
                 wf_sizes[chan,unit,:] = [n1,n2]
                 fid.seek(n1*n2*2,1)
             elif dataBlockHeader['Type'] ==4:
                 #event
-                nb_events[chan] += 1
+                if in_range and selection.keep_channel(chan):
+                    nb_events[chan] += 1
+                    if indexed:
+                        event_blocks.setdefault(chan, []).append(time)
             elif dataBlockHeader['Type'] == 5:
                 #continuous signal
+                if indexed and n2 > 0 and selection.keep_channel(chan):
+                    signal_blocks.setdefault(chan, []).append((fid.tell(), n2))
                 fid.seek(n2*2, 1)
                 if n2> 0:
+                    if nb_samples[chan] ==0:
+                        # time of the first sample, in s
+                        t_starts[chan] = time/globalHeader['ADFrequency']
                     nb_samples[chan] += n2
-                if nb_samples[chan] ==0:
-                    t_starts[chan] = time
                     
 
+        # samples of the signals in the time range
+        sample_ranges = { }
+        for chan, h in iteritems(slowChannelHeaders):
+            sample_ranges[chan] = selection.sample_range(
+                t_starts[chan]*pq.s, float(h['ADFreq'])*pq.Hz,
+                int(nb_samples[chan]))
+
         ## Step 3: allocating memory and 2 loop for reading if not lazy
-        if not lazy:
+        if indexed:
+            # the channels are decoded from the positions of their blocks
+            raw = resource_pool.memmap(self.filename, dtype = 'u1', mode = 'r')
+            ADFrequency = float(globalHeader['ADFrequency'])
+
+            def read_signal(chan):
+                sig_start, sig_stop = sample_ranges[chan]
+                blocks = np.array(signal_blocks.get(chan, [ ]), dtype = 'i8').reshape(-1, 2)
+                offsets, sizes = blocks[:, 0], blocks[:, 1]
+                positions = np.cumsum(sizes) - sizes
+                # samples of each block in the time range
+                first = np.clip(sig_start - positions, 0, sizes)
+                last = np.clip(sig_stop - positions, 0, sizes)
+                keep = first < last
+                data = read_chunks(raw, offsets[keep] + first[keep]*2,
+                                   (last - first)[keep]*2)
+                return data.view('i2').astype('f8')
+
+            def read_spikes(key):
+                blocks = spike_blocks[key]
+                times = np.array([time for time, _ in blocks]) / ADFrequency
+                waveforms = None
+                if load_spike_waveform:
+                    n1, n2 = wf_sizes[key[0], key[1], :]
+                    if n1*n2 != 0:
+                        data = read_chunks(raw, [offset for _, offset in blocks],
+                                           [n1*n2*2] * len(blocks))
+                        waveforms = data.view('i2').reshape(-1, n1, n2).astype('f4')
+                    else:
+                        waveforms = np.zeros((len(blocks), n1, n2), dtype = 'f4')
+                return times.astype('f'), waveforms
+
+            signal_chans = [chan for chan in slowChannelHeaders
+                            if selection.keep_channel(chan)]
+            sigarrays = dict(zip(signal_chans,
+                                 map_threads(read_signal, signal_chans, num_threads)))
+
+            stimearrays = np.zeros((maxchan+1, maxunit+1) ,dtype=object)
+            swfarrays = np.zeros((maxchan+1, maxunit+1) ,dtype=object)
+            units = sorted(spike_blocks)
+            for key, (times, waveforms) in zip(units,
+                    map_threads(read_spikes, units, num_threads)):
+                stimearrays[key] = times
+                swfarrays[key] = waveforms
+
+            evarrays = { }
+            for chan in nb_events:
+                evarrays[chan] = (np.array(event_blocks.get(chan, [ ])) / ADFrequency).astype('f')
+
+        elif not lazy:
             # allocating mem for signal
             sigarrays = { }
             for chan, h in iteritems(slowChannelHeaders):
-                sigarrays[chan] = np.zeros(nb_samples[chan])
+                sig_start, sig_stop = sample_ranges[chan]
+                sigarrays[chan] = np.zeros(sig_stop - sig_start)
                 
             # allocating mem for SpikeTrain
             stimearrays = np.zeros((maxchan+1, maxunit+1) ,dtype=object)
@@ -210,9 +311,15 @@ class PlexonIO(BaseIO):
                 time/= globalHeader['ADFrequency']
 
                 if n2 <0: break
+                in_range = t_first <= time <= t_last
+
                 if dataBlockHeader['Type'] == 1:
                     #spike
                     unit = dataBlockHeader['Unit']
+                    if not (in_range and selection.keep_channel(chan) and
+                            selection.keep_unit(unit)):
+                        fid.seek(n1*n2*2,1)
+                        continue
                     pos = pos_spikes[chan,unit]
                     stimearrays[chan, unit][pos] = time
                     if load_spike_waveform and n1*n2 != 0 :
@@ -223,19 +330,32 @@ class PlexonIO(BaseIO):
                 
                 elif dataBlockHeader['Type'] == 4:
                     # event
+                    if not (in_range and selection.keep_channel(chan)):
+                        continue
                     pos = eventpositions[chan]
                     evarrays[chan][pos] = time
                     eventpositions[chan]+= 1
 
                 elif dataBlockHeader['Type'] == 5:
                     #signal
-                    data = np.fromstring( fid.read(n2*2) , dtype = 'i2').astype('f4')
-                    sigarrays[chan][sample_positions[chan] : sample_positions[chan]+data.size] = data
-                    sample_positions[chan] += data.size
+                    sig_start, sig_stop = sample_ranges[chan]
+                    first = max(sig_start - sample_positions[chan], 0)
+                    last = min(sig_stop - sample_positions[chan], n2)
+                    if selection.keep_channel(chan) and first < last:
+                        fid.seek(first*2, 1)
+                        data = np.fromstring( fid.read((last-first)*2) , dtype = 'i2').astype('f4')
+                        fid.seek((n2-last)*2, 1)
+                        pos = sample_positions[chan] + first - sig_start
+                        sigarrays[chan][pos : pos+data.size] = data
+                    else:
+                        fid.seek(n2*2, 1)
+                    sample_positions[chan] += n2
 
 
         ## Step 3: create neo object
         for chan, h in iteritems(eventHeaders):
+            if not selection.keep_channel(chan):
+                continue
             if lazy:
                 times = [ ]
             else:
@@ -248,6 +368,10 @@ class PlexonIO(BaseIO):
             seg.eventarrays.append(ea)
             
         for chan, h in iteritems(slowChannelHeaders):
+            if not selection.keep_channel(chan):
+                continue
+            sig_start, sig_stop = sample_ranges[chan]
+            sampling_rate = float(slowChannelHeaders[chan]['ADFreq'])*pq.Hz
             if lazy:
                 signal = [ ]
             else:
@@ -260,13 +384,13 @@ class PlexonIO(BaseIO):
                                                         slowChannelHeaders[chan]['Gain']*slowChannelHeaders[chan]['PreampGain'])
                 signal = sigarrays[chan]*gain
             anasig =  AnalogSignal(signal*pq.V,
-                                                        sampling_rate = float(slowChannelHeaders[chan]['ADFreq'])*pq.Hz,
-                                                        t_start = t_starts[chan]*pq.s,
+                                                        sampling_rate = sampling_rate,
+                                                        t_start = t_starts[chan]*pq.s + (sig_start/sampling_rate).rescale(pq.s),
                                                         channel_index = slowChannelHeaders[chan]['Channel'],
                                                         channel_name = slowChannelHeaders[chan]['Name'],
                                                         )
             if lazy:
-                anasig.lazy_shape = nb_samples[chan]
+                anasig.lazy_shape = sig_stop - sig_start
             seg.analogsignals.append(anasig)
             
         for (chan, unit), value in np.ndenumerate(nb_spikes):
@@ -294,6 +418,7 @@ class PlexonIO(BaseIO):
                                             )
             sptr.annotate(unit_name = dspChannelHeaders[chan]['Name'])
             sptr.annotate(channel_index = chan)
+            sptr.annotate(unit_id = unit)
             if lazy:
                 sptr.lazy_shape = nb_spikes[chan,unit]
             seg.spiketrains.append(sptr)
@@ -0,0 +1,788 @@
+# -*- coding: utf-8 -*-
+"""
+Proxies of the data objects read lazily by the IOs.
+
+When a file is read with ``lazy=True``, the data objects are returned empty,
+with a ``lazy_shape`` attribute giving the shape of their data.  Readers
+supporting proxies also attach a ``lazy_proxy`` attribute to them: an
+:class:`AnalogSignalProxy`, :class:`SpikeTrainProxy`,
+:class:`EventArrayProxy` or :class:`EpochArrayProxy` which knows where the
+data are in the file, and reads only the part that is requested::
+
+    >>> seg = AxonIO(filename).read_block(lazy=True).segments[0]
+    >>> proxy = seg.analogsignals[0].lazy_proxy
+    >>> sig = proxy.load(time_slice=(10*pq.s, 12*pq.s))
+
+or, equivalently, :meth:`BaseIO.load_lazy_object`::
+
+    >>> sig = reader.load_lazy_object(seg.analogsignals[0],
+    ...                               time_slice=(10*pq.s, 12*pq.s))
+
+The data are described by :class:`RawArray` objects (a file name, a dtype, a
+shape, a byte offset and an optional linear scaling), which are memory-mapped
+only while a proxy is loaded, through the bounded pool of
+:mod:`neo.io.resources`, so proxies hold no open file and can be kept as
+long as the file exists.  Data already in memory (e.g. parsed from a
+header) can be given as plain arrays instead.
+"""
+
+# needed for python 3 compatibility
+from __future__ import absolute_import, division, print_function
+
+import numpy as np
+import quantities as pq
+
+from neo.core import (AnalogSignal, AnalogSignalArray, EpochArray,
+                      EventArray, SpikeTrain)
+from neo.io.resources import resource_pool
+
+
+class RawArray(object):
+    """
+    Description of an array stored in a binary file.
+
+    The values read are ``raw * gain + offset``, computed in
+    :attr:`scaled_dtype` when :attr:`gain` or :attr:`offset` is given, and
+    left in :attr:`dtype` otherwise.  :attr:`gain` and :attr:`offset` are
+    scalars or arrays broadcast along the last axis, e.g. one per channel of
+    an interleaved (sample, channel) array.
+
+    *Usage*::
+
+        >>> raw = RawArray('data.raw', 'int16', (n_samples, 16),
+        ...                byte_offset=512, gain=0.1)
+        >>> chunk = raw.read(slice(1000, 2000))
+
+    *Required attributes/properties*:
+        :filename: (str) The file holding the array.
+        :dtype: (numpy dtype) The dtype of the values in the file.
+        :shape: (tuple) The shape of the array, C order.
+
+    *Recommended attributes/properties*:
+        :byte_offset: (int) Position of the first value in the file.
+        :gain: (float or array) Scale factor of the values.
+        :offset: (float or array) Offset of the values, after scaling.
+        :scaled_dtype: (numpy dtype) The dtype of the scaled values.
+            Default: float32, as most readers use for signals.
+    """
+
+    def __init__(self, filename, dtype, shape, byte_offset=0, gain=None,
+                 offset=None, scaled_dtype='f'):
+        self.filename = filename
+        self.dtype = np.dtype(dtype)
+        if np.isscalar(shape):
+            shape = (shape,)
+        self.shape = tuple(int(n) for n in shape)
+        self.byte_offset = int(byte_offset)
+        self.gain = gain
+        self.offset = offset
+        self.scaled_dtype = np.dtype(scaled_dtype)
+
+    def __len__(self):
+        return self.shape[0]
+
+    @property
+    def scaled(self):
+        """
+        True if the values are scaled when read.
+        """
+        return self.gain is not None or self.offset is not None
+
+    def memmap(self):
+        """
+        Read-only memory map of the raw values, viewing the mapping of the
+        file kept by :data:`neo.io.resources.resource_pool`.
+        """
+        if not np.prod(self.shape):
+            return np.zeros(self.shape, dtype=self.dtype)
+        return resource_pool.memmap(self.filename, self.dtype, 'r',
+                                    offset=self.byte_offset, shape=self.shape)
+
+    def scale(self, raw, index=Ellipsis):
+        """
+        Apply the scaling to :attr:`raw`, the values of the columns selected
+        by :attr:`index` along the last axis.
+        """
+        if not self.scaled:
+            return np.array(raw)
+        data = np.array(raw, dtype=self.scaled_dtype)
+        if self.gain is not None:
+            data *= self._column_values(self.gain, index)
+        if self.offset is not None:
+            data += self._column_values(self.offset, index)
+        return data
+
+    def _column_values(self, value, index):
+        """
+        The gain or offset :attr:`value` of the columns of :attr:`index`.
+        """
+        value = np.asarray(value, dtype=self.scaled_dtype)
+        if value.ndim:
+            return value[index]
+        return value
+
+    def read(self, rows=slice(None), columns=None):
+        """
+        Read the values at :attr:`rows` (along the first axis) and
+        :attr:`columns` (along the last axis, all of them by default).
+        Only the pages holding these values are read from the file.
+        """
+        raw = self.memmap()[rows]
+        if columns is None:
+            return self.scale(raw)
+        columns = np.asarray(columns)
+        return self.scale(raw[..., columns], columns)
+
+    def rows(self, start, stop):
+        """
+        The :class:`RawArray` of the rows from :attr:`start` to :attr:`stop`
+        (excluded) of this one.  Nothing is read from the file.
+        """
+        start = min(max(int(start), 0), self.shape[0])
+        stop = min(max(int(stop), start), self.shape[0])
+        row_size = int(np.prod(self.shape[1:])) * self.dtype.itemsize
+        return RawArray(self.filename, self.dtype,
+                        (stop - start,) + self.shape[1:],
+                        byte_offset=self.byte_offset + start * row_size,
+                        gain=self.gain, offset=self.offset,
+                        scaled_dtype=self.scaled_dtype)
+
+    def searchsorted(self, value, side='left'):
+        """
+        Index where the scaled :attr:`value` would be inserted in the array,
+        which must be 1D and sorted.  Only about log2(n) values are read.
+        """
+        if self.gain is not None and np.any(np.asarray(self.gain) < 0):
+            raise ValueError("searchsorted needs a positive gain")
+        if self.offset is not None:
+            value = value - self.offset
+        if self.gain is not None:
+            value = value / self.gain
+        return int(np.searchsorted(self.memmap(), value, side=side))
+
+
+def _read(source, rows=slice(None)):
+    """
+    Values of :attr:`source` (a :class:`RawArray` or an array) at
+    :attr:`rows`.
+    """
+    if isinstance(source, RawArray):
+        return source.read(rows)
+    return np.asarray(source)[rows]
+
+
+def _rows(source, start, stop):
+    """
+    The part of :attr:`source` (a :class:`RawArray` or an array) from
+    :attr:`start` to :attr:`stop` (excluded), without reading it.
+    """
+    if source is None:
+        return None
+    if isinstance(source, RawArray):
+        return source.rows(start, stop)
+    return source[start:stop]
+
+
+def _searchsorted(source, value, side='left'):
+    """
+    Index where :attr:`value` would be inserted in the sorted 1D
+    :attr:`source` (a :class:`RawArray` or an array).
+    """
+    if isinstance(source, RawArray):
+        return source.searchsorted(value, side=side)
+    return int(np.searchsorted(np.asarray(source), value, side=side))
+
+
+def _magnitude(value, units):
+    """
+    Float value of the time :attr:`value` in :attr:`units`, plain numbers
+    being already in :attr:`units`.
+    """
+    if isinstance(value, pq.Quantity):
+        return float(value.rescale(units).magnitude)
+    return float(value)
+
+
+def sample_range(t_start, sampling_rate, n_samples, time_slice=None):
+    """
+    First and last (excluded) indexes of the samples in :attr:`time_slice`
+    (a (t_start, t_stop) pair, either being None for no limit) of a signal
+    of :attr:`n_samples` samples starting at :attr:`t_start`.  The times
+    are rounded to the nearest sample as in
+    :meth:`AnalogSignalArray.time_slice`, and the indexes clipped to the
+    signal.
+    """
+    start, stop = 0, n_samples
+    if time_slice is None:
+        return start, stop
+    t_first, t_last = time_slice
+    units = t_start.units
+    period = _magnitude(1 / sampling_rate, units)
+    if t_first is not None:
+        start = int(np.rint((_magnitude(t_first, units) -
+                             t_start.magnitude) / period))
+    if t_last is not None:
+        stop = int(np.rint((_magnitude(t_last, units) -
+                            t_start.magnitude) / period))
+    start = min(max(start, 0), n_samples)
+    stop = min(max(stop, start), n_samples)
+    return start, stop
+
+
+class BaseProxy(object):
+    """
+    Base class of the proxies.
+
+    A proxy keeps the attributes and annotations of the object it stands
+    for, and builds it either empty (:meth:`lazy_object`) or with its data,
+    or part of them (:meth:`load`).
+    """
+
+    def __init__(self, name=None, description=None, file_origin=None,
+                 **annotations):
+        self.name = name
+        self.description = description
+        self.file_origin = file_origin
+        self.annotations = annotations
+
+    def _metadata(self):
+        """
+        Keyword arguments of the constructor of the object.
+        """
+        kwargs = dict(self.annotations)
+        kwargs.update(name=self.name, description=self.description,
+                      file_origin=self.file_origin)
+        return kwargs
+
+    @property
+    def lazy_shape(self):
+        """
+        Shape of the data of the object, when fully loaded.
+        """
+        raise NotImplementedError
+
+    def load(self, time_slice=None):
+        """
+        Read the data between the times of :attr:`time_slice` (a
+        (t_start, t_stop) pair, either being None for no limit) and return
+        the object.
+        """
+        raise NotImplementedError
+
+    def time_sliced(self, time_slice):
+        """
+        A proxy of the part of the object between the times of
+        :attr:`time_slice`, so that :meth:`load` gives the same result as
+        ``load(time_slice=time_slice)`` on this proxy.  At most the
+        times needed to find the limits are read from the file.
+        """
+        raise NotImplementedError
+
+    def _empty(self):
+        """
+        The object without data.
+        """
+        raise NotImplementedError
+
+    def lazy_object(self):
+        """
+        The object without data, as returned by the readers with
+        ``lazy=True``, with ``lazy_shape`` and ``lazy_proxy`` attributes.
+        """
+        obj = self._empty()
+        obj.lazy_shape = self.lazy_shape
+        obj.lazy_proxy = self
+        return obj
+
+    def __repr__(self):
+        return '<%s(%r, shape %s)>' % (self.__class__.__name__, self.name,
+                                       self.lazy_shape)
+
+
+class AnalogSignalProxy(BaseProxy):
+    """
+    Proxy of an :class:`AnalogSignal` or an :class:`AnalogSignalArray`.
+
+    The samples are stored in :attr:`raw`, a (sample, column) array of which
+    the proxy uses :attr:`columns`.  A proxy of a single column loads an
+    :class:`AnalogSignal`, a proxy of several columns an
+    :class:`AnalogSignalArray`.
+
+    *Usage*::
+
+        >>> raw = RawArray('data.raw', 'int16', (n_samples, 16), gain=0.1)
+        >>> proxy = AnalogSignalProxy(raw, units='mV',
+        ...                           sampling_rate=10*pq.kHz)
+        >>> sigarr = proxy.load(time_slice=(1*pq.s, 2*pq.s),
+        ...                     channel_indexes=[0, 3])
+
+    *Required attributes/properties*:
+        :raw: (:class:`RawArray` or numpy array 2D) The samples.
+        :units: (quantity units) Units of the (scaled) samples.
+        :sampling_rate: (quantity scalar) Sampling rate of the signal.
+
+    *Recommended attributes/properties*:
+        :t_start: (quantity scalar) Time of the first sample of :attr:`raw`.
+            Default: 0 s.
+        :columns: (list of int) The columns of :attr:`raw` used.
+            Default: all of them.
+        :channel_indexes: (list of int) The channel index of each column
+            used.  Default: :attr:`columns`.
+        :name: (str) A label for the signal.
+        :description: (str) Text description.
+        :file_origin: (str) Filesystem path or URL of the original data file.
+
+    Note: Any other additional arguments are stored as annotations of the
+    signal.
+    """
+
+    def __init__(self, raw, units, sampling_rate, t_start=0 * pq.s,
+                 columns=None, channel_indexes=None, name=None,
+                 description=None, file_origin=None, **annotations):
+        super(AnalogSignalProxy, self).__init__(name=name,
+                                                description=description,
+                                                file_origin=file_origin,
+                                                **annotations)
+        self.raw = raw
+        self.units = pq.Quantity(1, units).units
+        self.sampling_rate = sampling_rate
+        self.t_start = t_start
+        n_columns = raw.shape[1] if len(raw.shape) > 1 else 1
+        if columns is None:
+            columns = range(n_columns)
+        self.columns = [int(col) for col in columns]
+        if channel_indexes is None:
+            channel_indexes = self.columns
+        if len(channel_indexes) != len(self.columns):
+            raise ValueError("one channel index per column is needed")
+        self.channel_indexes = [int(ind) for ind in channel_indexes]
+
+    @property
+    def n_samples(self):
+        """
+        Number of samples of the signal.
+        """
+        return self.raw.shape[0]
+
+    @property
+    def lazy_shape(self):
+        if len(self.columns) == 1:
+            return (self.n_samples,)
+        return (self.n_samples, len(self.columns))
+
+    def sample_range(self, time_slice=None):
+        """
+        First and last (excluded) indexes of the samples in
+        :attr:`time_slice`, rounded to the nearest sample as in
+        :meth:`AnalogSignalArray.time_slice` and clipped to the signal.
+        """
+        return sample_range(self.t_start, self.sampling_rate,
+                            self.n_samples, time_slice)
+
+    def _column_positions(self, channel_indexes):
+        """
+        Positions in :attr:`columns` of the channels of
+        :attr:`channel_indexes`.
+        """
+        positions = []
+        for ind in channel_indexes:
+            if ind not in self.channel_indexes:
+                raise ValueError("channel %s is not in this signal" % ind)
+            positions.append(self.channel_indexes.index(ind))
+        return positions
+
+    def _read(self, rows, positions):
+        """
+        Samples of :attr:`rows` for the used columns at :attr:`positions`,
+        as a (sample, channel) array.
+        """
+        columns = [self.columns[pos] for pos in positions]
+        if isinstance(self.raw, RawArray):
+            if len(self.raw.shape) == 1:
+                return self.raw.read(rows)[:, np.newaxis]
+            return self.raw.read(rows, columns)
+        raw = np.asarray(self.raw)
+        if raw.ndim == 1:
+            return np.array(raw[rows])[:, np.newaxis]
+        return np.array(raw[rows][:, columns])
+
+    def read_samples(self, start, stop, channel_indexes=None):
+        """
+        Read the samples from :attr:`start` to :attr:`stop` (excluded) of
+        the channels of :attr:`channel_indexes` (all by default), and return
+        them as a (sample, channel) array in :attr:`units`.
+        """
+        if channel_indexes is None:
+            positions = list(range(len(self.columns)))
+        else:
+            positions = self._column_positions(channel_indexes)
+        return self._read(slice(start, stop), positions)
+
+    def sample_time(self, index):
+        """
+        Time of the sample at :attr:`index`.
+        """
+        t_start = self.t_start + index / self.sampling_rate
+        return t_start.rescale(self.t_start.units)
+
+    def load(self, time_slice=None, channel_indexes=None):
+        """
+        Read the samples between the times of :attr:`time_slice` of the
+        channels of :attr:`channel_indexes` (all by default), and return
+        them as an :class:`AnalogSignal` (for a proxy of a single channel)
+        or an :class:`AnalogSignalArray`.
+        """
+        start, stop = self.sample_range(time_slice)
+        data = self.read_samples(start, stop, channel_indexes)
+        t_start = self.sample_time(start)
+        kwargs = self._metadata()
+        if len(self.columns) == 1:
+            return AnalogSignal(data[:, 0], units=self.units, copy=False,
+                                t_start=t_start,
+                                sampling_rate=self.sampling_rate,
+                                channel_index=self.channel_indexes[0],
+                                **kwargs)
+        if channel_indexes is None:
+            channel_indexes = self.channel_indexes
+        channel_indexes = np.array(channel_indexes, dtype='i')
+        return AnalogSignalArray(data, units=self.units, copy=False,
+                                 t_start=t_start,
+                                 sampling_rate=self.sampling_rate,
+                                 channel_index=channel_indexes, **kwargs)
+
+    def time_sliced(self, time_slice):
+        start, stop = self.sample_range(time_slice)
+        return AnalogSignalProxy(_rows(self.raw, start, stop),
+                                 units=self.units,
+                                 sampling_rate=self.sampling_rate,
+                                 t_start=self.sample_time(start),
+                                 columns=self.columns,
+                                 channel_indexes=self.channel_indexes,
+                                 **self._metadata())
+
+    def _empty(self):
+        kwargs = self._metadata()
+        if len(self.columns) == 1:
+            return AnalogSignal([], units=self.units, t_start=self.t_start,
+                                sampling_rate=self.sampling_rate,
+                                channel_index=self.channel_indexes[0],
+                                **kwargs)
+        return AnalogSignalArray(np.zeros((0, len(self.columns))),
+                                 units=self.units, t_start=self.t_start,
+                                 sampling_rate=self.sampling_rate,
+                                 channel_index=np.array(self.channel_indexes,
+                                                        dtype='i'),
+                                 **kwargs)
+
+
+class SpikeTrainProxy(BaseProxy):
+    """
+    Proxy of a :class:`SpikeTrain`.
+
+    The spike times are stored in :attr:`times`, sorted, so a time slice
+    only reads the times it holds and about log2(n) others.  The waveforms,
+    if any, are stored in :attr:`waveforms`, a (spike, channel, time) array.
+
+    *Usage*::
+
+        >>> times = RawArray('data.nex', 'int32', n_spikes, byte_offset=2048,
+        ...                  gain=1/40000.)
+        >>> proxy = SpikeTrainProxy(times, units='s', t_stop=100*pq.s)
+        >>> sptr = proxy.load(time_slice=(10*pq.s, 20*pq.s))
+
+    *Required attributes/properties*:
+        :times: (:class:`RawArray` or numpy array 1D) The spike times, in
+            :attr:`units`.
+        :units: (quantity units) Units of the spike times.
+        :t_stop: (quantity scalar) Time at which the train ends.
+
+    *Recommended attributes/properties*:
+        :t_start: (quantity scalar) Time at which the train begins.
+            Default: 0 s.
+        :waveforms: (:class:`RawArray` or numpy array 3D) The waveforms, in
+            :attr:`waveform_units`.
+        :waveform_units: (quantity units) Units of the waveforms.
+        :sampling_rate: (quantity scalar) Sampling rate of the waveforms.
+        :left_sweep: (quantity scalar) Time from the beginning of the
+            waveforms to the spikes.
+        :name: (str) A label for the train.
+        :description: (str) Text description.
+        :file_origin: (str) Filesystem path or URL of the original data file.
+
+    Note: Any other additional arguments are stored as annotations of the
+    train.
+    """
+
+    def __init__(self, times, units, t_stop, t_start=0 * pq.s,
+                 waveforms=None, waveform_units=None, sampling_rate=None,
+                 left_sweep=None, name=None, description=None,
+                 file_origin=None, **annotations):
+        super(SpikeTrainProxy, self).__init__(name=name,
+                                              description=description,
+                                              file_origin=file_origin,
+                                              **annotations)
+        self.times = times
+        self.units = pq.Quantity(1, units).units
+        self.t_start = t_start
+        self.t_stop = t_stop
+        self.waveforms = waveforms
+        self.waveform_units = waveform_units
+        self.sampling_rate = sampling_rate
+        self.left_sweep = left_sweep
+
+    @property
+    def lazy_shape(self):
+        return (len(self.times),)
+
+    def spike_range(self, time_slice=None):
+        """
+        First and last (excluded) indexes of the spikes in
+        :attr:`time_slice`, both ends included as in
+        :meth:`SpikeTrain.time_slice`.
+        """
+        start, stop = 0, len(self.times)
+        if time_slice is None:
+            return start, stop
+        t_first, t_last = time_slice
+        if t_first is not None:
+            start = _searchsorted(self.times,
+                                  _magnitude(t_first, self.units), 'left')
+        if t_last is not None:
+            stop = _searchsorted(self.times,
+                                 _magnitude(t_last, self.units), 'right')
+        return start, max(stop, start)
+
+    def load(self, time_slice=None, load_waveforms=True):
+        """
+        Read the spikes between the times of :attr:`time_slice`, and their
+        waveforms unless :attr:`load_waveforms` is False, and return them as
+        a :class:`SpikeTrain`.
+        """
+        start, stop = self.spike_range(time_slice)
+        times = _read(self.times, slice(start, stop))
+        t_start, t_stop = self.t_start, self.t_stop
+        if time_slice is not None:
+            if time_slice[0] is not None:
+                t_start = max(t_start, time_slice[0])
+            if time_slice[1] is not None:
+                t_stop = min(t_stop, time_slice[1])
+        waveforms = None
+        if load_waveforms and self.waveforms is not None:
+            waveforms = pq.Quantity(_read(self.waveforms, slice(start, stop)),
+                                    self.waveform_units, copy=False)
+        return SpikeTrain(times, t_stop=t_stop, units=self.units,
+                          t_start=t_start, waveforms=waveforms,
+                          sampling_rate=self.sampling_rate,
+                          left_sweep=self.left_sweep, **self._metadata())
+
+    def time_sliced(self, time_slice):
+        start, stop = self.spike_range(time_slice)
+        t_start, t_stop = self.t_start, self.t_stop
+        if time_slice is not None:
+            if time_slice[0] is not None:
+                t_start = max(t_start, time_slice[0])
+            if time_slice[1] is not None:
+                t_stop = min(t_stop, time_slice[1])
+        return SpikeTrainProxy(_rows(self.times, start, stop),
+                               units=self.units, t_stop=t_stop,
+                               t_start=t_start,
+                               waveforms=_rows(self.waveforms, start, stop),
+                               waveform_units=self.waveform_units,
+                               sampling_rate=self.sampling_rate,
+                               left_sweep=self.left_sweep,
+                               **self._metadata())
+
+    def _empty(self):
+        return SpikeTrain([], t_stop=self.t_stop, units=self.units,
+                          t_start=self.t_start,
+                          sampling_rate=self.sampling_rate,
+                          left_sweep=self.left_sweep, **self._metadata())
+
+
+class EventArrayProxy(BaseProxy):
+    """
+    Proxy of an :class:`EventArray`.
+
+    The event times are stored in :attr:`times`, sorted, and their labels,
+    if any, in :attr:`labels`.
+
+    *Usage*::
+
+        >>> proxy = EventArrayProxy(RawArray('data.nex', 'int32', n_events,
+        ...                                  gain=1/40000.), units='s')
+        >>> evtarr = proxy.load(time_slice=(10*pq.s, 20*pq.s))
+
+    *Required attributes/properties*:
+        :times: (:class:`RawArray` or numpy array 1D) The event times, in
+            :attr:`units`.
+        :units: (quantity units) Units of the event times.
+
+    *Recommended attributes/properties*:
+        :labels: (:class:`RawArray` or numpy array 1D dtype='S') The labels
+            of the events.  Default: empty labels.
+        :name: (str) A label for the events.
+        :description: (str) Text description.
+        :file_origin: (str) Filesystem path or URL of the original data file.
+
+    Note: Any other additional arguments are stored as annotations of the
+    event array.
+    """
+
+    def __init__(self, times, units, labels=None, name=None,
+                 description=None, file_origin=None, **annotations):
+        super(EventArrayProxy, self).__init__(name=name,
+                                              description=description,
+                                              file_origin=file_origin,
+                                              **annotations)
+        self.times = times
+        self.units = pq.Quantity(1, units).units
+        self.labels = labels
+
+    @property
+    def lazy_shape(self):
+        return (len(self.times),)
+
+    def event_range(self, time_slice=None):
+        """
+        First and last (excluded) indexes of the events in
+        :attr:`time_slice`, both ends included.
+        """
+        start, stop = 0, len(self.times)
+        if time_slice is None:
+            return start, stop
+        t_first, t_last = time_slice
+        if t_first is not None:
+            start = _searchsorted(self.times,
+                                  _magnitude(t_first, self.units), 'left')
+        if t_last is not None:
+            stop = _searchsorted(self.times,
+                                 _magnitude(t_last, self.units), 'right')
+        return start, max(stop, start)
+
+    def _labels(self, rows):
+        """
+        The labels of the events at :attr:`rows`.
+        """
+        if self.labels is None:
+            n_events = len(range(*rows.indices(len(self.times))))
+            return np.array([''] * n_events, dtype='S')
+        return np.array(_read(self.labels, rows), dtype='S')
+
+    def load(self, time_slice=None):
+        """
+        Read the events between the times of :attr:`time_slice` and return
+        them as an :class:`EventArray`.
+        """
+        rows = slice(*self.event_range(time_slice))
+        times = pq.Quantity(_read(self.times, rows), self.units, copy=False)
+        return EventArray(times=times, labels=self._labels(rows),
+                          **self._metadata())
+
+    def time_sliced(self, time_slice):
+        start, stop = self.event_range(time_slice)
+        return EventArrayProxy(_rows(self.times, start, stop),
+                               units=self.units,
+                               labels=_rows(self.labels, start, stop),
+                               **self._metadata())
+
+    def _empty(self):
+        return EventArray(times=pq.Quantity([], self.units),
+                          labels=np.array([], dtype='S'), **self._metadata())
+
+
+class EpochArrayProxy(EventArrayProxy):
+    """
+    Proxy of an :class:`EpochArray`.
+
+    As :class:`EventArrayProxy`, with the durations of the epochs in
+    :attr:`durations`, or their end times in :attr:`stop_times` (in
+    :attr:`units`).  A time slice selects the epochs starting in it.
+    """
+
+    def __init__(self, times, units, durations=None, stop_times=None,
+                 labels=None, name=None, description=None, file_origin=None,
+                 **annotations):
+        super(EpochArrayProxy, self).__init__(times, units, labels=labels,
+                                              name=name,
+                                              description=description,
+                                              file_origin=file_origin,
+                                              **annotations)
+        if (durations is None) == (stop_times is None):
+            raise ValueError("either durations or stop_times is needed")
+        self.durations = durations
+        self.stop_times = stop_times
+
+    def load(self, time_slice=None):
+        """
+        Read the epochs starting between the times of :attr:`time_slice`
+        and return them as an :class:`EpochArray`.
+        """
+        rows = slice(*self.event_range(time_slice))
+        times = _read(self.times, rows)
+        if self.durations is None:
+            durations = _read(self.stop_times, rows) - times
+        else:
+            durations = _read(self.durations, rows)
+        times = pq.Quantity(times, self.units, copy=False)
+        durations = pq.Quantity(durations, self.units, copy=False)
+        return EpochArray(times=times, durations=durations,
+                          labels=self._labels(rows), **self._metadata())
+
+    def time_sliced(self, time_slice):
+        start, stop = self.event_range(time_slice)
+        return EpochArrayProxy(_rows(self.times, start, stop),
+                               units=self.units,
+                               durations=_rows(self.durations, start, stop),
+                               stop_times=_rows(self.stop_times, start, stop),
+                               labels=_rows(self.labels, start, stop),
+                               **self._metadata())
+
+    def _empty(self):
+        return EpochArray(times=pq.Quantity([], self.units),
+                          durations=pq.Quantity([], self.units),
+                          labels=np.array([], dtype='S'), **self._metadata())
+
+
+def group_analogsignal_proxies(proxies):
+    """
+    Group the :class:`AnalogSignalProxy` objects of :attr:`proxies` whose
+    samples are taken at the same times and are in the same units, i.e.
+    have the same sampling rate, t_start, number of samples and units.
+
+    In each group the proxies of columns of the same :class:`RawArray` are
+    merged into one proxy of several columns, so the samples of all these
+    channels are read at once.  Returns the list of groups, each a list of
+    proxies.
+    """
+    groups = []
+    keys = {}
+    for proxy in proxies:
+        key = (float(proxy.sampling_rate.rescale(pq.Hz).magnitude),
+               float(proxy.t_start.rescale(pq.s).magnitude), proxy.n_samples,
+               proxy.units.dimensionality.string)
+        if key not in keys:
+            keys[key] = len(groups)
+            groups.append([])
+        groups[keys[key]].append(proxy)
+
+    merged_groups = []
+    for group in groups:
+        merged = []
+        sources = {}
+        for proxy in group:
+            source = id(proxy.raw)
+            if source not in sources:
+                sources[source] = len(merged)
+                merged.append(([], [], proxy))
+            columns, channel_indexes, _ = merged[sources[source]]
+            columns.extend(proxy.columns)
+            channel_indexes.extend(proxy.channel_indexes)
+        merged_groups.append([
+            AnalogSignalProxy(first.raw, units=first.units,
+                              sampling_rate=first.sampling_rate,
+                              t_start=first.t_start, columns=columns,
+                              channel_indexes=channel_indexes,
+                              file_origin=first.file_origin)
+            if len(columns) > 1 else first
+            for columns, channel_indexes, first in merged])
+    return merged_groups
@@ -17,6 +17,9 @@ import numpy as np
 import quantities as pq
 
 from neo.io.baseio import BaseIO
+from neo.io.proxyobjects import RawArray, AnalogSignalProxy
+from neo.io.resources import resource_pool
+from neo.io.selection import DataSelection
 from neo.core import Segment, AnalogSignal
 
 
@@ -40,7 +43,9 @@ class RawBinarySignalIO(BaseIO):
     writeable_objects   = [Segment]
 
     has_header         = False
-    is_streameable     = False
+    is_streameable     = True
+    has_lazy_proxies   = True
+    supported_selection = ['channel_indexes', 'time_range']
     read_params        = { Segment : [
                                         ('sampling_rate' , { 'value' : 1000. } ) ,
                                         ('nbchannel' , { 'value' : 16 } ),
@@ -92,6 +97,9 @@ class RawBinarySignalIO(BaseIO):
                                         dtype = 'f4',
                                         rangemin = -10,
                                         rangemax = 10,
+
+                                        channel_indexes = None,
+                                        time_range = None,
                                     ):
         """
         Reading signal in a raw binary interleaved compact file.
@@ -105,7 +113,11 @@ class RawBinarySignalIO(BaseIO):
 
             dtype : dtype of the data
             rangemin , rangemax : if the dtype is integer, range can give in volt the min and the max of the range
+            channel_indexes : the channels to read (all by default)
+            time_range : (t_start, t_stop) of the samples to read (all by default)
         """
+        selection = DataSelection(channel_indexes=channel_indexes,
+                                  time_range=time_range)
         seg = Segment(file_origin = os.path.basename(self.filename))
         if not cascade:
             return seg
@@ -123,10 +135,19 @@ class RawBinarySignalIO(BaseIO):
         unit = pq.Quantity(1, unit)
 
         if not lazy:
-            sig = np.memmap(self.filename, dtype = dtype, mode = 'r', offset = bytesoffset)
+            sig = resource_pool.memmap(self.filename, dtype = dtype, mode = 'r', offset = bytesoffset)
             if sig.size % nbchannel != 0 :
                 sig = sig[:- sig.size%nbchannel]
-            sig = sig.reshape((sig.size/nbchannel,nbchannel))
+            sig = sig.reshape((sig.size//nbchannel,nbchannel))
+            # only the selected samples and channels are decoded
+            start, stop = selection.sample_range(t_start, sampling_rate,
+                                                 sig.shape[0])
+            channels = selection.channels(range(nbchannel))
+            if len(channels) < nbchannel:
+                sig = sig[start:stop, channels]
+            else:
+                sig = sig[start:stop]
+            sig_t_start = (t_start + start / sampling_rate).rescale(t_start.units)
             if dtype.kind == 'i' :
                 sig = sig.astype('f')
                 sig /= 2**(8*dtype.itemsize)
@@ -138,19 +159,31 @@ class RawBinarySignalIO(BaseIO):
                 sig *= ( rangemax-rangemin )
                 sig += rangemin
             sig_with_units =  pq.Quantity(sig, units=unit, copy = False)
-        
-        for i in range(nbchannel) :
-            if lazy:
-                signal = [ ]*unit
-            else:
-                signal = sig_with_units[:,i]
-
-            anaSig = AnalogSignal(signal, sampling_rate=sampling_rate,
-                                  t_start=t_start, channel_index=i, copy = False)
-            
+        else:
+            # the samples are read only when the proxies are loaded
+            n_samples = (os.path.getsize(self.filename) - bytesoffset) // \
+                dtype.itemsize // nbchannel
+            gain = offset = None
+            if dtype.kind in 'iu':
+                gain = (rangemax - rangemin) / 2. ** (8 * dtype.itemsize)
+                if dtype.kind == 'i':
+                    offset = (rangemax + rangemin) / 2.
+                else:
+                    offset = rangemin
+            raw = RawArray(self.filename, dtype, (n_samples, nbchannel),
+                           byte_offset=bytesoffset, gain=gain, offset=offset)
+
+        for n, i in enumerate(selection.channels(range(nbchannel))) :
             if lazy:
-                # TODO
-                anaSig.lazy_shape = None
+                proxy = AnalogSignalProxy(raw, units=unit.units,
+                                          sampling_rate=sampling_rate,
+                                          t_start=t_start, columns=[i])
+                seg.analogsignals.append(selection.read(proxy, lazy=True))
+                continue
+
+            anaSig = AnalogSignal(sig_with_units[:,n],
+                                  sampling_rate=sampling_rate,
+                                  t_start=sig_t_start, channel_index=i, copy = False)
             seg.analogsignals.append(anaSig)
 
         seg.create_many_to_one_relationship()
@@ -190,7 +223,9 @@ class RawBinarySignalIO(BaseIO):
             sigs /= (rangemax - rangemin)
             sigs *= 2 ** (8 * dtype.itemsize)
         sigs = sigs.astype(dtype)
-            
+
+        # the file must not be mapped while it is written
+        self.close()
         f = open(self.filename, 'wb')
         f.write(sigs.tostring())
         f.close()
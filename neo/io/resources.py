@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+"""
+Pool of the files and memory maps opened by the IOs.
+
+Reading thousands of files in one process can run out of file descriptors
+or of address space if each reading keeps its files open or mapped.  The
+IOs therefore get them from :data:`resource_pool`, which keeps at most
+:attr:`ResourcePool.max_files` idle file objects and
+:attr:`ResourcePool.max_memmaps` memory maps, closing or dropping the least
+recently used ones, and reopens them when they are needed again::
+
+    >>> from neo.io.resources import resource_pool
+    >>> resource_pool.max_memmaps = 16
+    >>> with resource_pool.open(filename) as fobj:
+    ...     fobj.seek(header_size)
+    ...     data = np.fromfile(fobj, dtype='i2', count=n)
+    >>> sig = resource_pool.memmap(filename, 'i2', 'r', offset=header_size,
+    ...                            shape=(n_samples, n_channels))
+
+:meth:`BaseIO.close` (called at the end of a ``with`` block on an IO)
+releases those of the file of the IO::
+
+    >>> with AxonIO(filename) as reader:
+    ...     blk = reader.read_block()
+"""
+
+# needed for python 3 compatibility
+from __future__ import absolute_import, division, print_function
+
+from contextlib import contextmanager
+import os
+import threading
+
+import numpy as np
+
+
+class ResourcePool(object):
+    """
+    Bounded pool of file objects and read-only memory maps, shared by the
+    IOs and safe to use from several threads.
+
+    *Usage*::
+
+        >>> pool = ResourcePool(max_files=8, max_memmaps=8)
+        >>> with pool.open('data.raw') as fobj:
+        ...     header = fobj.read(512)
+        >>> data = pool.memmap('data.raw', 'i2', 'r', offset=512)
+        >>> pool.release('data.raw')
+
+    A file object is lent to one caller at a time by :meth:`open`, then kept
+    open, up to :attr:`max_files` of them, for the next caller.  Each file
+    is mapped once by :meth:`memmap`, which returns views of the mapping;
+    a mapping dropped from the pool is unmapped once the arrays viewing it
+    are deleted.
+
+    *Recommended attributes/properties*:
+        :max_files: (int) Maximum number of idle file objects kept open.
+        :max_memmaps: (int) Maximum number of files kept mapped.
+
+    *Properties available on this object*:
+        :n_files: (int) Number of idle file objects kept open.
+        :n_memmaps: (int) Number of files kept mapped.
+    """
+
+    def __init__(self, max_files=32, max_memmaps=32):
+        self.max_files = max_files
+        self.max_memmaps = max_memmaps
+        self._lock = threading.Lock()
+        # counter giving the order of use of the resources
+        self._tick = 0
+        # idle [tick, file object] lists by (filename, mode), and
+        # [tick, file signature, memmap] by filename
+        self._files = {}
+        self._memmaps = {}
+
+    @property
+    def n_files(self):
+        with self._lock:
+            return sum(len(idle) for idle in self._files.values())
+
+    @property
+    def n_memmaps(self):
+        with self._lock:
+            return len(self._memmaps)
+
+    def _next_tick(self):
+        self._tick += 1
+        return self._tick
+
+    @staticmethod
+    def _signature(stat):
+        """
+        What identifies the version of a file in its :func:`os.stat`: a file
+        replaced or rewritten since it was opened is opened again.
+        """
+        return stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime
+
+    @contextmanager
+    def open(self, filename, mode='rb'):
+        """
+        Context manager lending an idle file object of :attr:`filename`
+        opened in :attr:`mode`, or a newly opened one.  Its position is
+        undefined: seek before reading.
+        """
+        key = (os.path.abspath(filename), mode)
+        fobj = None
+        with self._lock:
+            idle = self._files.get(key)
+            if idle:
+                fobj = idle.pop()[1]
+        if fobj is not None and 'w' not in mode and (
+                os.fstat(fobj.fileno()).st_ino != os.stat(filename).st_ino):
+            # the file has been replaced
+            fobj.close()
+            fobj = None
+        if fobj is None:
+            fobj = open(filename, mode)
+        try:
+            yield fobj
+        finally:
+            if not fobj.closed:
+                with self._lock:
+                    self._files.setdefault(key, []).append(
+                        [self._next_tick(), fobj])
+                    self._evict_files()
+
+    def _evict_files(self):
+        """
+        Close the least recently used idle file objects beyond
+        :attr:`max_files`.
+        """
+        entries = [(entry[0], key, entry)
+                   for key, idle in self._files.items() for entry in idle]
+        entries.sort(key=lambda item: item[0])
+        for _, key, entry in entries[:max(len(entries) - self.max_files, 0)]:
+            self._files[key].remove(entry)
+            if not self._files[key]:
+                del self._files[key]
+            entry[1].close()
+
+    def memmap(self, filename, dtype, mode='r', offset=0, shape=None):
+        """
+        Read-only array of :attr:`dtype` and :attr:`shape` (to the end of the
+        file if None) at :attr:`offset` bytes in :attr:`filename`, as
+        :func:`numpy.memmap` returns, but viewing a mapping of the file
+        kept in the pool.
+        """
+        if mode != 'r':
+            raise ValueError('only read-only memory maps are pooled')
+        dtype = np.dtype(dtype)
+        if shape is not None:
+            if np.isscalar(shape):
+                shape = (shape,)
+            shape = tuple(int(n) for n in shape)
+            nbytes = int(np.prod(shape)) * dtype.itemsize
+        else:
+            nbytes = os.path.getsize(filename) - offset
+            if nbytes % dtype.itemsize:
+                raise ValueError('Size of available data is not a multiple '
+                                 'of the data-type size.')
+            shape = (nbytes // dtype.itemsize,)
+        if not nbytes:
+            # empty files cannot be mapped
+            return np.zeros(shape, dtype=dtype)
+        mapping = self._mapping(filename, offset + nbytes)
+        return mapping[offset:offset + nbytes].view(dtype).reshape(shape)
+
+    def _mapping(self, filename, size):
+        """
+        The byte mapping of the whole file :attr:`filename`, which must be at
+        least :attr:`size` bytes long.
+        """
+        key = os.path.abspath(filename)
+        signature = self._signature(os.stat(filename))
+        with self._lock:
+            entry = self._memmaps.get(key)
+            if entry is not None and entry[1] == signature:
+                entry[0] = self._next_tick()
+                mapping = entry[2]
+            else:
+                mapping = None
+        if mapping is None:
+            # mapped outside of the lock, the file may be large
+            mapping = np.memmap(filename, dtype='u1', mode='r')
+            with self._lock:
+                self._memmaps[key] = [self._next_tick(), signature, mapping]
+                self._evict_memmaps()
+        if len(mapping) < size:
+            raise ValueError('%s has %d bytes, %d are needed' %
+                             (filename, len(mapping), size))
+        return mapping
+
+    def _evict_memmaps(self):
+        """
+        Drop the least recently used memory maps beyond :attr:`max_memmaps`.
+        """
+        excess = len(self._memmaps) - self.max_memmaps
+        if excess > 0:
+            oldest = sorted(self._memmaps,
+                            key=lambda name: self._memmaps[name][0])
+            for name in oldest[:excess]:
+                del self._memmaps[name]
+
+    def release(self, filename=None):
+        """
+        Close the idle file objects and drop the memory maps of
+        :attr:`filename`, or of all files if None.  Files about to be
+        written must be released first.
+        """
+        key = None if filename is None else os.path.abspath(filename)
+        closing = []
+        with self._lock:
+            for file_key in list(self._files):
+                if key is None or file_key[0] == key:
+                    closing.extend(entry[1]
+                                   for entry in self._files.pop(file_key))
+            for name in list(self._memmaps):
+                if key is None or name == key:
+                    del self._memmaps[name]
+        for fobj in closing:
+            fobj.close()
+
+
+#: The pool of the IOs.
+resource_pool = ResourcePool()
@@ -0,0 +1,320 @@
+# -*- coding: utf-8 -*-
+"""
+Selection of the part of a file read by the IOs.
+
+:meth:`BaseIO.read` accepts three keyword arguments restricting what is
+read:
+
+    :channel_indexes: (list of int) The channels whose signals, spike
+        trains and events are read.  Objects without a channel index are
+        always read.
+    :unit_ids: (list) The units whose spike trains are read, matched
+        against the ``unit_id`` annotation of the trains (or of their
+        :class:`Unit`).
+    :time_range: (pair of quantity scalars) The (t_start, t_stop) times
+        between which the data are read, either being None for no limit.
+
+*Usage*::
+
+    >>> blk = AxonIO(filename).read_block(channel_indexes=[0, 3],
+    ...                                   time_range=(10*pq.s, 20*pq.s))
+
+The ``read_block``/``read_segment`` methods of the IOs accept the arguments
+listed in their **supported_selection** attribute, and skip the unselected
+channels or units, or only read and decode the samples in the time range
+(through the proxies of :mod:`neo.io.proxyobjects`).  :meth:`BaseIO.read`
+applies the other arguments once the data are read, with
+:meth:`DataSelection.select_block`; with ``lazy=True`` only the channels
+and units are then selected.
+"""
+
+# needed for python 3 compatibility
+from __future__ import absolute_import, division, print_function
+
+import numpy as np
+
+from neo.core import (AnalogSignal, AnalogSignalArray, Epoch, EpochArray,
+                      Event, EventArray, IrregularlySampledSignal, Spike,
+                      SpikeTrain)
+from neo.io.proxyobjects import sample_range
+
+
+class DataSelection(object):
+    """
+    The channels, units and time range to read from a file.
+
+    *Usage*::
+
+        >>> selection = DataSelection(channel_indexes=[0, 3],
+        ...                           time_range=(10*pq.s, 20*pq.s))
+        >>> for i in selection.channels(range(n_channels)):
+        ...     sig = selection.read(proxies[i], lazy)
+
+    *Recommended attributes/properties*:
+        :channel_indexes: (list of int) The channels to read.
+            Default: all of them.
+        :unit_ids: (list) The units to read.  Default: all of them.
+        :time_range: (pair of quantity scalars) The times between which the
+            data are read.  Default: the whole recording.
+
+    *Properties available on this object*:
+        :selects_all: (bool) True if everything is read.
+    """
+
+    keys = ('channel_indexes', 'unit_ids', 'time_range')
+
+    def __init__(self, channel_indexes=None, unit_ids=None,
+                 time_range=None):
+        if channel_indexes is not None:
+            channel_indexes = [int(ind) for ind in channel_indexes]
+        if unit_ids is not None:
+            unit_ids = list(unit_ids)
+        if time_range is not None:
+            time_range = tuple(time_range)
+            if all(time is None for time in time_range):
+                time_range = None
+        self.channel_indexes = channel_indexes
+        self.unit_ids = unit_ids
+        self.time_range = time_range
+
+    @classmethod
+    def pop(cls, kargs):
+        """
+        The selection given by the keyword arguments :attr:`kargs`, which
+        are removed from it.
+        """
+        return cls(**dict((key, kargs.pop(key)) for key in cls.keys
+                          if key in kargs))
+
+    @property
+    def selects_all(self):
+        return (self.channel_indexes is None and self.unit_ids is None and
+                self.time_range is None)
+
+    def kwargs(self):
+        """
+        The keyword arguments giving this selection.
+        """
+        return dict((key, getattr(self, key)) for key in self.keys
+                    if getattr(self, key) is not None)
+
+    def split(self, keys):
+        """
+        The keyword arguments of this selection in :attr:`keys`, and the
+        selection given by the other arguments.
+        """
+        kwargs = self.kwargs()
+        native = dict((key, value) for key, value in kwargs.items()
+                      if key in keys)
+        others = dict((key, value) for key, value in kwargs.items()
+                      if key not in keys)
+        return native, DataSelection(**others)
+
+    def keep_channel(self, channel_index):
+        """
+        True if the objects of the channel :attr:`channel_index` (None for
+        objects without a channel) are read.
+        """
+        return (self.channel_indexes is None or channel_index is None or
+                int(channel_index) in self.channel_indexes)
+
+    def keep_unit(self, unit_id):
+        """
+        True if the spike trains of the unit :attr:`unit_id` are read.
+        """
+        return self.unit_ids is None or unit_id in self.unit_ids
+
+    def channels(self, channel_indexes):
+        """
+        Positions in :attr:`channel_indexes` of the channels read.
+        """
+        return [pos for pos, ind in enumerate(channel_indexes)
+                if self.keep_channel(ind)]
+
+    def sample_range(self, t_start, sampling_rate, n_samples):
+        """
+        First and last (excluded) indexes of the samples in the time range
+        of a signal of :attr:`n_samples` samples.
+        """
+        return sample_range(t_start, sampling_rate, n_samples,
+                            self.time_range)
+
+    def time_limits(self, units):
+        """
+        The limits of the time range as floats in :attr:`units`, -inf and
+        inf standing for no limit, to test many times at little cost.
+        """
+        t_first, t_last = -np.inf, np.inf
+        if self.time_range is not None:
+            if self.time_range[0] is not None:
+                t_first = float(self.time_range[0].rescale(units).magnitude)
+            if self.time_range[1] is not None:
+                t_last = float(self.time_range[1].rescale(units).magnitude)
+        return t_first, t_last
+
+    def time_bounds(self, times):
+        """
+        First and last (excluded) indexes of the sorted :attr:`times` (a
+        quantity array) in the time range, both ends included.
+        """
+        start, stop = 0, len(times)
+        if self.time_range is None:
+            return start, stop
+        t_first, t_last = self.time_range
+        magnitude = times.magnitude
+        if t_first is not None:
+            t_first = float(t_first.rescale(times.units).magnitude)
+            start = int(np.searchsorted(magnitude, t_first, 'left'))
+        if t_last is not None:
+            t_last = float(t_last.rescale(times.units).magnitude)
+            stop = int(np.searchsorted(magnitude, t_last, 'right'))
+        return start, max(stop, start)
+
+    def read(self, proxy, lazy=False):
+        """
+        The object of :attr:`proxy` (see :mod:`neo.io.proxyobjects`) in the
+        time range: loaded, or empty with a proxy of its selected part if
+        :attr:`lazy` is True.
+        """
+        if lazy:
+            if self.time_range is not None:
+                proxy = proxy.time_sliced(self.time_range)
+            return proxy.lazy_object()
+        return proxy.load(time_slice=self.time_range)
+
+    def _unit_id(self, obj):
+        """
+        The unit id of the SpikeTrain or Spike :attr:`obj`.
+        """
+        unit_id = obj.annotations.get('unit_id')
+        unit = getattr(obj, 'unit', None)
+        if unit_id is None and unit is not None:
+            unit_id = unit.annotations.get('unit_id')
+        return unit_id
+
+    def _time_slice(self, obj):
+        """
+        The part of :attr:`obj` in the time range.
+        """
+        t_first, t_last = self.time_range
+        if isinstance(obj, (AnalogSignal, AnalogSignalArray)):
+            start, stop = self.sample_range(obj.t_start, obj.sampling_rate,
+                                            len(obj))
+            # a slice object, so that __getitem__ updates t_start
+            return obj[slice(start, stop)]
+        if isinstance(obj, (SpikeTrain, EventArray, EpochArray)):
+            return obj.time_slice(t_first, t_last)
+        if isinstance(obj, IrregularlySampledSignal):
+            mask = np.ones(len(obj), dtype=bool)
+            if t_first is not None:
+                mask &= obj.times >= t_first
+            if t_last is not None:
+                mask &= obj.times <= t_last
+            return obj[mask]
+        if isinstance(obj, (Spike, Event, Epoch)):
+            if ((t_first is not None and obj.time < t_first) or
+                    (t_last is not None and obj.time > t_last)):
+                return None
+        return obj
+
+    def _select_channels(self, sigarr):
+        """
+        The selected channels of the AnalogSignalArray :attr:`sigarr`, or
+        None if there are none.
+        """
+        if self.channel_indexes is None or sigarr.channel_index is None:
+            return sigarr
+        channel_index = np.asarray(sigarr.channel_index)
+        positions = self.channels(channel_index)
+        if not positions:
+            return None
+        if len(positions) == len(channel_index):
+            return sigarr
+        data = sigarr.magnitude
+        if data.size:
+            data = data[:, positions]
+        else:
+            data = np.zeros((0, len(positions)), dtype=data.dtype)
+        new_sigarr = AnalogSignalArray(data, units=sigarr.units,
+                                       t_start=sigarr.t_start,
+                                       sampling_rate=sigarr.sampling_rate,
+                                       channel_index=channel_index[positions],
+                                       name=sigarr.name,
+                                       description=sigarr.description,
+                                       file_origin=sigarr.file_origin,
+                                       **sigarr.annotations)
+        if hasattr(sigarr, 'lazy_shape'):
+            new_sigarr.lazy_shape = (sigarr.lazy_shape[0], len(positions))
+        return new_sigarr
+
+    def select_object(self, obj, lazy=False):
+        """
+        The selected part of the data object :attr:`obj`, or None if none
+        of it is selected.  With :attr:`lazy` the time range is ignored.
+        """
+        if isinstance(obj, AnalogSignalArray):
+            obj = self._select_channels(obj)
+        else:
+            channel_index = getattr(obj, 'channel_index', None)
+            if channel_index is None:
+                channel_index = obj.annotations.get('channel_index')
+            if not self.keep_channel(channel_index):
+                return None
+        if isinstance(obj, (SpikeTrain, Spike)):
+            if (self.unit_ids is not None and
+                    not self.keep_unit(self._unit_id(obj))):
+                return None
+        if obj is None or lazy or self.time_range is None:
+            return obj
+        return self._time_slice(obj)
+
+    def select_segment(self, seg, lazy=False):
+        """
+        Keep only the selected data of the Segment :attr:`seg`.  Returns a
+        dict of the new objects by the id of the objects they replace (None
+        for the removed ones).
+        """
+        replaced = {}
+        for attr in ('analogsignals', 'analogsignalarrays',
+                     'irregularlysampledsignals', 'spiketrains', 'spikes',
+                     'eventarrays', 'events', 'epocharrays', 'epochs'):
+            objects = []
+            for obj in getattr(seg, attr):
+                new_obj = self.select_object(obj, lazy=lazy)
+                if new_obj is not obj:
+                    replaced[id(obj)] = new_obj
+                if new_obj is not None:
+                    new_obj.segment = seg
+                    objects.append(new_obj)
+            setattr(seg, attr, objects)
+        return replaced
+
+    def select_block(self, blk, lazy=False):
+        """
+        Keep only the selected data of the Block :attr:`blk`, in its
+        Segments and in its RecordingChannelGroups, and return it.
+        """
+        replaced = {}
+        for seg in blk.segments:
+            replaced.update(self.select_segment(seg, lazy=lazy))
+        if not replaced:
+            return blk
+
+        def update(container, attr):
+            objects = []
+            for obj in getattr(container, attr):
+                new_obj = replaced.get(id(obj), obj)
+                if new_obj is not None:
+                    objects.append(new_obj)
+            setattr(container, attr, objects)
+
+        for rcg in blk.recordingchannelgroups:
+            update(rcg, 'analogsignalarrays')
+            for rc in rcg.recordingchannels:
+                update(rc, 'analogsignals')
+                update(rc, 'irregularlysampledsignals')
+            for unit in rcg.units:
+                update(unit, 'spiketrains')
+                update(unit, 'spikes')
+        blk.create_many_to_one_relationship(force=True)
+        return blk
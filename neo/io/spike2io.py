@@ -29,7 +29,9 @@ import numpy as np
 import quantities as pq
 
 from neo.io.baseio import BaseIO
+from neo.io.resources import resource_pool
 from neo.core import Segment, AnalogSignal, SpikeTrain, EventArray
+from neo.core.streaming import map_threads
 
 PY3K = (sys.version_info[0] == 3)
 
@@ -80,18 +82,17 @@ class Spike2IO(BaseIO):
                                             take_ideal_sampling_rate = False,
                                             lazy = False,
                                             cascade = True,
-
+                                            num_threads = 1,
                                                 ):
         """
         Arguments:
+            num_threads : number of threads decoding the channels, each
+                reading with its own file object (1 by default)
         """
 
 
         header = self.read_header(filename = self.filename)
 
-        #~ print header
-        fid = open(self.filename, 'rb')
-
         seg  = Segment(
                                     file_origin = os.path.basename(self.filename),
                                     ced_version = str(header.system_id),
@@ -105,41 +106,36 @@ class Spike2IO(BaseIO):
             ob.annotate(physical_channel_index = channelHeader.phy_chan)
             ob.annotate(comment = channelHeader.comment)
 
-        for i in range(header.channels) :
+        def read_channel(i):
+            # the channels are independent once the header is read, so each
+            # one is read with its own file object, lent by the pool
             channelHeader = header.channelHeaders[i]
+            with resource_pool.open(self.filename) as fid:
+                if channelHeader.kind in [1, 9]:
+                    return self.readOneChannelContinuous( fid, i, header, take_ideal_sampling_rate, lazy = lazy)
+                elif channelHeader.kind in  [2, 3, 4, 5, 6, 7, 8] :
+                    return self.readOneChannelEventOrSpike( fid, i, header , lazy = lazy)
 
-            #~ print 'channel' , i , 'kind' ,  channelHeader.kind
+        channels = map_threads(read_channel, range(header.channels), num_threads)
 
-            if channelHeader.kind !=0:
-                #~ print '####'
-                #~ print 'channel' , i, 'kind' , channelHeader.kind , channelHeader.type , channelHeader.phy_chan
-                #~ print channelHeader
-                pass
+        for i, ob in enumerate(channels) :
+            channelHeader = header.channelHeaders[i]
 
             if channelHeader.kind in [1, 9]:
-                #~ print 'analogChanel'
-                anaSigs = self.readOneChannelContinuous( fid, i, header, take_ideal_sampling_rate, lazy = lazy)
-                #~ print 'nb sigs', len(anaSigs) , ' sizes : ',
-                for anaSig in anaSigs :
+                for anaSig in ob :
                     addannotations(anaSig, channelHeader)
                     anaSig.name = str(anaSig.annotations['title'])
                     seg.analogsignals.append( anaSig )
-                    #~ print sig.signal.size,
-                #~ print ''
 
             elif channelHeader.kind in  [2, 3, 4, 5, 8] :
-                ea = self.readOneChannelEventOrSpike( fid, i, header , lazy = lazy)
-                if ea is not None:
-                    addannotations(ea, channelHeader)
-                    seg.eventarrays.append(ea)
+                if ob is not None:
+                    addannotations(ob, channelHeader)
+                    seg.eventarrays.append(ob)
 
             elif channelHeader.kind in  [6,7] :
-                sptr = self.readOneChannelEventOrSpike( fid, i, header, lazy = lazy )
-                if sptr is not None:
-                    addannotations(sptr, channelHeader)
-                    seg.spiketrains.append(sptr)
-
-        fid.close()
+                if ob is not None:
+                    addannotations(ob, channelHeader)
+                    seg.spiketrains.append(ob)
 
         seg.create_many_to_one_relationship()
         return seg
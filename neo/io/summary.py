@@ -0,0 +1,252 @@
+# -*- coding: utf-8 -*-
+"""
+Summaries of the contents of files, returned by :meth:`BaseIO.describe`.
+
+A :class:`FileSummary` lists the signals, spike trains, events and epochs of
+a file with their channel, sampling rate and size, but holds none of their
+data, so that thousands of files can be inventoried quickly::
+
+    >>> summary = PlexonIO(filename).describe()
+    >>> summary.channel_indexes
+    [1, 2, 3, 4]
+    >>> summary.n_spikes
+    15324
+    >>> summary.duration
+    array(1205.3) * s
+
+IOs which can parse the headers and block indexes of their format build the
+summary from them directly.  The others read the file with ``lazy=True``
+and summarize the empty objects, using their ``lazy_shape``.
+"""
+
+# needed for python 3 compatibility
+from __future__ import absolute_import, division, print_function
+
+from collections import namedtuple
+import os
+
+import numpy as np
+import quantities as pq
+
+from neo.core import EpochArray, EventArray
+
+#: An analog signal: the index of its Segment, its channel, name, sampling
+#: rate, t_start (quantity scalars), number of samples and units.
+SignalSummary = namedtuple('SignalSummary',
+                           ['segment', 'channel_index', 'name',
+                            'sampling_rate', 't_start', 'n_samples',
+                            'units'])
+
+#: A spike train: the index of its Segment, its channel, unit id, name and
+#: number of spikes.
+SpikeTrainSummary = namedtuple('SpikeTrainSummary',
+                               ['segment', 'channel_index', 'unit_id',
+                                'name', 'n_spikes'])
+
+#: An event or epoch array: the index of its Segment, its channel, name and
+#: number of events or epochs.
+EventSummary = namedtuple('EventSummary',
+                          ['segment', 'channel_index', 'name', 'n_events'])
+
+
+def _lazy_size(obj):
+    """
+    Number of samples, spikes or events of :attr:`obj`, which may have been
+    read with ``lazy=True``.
+    """
+    shape = getattr(obj, 'lazy_shape', None)
+    if shape is None:
+        if isinstance(obj, (EventArray, EpochArray)):
+            return len(obj.times)
+        return len(obj)
+    if np.isscalar(shape):
+        return int(shape)
+    return int(shape[0]) if len(shape) else 0
+
+
+class FileSummary(object):
+    """
+    The contents of a file, without their data.
+
+    *Usage*::
+
+        >>> summary = FileSummary(file_origin='data.plx', file_size=2**20)
+        >>> summary.add_signal(0, 1, 'FP01', 1*pq.kHz, 0*pq.s, 60000, 'mV')
+        >>> summary.add_spiketrain(0, 1, 1, 'sig001a', 542)
+        >>> summary.duration
+        array(60.0) * s
+
+    *Recommended attributes/properties*:
+        :file_origin: (str) Filesystem path or URL of the file.
+        :file_size: (int) Size of the file, or of the files of the
+            recording, in bytes.
+        :n_segments: (int) Number of Segments in the file.
+
+    *Properties available on this object*:
+        :signals: (list of :class:`SignalSummary`) The analog signals, one
+            per channel of each signal array.
+        :spiketrains: (list of :class:`SpikeTrainSummary`) The spike trains.
+        :eventarrays: (list of :class:`EventSummary`) The event arrays.
+        :epocharrays: (list of :class:`EventSummary`) The epoch arrays.
+        :channel_indexes: (list) The channels of the signals and spike
+            trains, sorted.
+        :sampling_rates: (list of quantity scalars) The distinct sampling
+            rates of the signals.
+        :t_start: (quantity scalar) Time of the first sample.
+        :t_stop: (quantity scalar) Time after the last sample.
+        :duration: (quantity scalar) :attr:`t_stop` - :attr:`t_start`.
+        :n_samples: (int) Total number of samples of all signals.
+        :n_spikes: (int) Total number of spikes.
+
+    Note: Any other additional arguments are stored as annotations, e.g.
+    the version of the format.
+    """
+
+    def __init__(self, file_origin=None, file_size=None, n_segments=0,
+                 **annotations):
+        self.file_origin = file_origin
+        self.file_size = file_size
+        self.n_segments = n_segments
+        self.annotations = annotations
+        self.signals = []
+        self.spiketrains = []
+        self.eventarrays = []
+        self.epocharrays = []
+
+    @classmethod
+    def from_file(cls, filename, **annotations):
+        """
+        An empty summary of the file :attr:`filename`, with its size.
+        """
+        file_size = None
+        if filename is not None and os.path.isfile(filename):
+            file_size = os.path.getsize(filename)
+        elif filename is not None and os.path.isdir(filename):
+            file_size = 0
+            for dirpath, _, filenames in os.walk(filename):
+                for name in filenames:
+                    file_size += os.path.getsize(os.path.join(dirpath, name))
+        return cls(file_origin=filename, file_size=file_size, **annotations)
+
+    def add_signal(self, segment, channel_index, name, sampling_rate,
+                   t_start, n_samples, units):
+        """
+        Add an analog signal.
+        """
+        self.signals.append(SignalSummary(segment, channel_index, name,
+                                          sampling_rate, t_start,
+                                          int(n_samples), units))
+
+    def add_spiketrain(self, segment, channel_index, unit_id, name,
+                       n_spikes):
+        """
+        Add a spike train.
+        """
+        self.spiketrains.append(SpikeTrainSummary(segment, channel_index,
+                                                  unit_id, name,
+                                                  int(n_spikes)))
+
+    def add_eventarray(self, segment, channel_index, name, n_events):
+        """
+        Add an event array.
+        """
+        self.eventarrays.append(EventSummary(segment, channel_index, name,
+                                             int(n_events)))
+
+    def add_epocharray(self, segment, channel_index, name, n_epochs):
+        """
+        Add an epoch array.
+        """
+        self.epocharrays.append(EventSummary(segment, channel_index, name,
+                                             int(n_epochs)))
+
+    def add_segment(self, seg):
+        """
+        Add the contents of the Segment :attr:`seg`, which can have been
+        read with ``lazy=True``.
+        """
+        index = self.n_segments
+        self.n_segments += 1
+        for sig in seg.analogsignals:
+            self.add_signal(index, sig.channel_index, sig.name,
+                            sig.sampling_rate, sig.t_start, _lazy_size(sig),
+                            sig.units)
+        for sigarr in seg.analogsignalarrays:
+            shape = getattr(sigarr, 'lazy_shape', sigarr.shape)
+            channel_indexes = sigarr.channel_index
+            n_channels = shape[1] if len(shape) > 1 else 1
+            if channel_indexes is None:
+                channel_indexes = [None] * n_channels
+            for channel_index in np.atleast_1d(channel_indexes):
+                self.add_signal(index, channel_index, sigarr.name,
+                                sigarr.sampling_rate, sigarr.t_start,
+                                shape[0], sigarr.units)
+        for sptr in seg.spiketrains:
+            unit = getattr(sptr, 'unit', None)
+            unit_id = sptr.annotations.get('unit_id')
+            if unit_id is None and unit is not None:
+                unit_id = unit.annotations.get('unit_id')
+            self.add_spiketrain(index, sptr.annotations.get('channel_index'),
+                                unit_id, sptr.name, _lazy_size(sptr))
+        for evtarr in seg.eventarrays:
+            self.add_eventarray(index, evtarr.annotations.get('channel_index'),
+                                evtarr.name, _lazy_size(evtarr))
+        for epcarr in seg.epocharrays:
+            self.add_epocharray(index, epcarr.annotations.get('channel_index'),
+                                epcarr.name, _lazy_size(epcarr))
+
+    def add_block(self, blk):
+        """
+        Add the contents of the Segments of the Block :attr:`blk`.
+        """
+        for seg in blk.segments:
+            self.add_segment(seg)
+
+    @property
+    def channel_indexes(self):
+        channels = set(sig.channel_index for sig in self.signals)
+        channels.update(sptr.channel_index for sptr in self.spiketrains)
+        return sorted(int(ind) for ind in channels if ind is not None)
+
+    @property
+    def sampling_rates(self):
+        rates = []
+        for sig in self.signals:
+            if not any(sig.sampling_rate == rate for rate in rates):
+                rates.append(sig.sampling_rate)
+        return rates
+
+    @property
+    def t_start(self):
+        if not self.signals:
+            return None
+        return min(sig.t_start.rescale(pq.s) for sig in self.signals)
+
+    @property
+    def t_stop(self):
+        if not self.signals:
+            return None
+        return max((sig.t_start + sig.n_samples /
+                    sig.sampling_rate).rescale(pq.s)
+                   for sig in self.signals)
+
+    @property
+    def duration(self):
+        if not self.signals:
+            return None
+        return self.t_stop - self.t_start
+
+    @property
+    def n_samples(self):
+        return sum(sig.n_samples for sig in self.signals)
+
+    @property
+    def n_spikes(self):
+        return sum(sptr.n_spikes for sptr in self.spiketrains)
+
+    def __repr__(self):
+        return ('<FileSummary(%r, %s segments, %s signals, %s spike trains, '
+                '%s event arrays, %s epoch arrays)>' %
+                (self.file_origin, self.n_segments, len(self.signals),
+                 len(self.spiketrains), len(self.eventarrays),
+                 len(self.epocharrays)))
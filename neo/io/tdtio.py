@@ -25,6 +25,7 @@ import quantities as pq
 import itertools
 
 from neo.io.baseio import BaseIO
+from neo.io.summary import FileSummary
 from neo.core import Block, Segment, AnalogSignal, SpikeTrain, EventArray
 from neo.io.tools import iteritems
 
@@ -102,28 +103,27 @@ class TdtIO(BaseIO):
         tankname = os.path.basename(self.dirname)
         bl.file_origin = tankname
         if not cascade : return bl
+        bl.segments = list(self._iter_segments(lazy = lazy))
+        bl.create_many_to_one_relationship()
+        return bl
+
+    def _iter_segments(self, lazy = False):
+        """
+        Generator of the Segments of the tank, one per TDT block, each read
+        when it is reached.
+        """
+        tankname = os.path.basename(self.dirname)
         for blockname in os.listdir(self.dirname):
             if blockname == 'TempBlk': continue
             subdir = os.path.join(self.dirname,blockname)
             if not os.path.isdir(subdir): continue
 
             seg = Segment(name = blockname)
-            bl.segments.append( seg)
 
 
             #TSQ is the global index
             tsq_filename = os.path.join(subdir, tankname+'_'+blockname+'.tsq')
-            dt = [('size','int32'),
-                        ('evtype','int32'),
-                        ('code','S4'),
-                        ('channel','uint16'),
-                        ('sortcode','uint16'),
-                        ('timestamp','float64'),
-                        ('eventoffset','int64'),
-                        ('dataformat','int32'),
-                        ('frequency','float32'),
-                    ]
-            tsq = np.fromfile(tsq_filename, dtype = dt)
+            tsq = np.fromfile(tsq_filename, dtype = tsq_dtype)
             
             #0x8801: 'EVTYPE_MARK' give the global_start
             global_t_start = tsq[tsq['evtype']==0x8801]['timestamp'][0]
@@ -152,11 +152,17 @@ class TdtIO(BaseIO):
                         if type_label in ['EVTYPE_STRON', 'EVTYPE_STROFF']:
                             if lazy:
                                 times = [ ]*pq.s
-                                labels = np.array([ ], dtype = str)
+                                label_names = np.array([ ], dtype = 'S')
+                                label_codes = np.array([ ], dtype = 'i')
                             else:
                                 times = (tsq[mask3]['timestamp'] - global_t_start) * pq.s
-                                labels = tsq[mask3]['eventoffset'].view('float64').astype('S')
-                            ea = EventArray(times = times, name = code , channel_index = int(channel), labels = labels)
+                                # strobe values repeat a lot, so store them as
+                                # categorical labels
+                                strobes = tsq[mask3]['eventoffset'].view('float64')
+                                label_names, label_codes = np.unique(strobes, return_inverse = True)
+                                label_names = label_names.astype('S')
+                            ea = EventArray(times = times, name = code , channel_index = int(channel),
+                                            label_codes = label_codes, label_names = label_names)
                             if lazy:
                                 ea.lazy_shape = np.sum(mask3)
                             seg.eventarrays.append(ea)
@@ -225,11 +231,65 @@ class TdtIO(BaseIO):
                             if lazy:
                                 anasig.lazy_shape = shape
                             seg.analogsignals.append(anasig)
-        bl.create_many_to_one_relationship()
-        return bl
+            seg.create_many_to_one_relationship()
+            yield seg
+
+    def describe(self, **kargs):
+        """
+        Summary of the tank, read from the tsq index files only.
+        """
+        summary = FileSummary.from_file(self.dirname)
+        tankname = os.path.basename(self.dirname)
+        for blockname in os.listdir(self.dirname):
+            if blockname == 'TempBlk': continue
+            subdir = os.path.join(self.dirname,blockname)
+            if not os.path.isdir(subdir): continue
+            seg_index = summary.n_segments
+            summary.n_segments += 1
+
+            tsq_filename = os.path.join(subdir, tankname+'_'+blockname+'.tsq')
+            tsq = np.fromfile(tsq_filename, dtype = tsq_dtype)
+            global_t_start = tsq[tsq['evtype']==0x8801]['timestamp'][0]
+
+            for type_code, type_label in tdt_event_type:
+                mask1 = tsq['evtype']==type_code
+                for code in np.unique(tsq[mask1]['code']):
+                    mask2 = mask1 & (tsq['code']==code)
+                    for channel in np.unique(tsq[mask2]['channel']):
+                        mask3 = mask2 & (tsq['channel']==channel)
+                        if type_label in ['EVTYPE_STRON', 'EVTYPE_STROFF']:
+                            summary.add_eventarray(seg_index, int(channel), code,
+                                                   np.sum(mask3))
+                        elif type_label == 'EVTYPE_SNIP':
+                            for sortcode in np.unique(tsq[mask3]['sortcode']):
+                                mask4 = mask3 & (tsq['sortcode']==sortcode)
+                                summary.add_spiketrain(seg_index, int(channel), int(sortcode),
+                                                       'Chan{} Code{}'.format(channel,sortcode),
+                                                       np.sum(mask4))
+                        elif type_label == 'EVTYPE_STREAM':
+                            # sizes are in 4 bytes words, with a 10 words header
+                            dt = np.dtype(data_formats[ tsq[mask3]['dataformat'][0]])
+                            n_samples = np.sum(tsq[mask3]['size']-10) * 4 // dt.itemsize
+                            summary.add_signal(seg_index, int(channel),
+                                               '{} {}'.format(code, channel),
+                                               tsq[mask3]['frequency'][0] * pq.Hz,
+                                               (tsq[mask3]['timestamp'][0] - global_t_start) * pq.s,
+                                               n_samples, pq.V)
+        return summary
             
 
 
+tsq_dtype = [('size','int32'),
+            ('evtype','int32'),
+            ('code','S4'),
+            ('channel','uint16'),
+            ('sortcode','uint16'),
+            ('timestamp','float64'),
+            ('eventoffset','int64'),
+            ('dataformat','int32'),
+            ('frequency','float32'),
+        ]
+
 tdt_event_type = [
    #(0x0,'EVTYPE_UNKNOWN'),
     (0x101, 'EVTYPE_STRON'),
@@ -3,6 +3,7 @@
 Tools for IO coder:
   * Creating RecordingChannel and making links with AnalogSignals and
     SPikeTrains
+  * Reading scattered chunks of a file at once
 """
 
 import collections
@@ -72,6 +73,24 @@ def populate_RecordingChannel(bl, remove_from_annotation=True):
         recordingchannels[ind].recordingchannelgroups.append(rcg)
 
 
+def read_chunks(source, offsets, sizes):
+    """
+    Return the concatenation of the chunks of the 1D array :attr:`source`
+    (e.g. a memmap of a file) starting at :attr:`offsets` with
+    :attr:`sizes`, gathered in one indexing operation.
+
+    Usage:
+    >>> data = read_chunks(np.memmap(filename, 'u1', 'r'), offsets, sizes)
+    """
+    offsets = np.asarray(offsets, dtype='i8')
+    sizes = np.asarray(sizes, dtype='i8')
+    if not sizes.size:
+        return np.asarray(source[:0])
+    starts = np.cumsum(sizes) - sizes
+    index = np.repeat(offsets - starts, sizes) + np.arange(sizes.sum())
+    return np.asarray(source[index])
+
+
 def iteritems(D):
     try:
         return D.iteritems()  # Python 2
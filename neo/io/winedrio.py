@@ -22,6 +22,7 @@ import numpy as np
 import quantities as pq
 
 from neo.io.baseio import BaseIO
+from neo.io.resources import resource_pool
 from neo.core import Segment, AnalogSignal
 
 PY3K = (sys.version_info[0] == 3)
@@ -98,7 +99,7 @@ class WinEdrIO(BaseIO):
             header[key] = val
 
         if not lazy:
-            data = np.memmap(self.filename , np.dtype('i2')  , 'r',
+            data = resource_pool.memmap(self.filename , np.dtype('i2')  , 'r',
                   #shape = (header['NC'], header['NP']) ,
                   shape = (header['NP']/header['NC'],header['NC'], ) ,
                   offset = header['NBH'])
@@ -20,6 +20,9 @@ import numpy as np
 import quantities as pq
 
 from neo.io.baseio import BaseIO
+from neo.io.proxyobjects import RawArray, AnalogSignalProxy
+from neo.io.resources import resource_pool
+from neo.io.selection import DataSelection
 from neo.core import Block, Segment, AnalogSignal
 
 PY3K = (sys.version_info[0] == 3)
@@ -51,6 +54,8 @@ class WinWcpIO(BaseIO):
 
     has_header         = False
     is_streameable     = False
+    has_lazy_proxies   = True
+    supported_selection = ['channel_indexes', 'time_range']
 
     read_params        = { Block : [ ], }
 
@@ -73,11 +78,34 @@ class WinWcpIO(BaseIO):
 
     def read_block(self , lazy = False,
                                     cascade = True,
+                                    channel_indexes = None,
+                                    time_range = None,
                                     ):
+        """
+        Read the file, or the channels of :attr:`channel_indexes` between
+        the times of :attr:`time_range` (see :mod:`neo.io.selection`).
+        """
         bl = Block( file_origin = os.path.basename(self.filename), )
         if not cascade:
             return bl
 
+        bl.segments = list(self._iter_segments(lazy=lazy,
+                                               channel_indexes=channel_indexes,
+                                               time_range=time_range))
+        bl.create_many_to_one_relationship()
+        return bl
+
+    def _iter_segments(self, lazy=False, channel_indexes=None,
+                       time_range=None):
+        """
+        Generator of the Segments of the file, one per record, each read
+        when it is reached.  See :meth:`read_block` for the arguments.
+        """
+        selection = DataSelection(channel_indexes=channel_indexes,
+                                  time_range=time_range)
+        # the selected part of the data is read through the proxies
+        use_proxies = lazy or not selection.selects_all
+
         fid = open(self.filename , 'rb')
 
         headertext = fid.read(1024)
@@ -108,20 +136,19 @@ class WinWcpIO(BaseIO):
             #print analysisHeader
 
             # read data
-            NP = (SECTORSIZE*header['NBD'])/2
+            NP = (SECTORSIZE*header['NBD'])//2
             NP = NP - NP%header['NC']
-            NP = NP/header['NC']
-            if not lazy:
-                data = np.memmap(self.filename , np.dtype('i2')  , 'r',
+            NP = NP//header['NC']
+            if not use_proxies:
+                data = resource_pool.memmap(self.filename , np.dtype('i2')  , 'r',
                               #shape = (header['NC'], header['NP']) ,
                               shape = (NP,header['NC'], ) ,
                               offset = offset+header['NBA']*SECTORSIZE)
 
             # create a segment
             seg = Segment()
-            bl.segments.append(seg)
 
-            for c in range(header['NC']):
+            for c in selection.channels(range(header['NC'])):
 
                 unit = header['YU%d'%c]
                 try :
@@ -129,13 +156,28 @@ class WinWcpIO(BaseIO):
                 except:
                     unit = pq.Quantity(1., '')
 
-                if lazy:
-                    signal = [ ] * unit
-                else:
-                    YG = float(header['YG%d'%c].replace(',','.'))
-                    ADCMAX = header['ADCMAX']
-                    VMax = analysisHeader['VMax'][c]
-                    signal = data[:,header['YO%d'%c]].astype('f4')*VMax/ADCMAX/YG * unit
+                YG = float(header['YG%d'%c].replace(',','.'))
+                ADCMAX = header['ADCMAX']
+                VMax = analysisHeader['VMax'][c]
+                if use_proxies:
+                    # the samples are read only when the proxy is loaded
+                    raw = RawArray(self.filename, 'i2', (NP, header['NC']),
+                                   byte_offset=offset+header['NBA']*SECTORSIZE,
+                                   gain=VMax/ADCMAX/YG)
+                    proxy = AnalogSignalProxy(raw, units=unit.units,
+                                              sampling_rate=
+                                              pq.Hz /
+                                              analysisHeader['SamplingInterval'],
+                                              t_start=
+                                              analysisHeader['TimeRecorded'] *
+                                              pq.s,
+                                              columns=[header['YO%d'%c]],
+                                              channel_indexes=[c],
+                                              name=header['YN%d'%c])
+                    seg.analogsignals.append(selection.read(proxy, lazy))
+                    continue
+
+                signal = data[:,header['YO%d'%c]].astype('f4')*VMax/ADCMAX/YG * unit
                 anaSig = AnalogSignal(signal,
                                       sampling_rate=
                                       pq.Hz /
@@ -143,15 +185,12 @@ class WinWcpIO(BaseIO):
                                       t_start=analysisHeader['TimeRecorded'] *
                                       pq.s,
                                       name=header['YN%d'%c], channel_index=c)
-
-                if lazy:
-                    anaSig.lazy_shape = NP
                 seg.analogsignals.append(anaSig)
 
-        fid.close()
+            seg.create_many_to_one_relationship()
+            yield seg
 
-        bl.create_many_to_one_relationship()
-        return bl
+        fid.close()
 
 
 
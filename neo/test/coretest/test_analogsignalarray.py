@@ -5,6 +5,8 @@ Tests of the neo.core.analogsignalarray.AnalogSignalArrayArray class
 
 import os
 import pickle
+import shutil
+import tempfile
 
 try:
     import unittest2 as unittest
@@ -21,8 +23,17 @@ except ImportError as err:
 else:
     HAVE_IPYTHON = True
 
+try:
+    import scipy.signal
+except ImportError:
+    HAVE_SCIPY = False
+else:
+    HAVE_SCIPY = True
+
 from neo.core.analogsignalarray import AnalogSignalArray
 from neo.core import AnalogSignal, Segment, RecordingChannelGroup
+from neo.core.streaming import (FilterStage, DecimateStage,
+                                CommonAverageReference)
 from neo.test.tools import (assert_arrays_almost_equal, assert_arrays_equal,
                             assert_neo_object_is_compliant,
                             assert_same_sub_schema)
@@ -759,6 +770,271 @@ class TestAnalogSignalArrayCombination(unittest.TestCase):
         assert_arrays_equal(merged24.channel_indexes, np.arange(5))
 
 
+class TestAnalogSignalArrayDetectSpikes(unittest.TestCase):
+    def setUp(self):
+        data = np.zeros((1000, 3))
+        data[[100, 101, 102, 103, 300, 999], 0] = -5
+        data[[500, 505, 520], 1] = -5
+        data[[0, 10], 2] = -5
+        self.signal = AnalogSignalArray(data, units='uV',
+                                        sampling_rate=1 * pq.kHz,
+                                        t_start=2 * pq.s,
+                                        channel_index=np.array([4, 5, 6]))
+        self.targ = [[2.1, 2.3, 2.999], [2.5, 2.52], [2.01]]
+
+    def check_trains(self, trains, targ, channel_indexes):
+        self.assertEqual(len(trains), len(targ))
+        for train, times, index in zip(trains, targ, channel_indexes):
+            assert_arrays_almost_equal(train.magnitude, np.array(times),
+                                       1e-9)
+            self.assertEqual(train.units, pq.s)
+            self.assertEqual(train.t_start, 2 * pq.s)
+            self.assertEqual(train.t_stop, 3 * pq.s)
+            self.assertEqual(train.annotations['channel_index'], index)
+
+    def test__detect_spikes_chunked(self):
+        for chunk_duration in [1 * pq.s, 101 * pq.ms, 1 * pq.ms]:
+            res = self.signal.detect_spikes(-1 * pq.uV,
+                                            refractory_period=10 * pq.ms,
+                                            chunk_duration=chunk_duration)
+            self.check_trains(res, self.targ, [4, 5, 6])
+
+    def test__detect_spikes_workers(self):
+        res = self.signal.detect_spikes(-1 * pq.uV, workers=3,
+                                        refractory_period=10 * pq.ms,
+                                        chunk_duration=50 * pq.ms)
+        self.check_trains(res, self.targ, [4, 5, 6])
+
+    def test__detect_spikes_refractory(self):
+        res = self.signal.detect_spikes(-1 * pq.uV, refractory_period=0 * pq.s,
+                                        channels=[1])
+        self.check_trains(res, [[2.5, 2.505, 2.52]], [5])
+
+    def test__detect_spikes_threshold_per_channel_above(self):
+        signal = AnalogSignalArray(-self.signal.magnitude, units='uV',
+                                   sampling_rate=1 * pq.kHz,
+                                   t_start=2 * pq.s,
+                                   channel_index=np.array([4, 5, 6]))
+        res = signal.detect_spikes(np.array([1, 1, 10]) * pq.uV,
+                                   sign='above', refractory_period=10 * pq.ms)
+        self.check_trains(res, self.targ[:2] + [[]], [4, 5, 6])
+
+    def test__detect_spikes_waveforms_segment(self):
+        seg = Segment()
+        res = self.signal.detect_spikes(-1 * pq.uV, channels=[0, 2],
+                                        refractory_period=10 * pq.ms,
+                                        waveforms=(1 * pq.ms, 2 * pq.ms),
+                                        segment=seg)
+        self.check_trains(res, [self.targ[0], self.targ[2]], [4, 6])
+        self.assertEqual(seg.spiketrains, res)
+        for train in res:
+            self.assertTrue(train.segment is seg)
+        self.assertEqual(res[0].waveforms.shape, (3, 1, 3))
+        assert_arrays_equal(res[0].waveforms[0, 0].magnitude,
+                            np.array([0., -5., -5.]))
+
+    def test__detect_spikes_invalid(self):
+        self.assertRaises(ValueError, self.signal.detect_spikes, -1 * pq.uV,
+                          sign='both')
+        self.assertRaises(ValueError, self.signal.detect_spikes,
+                          [1, 2] * pq.uV)
+
+
+class TestAnalogSignalArrayEnvelope(unittest.TestCase):
+    def setUp(self):
+        np.random.seed(12)
+        self.data = np.random.randn(10007, 2)
+        self.signal = AnalogSignalArray(self.data, units='mV',
+                                        sampling_rate=1 * pq.kHz,
+                                        t_start=1 * pq.s)
+
+    def check_envelope(self, times, mins, maxs, stop=None):
+        edges = (times - self.signal.t_start).rescale(pq.ms).magnitude
+        edges = np.round(edges)
+        edges = list(edges.astype('i')) + [stop]
+        for i in range(len(times)):
+            samples = self.data[edges[i]:edges[i + 1]]
+            assert_arrays_equal(mins[i].magnitude, samples.min(axis=0))
+            assert_arrays_equal(maxs[i].magnitude, samples.max(axis=0))
+        self.assertEqual(mins.units, pq.mV)
+        self.assertEqual(maxs.units, pq.mV)
+
+    def test__build_envelope(self):
+        pyramid = self.signal.build_envelope(base=8, factor=2, chunk_size=100)
+        self.assertTrue(self.signal.envelope is pyramid)
+        self.assertEqual(pyramid.bin_size(2), 32)
+        self.assertEqual(len(pyramid.mins[0]), 1251)
+        self.assertEqual(len(pyramid.mins[-1]), 1)
+        assert_arrays_equal(pyramid.mins[-1][0], self.data.min(axis=0))
+        assert_arrays_equal(pyramid.maxs[-1][0], self.data.max(axis=0))
+        self.assertEqual(self.signal[10:].envelope, None)
+
+    def test__get_envelope_whole(self):
+        self.signal.build_envelope(base=8, factor=2, chunk_size=100)
+        times, mins, maxs = self.signal.get_envelope(n_pixels=100)
+        self.assertEqual(mins.shape, (100, 2))
+        self.assertEqual(times[0], 1 * pq.s)
+        self.check_envelope(times, mins, maxs)
+
+    def test__get_envelope_zoom(self):
+        # built on demand; fine zooms are read from the signal itself
+        times, mins, maxs = self.signal.get_envelope(3 * pq.s, 3.1 * pq.s,
+                                                     n_pixels=20)
+        self.assertTrue(self.signal.envelope is not None)
+        self.assertEqual(len(times), 20)
+        self.assertEqual(times[0], 3 * pq.s)
+        self.check_envelope(times, mins, maxs, 2100)
+
+        times, mins, maxs = self.signal.get_envelope(2 * pq.s, 9 * pq.s,
+                                                     n_pixels=30)
+        self.assertTrue(len(times) <= 30)
+        self.assertTrue(times[0] <= 2 * pq.s)
+        self.check_envelope(times, mins, maxs, 8000)
+
+    def test__get_envelope_1d(self):
+        signal = AnalogSignal(np.arange(1000.), units='V',
+                              sampling_rate=1 * pq.Hz)
+        times, mins, maxs = signal.get_envelope(n_pixels=4)
+        assert_arrays_equal(times.magnitude, np.array([0., 256., 512., 768.]))
+        assert_arrays_equal(mins.magnitude, np.array([0., 256., 512., 768.]))
+        assert_arrays_equal(maxs.magnitude, np.array([255., 511., 767., 999.]))
+        self.assertEqual(maxs.units, pq.V)
+
+    def test__envelope_cache_file(self):
+        dirname = tempfile.mkdtemp()
+        try:
+            filename = os.path.join(dirname, 'signal.envelope.npz')
+            pyramid = self.signal.build_envelope(base=16, cache_file=filename)
+            self.assertTrue(os.path.exists(filename))
+            signal = self.signal.duplicate_with_new_array(self.data)
+            loaded = signal.build_envelope(cache_file=filename)
+            self.assertEqual(loaded.base, 16)
+            self.assertEqual(len(loaded.mins), len(pyramid.mins))
+            for arr1, arr2 in zip(loaded.maxs, pyramid.maxs):
+                assert_arrays_equal(arr1, arr2)
+            # a cache made for another signal is rebuilt
+            loaded = self.signal[:100].build_envelope(cache_file=filename)
+            self.assertEqual(loaded.n_samples, 100)
+        finally:
+            shutil.rmtree(dirname)
+
+    def test__envelope_wrong_size(self):
+        pyramid = self.signal[:100].build_envelope()
+        self.assertRaises(ValueError, setattr, self.signal, 'envelope',
+                          pyramid)
+
+
+class TestAnalogSignalArrayChunkedReductions(unittest.TestCase):
+    def setUp(self):
+        np.random.seed(3)
+        self.data = (np.random.randn(1001, 3) * 100).astype('int16')
+        self.dirname = tempfile.mkdtemp()
+        filename = os.path.join(self.dirname, 'signal.raw')
+        self.data.tofile(filename)
+        data = np.memmap(filename, dtype='int16', mode='r', shape=(1001, 3))
+        self.signal = AnalogSignalArray(data, units='uV', copy=False,
+                                        sampling_rate=1 * pq.kHz)
+
+    def tearDown(self):
+        del self.signal
+        shutil.rmtree(self.dirname)
+
+    def test__chunked_reductions(self):
+        data = self.data.astype('float64')
+        for chunk_size, workers in [(None, None), (100, None), (7, 4),
+                                    (1, 2)]:
+            kwargs = dict(chunk_size=chunk_size, workers=workers)
+            result = self.signal.chunked_min(**kwargs)
+            assert_arrays_equal(result.magnitude, self.data.min(axis=0))
+            self.assertEqual(result.units, pq.uV)
+            result = self.signal.chunked_max(**kwargs)
+            assert_arrays_equal(result.magnitude, self.data.max(axis=0))
+            result = self.signal.chunked_mean(**kwargs)
+            assert_arrays_almost_equal(result.magnitude, data.mean(axis=0),
+                                       1e-9)
+            self.assertEqual(result.units, pq.uV)
+            result = self.signal.chunked_std(**kwargs)
+            assert_arrays_almost_equal(result.magnitude, data.std(axis=0),
+                                       1e-9)
+            result = self.signal.chunked_std(ddof=1, **kwargs)
+            assert_arrays_almost_equal(result.magnitude,
+                                       data.std(axis=0, ddof=1), 1e-9)
+
+    def test__chunked_reductions_1d(self):
+        signal = self.signal[:, 1]
+        self.assertTrue(isinstance(signal, AnalogSignal))
+        result = signal.chunked_mean(chunk_size=10)
+        self.assertEqual(result.shape, ())
+        self.assertAlmostEqual(float(result.magnitude),
+                               self.data[:, 1].mean())
+        self.assertEqual(signal.chunked_max(chunk_size=10),
+                         self.data[:, 1].max() * pq.uV)
+
+
+class TestAnalogSignalArrayProcessChunks(unittest.TestCase):
+    def setUp(self):
+        np.random.seed(5)
+        self.data = np.random.randn(2001, 3)
+        self.signal = AnalogSignalArray(self.data, units='mV',
+                                        sampling_rate=1 * pq.kHz,
+                                        t_start=2 * pq.s,
+                                        channel_index=np.array([3, 4, 5]),
+                                        name='raw', probe='A')
+
+    @unittest.skipUnless(HAVE_SCIPY, "requires scipy")
+    def test__process_chunks_filter(self):
+        sos = scipy.signal.butter(3, [0.05, 0.2], btype='bandpass',
+                                  output='sos')
+        targ = scipy.signal.sosfilt(sos, self.data, axis=0)
+        for chunk_size, workers in [(None, None), (100, 2), (7, 3)]:
+            stage = FilterStage(sos=sos, workers=workers)
+            res = self.signal.process_chunks([stage], chunk_size=chunk_size)
+            assert_arrays_almost_equal(res.magnitude, targ, 1e-12)
+            self.assertEqual(res.units, pq.mV)
+            self.assertEqual(res.sampling_rate, 1 * pq.kHz)
+            self.assertEqual(res.t_start, 2 * pq.s)
+            assert_arrays_equal(res.channel_index, np.array([3, 4, 5]))
+            self.assertEqual(res.name, 'raw')
+            self.assertEqual(res.annotations, {'probe': 'A'})
+
+    @unittest.skipUnless(HAVE_SCIPY, "requires scipy")
+    def test__process_chunks_fir_decimate_reference(self):
+        taps = scipy.signal.firwin(21, 0.2)
+        targ = scipy.signal.lfilter(taps, [1.], self.data, axis=0)[::4]
+        targ = targ - targ.mean(axis=1)[:, np.newaxis]
+        stages = [FilterStage(b=taps), DecimateStage(4),
+                  CommonAverageReference()]
+        res = self.signal.process_chunks(stages, chunk_size=33)
+        self.assertEqual(res.shape, (501, 3))
+        assert_arrays_almost_equal(res.magnitude, targ, 1e-12)
+        self.assertEqual(res.sampling_rate, 250 * pq.Hz)
+
+    @unittest.skipUnless(HAVE_SCIPY, "requires scipy")
+    def test__filter_stage_butter(self):
+        stage = FilterStage.butter(2, 100 * pq.Hz, 1 * pq.kHz,
+                                   btype='highpass')
+        targ = scipy.signal.butter(2, 0.2, btype='highpass', output='sos')
+        assert_arrays_almost_equal(stage.sos, targ, 1e-12)
+        self.assertRaises(ValueError, FilterStage)
+
+    def test__process_chunks_out(self):
+        chunks = []
+        stages = [DecimateStage(3), CommonAverageReference(channels=[0],
+                                                           median=True)]
+        res = self.signal.process_chunks(stages, chunk_size=10,
+                                         out=chunks.append)
+        self.assertEqual(res, None)
+        targ = self.data[::3] - self.data[::3, :1]
+        assert_arrays_almost_equal(np.concatenate(chunks), targ, 1e-12)
+
+        out = np.zeros((667, 3))
+        res = self.signal.process_chunks(stages, chunk_size=10, out=out)
+        assert_arrays_almost_equal(out, targ, 1e-12)
+        self.assertEqual(res.sampling_rate, 1 * pq.kHz / 3)
+        self.assertRaises(ValueError, self.signal.process_chunks, stages,
+                          out=np.zeros((10, 3)))
+
+
 class TestAnalogSignalArrayFunctions(unittest.TestCase):
     def test__pickle(self):
         signal1 = AnalogSignalArray(np.arange(55.0).reshape((11, 5)),
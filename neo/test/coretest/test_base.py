@@ -23,7 +23,7 @@ except ImportError as err:
 else:
     HAVE_IPYTHON = True
 
-from neo.core.baseneo import (BaseNeo, _check_annotations,
+from neo.core.baseneo import (BaseNeo, CompactNeo, _check_annotations,
                               merge_annotations, merge_annotation)
 from neo.test.tools import assert_arrays_equal
 
@@ -1064,5 +1064,64 @@ class Test_pprint(unittest.TestCase):
         self.assertEqual(res, targ)
 
 
+class TestCompactNeo(unittest.TestCase):
+    def setUp(self):
+        from neo.core import Epoch, Event, RecordingChannel, Spike, Unit
+        self.objs = [Event(1 * pq.s, 'trigger'),
+                     Epoch(1 * pq.s, 2 * pq.s, 'trial'),
+                     Spike(1 * pq.s),
+                     RecordingChannel(index=3),
+                     Unit(name='unit')]
+
+    def test__is_compact(self):
+        for obj in self.objs:
+            self.assertTrue(isinstance(obj, CompactNeo))
+            self.assertTrue(isinstance(obj, BaseNeo))
+            for attr in obj._all_attrs:
+                self.assertTrue(attr[0] in obj._slot_names())
+            for attr in obj._parent_containers:
+                self.assertTrue(attr in obj._slot_names())
+
+    def test__annotations_lazy(self):
+        for obj in self.objs:
+            self.assertEqual(obj._annotations, None)
+            self.assertEqual(obj.annotations, {})
+            obj.annotations['key'] = 'value'
+            self.assertEqual(obj.annotations, {'key': 'value'})
+            obj.annotate(key2=2)
+            self.assertEqual(obj.annotations, {'key': 'value', 'key2': 2})
+
+    def test__extra_attributes(self):
+        for obj in self.objs:
+            obj.lazy_shape = (10,)
+            self.assertEqual(obj.lazy_shape, (10,))
+
+    def test__pickle_and_copy(self):
+        import copy
+        import pickle
+        for obj in self.objs:
+            obj.annotate(key=1)
+            obj.extra = 'x'
+            for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+                res = pickle.loads(pickle.dumps(obj, protocol))
+                self.assertEqual(res.name, obj.name)
+                self.assertEqual(res.annotations, {'key': 1})
+                self.assertEqual(res.extra, 'x')
+            res = copy.deepcopy(obj)
+            self.assertEqual(res.annotations, {'key': 1})
+            for name in obj._necessary_attrs:
+                assert_arrays_equal(np.asarray(getattr(res, name[0])),
+                                    np.asarray(getattr(obj, name[0])))
+
+    def test__setstate_old_layout(self):
+        from neo.core import Event
+        obj = Event.__new__(Event)
+        obj.__setstate__({'time': 1 * pq.s, 'label': 'a', 'name': None,
+                          'description': None, 'file_origin': None,
+                          'segment': None, 'annotations': {'key': 1}})
+        self.assertEqual(obj.label, 'a')
+        self.assertEqual(obj.annotations, {'key': 1})
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -14,6 +14,7 @@ except ImportError:
     import unittest
 
 import numpy as np
+import quantities as pq
 
 try:
     from IPython.lib.pretty import pretty
@@ -23,9 +24,13 @@ else:
     HAVE_IPYTHON = True
 
 from neo.core.block import Block
+from neo.core.spiketrain import _correlograms
 from neo.core.container import filterdata
-from neo.core import SpikeTrain, Unit
-from neo.test.tools import (assert_neo_object_is_compliant,
+from neo.core import (AnalogSignal, AnalogSignalArray, Event,
+                      RecordingChannelGroup, Segment, Spike,
+                      SpikeTrain, Unit)
+from neo.test.tools import (assert_arrays_almost_equal, assert_arrays_equal,
+                            assert_neo_object_is_compliant,
                             assert_same_sub_schema)
 from neo.test.generate_datasets import (get_fake_value, get_fake_values,
                                         fake_neo, clone_object,
@@ -837,5 +842,327 @@ class TestBlock(unittest.TestCase):
         assert_same_sub_schema(self.rchans2, self.blk2.list_recordingchannels)
 
 
+class TestBlockConsolidate(unittest.TestCase):
+    def test__consolidate(self):
+        blk = Block()
+        rcg = RecordingChannelGroup()
+        unit = Unit()
+        rcg.units.append(unit)
+        blk.recordingchannelgroups.append(rcg)
+        for i in range(2):
+            seg = Segment()
+            seg.events = [Event(1*pq.s, label='a'), Event(2*pq.s, label='b')]
+            spikes = [Spike(t*pq.ms) for t in (1., 2.)]
+            seg.spikes = spikes
+            unit.spikes.extend(spikes)
+            blk.segments.append(seg)
+
+        blk.consolidate()
+        for seg in blk.segments:
+            self.assertEqual(seg.events, [])
+            self.assertEqual(seg.spikes, [])
+            self.assertEqual(len(seg.eventarrays), 1)
+            self.assertEqual(len(seg.spiketrains), 1)
+            self.assertTrue(seg.spiketrains[0].unit is unit)
+        self.assertEqual(unit.spikes, [])
+        self.assertEqual(len(unit.spiketrains), 2)
+        blk.create_many_to_one_relationship()
+        assert_neo_object_is_compliant(blk)
+
+    def test__consolidate_inconsistent(self):
+        blk = Block()
+        for left_sweep in (1., 2.):
+            seg = Segment()
+            seg.events = [Event(1*pq.s, label='a')]
+            seg.spikes = [Spike(t*pq.ms, left_sweep=left_sweep*pq.ms)
+                          for t in (1., 2.)]
+            blk.segments.append(seg)
+        blk.segments[1].spikes[0].left_sweep = 3*pq.ms
+        self.assertRaises(ValueError, blk.consolidate)
+        # the first Segment is not consolidated either
+        self.assertEqual(len(blk.segments[0].events), 1)
+        self.assertEqual(len(blk.segments[0].spikes), 2)
+        self.assertEqual(blk.segments[0].spiketrains, [])
+
+
+class TestBlockBinSpikeTrains(unittest.TestCase):
+    def test__bin_spiketrains(self):
+        blk = Block()
+        unit = Unit()
+        trains = []
+        for i in range(2):
+            seg = Segment()
+            train = SpikeTrain([i, i + .5, 2.5] * pq.s, t_stop=3 * pq.s)
+            seg.spiketrains.append(train)
+            unit.spiketrains.append(train)
+            blk.segments.append(seg)
+            trains.append(train)
+        rcg = RecordingChannelGroup()
+        rcg.units.append(unit)
+        blk.recordingchannelgroups.append(rcg)
+
+        res, edges = blk.bin_spiketrains(1 * pq.s, dense=True)
+        assert_arrays_equal(res, np.array([[2, 0, 1], [0, 2, 1]]))
+        assert_arrays_equal(edges.magnitude, np.array([0., 1., 2., 3.]))
+
+
+class TestBlockCorrelograms(unittest.TestCase):
+    def setUp(self):
+        np.random.seed(0)
+        self.blk = Block()
+        for n_trains in (3, 2):
+            seg = Segment()
+            for i in range(n_trains):
+                times = np.random.uniform(0, 10, 100) * pq.s
+                seg.spiketrains.append(SpikeTrain(times, t_stop=10 * pq.s))
+            self.blk.segments.append(seg)
+
+    def test__correlograms(self):
+        res = self.blk.correlograms(10 * pq.ms, 100 * pq.ms)
+        self.assertEqual(res.shape, (20, 9))
+        self.assertEqual(res.t_start, -100 * pq.ms)
+        assert_arrays_equal(res.annotations['segment_index'],
+                            np.array([0, 0, 0, 0, 0, 0, 1, 1, 1]))
+        assert_arrays_equal(res.annotations['first_index'],
+                            np.array([0, 0, 0, 1, 1, 2, 0, 0, 1]))
+        assert_arrays_equal(res.annotations['second_index'],
+                            np.array([0, 1, 2, 1, 2, 2, 0, 1, 1]))
+        for col in range(res.shape[1]):
+            seg = self.blk.segments[res.annotations['segment_index'][col]]
+            train1 = seg.spiketrains[res.annotations['first_index'][col]]
+            train2 = seg.spiketrains[res.annotations['second_index'][col]]
+            if train1 is train2:
+                train2 = None
+            targ = train1.correlogram(train2, 10 * pq.ms, 100 * pq.ms)
+            assert_arrays_equal(res[:, col].magnitude, targ.magnitude)
+
+    def test__correlograms_no_auto_workers(self):
+        targ = self.blk.correlograms(10 * pq.ms, 100 * pq.ms, auto=False)
+        self.assertEqual(targ.shape, (20, 4))
+        res = self.blk.correlograms(10 * pq.ms, 100 * pq.ms, auto=False,
+                                    workers=2)
+        assert_arrays_equal(res.magnitude, targ.magnitude)
+
+        times = [np.sort(train.magnitude)
+                 for train in self.blk.segments[0].spiketrains]
+        pairs = [(0, 1), (0, 2), (1, 2)]
+        res = _correlograms(times, pairs, .01, 10, workers=2, batch_size=1)
+        assert_arrays_equal(res, targ.magnitude[:, :3])
+
+    def test__correlograms_invalid(self):
+        self.assertRaises(ValueError, self.blk.correlograms, 0 * pq.ms)
+        self.assertRaises(ValueError, self.blk.correlograms, -1 * pq.ms)
+        self.assertRaises(ValueError, self.blk.correlograms, 1 * pq.ms,
+                          0 * pq.ms)
+
+
+class TestBlockSpikeStatistics(unittest.TestCase):
+    def setUp(self):
+        self.blk = Block()
+        rcg = RecordingChannelGroup()
+        self.blk.recordingchannelgroups.append(rcg)
+        self.units = [Unit(channel_indexes=np.array([3])), Unit()]
+        rcg.units.extend(self.units)
+        seg = Segment()
+        self.blk.segments.append(seg)
+        self.trains = [
+            SpikeTrain([1., 2., 3., 3.001, 5.] * pq.s, t_stop=10 * pq.s),
+            SpikeTrain([5000., 1000.] * pq.ms, t_stop=10 * pq.s,
+                       channel_index=7),
+            SpikeTrain([] * pq.s, t_start=1 * pq.s, t_stop=3 * pq.s),
+            SpikeTrain([1., 2., 3.] * pq.s, t_stop=4 * pq.s)]
+        seg.spiketrains.extend(self.trains[:3])
+        self.units[0].spiketrains.extend(self.trains[0:3:2])
+        self.units[1].spiketrains.extend(self.trains[1:2])
+        # a train only linked to a unit
+        self.units[1].spiketrains.append(self.trains[3])
+
+    def test__spike_statistics(self):
+        res = self.blk.spike_statistics(refractory_period=2 * pq.ms)
+        trains = self.blk.list_children_by_class('SpikeTrain')
+        order = [[train is targ for targ in self.trains].index(True)
+                 for train in trains]
+        self.assertEqual(sorted(order), [0, 1, 2, 3])
+
+        targ_count = np.array([5, 2, 0, 3])
+        targ_rate = np.array([.5, .2, 0, .75])
+        targ_violations = np.array([1, 0, 0, 0])
+        isi = np.diff([1., 2., 3., 3.001, 5.])
+        targ_cv = np.array([isi.std() / isi.mean(), np.nan, np.nan, 0])
+        targ_segment = np.array([0, 0, 0, -1])
+        targ_unit = np.array([0, 1, 0, 1])
+        targ_channel = np.array([3, 7, 3, -1])
+
+        assert_arrays_equal(res['count'], targ_count[order])
+        self.assertEqual(res['rate'].units, pq.Hz)
+        assert_arrays_equal(res['rate'].magnitude, targ_rate[order])
+        assert_arrays_equal(res['refractory_violations'],
+                            targ_violations[order])
+        assert_arrays_equal(np.isnan(res['isi_cv']),
+                            np.isnan(targ_cv[order]))
+        valid = ~np.isnan(res['isi_cv'])
+        assert_arrays_equal(res['isi_cv'][valid], targ_cv[order][valid])
+        assert_arrays_equal(res['segment_index'], targ_segment[order])
+        assert_arrays_equal(res['unit_index'], targ_unit[order])
+        assert_arrays_equal(res['channel_index'], targ_channel[order])
+
+    def test__spike_statistics_units(self):
+        # t_start and t_stop in other units than the times
+        train = SpikeTrain([100., 200., 300.] * pq.ms, t_start=0 * pq.s,
+                           t_stop=1 * pq.s)
+        train.t_stop = 2 * pq.s
+        seg = Segment()
+        seg.spiketrains.append(train)
+        blk = Block()
+        blk.segments.append(seg)
+        res = blk.spike_statistics()
+        assert_arrays_almost_equal(res['rate'].magnitude, np.array([1.5]),
+                                   1e-12)
+
+    def test__spike_statistics_empty(self):
+        res = Block().spike_statistics()
+        for key in ('count', 'rate', 'isi_cv', 'refractory_violations',
+                    'segment_index', 'unit_index', 'channel_index'):
+            self.assertEqual(len(res[key]), 0)
+
+
+class TestBlockStackSegments(unittest.TestCase):
+    def setUp(self):
+        self.raw = np.arange(4 * 50 * 3, dtype='int16').reshape((200, 3))
+        self.blk = Block()
+        for i in range(4):
+            seg = Segment()
+            seg.analogsignalarrays.append(
+                AnalogSignalArray(self.raw[i * 50:(i + 1) * 50], copy=False,
+                                  units='uV', sampling_rate=1 * pq.kHz,
+                                  t_start=i * 10 * pq.ms,
+                                  channel_index=np.array([5, 6, 7])))
+            self.blk.segments.append(seg)
+        self.targ = self.raw.reshape((4, 50, 3))
+
+    def test__stack_segments_view(self):
+        data, times, channels = self.blk.stack_segments()
+        self.assertEqual(data.shape, (4, 50, 3))
+        self.assertEqual(data.units, pq.uV)
+        assert_arrays_equal(data.magnitude, self.targ)
+        self.assertTrue(np.may_share_memory(data, self.raw))
+        assert_arrays_equal(channels, np.array([5, 6, 7]))
+        assert_arrays_almost_equal(times, np.arange(50) * pq.ms, 1e-12)
+
+        data, times, channels = self.blk.stack_segments(channel_index=[7, 5])
+        assert_arrays_equal(data.magnitude, self.targ[:, :, [2, 0]])
+        self.assertTrue(np.may_share_memory(data, self.raw))
+
+    def test__stack_segments_absolute_copy(self):
+        # one sweep as separate AnalogSignal objects in other units
+        seg = self.blk.segments[2]
+        sigarr = seg.analogsignalarrays.pop()
+        for column in [2, 0, 1]:
+            seg.analogsignals.append(
+                AnalogSignal(sigarr.magnitude[:, column] / 1000., units='mV',
+                             sampling_rate=1 * pq.kHz,
+                             t_start=sigarr.t_start,
+                             channel_index=5 + column))
+        data, times, channels = self.blk.stack_segments(align='absolute')
+        self.assertEqual(data.shape, (4, 20, 3))
+        self.assertFalse(np.may_share_memory(data, self.raw))
+        self.assertEqual(data.units, pq.uV)
+        for i in range(4):
+            start = 30 - 10 * i
+            assert_arrays_almost_equal(data.magnitude[i],
+                                       self.targ[i, start:start + 20], 1e-9)
+        assert_arrays_almost_equal(times, (30 + np.arange(20)) * pq.ms,
+                                   1e-12)
+
+    def test__stack_segments_errors(self):
+        self.assertRaises(ValueError, self.blk.stack_segments,
+                          channel_index=[4])
+        self.assertRaises(ValueError, self.blk.stack_segments,
+                          align='stimulus')
+        self.blk.segments[1].analogsignalarrays[0].sampling_rate = 2 * pq.kHz
+        self.assertRaises(ValueError, self.blk.stack_segments)
+        self.assertRaises(ValueError, Block().stack_segments)
+
+
+class TestBlockSpikeTable(unittest.TestCase):
+    def setUp(self):
+        self.blk = Block()
+        rcg = RecordingChannelGroup()
+        self.blk.recordingchannelgroups.append(rcg)
+        self.units = [Unit(channel_indexes=np.array([4])),
+                      Unit(channel_indexes=np.array([7]))]
+        rcg.units = self.units
+        for iseg in range(2):
+            seg = Segment()
+            self.blk.segments.append(seg)
+            for iunit, unit in enumerate(self.units):
+                train = SpikeTrain(np.arange(3 + iunit) + 10 * iseg,
+                                   units='ms', t_stop=100 * pq.ms)
+                seg.spiketrains.append(train)
+                unit.spiketrains.append(train)
+        seg.spiketrains.append(SpikeTrain([0.05] * pq.s, t_stop=1 * pq.s,
+                                          channel_index=9))
+
+    def test__to_spike_table(self):
+        table = self.blk.to_spike_table()
+        self.assertEqual(table['time'].units, pq.s)
+        targ_time = np.array([0, 1, 2, 0, 1, 2, 3, 10, 11, 12,
+                              10, 11, 12, 13, 50]) / 1000.
+        assert_arrays_almost_equal(table['time'].magnitude, targ_time, 1e-12)
+        assert_arrays_equal(table['segment_index'],
+                            np.array([0] * 7 + [1] * 8))
+        assert_arrays_equal(table['unit_index'],
+                            np.array([0] * 3 + [1] * 4 + [0] * 3 + [1] * 4 +
+                                     [-1]))
+        assert_arrays_equal(table['channel_index'],
+                            np.array([4] * 3 + [7] * 4 + [4] * 3 + [7] * 4 +
+                                     [9]))
+        assert_arrays_equal(table['train_index'],
+                            np.repeat(np.arange(5), [3, 4, 3, 4, 1]))
+
+        table = self.blk.to_spike_table(units=pq.ms, structured=True)
+        self.assertEqual(table.dtype.names,
+                         ('time', 'segment_index', 'unit_index',
+                          'channel_index', 'train_index'))
+        assert_arrays_almost_equal(table['time'], targ_time * 1000., 1e-9)
+
+    def test__from_spike_table(self):
+        table = self.blk.to_spike_table(units=pq.ms)
+        # the rows do not need to be grouped or sorted
+        order = np.random.RandomState(0).permutation(len(table['time']))
+        table = dict((key, value[order]) for key, value in table.items())
+        blk = Block.from_spike_table(table, t_start=0 * pq.ms,
+                                     t_stop=100 * pq.ms, name='copy')
+        self.assertEqual(blk.name, 'copy')
+        self.assertEqual(len(blk.segments), 2)
+        self.assertEqual(len(blk.list_units), 2)
+        assert_arrays_equal(blk.list_units[1].channel_indexes, np.array([7]))
+
+        seg = blk.segments[1]
+        self.assertEqual(len(seg.spiketrains), 3)
+        train = seg.spiketrains[0]
+        self.assertEqual(train.units, pq.ms)
+        assert_arrays_equal(train.magnitude, np.array([50.]))
+        self.assertEqual(train.unit, None)
+        self.assertEqual(train.annotations, {'channel_index': 9})
+        train = seg.spiketrains[2]
+        assert_arrays_equal(train.magnitude, np.array([10., 11., 12., 13.]))
+        self.assertTrue(train.unit is blk.list_units[1])
+        self.assertTrue(train.segment is seg)
+        self.assertEqual(train.t_stop, 100 * pq.ms)
+
+        targ = self.blk.to_spike_table()
+        res = blk.to_spike_table()
+        self.assertEqual(len(res['time']), len(targ['time']))
+
+    def test__from_spike_table_default_times(self):
+        table = self.blk.to_spike_table(units=pq.ms, structured=True)
+        self.assertRaises(ValueError, Block.from_spike_table, table)
+        blk = Block.from_spike_table(table, units=pq.ms)
+        for train in blk.segments[1].spiketrains:
+            self.assertEqual(train.t_start, 10 * pq.ms)
+            self.assertEqual(train.t_stop, 50 * pq.ms)
+
+
 if __name__ == "__main__":
     unittest.main()
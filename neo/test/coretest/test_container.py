@@ -9,6 +9,7 @@ except ImportError:
     import unittest
 
 import numpy as np
+import quantities as pq
 
 try:
     from IPython.lib.pretty import pretty
@@ -17,7 +18,11 @@ except ImportError as err:
 else:
     HAVE_IPYTHON = True
 
-from neo.core.container import Container, unique_objs
+from neo.core.container import Container, unique_objs, filterdata
+from neo.core.filters import (Equals, IsNot, LessThan, LessThanOrEquals,
+                              GreaterThan, GreaterThanOrEquals, IsIn,
+                              InRange, MetadataTable, Satisfies)
+from neo.core import AnalogSignal, Block, Segment, SpikeTrain, Unit
 
 
 class Test_unique_objs(unittest.TestCase):
@@ -164,5 +169,83 @@ class Test_pprint(unittest.TestCase):
         self.assertEqual(res, targ)
 
 
+class Test_filter_conditions(unittest.TestCase):
+    def setUp(self):
+        self.blk = Block()
+        self.trains = []
+        self.signals = []
+        for i, n_spikes in enumerate([5, 50, 500]):
+            seg = Segment(index=i)
+            train = SpikeTrain(np.linspace(0, 1, n_spikes), units='s',
+                               t_stop=1 * pq.s, name='train %d' % i)
+            seg.spiketrains.append(train)
+            signal = AnalogSignal(np.zeros(10), units='mV',
+                                  sampling_rate=(i + 1) * 10000 * pq.Hz)
+            seg.analogsignals.append(signal)
+            self.blk.segments.append(seg)
+            self.trains.append(train)
+            self.signals.append(signal)
+        self.units = [Unit(name='u%d' % i, depth=depth)
+                      for i, depth in enumerate([100, 250, 400 * pq.um])]
+
+    def test__comparisons(self):
+        res = self.blk.filter(size=GreaterThan(40), objects='SpikeTrain')
+        self.assertEqual(res, self.trains[1:])
+        res = self.blk.filter(size=LessThanOrEquals(50),
+                              objects=SpikeTrain)
+        self.assertEqual(res, self.trains[:2])
+        res = self.blk.filter(size=LessThan(50), objects=SpikeTrain)
+        self.assertEqual(res, self.trains[:1])
+        res = self.blk.filter(sampling_rate=GreaterThanOrEquals(20*pq.kHz))
+        self.assertEqual(res, self.signals[1:])
+        res = self.blk.filter(sampling_rate=Equals(10*pq.kHz))
+        self.assertEqual(res, self.signals[:1])
+        res = self.blk.filter(sampling_rate=IsNot(10*pq.kHz),
+                              objects='AnalogSignal')
+        self.assertEqual(res, self.signals[1:])
+        res = self.blk.filter(index=IsIn([0, 2]), container=True,
+                              data=False)
+        self.assertEqual(res, [self.blk.segments[0], self.blk.segments[2]])
+
+    def test__range_annotations_units(self):
+        res = filterdata(self.units, depth=InRange(200, 300))
+        self.assertEqual(res, self.units[1:2])
+        res = filterdata(self.units, depth=InRange(0.2 * pq.mm, 1 * pq.mm))
+        self.assertEqual(res, self.units[2:])
+        res = filterdata(self.units, depth=InRange(100, 250,
+                                                   left_closed=False))
+        self.assertEqual(res, self.units[1:2])
+
+    def test__callables(self):
+        res = self.blk.filter(name=Satisfies(lambda name:
+                                             name.endswith('2')))
+        self.assertEqual(res, self.trains[2:])
+        res = filterdata(self.units, lambda obj: obj.name != 'u1')
+        self.assertEqual(res, [self.units[0], self.units[2]])
+        res = self.blk.filter([{'size': GreaterThan(10)},
+                               lambda obj: obj.name == 'train 1'],
+                              objects='SpikeTrain')
+        self.assertEqual(res, self.trains[1:2])
+
+    def test__callable_values(self):
+        # a callable value is compared for equality, not called
+        self.trains[1].kind = np.float64
+        res = self.blk.filter(kind=np.float64)
+        self.assertEqual(res, self.trains[1:2])
+
+    def test__metadata_table(self):
+        table = self.blk.metadata_table(objects='SpikeTrain')
+        self.assertTrue(isinstance(table, MetadataTable))
+        self.assertEqual(list(table), self.trains)
+        self.assertEqual(table.filter(size=GreaterThan(10)), self.trains[1:])
+        self.assertEqual(table.filter(name='train 0'), self.trains[:1])
+        # the cached column is used, not the modified object
+        self.trains[0].name = 'renamed'
+        self.assertEqual(table.filter(name='train 0'), self.trains[:1])
+        self.assertEqual(table.filter(name=IsIn(['train 0', 'train 2'])),
+                         [self.trains[0], self.trains[2]])
+        self.assertEqual(self.blk.filter(name='train 0'), [])
+
+
 if __name__ == "__main__":
     unittest.main()
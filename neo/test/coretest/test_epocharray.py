@@ -21,7 +21,8 @@ else:
 from neo.core.epocharray import EpochArray
 from neo.core import Segment
 from neo.test.tools import (assert_neo_object_is_compliant,
-                            assert_arrays_equal, assert_same_sub_schema)
+                            assert_arrays_equal, assert_arrays_almost_equal,
+                            assert_same_sub_schema)
 from neo.test.generate_datasets import (get_fake_value, get_fake_values,
                                         fake_neo, TEST_ANNOTATIONS)
 
@@ -229,5 +230,57 @@ class TestEpochArray(unittest.TestCase):
         self.assertEqual(prepr, targ)
 
 
+class TestEpochArrayCategorical(unittest.TestCase):
+    def setUp(self):
+        self.labels = np.array(['sleep', 'wake', 'sleep', 'wake'], dtype='S')
+        self.epca = EpochArray([1.1, 1.5, 1.7, 2.0]*pq.ms,
+                               durations=[20, 40, 60, 80]*pq.ns,
+                               labels=self.labels, name='test',
+                               categorical=True)
+
+    def test_creation(self):
+        assert_neo_object_is_compliant(self.epca)
+        self.assertTrue(self.epca.is_categorical)
+        assert_arrays_equal(self.epca.label_names,
+                            np.array(['sleep', 'wake'], dtype='S'))
+        assert_arrays_equal(self.epca.label_codes, np.array([0, 1, 0, 1]))
+        assert_arrays_equal(self.epca.labels, self.labels)
+
+    def test_select_labels(self):
+        res = self.epca.select_labels('wake')
+        assert_neo_object_is_compliant(res)
+        assert_arrays_equal(res.times, [1.5, 2.0]*pq.ms)
+        assert_arrays_equal(res.durations, [40, 80]*pq.ns)
+        assert_arrays_equal(res.labels, np.array(['wake', 'wake'], dtype='S'))
+
+    def test_slicing(self):
+        res = self.epca[::2]
+        self.assertTrue(res.is_categorical)
+        assert_arrays_equal(res.times, [1.1, 1.7]*pq.ms)
+        assert_arrays_equal(res.durations, [20, 60]*pq.ns)
+
+    def test_integer_index(self):
+        # an integer index gives an EpochArray of length 1, not an Epoch
+        res = self.epca[1]
+        self.assertTrue(isinstance(res, EpochArray))
+        self.assertTrue(res.is_categorical)
+        assert_arrays_equal(res.times, [1.5]*pq.ms)
+        self.assertEqual(len(res.durations), 1)
+        self.assertRaises(IndexError, self.epca.__getitem__, -5)
+
+    def test_merge(self):
+        epca2 = EpochArray([3.1]*pq.ms, durations=[1]*pq.us,
+                           labels=np.array(['dream'], dtype='S'),
+                           categorical=True)
+        res = self.epca.merge(epca2)
+        assert_neo_object_is_compliant(res)
+        assert_arrays_equal(res.label_names,
+                            np.array(['dream', 'sleep', 'wake'], dtype='S'))
+        assert_arrays_equal(res.labels,
+                            np.hstack([self.labels, epca2.labels]))
+        assert_arrays_almost_equal(res.durations,
+                                   [20, 40, 60, 80, 1000]*pq.ns, 1e-10)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -218,5 +218,115 @@ class TestEventArray(unittest.TestCase):
         self.assertEqual(prepr, targ)
 
 
+class TestEventArrayCategorical(unittest.TestCase):
+    def setUp(self):
+        self.labels = np.array(['off', 'on', 'on', 'off', 'blink'],
+                               dtype='S')
+        self.evta = EventArray([1.1, 1.5, 1.7, 2.0, 2.2]*pq.ms,
+                               labels=self.labels, name='test',
+                               categorical=True, test1=1)
+
+    def test_creation(self):
+        assert_neo_object_is_compliant(self.evta)
+        self.assertTrue(self.evta.is_categorical)
+        assert_arrays_equal(self.evta.label_names,
+                            np.array(['blink', 'off', 'on'], dtype='S'))
+        assert_arrays_equal(self.evta.label_codes, np.array([1, 2, 2, 1, 0]))
+        self.assertEqual(self.evta.label_codes.dtype, np.int8)
+        assert_arrays_equal(self.evta.labels, self.labels)
+
+    def test_creation_from_codes(self):
+        evta = EventArray([1.1, 1.5]*pq.ms, label_codes=[1, 0],
+                          label_names=['a', 'b'])
+        self.assertTrue(evta.is_categorical)
+        assert_arrays_equal(evta.labels, np.array(['b', 'a'], dtype='S'))
+        self.assertRaises(ValueError, EventArray, [1.1]*pq.ms,
+                          label_codes=[0])
+
+    def test_to_categorical(self):
+        evta = EventArray([1.1, 1.5, 1.7]*pq.ms,
+                          labels=np.array(['a', 'b', 'a'], dtype='S'))
+        self.assertFalse(evta.is_categorical)
+        evta.to_categorical()
+        self.assertTrue(evta.is_categorical)
+        assert_arrays_equal(evta.label_codes, np.array([0, 1, 0]))
+        assert_arrays_equal(evta.labels,
+                            np.array(['a', 'b', 'a'], dtype='S'))
+
+    def test_set_labels(self):
+        self.evta.labels = np.array(['x', 'y', 'x', 'y', 'y'], dtype='S')
+        self.assertTrue(self.evta.is_categorical)
+        assert_arrays_equal(self.evta.label_names,
+                            np.array(['x', 'y'], dtype='S'))
+
+    def test_label_mask(self):
+        assert_arrays_equal(self.evta.label_mask('on'),
+                            np.array([False, True, True, False, False]))
+        assert_arrays_equal(self.evta.label_mask(['on', 'blink']),
+                            np.array([False, True, True, False, True]))
+        assert_arrays_equal(self.evta.label_mask('missing'),
+                            np.zeros(5, dtype=bool))
+
+        evta = EventArray(self.evta.times, labels=self.labels)
+        assert_arrays_equal(evta.label_mask(['on', 'blink']),
+                            np.array([False, True, True, False, True]))
+
+    def test_select_labels(self):
+        res = self.evta.select_labels('off')
+        self.assertTrue(res.is_categorical)
+        assert_arrays_equal(res.times, [1.1, 2.0]*pq.ms)
+        assert_arrays_equal(res.labels, np.array(['off', 'off'], dtype='S'))
+        self.assertEqual(res.name, 'test')
+        self.assertEqual(res.annotations, {'test1': 1})
+
+    def test_slicing(self):
+        res = self.evta[1:3]
+        assert_neo_object_is_compliant(res)
+        self.assertTrue(res.is_categorical)
+        self.assertTrue(res.label_names is self.evta.label_names)
+        assert_arrays_equal(res.times, [1.5, 1.7]*pq.ms)
+        assert_arrays_equal(res.labels, np.array(['on', 'on'], dtype='S'))
+
+        # an integer index gives an EventArray of length 1, not an Event
+        res = self.evta[-1]
+        self.assertTrue(isinstance(res, EventArray))
+        assert_arrays_equal(res.times, [2.2]*pq.ms)
+        assert_arrays_equal(res.labels, np.array(['blink'], dtype='S'))
+        self.assertRaises(IndexError, self.evta.__getitem__, 5)
+
+    def test_time_slice(self):
+        res = self.evta.time_slice(1.5*pq.ms, 2.0*pq.ms)
+        assert_arrays_equal(res.times, [1.5, 1.7, 2.0]*pq.ms)
+        assert_arrays_equal(res.label_codes, np.array([2, 2, 1]))
+        res = self.evta.time_slice(None, 1.5*pq.ms)
+        assert_arrays_equal(res.times, [1.1, 1.5]*pq.ms)
+
+    def test_merge(self):
+        evta2 = EventArray([3.1, 3.5]*pq.ms,
+                           labels=np.array(['on', 'new'], dtype='S'),
+                           name='test', test1=1)
+        res = self.evta.merge(evta2)
+        assert_neo_object_is_compliant(res)
+        self.assertTrue(res.is_categorical)
+        assert_arrays_equal(res.label_names,
+                            np.array(['blink', 'new', 'off', 'on'],
+                                     dtype='S'))
+        assert_arrays_equal(res.labels,
+                            np.hstack([self.labels, evta2.labels]))
+        assert_arrays_equal(res.times,
+                            [1.1, 1.5, 1.7, 2.0, 2.2, 3.1, 3.5]*pq.ms)
+
+        res = evta2.merge(self.evta)
+        self.assertTrue(res.is_categorical)
+        assert_arrays_equal(res.labels,
+                            np.hstack([evta2.labels, self.labels]))
+
+    def test_repr(self):
+        evta = EventArray([1.1, 1.5]*pq.ms,
+                          labels=np.array(['a', 'b'], dtype='S'),
+                          categorical=True)
+        self.assertEqual(repr(evta), '<EventArray: a@1.1 ms, b@1.5 ms>')
+
+
 if __name__ == "__main__":
     unittest.main()
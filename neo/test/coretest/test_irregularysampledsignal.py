@@ -325,6 +325,14 @@ class TestIrregularlySampledSignalArrayMethods(unittest.TestCase):
         self.assertEqual(self.signal1.min(), 0*pq.mV)
         self.assertEqual(self.signal1.mean(), targmean)
 
+    def test_mean_chunked(self):
+        targmean = self.signal1.mean()
+        for chunk_size in [1, 3, 20]:
+            result = self.signal1.mean(chunk_size=chunk_size, workers=2)
+            self.assertEqual(result.units, pq.mV)
+            self.assertAlmostEqual(float(result.magnitude),
+                                   float(targmean.magnitude))
+
     def test_mean_interpolation_NotImplementedError(self):
         self.assertRaises(NotImplementedError, self.signal1.mean, True)
 
@@ -23,13 +23,22 @@ except ImportError as err:
 else:
     HAVE_IPYTHON = True
 
+try:
+    import scipy.sparse
+except ImportError:
+    HAVE_SCIPY = False
+else:
+    HAVE_SCIPY = True
+
 from neo.core.segment import Segment
 from neo.core import (AnalogSignalArray, Block,
-                      Epoch, EpochArray,
-                      RecordingChannelGroup, SpikeTrain, Unit)
+                      Epoch, EpochArray, Event,
+                      RecordingChannelGroup, Spike, SpikeTrain, Unit)
 from neo.core.container import filterdata
+from neo.core.spiketrain import _convolve_rows
 from neo.test.tools import (assert_neo_object_is_compliant,
-                            assert_same_sub_schema)
+                            assert_arrays_almost_equal,
+                            assert_arrays_equal, assert_same_sub_schema)
 from neo.test.generate_datasets import (fake_neo, get_fake_value,
                                         get_fake_values, get_annotations,
                                         clone_object, TEST_ANNOTATIONS)
@@ -874,5 +883,179 @@ class TestSegment(unittest.TestCase):
         assert_same_sub_schema(result23, targ3)
 
 
+class TestSegmentConsolidate(unittest.TestCase):
+    def setUp(self):
+        self.seg = Segment(name='seg')
+        self.seg.events = [Event(1*pq.s, label='a', name='trig', n=1),
+                           Event(2000*pq.ms, label='b', name='trig', n=2),
+                           Event(3*pq.s, label='c', name='stim')]
+        self.seg.epochs = [Epoch(1*pq.s, duration=1*pq.ms, label='x'),
+                           Epoch(2*pq.s, duration=2*pq.ms, label='y')]
+        self.unit1 = Unit(name='unit1')
+        self.unit2 = Unit(name='unit2')
+        self.spikes = []
+        for time, unit in ((3., self.unit1), (1., self.unit1),
+                           (2., self.unit2)):
+            spike = Spike(time*pq.ms, waveform=np.ones((2, 4))*time*pq.mV,
+                          sampling_rate=10*pq.kHz, left_sweep=0.1*pq.ms,
+                          quality=time)
+            spike.unit = unit
+            unit.spikes.append(spike)
+            self.spikes.append(spike)
+        self.seg.spikes = list(self.spikes)
+
+    def test__consolidate_events(self):
+        self.seg.consolidate()
+        self.assertEqual(self.seg.events, [])
+        self.assertEqual(len(self.seg.eventarrays), 2)
+        trig, stim = self.seg.eventarrays
+        assert_neo_object_is_compliant(trig)
+        self.assertEqual(trig.name, 'trig')
+        assert_arrays_equal(trig.times, [1., 2.]*pq.s)
+        assert_arrays_equal(trig.labels, np.array(['a', 'b'], dtype='S'))
+        assert_arrays_equal(trig.annotations['n'], np.array([1, 2]))
+        self.assertEqual(stim.name, 'stim')
+        self.assertTrue(trig.segment is self.seg)
+
+    def test__consolidate_epochs(self):
+        self.seg.consolidate()
+        self.assertEqual(self.seg.epochs, [])
+        self.assertEqual(len(self.seg.epocharrays), 1)
+        epcarr = self.seg.epocharrays[0]
+        assert_neo_object_is_compliant(epcarr)
+        assert_arrays_equal(epcarr.times, [1., 2.]*pq.s)
+        assert_arrays_equal(epcarr.durations, [1., 2.]*pq.ms)
+        assert_arrays_equal(epcarr.labels, np.array(['x', 'y'], dtype='S'))
+
+    def test__consolidate_spikes(self):
+        self.seg.consolidate()
+        self.assertEqual(self.seg.spikes, [])
+        self.assertEqual(self.unit1.spikes, [])
+        self.assertEqual(len(self.seg.spiketrains), 2)
+        train1, train2 = self.seg.spiketrains
+        assert_neo_object_is_compliant(train1)
+        self.assertTrue(train1.unit is self.unit1)
+        self.assertEqual(self.unit1.spiketrains, [train1])
+        self.assertEqual(self.unit2.spiketrains, [train2])
+        assert_arrays_equal(train1, [1., 3.]*pq.ms)
+        self.assertEqual(train1.t_start, 1.*pq.ms)
+        self.assertEqual(train1.t_stop, 3.*pq.ms)
+        self.assertEqual(train1.waveforms.shape, (2, 2, 4))
+        assert_arrays_equal(train1.waveforms[:, 0, 0], [1., 3.]*pq.mV)
+        assert_arrays_equal(train1.annotations['quality'],
+                            np.array([1., 3.]))
+        self.assertEqual(train1.sampling_rate, 10*pq.kHz)
+        self.assertEqual(train1.left_sweep, 0.1*pq.ms)
+
+    def test__consolidate_spikes_units_arg(self):
+        for spike in self.spikes:
+            spike.unit = None
+        self.seg.consolidate(t_start=0*pq.ms, t_stop=10*pq.ms,
+                             units=[self.unit1, self.unit2])
+        train1, train2 = self.seg.spiketrains
+        self.assertTrue(train1.unit is self.unit1)
+        self.assertEqual(train2.t_start, 0.*pq.ms)
+        self.assertEqual(train2.t_stop, 10.*pq.ms)
+
+    def test__consolidate_spikes_different_waveforms(self):
+        self.spikes[0].waveform = np.ones((2, 5))*pq.mV
+        self.seg.consolidate()
+        self.assertEqual(self.seg.spiketrains[0].waveforms, None)
+
+    def test__consolidate_spikes_inconsistent(self):
+        self.spikes[0].sampling_rate = 20*pq.kHz
+        self.assertRaises(ValueError, self.seg.consolidate)
+        # nothing is consolidated if the spikes cannot be
+        self.assertEqual(len(self.seg.events), 3)
+        self.assertEqual(len(self.seg.epochs), 2)
+        self.assertEqual(self.seg.eventarrays, [])
+        self.assertEqual(self.seg.epocharrays, [])
+        self.assertEqual(self.seg.spikes, self.spikes)
+        self.assertEqual(len(self.unit1.spikes), 2)
+
+
+class TestSegmentBinSpikeTrains(unittest.TestCase):
+    def setUp(self):
+        np.random.seed(0)
+        self.seg = Segment()
+        for i in range(20):
+            times = np.random.uniform(0, 10, np.random.randint(0, 100))
+            self.seg.spiketrains.append(SpikeTrain(times * pq.s,
+                                                   t_stop=10 * pq.s))
+        self.seg.spiketrains.append(SpikeTrain([]*pq.s, t_stop=10 * pq.s))
+        self.seg.spiketrains.append(SpikeTrain([100, 300, 10000] * pq.ms,
+                                               t_stop=10 * pq.s))
+
+    def targ_counts(self, edges):
+        return np.array([np.histogram(train.rescale(edges.units).magnitude,
+                                      bins=edges.magnitude)[0]
+                         for train in self.seg.spiketrains])
+
+    def test__bin_spiketrains_dense(self):
+        res, edges = self.seg.bin_spiketrains(10 * pq.ms, dense=True)
+        self.assertEqual(res.shape, (22, 1000))
+        self.assertEqual(edges.units, pq.ms)
+        assert_arrays_equal(edges.magnitude, np.arange(1001) * 10.)
+        assert_arrays_equal(res, self.targ_counts(edges))
+
+    @unittest.skipUnless(HAVE_SCIPY, "requires scipy")
+    def test__bin_spiketrains_sparse(self):
+        res, edges = self.seg.bin_spiketrains(10 * pq.ms)
+        self.assertTrue(scipy.sparse.isspmatrix_csr(res))
+        self.assertEqual(res.shape, (22, 1000))
+        assert_arrays_equal(res.toarray(), self.targ_counts(edges))
+
+    def test__bin_spiketrains_edges(self):
+        self.seg.spiketrains = [SpikeTrain([.1, .3, .2, .3, .4] * pq.s,
+                                           t_stop=10 * pq.s)]
+        res, edges = self.seg.bin_spiketrains(.1 * pq.s, t_start=.1 * pq.s,
+                                              t_stop=.4 * pq.s, dense=True)
+        assert_arrays_equal(res, np.array([[1, 1, 3]]))
+        self.assertEqual(len(edges), 4)
+
+    def test__bin_spiketrains_invalid(self):
+        self.assertRaises(ValueError, self.seg.bin_spiketrains, 1 * pq.mV,
+                          dense=True)
+        self.assertRaises(ValueError, self.seg.bin_spiketrains, 0 * pq.s,
+                          dense=True)
+        self.assertRaises(ValueError, self.seg.bin_spiketrains, 1 * pq.s,
+                          t_start=2 * pq.s, t_stop=1 * pq.s, dense=True)
+
+
+class TestSegmentInstantaneousRates(unittest.TestCase):
+    def setUp(self):
+        np.random.seed(0)
+        self.seg = Segment()
+        for i in range(20):
+            times = np.random.uniform(0, 10, np.random.randint(0, 100))
+            self.seg.spiketrains.append(SpikeTrain(times * pq.s,
+                                                   t_stop=10 * pq.s))
+        self.seg.spiketrains.append(SpikeTrain([]*pq.s, t_stop=10 * pq.s))
+        self.seg.spiketrains.append(SpikeTrain([100, 300, 10000] * pq.ms,
+                                               t_stop=10 * pq.s))
+
+    def test__instantaneous_rates(self):
+        res = self.seg.instantaneous_rates(50 * pq.ms, 10 * pq.ms)
+        self.assertTrue(isinstance(res, AnalogSignalArray))
+        self.assertEqual(res.shape, (1000, 22))
+        self.assertEqual(res.units, pq.Hz)
+        self.assertEqual(res.t_start, 0 * pq.s)
+        for i, train in enumerate(self.seg.spiketrains):
+            targ = train.instantaneous_rate(50 * pq.ms, 10 * pq.ms,
+                                            t_start=0 * pq.s,
+                                            t_stop=10 * pq.s)
+            assert_arrays_almost_equal(res[:, i].magnitude, targ.magnitude,
+                                       1e-9)
+
+    def test__convolve_rows_chunks(self):
+        counts, edges = self.seg.bin_spiketrains(10 * pq.ms, dense=True)
+        for kernel in [np.array([.25, .5, .25]), np.hanning(51)]:
+            targ = np.array([np.convolve(row, kernel, mode='same')
+                             for row in counts])
+            for chunk_size in [1, 7, 1000]:
+                res = _convolve_rows(counts, kernel, chunk_size=chunk_size)
+                assert_arrays_almost_equal(res, targ, 1e-12)
+
+
 if __name__ == "__main__":
     unittest.main()
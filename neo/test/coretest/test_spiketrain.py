@@ -25,8 +25,9 @@ else:
 
 from neo.core.spiketrain import (check_has_dimensions_time, SpikeTrain,
                                  _check_time_in_range, _new_spiketrain)
-from neo.core import Segment, Unit
-from neo.test.tools import assert_arrays_equal, assert_neo_object_is_compliant
+from neo.core import AnalogSignal, AnalogSignalArray, Segment, Unit
+from neo.test.tools import (assert_arrays_almost_equal, assert_arrays_equal,
+                            assert_neo_object_is_compliant)
 from neo.test.generate_datasets import (get_fake_value, get_fake_values,
                                         fake_neo, TEST_ANNOTATIONS)
 
@@ -1503,6 +1504,171 @@ class TestPropertiesMethods(unittest.TestCase):
         self.assertEqual(res, targ)
 
 
+class TestExtractWaveforms(unittest.TestCase):
+    def setUp(self):
+        self.data = np.arange(100 * 4, dtype='int16').reshape(100, 4)
+        self.signal = AnalogSignalArray(self.data, units='uV',
+                                        sampling_rate=1 * pq.kHz,
+                                        t_start=10 * pq.ms)
+        self.train = SpikeTrain([12, 50, 108] * pq.ms, t_stop=1 * pq.s)
+
+    def test__extract_waveforms_channels(self):
+        res = self.train.extract_waveforms(self.signal, 2 * pq.ms,
+                                           3 * pq.ms, channels=[1, 3])
+        self.assertEqual(res.shape, (3, 2, 5))
+        self.assertEqual(res.units, pq.uV)
+        self.assertTrue(res is self.train.waveforms)
+        assert_arrays_equal(res[0].magnitude, self.data[0:5, [1, 3]].T)
+        assert_arrays_equal(res[1].magnitude, self.data[38:43, [1, 3]].T)
+        assert_arrays_equal(res[2, :, :4].magnitude,
+                            self.data[96:100, [1, 3]].T)
+        self.assertTrue(np.isnan(res[2, :, 4].magnitude).all())
+
+        self.assertEqual(self.train.left_sweep, 2 * pq.ms)
+        self.assertEqual(self.train.sampling_rate, 1000 * pq.Hz)
+        self.assertAlmostEqual(
+            float(self.train.spike_duration.rescale(pq.ms)), 5)
+
+    def test__extract_waveforms_chunked_memmap(self):
+        import os
+        import tempfile
+        fd, filename = tempfile.mkstemp()
+        os.close(fd)
+        try:
+            memmap = np.memmap(filename, dtype='int16', mode='w+',
+                               shape=self.data.shape)
+            memmap[:] = self.data
+            signal = AnalogSignalArray(memmap, units='uV', copy=False,
+                                       sampling_rate=1 * pq.kHz,
+                                       t_start=10 * pq.ms)
+            targ = self.train.extract_waveforms(self.signal, 1 * pq.ms,
+                                                1 * pq.ms).copy()
+            res = self.train.extract_waveforms(signal, 1 * pq.ms, 1 * pq.ms,
+                                               chunk_size=1)
+            self.assertEqual(res.shape, (3, 4, 2))
+            assert_arrays_equal(res.magnitude, targ.magnitude)
+            del memmap, signal, res
+        finally:
+            os.remove(filename)
+
+    def test__extract_waveforms_analogsignal(self):
+        signal = AnalogSignal(np.arange(100.), units='mV',
+                              sampling_rate=1 * pq.kHz)
+        res = self.train.extract_waveforms(signal, 1 * pq.ms, 2 * pq.ms)
+        self.assertEqual(res.shape, (3, 1, 3))
+        assert_arrays_equal(res[1, 0].magnitude, np.array([49., 50., 51.]))
+
+    def test__extract_waveforms_invalid(self):
+        self.assertRaises(ValueError, self.train.extract_waveforms,
+                          self.signal, 1 * pq.mV, 1 * pq.ms)
+        self.assertRaises(ValueError, self.train.extract_waveforms,
+                          self.signal, 0 * pq.ms, 0 * pq.ms)
+
+
+class TestCorrelogram(unittest.TestCase):
+    def setUp(self):
+        np.random.seed(0)
+        self.train1 = SpikeTrain(np.random.uniform(0, 10, 300) * pq.s,
+                                 t_stop=10 * pq.s)
+        self.train2 = SpikeTrain(np.random.uniform(0, 10000, 200) * pq.ms,
+                                 t_stop=10 * pq.s)
+
+    def targ_counts(self, times1, times2, auto):
+        lags = np.subtract.outer(times2, times1)
+        if auto:
+            lags = lags[~np.eye(len(times1), dtype=bool)]
+        return np.histogram(lags.ravel(), bins=np.arange(-100, 101, 10))[0]
+
+    def test__correlogram_cross(self):
+        res = self.train1.correlogram(self.train2, 10 * pq.ms, 100 * pq.ms)
+        self.assertTrue(isinstance(res, AnalogSignal))
+        self.assertEqual(res.shape, (20,))
+        self.assertEqual(res.units, pq.dimensionless)
+        self.assertEqual(res.t_start, -100 * pq.ms)
+        self.assertEqual(res.sampling_period, 10 * pq.ms)
+        targ = self.targ_counts(self.train1.rescale(pq.ms).magnitude,
+                                self.train2.magnitude, False)
+        assert_arrays_equal(res.magnitude, targ)
+
+    def test__correlogram_auto(self):
+        res = self.train1.correlogram(bin_size=10 * pq.ms,
+                                      max_lag=100 * pq.ms)
+        times = self.train1.rescale(pq.ms).magnitude
+        assert_arrays_equal(res.magnitude,
+                            self.targ_counts(times, times, True))
+        assert_arrays_equal(res.magnitude, res.magnitude[::-1])
+
+    def test__correlogram_edges(self):
+        train1 = SpikeTrain([1.] * pq.s, t_stop=2 * pq.s)
+        train2 = SpikeTrain([.9, .99, 1., 1.05, 1.1] * pq.s, t_stop=2 * pq.s)
+        res = train1.correlogram(train2, 50 * pq.ms, 100 * pq.ms)
+        assert_arrays_equal(res.magnitude, np.array([1, 1, 1, 1]))
+
+    def test__correlogram_invalid(self):
+        self.assertRaises(ValueError, self.train1.correlogram, self.train2,
+                          1 * pq.mV, 10 * pq.ms)
+        self.assertRaises(ValueError, self.train1.correlogram, self.train2,
+                          1 * pq.ms, 0 * pq.ms)
+        self.assertRaises(ValueError, self.train1.correlogram, self.train2,
+                          0 * pq.ms, 10 * pq.ms)
+        self.assertRaises(ValueError, self.train1.correlogram, self.train2,
+                          -1 * pq.ms, 10 * pq.ms)
+
+
+class TestInstantaneousRate(unittest.TestCase):
+    def setUp(self):
+        np.random.seed(0)
+        self.train = SpikeTrain(np.random.uniform(1, 9, 50) * pq.s,
+                                t_stop=10 * pq.s)
+
+    def test__instantaneous_rate_gaussian(self):
+        res = self.train.instantaneous_rate(20 * pq.ms, 1 * pq.ms)
+        self.assertTrue(isinstance(res, AnalogSignal))
+        self.assertEqual(res.shape, (10000,))
+        self.assertEqual(res.units, pq.Hz)
+        self.assertEqual(res.t_start, 0 * pq.s)
+        self.assertEqual(res.sampling_period, 1 * pq.ms)
+        # the kernel has unit area, so the integral is the spike count
+        self.assertAlmostEqual(float(res.sum()) / 1000., 50, places=9)
+
+        lags = np.arange(-100, 101)
+        kernel = np.exp(-lags ** 2 / (2. * 20 ** 2))
+        kernel /= kernel.sum()
+        counts = np.histogram(self.train.magnitude,
+                              bins=np.arange(10001) / 1000.)[0]
+        targ = np.convolve(counts, kernel, mode='same') * 1000
+        assert_arrays_almost_equal(res.magnitude, targ, 1e-9)
+
+    def test__instantaneous_rate_shapes(self):
+        train = SpikeTrain([5.] * pq.ms, t_stop=10 * pq.ms)
+        res = train.instantaneous_rate(('rectangular', 3 * pq.ms),
+                                       1 * pq.ms)
+        assert_arrays_almost_equal(res.magnitude,
+                                   np.array([0, 0, 0, 0, 1000 / 3., 1000 / 3.,
+                                             1000 / 3., 0, 0, 0]), 1e-9)
+        res = train.instantaneous_rate(('exponential', 1 * pq.ms), 1 * pq.ms)
+        self.assertEqual(float(res[4]), 0)
+        self.assertTrue(res[5] > res[6] > res[7] > 0)
+        res = train.instantaneous_rate([1, 1, 2], 1 * pq.ms,
+                                       t_start=3 * pq.ms, t_stop=8 * pq.ms)
+        self.assertEqual(res.t_start, 3 * pq.ms)
+        assert_arrays_almost_equal(res.magnitude,
+                                   np.array([0, 250, 250, 500, 0]), 1e-9)
+        # negative samples of the kernel give negative rates
+        res = train.instantaneous_rate([-1, 3, -1], 1 * pq.ms)
+        assert_arrays_almost_equal(res.magnitude,
+                                   np.array([0, 0, 0, 0, -1000, 3000, -1000,
+                                             0, 0, 0]), 1e-9)
+
+    def test__instantaneous_rate_invalid(self):
+        self.assertRaises(ValueError, self.train.instantaneous_rate,
+                          ('cosine', 1 * pq.ms), 1 * pq.ms)
+        self.assertRaises(ValueError, self.train.instantaneous_rate,
+                          1 * pq.mV, 1 * pq.ms)
+        self.assertRaises(ValueError, self.train.instantaneous_rate,
+                          [0, 0, 0], 1 * pq.ms)
+
+
 class TestMiscellaneous(unittest.TestCase):
     def test__different_dtype_for_t_start_and_array(self):
         data = np.array([0, 9.9999999], dtype=np.float64) * pq.s
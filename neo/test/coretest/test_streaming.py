@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of neo.core.streaming
+"""
+
+# needed for python 3 compatibility
+from __future__ import absolute_import, division
+
+import threading
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest
+
+from neo.core.streaming import map_threads
+
+
+class TestMapThreads(unittest.TestCase):
+    def test__order(self):
+        self.assertEqual(map_threads(lambda item: item * 2, range(20),
+                                     workers=4),
+                         list(range(0, 40, 2)))
+
+    def test__serial(self):
+        def func(item):
+            return item, threading.current_thread()
+
+        main = threading.current_thread()
+        self.assertEqual(map_threads(func, [1, 2]), [(1, main), (2, main)])
+        self.assertEqual(map_threads(func, [1, 2], workers=1),
+                         [(1, main), (2, main)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -30,6 +30,7 @@ except ImportError:
     import unittest
 
 from neo.core import Block, Segment
+from neo.io.baseio import BaseIO
 from neo.test.tools import (assert_same_sub_schema,
                             assert_neo_object_is_compliant,
                             assert_sub_schema_is_lazy_loaded,
@@ -554,7 +555,8 @@ class BaseTestIO(object):
         AnalogSignalArray, SpikeTrain, Epocharray, and EventArray should
         contain the lazy_shape attribute.
         ''' % self.ioclass.__name__
-        if not hasattr(self.ioclass, 'load_lazy_object'):
+        if not (self.ioclass.has_lazy_proxies or
+                self.ioclass.load_lazy_object != BaseIO.load_lazy_object):
             return
 
         # This is for files presents at G-Node or generated
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of neo.io.asynchronous
+"""
+
+# needed for python 3 compatibility
+from __future__ import absolute_import, division
+
+import os
+import tempfile
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest
+
+try:
+    import asyncio
+except ImportError:
+    HAVE_ASYNCIO = False
+else:
+    HAVE_ASYNCIO = True
+    from neo.io.asynchronous import AsyncChunkIterator, StopAsyncIteration
+
+import numpy as np
+import quantities as pq
+
+from neo.io import BrainwareF32IO, RawBinarySignalIO
+from neo.test.tools import assert_arrays_equal
+
+
+@unittest.skipUnless(HAVE_ASYNCIO, "requires asyncio")
+class BaseAsyncTest(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+
+    def tearDown(self):
+        self.loop.close()
+        asyncio.set_event_loop(None)
+
+    def run_future(self, future):
+        return self.loop.run_until_complete(future)
+
+    def consume(self, chunks):
+        items = []
+        while True:
+            try:
+                items.append(self.run_future(chunks.__anext__()))
+            except StopAsyncIteration:
+                return items
+
+
+class TestAsyncChunkIterator(BaseAsyncTest):
+    def test__prefetch(self):
+        produced = []
+
+        def items():
+            for i in range(5):
+                produced.append(i)
+                yield i
+
+        chunks = AsyncChunkIterator(items(), prefetch=1)
+        self.assertEqual(self.run_future(chunks.__anext__()), 0)
+        self.run_future(asyncio.sleep(.2))
+        # one item read ahead of the consumer, no more
+        self.assertEqual(produced, [0, 1])
+        self.assertEqual(self.consume(chunks), [1, 2, 3, 4])
+
+    def test__cancelled_item_not_lost(self):
+        chunks = AsyncChunkIterator(iter(range(3)), prefetch=0)
+        waiter = chunks.__anext__()
+        waiter.cancel()
+        self.run_future(asyncio.sleep(.05))
+        self.assertEqual(self.consume(chunks), [0, 1, 2])
+
+    def test__error_and_close(self):
+        def items():
+            yield 1
+            raise ValueError('bad block')
+
+        chunks = AsyncChunkIterator(items())
+        self.assertEqual(self.run_future(chunks.__anext__()), 1)
+        self.assertRaises(ValueError, self.run_future, chunks.__anext__())
+        self.assertEqual(self.consume(chunks), [])
+
+        closed = []
+
+        def endless():
+            try:
+                while True:
+                    yield 0
+            finally:
+                closed.append(True)
+
+        chunks = AsyncChunkIterator(endless(), prefetch=3)
+        self.run_future(chunks.__anext__())
+        chunks.close()
+        self.run_future(asyncio.sleep(.05))
+        self.assertEqual(closed, [True])
+        self.assertEqual(self.consume(chunks), [])
+
+
+class TestBaseIOAsync(BaseAsyncTest):
+    def setUp(self):
+        super(TestBaseIOAsync, self).setUp()
+        fd, self.filename = tempfile.mkstemp()
+        os.close(fd)
+        self.data = np.arange(3000, dtype='f4').reshape(1000, 3)
+        self.kwargs = dict(sampling_rate=1 * pq.kHz, nbchannel=3)
+        self.data.tofile(self.filename)
+
+    def tearDown(self):
+        os.remove(self.filename)
+        super(TestBaseIOAsync, self).tearDown()
+
+    def test__aread_segment(self):
+        readers = [RawBinarySignalIO(filename=self.filename)
+                   for _ in range(3)]
+        segs = self.run_future(asyncio.gather(
+            *[reader.aread_segment(**self.kwargs) for reader in readers]))
+        self.assertEqual(len(segs), 3)
+        for seg in segs:
+            assert_arrays_equal(seg.analogsignals[1].magnitude,
+                                self.data[:, 1])
+
+    def test__aread_selection(self):
+        reader = RawBinarySignalIO(filename=self.filename)
+        seg = self.run_future(reader.aread_segment(
+            time_range=(100 * pq.ms, 200 * pq.ms), **self.kwargs))
+        self.assertEqual(len(seg.analogsignals), 3)
+        assert_arrays_equal(seg.analogsignals[1].magnitude,
+                            self.data[100:200, 1])
+
+        # read_block of the Brainware IOs takes no selection arguments
+        fd, filename = tempfile.mkstemp(suffix='.f32')
+        os.close(fd)
+        try:
+            np.array([-2, 500, 0, -1, 1., 2.],
+                     dtype=np.float32).tofile(filename)
+            reader = BrainwareF32IO(filename=filename)
+            blk = self.run_future(reader.aread_block(
+                time_range=(0 * pq.ms, 1.5 * pq.ms)))
+        finally:
+            os.remove(filename)
+        self.assertEqual(len(blk.segments[0].spiketrains[0]), 1)
+
+    def test__aiter_analogsignal_chunks(self):
+        reader = RawBinarySignalIO(filename=self.filename)
+        chunks = self.consume(reader.aiter_analogsignal_chunks(
+            400 * pq.ms, channel_indexes=[2], **self.kwargs))
+        self.assertEqual([len(chunk) for chunk in chunks], [400, 400, 200])
+        assert_arrays_equal(chunks[2].magnitude, self.data[800:, [2]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -6,13 +6,21 @@ Tests of neo.io.baseio
 # needed for python 3 compatibility
 from __future__ import absolute_import, division
 
+import os
+import tempfile
+
 try:
     import unittest2 as unittest
 except ImportError:
     import unittest
 
-from neo.core import objectlist
+import numpy as np
+import quantities as pq
+
+from neo.core import objectlist, AnalogSignalArray
+from neo.io import AsciiSignalIO, BrainwareDamIO, RawBinarySignalIO
 from neo.io.baseio import BaseIO
+from neo.test.tools import assert_arrays_equal
 
 
 class TestIOObjects(unittest.TestCase):
@@ -28,5 +36,92 @@ class TestIOObjects(unittest.TestCase):
                 self.assertRaises(AssertionError, meth, ())
 
 
+class TestIterAnalogSignalChunks(unittest.TestCase):
+    def setUp(self):
+        fd, self.filename = tempfile.mkstemp()
+        os.close(fd)
+        self.data = np.arange(3000, dtype='f4').reshape(1000, 3)
+        self.kwargs = dict(sampling_rate=1 * pq.kHz, nbchannel=3)
+        self.data.tofile(self.filename)
+
+    def tearDown(self):
+        os.remove(self.filename)
+
+    def test__contiguous_format(self):
+        reader = RawBinarySignalIO(filename=self.filename)
+        chunks = list(reader.iter_analogsignal_chunks(300 * pq.ms,
+                                                      **self.kwargs))
+        self.assertEqual([len(chunk) for chunk in chunks],
+                         [300, 300, 300, 100])
+        for i, chunk in enumerate(chunks):
+            self.assertIsInstance(chunk, AnalogSignalArray)
+            self.assertEqual(chunk.t_start, i * 300 * pq.ms)
+            assert_arrays_equal(chunk.magnitude,
+                                self.data[i * 300:(i + 1) * 300])
+        assert_arrays_equal(chunks[0].channel_index, np.array([0, 1, 2]))
+
+    def test__channels_and_overlap(self):
+        reader = RawBinarySignalIO(filename=self.filename)
+        chunks = list(reader.iter_analogsignal_chunks(
+            .5 * pq.s, channel_indexes=[2, 0], overlap=10 * pq.ms,
+            **self.kwargs))
+        self.assertEqual(len(chunks), 2)
+        assert_arrays_equal(chunks[0].magnitude, self.data[:510, [0, 2]])
+        assert_arrays_equal(chunks[1].magnitude, self.data[500:, [0, 2]])
+        assert_arrays_equal(chunks[1].channel_index, np.array([0, 2]))
+
+    def test__generic_fallback(self):
+        np.savetxt(self.filename, self.data, delimiter='\t')
+        reader = AsciiSignalIO(filename=self.filename)
+        self.assertFalse(reader.has_lazy_proxies)
+        chunks = list(reader.iter_analogsignal_chunks(
+            .4, overlap=5, sampling_rate=1 * pq.kHz, method='homemade'))
+        self.assertEqual([len(chunk) for chunk in chunks], [405, 405, 200])
+        self.assertEqual(chunks[2].t_start, .8 * pq.s)
+        self.assertEqual(chunks[2].shape[1], 3)
+        assert_arrays_equal(chunks[2].magnitude.astype('f4'),
+                            self.data[800:])
+
+
+class TestIterSegments(unittest.TestCase):
+    def setUp(self):
+        fd, self.filename = tempfile.mkstemp()
+        os.close(fd)
+
+    def tearDown(self):
+        os.remove(self.filename)
+
+    def test__generic_fallback(self):
+        data = np.arange(3000, dtype='f4').reshape(1000, 3)
+        data.tofile(self.filename)
+        reader = RawBinarySignalIO(filename=self.filename)
+        segs = list(reader.iter_segments(sampling_rate=1 * pq.kHz,
+                                         nbchannel=3, channel_indexes=[1],
+                                         unit_ids=[0]))
+        self.assertEqual(len(segs), 1)
+        self.assertEqual(len(segs[0].analogsignals), 1)
+        assert_arrays_equal(segs[0].analogsignals[0].magnitude, data[:, 1])
+
+    def test__per_sweep(self):
+        with open(self.filename, 'wb') as fobj:
+            for i in range(3):
+                fobj.write(np.array([i], dtype='f8').tostring())
+                fobj.write(np.array([i, 0], dtype='i2').tostring())
+                fobj.write(np.array([5], dtype='i4').tostring())
+                fobj.write((np.arange(5, dtype='i2') + i).tostring())
+        reader = BrainwareDamIO(filename=self.filename)
+        segs = reader.iter_segments()
+        seg = next(segs)
+        self.assertIsNone(seg.block)
+        assert_arrays_equal(seg.analogsignals[0].magnitude,
+                            np.arange(5.))
+        self.assertIs(seg.analogsignals[0].segment, seg)
+        self.assertEqual([seg.index for seg in segs], [1, 2])
+
+        segs = list(reader.iter_segments(lazy=True))
+        self.assertEqual([seg.analogsignals[0].lazy_shape for seg in segs],
+                         [5, 5, 5])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -6,8 +6,10 @@ Tests of neo.io.brainwaredamio
 # needed for python 3 compatibility
 from __future__ import absolute_import, division, print_function
 
+import os
 import os.path
 import sys
+import tempfile
 
 try:
     import unittest2 as unittest
@@ -21,7 +23,7 @@ from neo.core import (AnalogSignal, Block, RecordingChannel,
                       RecordingChannelGroup, Segment)
 from neo.io import BrainwareDamIO
 from neo.test.iotest.common_io_test import BaseTestIO
-from neo.test.tools import (assert_same_sub_schema,
+from neo.test.tools import (assert_arrays_equal, assert_same_sub_schema,
                             assert_neo_object_is_compliant)
 from neo.test.iotest.tools import create_generic_reader
 
@@ -152,5 +154,31 @@ class BrainwareDamIOTestCase(BaseTestIO, unittest.TestCase):
                 raise
 
 
+class BrainwareDamIOGeneratedFileTestCase(unittest.TestCase):
+    def setUp(self):
+        fd, self.filename = tempfile.mkstemp(suffix='.dam')
+        os.close(fd)
+        # two Segments without stimulus parameters
+        self.signals = [np.arange(5, dtype=np.int16),
+                        np.arange(10, 13, dtype=np.int16)]
+        with open(self.filename, 'wb') as fobject:
+            for i, signal in enumerate(self.signals):
+                np.array([i], dtype=np.float64).tofile(fobject)
+                np.array([i, 0], dtype=np.int16).tofile(fobject)
+                np.array([len(signal)], dtype=np.int32).tofile(fobject)
+                signal.tofile(fobject)
+
+    def tearDown(self):
+        os.remove(self.filename)
+
+    def test_iter_analogsignal_chunks(self):
+        # read() returns a single Block, not a list
+        ioobj = BrainwareDamIO(filename=self.filename)
+        chunks = list(ioobj.iter_analogsignal_chunks(3 * pq.s))
+        self.assertEqual([len(chunk) for chunk in chunks], [3, 2, 3])
+        assert_arrays_equal(chunks[1].magnitude[:, 0], self.signals[0][3:])
+        assert_arrays_equal(chunks[2].magnitude[:, 0], self.signals[1])
+
+
 if __name__ == '__main__':
     unittest.main()
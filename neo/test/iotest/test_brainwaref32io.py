@@ -6,8 +6,10 @@ Tests of neo.io.brainwaref32io
 # needed for python 3 compatibility
 from __future__ import absolute_import, division, print_function
 
+import os
 import os.path
 import sys
+import tempfile
 
 try:
     import unittest2 as unittest
@@ -19,6 +21,7 @@ import quantities as pq
 
 from neo.core import Block, RecordingChannelGroup, Segment, SpikeTrain, Unit
 from neo.io import BrainwareF32IO
+from neo.core.streaming import map_threads
 from neo.test.iotest.common_io_test import BaseTestIO
 from neo.test.tools import (assert_same_sub_schema,
                             assert_neo_object_is_compliant)
@@ -160,5 +163,52 @@ class BrainwareF32IOTestCase(BaseTestIO, unittest.TestCase):
                 raise
 
 
+class BrainwareF32IOGeneratedFileTestCase(unittest.TestCase):
+    def setUp(self):
+        fd, self.filename = tempfile.mkstemp(suffix='.f32')
+        os.close(fd)
+        # two conditions of 500 ms with one parameter, the first with two
+        # repetitions
+        data = [-2, 500, 1, 10., -1, 1., 2., -1, 3.,
+                -2, 500, 1, 20., -1, 4., 5., 6.]
+        np.array(data, dtype=np.float32).tofile(self.filename)
+
+    def tearDown(self):
+        os.remove(self.filename)
+
+    def test_read_in_threads(self):
+        ioobj = BrainwareF32IO(filename=self.filename)
+        blocks = map_threads(lambda _: ioobj.read_block(), range(8), 4)
+        for block in blocks:
+            self.assertEqual(len(block.segments), 3)
+            self.assertEqual(block.segments[2].annotations, {'Param0': 20.})
+            self.assertEqual([len(seg.spiketrains[0])
+                              for seg in block.segments], [2, 1, 3])
+            self.assertEqual(len(block.recordingchannelgroups[0].units[0].
+                                 spiketrains), 3)
+
+    def test_read_selection(self):
+        # read() overrides BaseIO.read, but still applies the selection
+        ioobj = BrainwareF32IO(filename=self.filename)
+        block = ioobj.read(time_range=(0 * pq.ms, 1.5 * pq.ms))
+        self.assertEqual([len(seg.spiketrains[0])
+                          for seg in block.segments], [1, 0, 0])
+        self.assertEqual(
+            sum(len(train)
+                for train in block.recordingchannelgroups[0].units[0].
+                spiketrains), 1)
+        assert_neo_object_is_compliant(block)
+
+    def test_describe(self):
+        # read() returns a single Block, not a list
+        summary = BrainwareF32IO(filename=self.filename).describe()
+        self.assertEqual(summary.n_spikes, 6)
+
+    def test_iter_segments(self):
+        ioobj = BrainwareF32IO(filename=self.filename)
+        self.assertEqual([len(seg.spiketrains[0])
+                          for seg in ioobj.iter_segments()], [2, 1, 3])
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -9,6 +9,7 @@ from __future__ import absolute_import, division, print_function
 import logging
 import os.path
 import sys
+import tempfile
 
 try:
     import unittest2 as unittest
@@ -21,6 +22,7 @@ import quantities as pq
 from neo.core import (Block, EventArray, RecordingChannel,
                       RecordingChannelGroup, Segment, SpikeTrain, Unit)
 from neo.io import BrainwareSrcIO, brainwaresrcio
+from neo.core.streaming import map_threads
 from neo.test.iotest.common_io_test import BaseTestIO
 from neo.test.tools import (assert_same_sub_schema,
                             assert_neo_object_is_compliant)
@@ -346,6 +348,60 @@ class BrainwareSrcIOTestCase(BaseTestIO, unittest.TestCase):
                 raise
 
 
+def write_units_src(filename, names):
+    '''Write an SRC file with a single Block, holding a list of unsorted
+    Units without spikes with the names :attr:`names`.'''
+    with open(filename, 'wb') as fsrc:
+        # list of Units
+        np.array([29082, len(names), 0, 0], dtype=np.int16).tofile(fsrc)
+        for name in names:
+            name = name.encode('ascii')
+            np.array([29084, 0, len(name)], dtype=np.uint16).tofile(fsrc)
+            fsrc.write(name)
+            # SpikeTrain length and response windows
+            np.array([1000, 0, 100, 100, 1000], dtype=np.int32).tofile(fsrc)
+            # empty list of SpikeTrains
+            np.array([29082, 0, 0, 0], dtype=np.int16).tofile(fsrc)
+
+
+class BrainwareSrcIOThreadsTestCase(unittest.TestCase):
+    def setUp(self):
+        fd, self.filename = tempfile.mkstemp(suffix='.src')
+        os.close(fd)
+        self.names = ['unit%s' % i for i in range(200)]
+        write_units_src(self.filename, self.names)
+
+    def tearDown(self):
+        os.remove(self.filename)
+
+    def test_read_block_threads(self):
+        ioobj = BrainwareSrcIO(filename=self.filename)
+
+        def read(_):
+            blk = ioobj.read_block()
+            return [unit.name for unit in blk.recordingchannelgroups[0].units]
+
+        for names in map_threads(read, range(8), 4):
+            self.assertEqual(names, ['UnassignedSpikes'] + self.names)
+        self.assertFalse(ioobj._isopen)
+        self.assertEqual(ioobj._files, set())
+
+    def test_close_threads(self):
+        ioobj = BrainwareSrcIO(filename=self.filename)
+
+        def open_file(_):
+            ioobj._opensrc()
+            return ioobj._state.fsrc
+
+        # files left open by threads are closed by close
+        fsrcs = map_threads(open_file, range(3), 3)
+        fsrcs.append(open_file(None))
+        self.assertFalse(any(fsrc.closed for fsrc in fsrcs))
+        ioobj.close()
+        self.assertTrue(all(fsrc.closed for fsrc in fsrcs))
+        self.assertEqual(ioobj._files, set())
+
+
 if __name__ == '__main__':
     logger = logging.getLogger(BrainwareSrcIO.__module__ +
                                '.' +
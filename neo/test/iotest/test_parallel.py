@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of neo.io.parallel
+"""
+
+# needed for python 3 compatibility
+from __future__ import absolute_import, division
+
+import gc
+import os
+import shutil
+import sys
+import tempfile
+import weakref
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest
+
+import numpy as np
+import quantities as pq
+
+from neo.io import RawBinarySignalIO, parallel, read_many
+from neo.test.tools import assert_arrays_equal
+
+
+class TestReadMany(unittest.TestCase):
+    def setUp(self):
+        self.dirname = tempfile.mkdtemp()
+        self.filenames = []
+        self.data = []
+        for i in range(3):
+            filename = os.path.join(self.dirname, 'file%d.raw' % i)
+            data = np.arange(200, dtype='f4').reshape(100, 2) + i
+            data.tofile(filename)
+            self.filenames.append(filename)
+            self.data.append(data)
+        self.kwargs = dict(sampling_rate=1 * pq.kHz, nbchannel=2,
+                           dtype='f4')
+
+    def tearDown(self):
+        shutil.rmtree(self.dirname)
+
+    def test__order_and_errors(self):
+        filenames = list(self.filenames)
+        filenames.insert(1, os.path.join(self.dirname, 'missing.raw'))
+        results = read_many(filenames, workers=2, **self.kwargs)
+        self.assertEqual([res.filename for res in results], filenames)
+        self.assertIsNone(results[1].blocks)
+        self.assertIn('missing.raw', results[1].error)
+        for res, data in zip(results[:1] + results[2:], self.data):
+            self.assertIsNone(res.error)
+            seg = res.blocks[0].segments[0]
+            self.assertIs(seg.block, res.blocks[0])
+            self.assertIs(seg.analogsignals[1].segment, seg)
+            assert_arrays_equal(seg.analogsignals[1].magnitude, data[:, 1])
+
+    def test__lazy_selection(self):
+        results = read_many(self.filenames, workers=2, lazy=True,
+                            io_class=RawBinarySignalIO,
+                            channel_indexes=[0], **self.kwargs)
+        reader = RawBinarySignalIO(filename=self.filenames[2])
+        sigs = results[2].blocks[0].segments[0].analogsignals
+        self.assertEqual(len(sigs), 1)
+        self.assertEqual(sigs[0].lazy_shape, (100,))
+        sig = reader.load_lazy_object(sigs[0], time_slice=(None, 10 * pq.ms))
+        assert_arrays_equal(sig.magnitude, self.data[2][:10, 0])
+
+    @unittest.skipUnless(parallel.HAVE_OUT_OF_BAND,
+                         "requires pickle protocol 5")
+    def test__out_of_band(self):
+        results = read_many(self.filenames, workers=2, **self.kwargs)
+        sig = results[0].blocks[0].segments[0].analogsignals[1]
+        assert_arrays_equal(sig.magnitude, self.data[0][:, 1])
+        # the signal views the shared memory, it was not copied
+        base = sig
+        while isinstance(base, np.ndarray):
+            self.assertFalse(base.flags.owndata)
+            base = base.base
+        self.assertIsInstance(base, parallel._SharedMemoryArray)
+
+        data, shared = parallel._dump(results[1].blocks)
+        self.assertIsNotNone(shared)
+        blocks = parallel._load(data, shared)
+        assert_arrays_equal(blocks[0].segments[0].analogsignals[0].magnitude,
+                            self.data[1][:, 0])
+
+    @unittest.skipUnless(parallel.HAVE_OUT_OF_BAND,
+                         "requires pickle protocol 5")
+    def test__out_of_band_close(self):
+        unraisable = []
+        hook = sys.unraisablehook
+        sys.unraisablehook = unraisable.append
+        try:
+            results = read_many(self.filenames, workers=2, **self.kwargs)
+            sig = results[0].blocks[0].segments[0].analogsignals[1]
+            base = sig
+            while isinstance(base, np.ndarray):
+                base = base.base
+            owner = weakref.ref(base)
+            del results, base
+            gc.collect()
+            # the block is still mapped while the signal views it
+            self.assertIsNotNone(owner())
+            assert_arrays_equal(sig.magnitude, self.data[0][:, 1])
+            del sig
+            gc.collect()
+            self.assertIsNone(owner())
+        finally:
+            sys.unraisablehook = hook
+        self.assertEqual([repr(err.exc_value) for err in unraisable], [])
+
+    def test__serial(self):
+        results = read_many(self.filenames[:2], workers=1, **self.kwargs)
+        self.assertEqual(len(results), 2)
+        self.assertIsNone(results[0].error)
+
+    def test__single_block_read(self):
+        # BrainwareDamIO.read returns a Block, not a list
+        filenames = []
+        for i in range(2):
+            filename = os.path.join(self.dirname, 'file%d.dam' % i)
+            with open(filename, 'wb') as fobject:
+                np.array([0], dtype=np.float64).tofile(fobject)
+                np.array([0, 0], dtype=np.int16).tofile(fobject)
+                np.array([3], dtype=np.int32).tofile(fobject)
+                np.arange(3, dtype=np.int16).tofile(fobject)
+            filenames.append(filename)
+        for workers in (1, 2):
+            results = read_many(filenames, workers=workers)
+            for res in results:
+                self.assertIsNone(res.error)
+                self.assertEqual(len(res.blocks), 1)
+                sig = res.blocks[0].segments[0].analogsignals[0]
+                assert_arrays_equal(sig.magnitude, np.arange(3.))
+
+
+if __name__ == "__main__":
+    unittest.main()
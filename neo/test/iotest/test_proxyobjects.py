@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of neo.io.proxyobjects
+"""
+
+# needed for python 3 compatibility
+from __future__ import absolute_import, division
+
+import os
+import tempfile
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest
+
+import numpy as np
+import quantities as pq
+
+from neo.core import (AnalogSignal, AnalogSignalArray, EpochArray,
+                      EventArray, SpikeTrain)
+from neo.io import RawBinarySignalIO
+from neo.io.proxyobjects import (RawArray, AnalogSignalProxy,
+                                 SpikeTrainProxy, EventArrayProxy,
+                                 EpochArrayProxy)
+from neo.test.tools import (assert_arrays_almost_equal,
+                            assert_arrays_equal)
+
+
+class BaseProxyTest(unittest.TestCase):
+    def setUp(self):
+        fd, self.filename = tempfile.mkstemp(suffix='.raw')
+        os.close(fd)
+
+    def tearDown(self):
+        os.remove(self.filename)
+
+    def write(self, *arrays):
+        with open(self.filename, 'wb') as fobj:
+            for arr in arrays:
+                fobj.write(arr.tostring())
+
+
+class TestRawArray(BaseProxyTest):
+    def test__read_scaled_columns(self):
+        data = np.arange(30, dtype='i2').reshape(10, 3)
+        self.write(np.zeros(4, dtype='i2'), data)
+        raw = RawArray(self.filename, 'i2', (10, 3), byte_offset=8,
+                       gain=[1., 2., 3.], offset=0.5)
+        self.assertEqual(len(raw), 10)
+        res = raw.read(slice(2, 5), [2, 0])
+        self.assertEqual(res.dtype, np.float32)
+        assert_arrays_almost_equal(res, data[2:5][:, [2, 0]] * [3., 1.] + .5,
+                                   1e-6)
+
+    def test__read_unscaled(self):
+        data = np.arange(10, dtype='f8')
+        self.write(data)
+        raw = RawArray(self.filename, 'f8', 10)
+        res = raw.read(slice(3, 6))
+        self.assertEqual(res.dtype, np.float64)
+        assert_arrays_equal(res, data[3:6])
+
+    def test__searchsorted(self):
+        self.write(np.array([10, 20, 30, 40], dtype='i4'))
+        raw = RawArray(self.filename, 'i4', 4, gain=0.1, scaled_dtype='f8')
+        self.assertEqual(raw.searchsorted(2.), 1)
+        self.assertEqual(raw.searchsorted(2., 'right'), 2)
+        self.assertEqual(raw.searchsorted(5.), 4)
+        # gain given per channel
+        raw.gain = np.array([0.1])
+        self.assertEqual(raw.searchsorted(2.), 1)
+        raw.gain = np.array([-0.1])
+        self.assertRaises(ValueError, raw.searchsorted, 2.)
+
+
+class TestAnalogSignalProxy(BaseProxyTest):
+    def setUp(self):
+        super(TestAnalogSignalProxy, self).setUp()
+        self.data = np.arange(300, dtype='f4').reshape(100, 3)
+        self.write(self.data)
+        self.raw = RawArray(self.filename, 'f4', (100, 3))
+
+    def test__single_channel(self):
+        proxy = AnalogSignalProxy(self.raw, units='mV',
+                                  sampling_rate=1 * pq.kHz,
+                                  t_start=1 * pq.s, columns=[1],
+                                  channel_indexes=[7], name='sig',
+                                  depth=3)
+        self.assertEqual(proxy.lazy_shape, (100,))
+        sig = proxy.load(time_slice=(1.010 * pq.s, 1020 * pq.ms))
+        self.assertIsInstance(sig, AnalogSignal)
+        assert_arrays_equal(sig.magnitude, self.data[10:20, 1])
+        self.assertEqual(sig.units, pq.mV)
+        self.assertAlmostEqual(float(sig.t_start.rescale(pq.s)), 1.01)
+        self.assertEqual(sig.channel_index, 7)
+        self.assertEqual(sig.name, 'sig')
+        self.assertEqual(sig.annotations, {'depth': 3})
+
+    def test__multi_channel(self):
+        proxy = AnalogSignalProxy(self.raw, units='mV',
+                                  sampling_rate=1 * pq.kHz,
+                                  channel_indexes=[5, 6, 7])
+        self.assertEqual(proxy.lazy_shape, (100, 3))
+        sigarr = proxy.load(time_slice=(None, 5 * pq.ms),
+                            channel_indexes=[7, 5])
+        self.assertIsInstance(sigarr, AnalogSignalArray)
+        assert_arrays_equal(sigarr.magnitude, self.data[:5, [2, 0]])
+        assert_arrays_equal(sigarr.channel_index, np.array([7, 5]))
+        self.assertRaises(ValueError, proxy.load, channel_indexes=[1])
+
+    def test__time_slice_clipped(self):
+        proxy = AnalogSignalProxy(self.raw, units='mV',
+                                  sampling_rate=1 * pq.kHz, columns=[0])
+        sig = proxy.load(time_slice=(-1 * pq.s, 10 * pq.s))
+        self.assertEqual(sig.shape, (100,))
+        sig = proxy.load(time_slice=(1 * pq.s, 2 * pq.s))
+        self.assertEqual(sig.shape, (0,))
+
+    def test__time_sliced(self):
+        proxy = AnalogSignalProxy(self.raw, units='mV',
+                                  sampling_rate=1 * pq.kHz, columns=[0, 2])
+        sliced = proxy.time_sliced((10 * pq.ms, 30 * pq.ms))
+        self.assertEqual(sliced.raw.byte_offset, 10 * 3 * 4)
+        self.assertEqual(sliced.lazy_shape, (20, 2))
+        sigarr = sliced.load()
+        assert_arrays_equal(sigarr.magnitude, self.data[10:30, [0, 2]])
+        self.assertEqual(sigarr.t_start, 10 * pq.ms)
+
+    def test__lazy_object(self):
+        proxy = AnalogSignalProxy(self.raw, units='mV',
+                                  sampling_rate=1 * pq.kHz, columns=[2])
+        sig = proxy.lazy_object()
+        self.assertIsInstance(sig, AnalogSignal)
+        self.assertEqual(sig.size, 0)
+        self.assertEqual(sig.lazy_shape, (100,))
+        self.assertIs(sig.lazy_proxy, proxy)
+        self.assertEqual(sig.channel_index, 2)
+
+
+class TestSpikeTrainProxy(BaseProxyTest):
+    def test__load(self):
+        times = np.array([100, 250, 300, 900], dtype='i4')
+        waveforms = np.arange(24, dtype='i2').reshape(4, 2, 3)
+        self.write(times, waveforms)
+        proxy = SpikeTrainProxy(
+            RawArray(self.filename, 'i4', 4, gain=1e-3, scaled_dtype='f8'),
+            units=pq.s, t_stop=1 * pq.s,
+            waveforms=RawArray(self.filename, 'i2', (4, 2, 3),
+                               byte_offset=16, gain=2.),
+            waveform_units=pq.uV, sampling_rate=10 * pq.kHz,
+            name='unit 1')
+        self.assertEqual(proxy.lazy_shape, (4,))
+
+        sptr = proxy.load(time_slice=(250 * pq.ms, 0.3 * pq.s))
+        self.assertIsInstance(sptr, SpikeTrain)
+        assert_arrays_almost_equal(sptr.magnitude, np.array([.25, .3]),
+                                   1e-12)
+        self.assertEqual(sptr.t_start, 250 * pq.ms)
+        self.assertEqual(sptr.t_stop, 0.3 * pq.s)
+        assert_arrays_equal(sptr.waveforms.magnitude,
+                            (waveforms[1:3] * 2.).astype('f'))
+        self.assertEqual(sptr.name, 'unit 1')
+
+        sptr = proxy.load(load_waveforms=False)
+        self.assertEqual(len(sptr), 4)
+        self.assertIsNone(sptr.waveforms)
+
+        lazy = proxy.lazy_object()
+        self.assertEqual(lazy.size, 0)
+        self.assertEqual(lazy.lazy_shape, (4,))
+
+
+class TestEventProxies(unittest.TestCase):
+    def test__event_array(self):
+        proxy = EventArrayProxy(np.array([1., 2., 3.]), units=pq.s,
+                                labels=np.array(['a', 'b', 'c'], dtype='S'),
+                                name='trig')
+        evtarr = proxy.load(time_slice=(1.5 * pq.s, None))
+        self.assertIsInstance(evtarr, EventArray)
+        assert_arrays_equal(evtarr.times.magnitude, np.array([2., 3.]))
+        self.assertEqual(list(evtarr.labels), [b'b', b'c'])
+        self.assertEqual(evtarr.name, 'trig')
+        lazy = proxy.lazy_object()
+        self.assertEqual(lazy.times.size, 0)
+        self.assertEqual(lazy.lazy_shape, (3,))
+        sliced = proxy.time_sliced((None, 2 * pq.s))
+        self.assertEqual(sliced.lazy_shape, (2,))
+        self.assertEqual(list(sliced.load().labels), [b'a', b'b'])
+
+    def test__epoch_array(self):
+        proxy = EpochArrayProxy(np.array([1., 2., 3.]), units=pq.s,
+                                stop_times=np.array([1.5, 2.5, 4.]))
+        epcarr = proxy.load(time_slice=(None, 2 * pq.s))
+        self.assertIsInstance(epcarr, EpochArray)
+        assert_arrays_almost_equal(epcarr.durations.magnitude,
+                                   np.array([.5, .5]), 1e-12)
+        self.assertEqual(len(epcarr.labels), 2)
+        self.assertRaises(ValueError, EpochArrayProxy, [1.], units=pq.s)
+
+
+class TestRawBinarySignalIOLazy(BaseProxyTest):
+    def test__load_lazy_object(self):
+        data = (np.arange(3000) % 200 - 100).astype('i2').reshape(1000, 3)
+        self.write(data)
+        reader = RawBinarySignalIO(filename=self.filename)
+        kwargs = dict(sampling_rate=1 * pq.kHz, nbchannel=3, dtype='i2')
+        full = reader.read_segment(**kwargs)
+        seg = reader.read_segment(lazy=True, **kwargs)
+        self.assertEqual(len(seg.analogsignals), 3)
+        lazy = seg.analogsignals[2]
+        self.assertEqual(lazy.size, 0)
+        self.assertEqual(lazy.lazy_shape, (1000,))
+
+        sig = reader.load_lazy_object(lazy, time_slice=(.1 * pq.s,
+                                                        .2 * pq.s))
+        assert_arrays_almost_equal(sig.magnitude,
+                                   full.analogsignals[2].magnitude[100:200],
+                                   1e-6)
+        self.assertEqual(sig.channel_index, 2)
+        self.assertEqual(sig.t_start, .1 * pq.s)
+
+    def test__not_lazy_raises(self):
+        reader = RawBinarySignalIO(filename=self.filename)
+        self.assertRaises(NotImplementedError, reader.load_lazy_object,
+                          AnalogSignal([1.], units='mV',
+                                       sampling_rate=1 * pq.Hz))
+
+
+if __name__ == "__main__":
+    unittest.main()
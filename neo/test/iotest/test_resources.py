@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of neo.io.resources
+"""
+
+# needed for python 3 compatibility
+from __future__ import absolute_import, division
+
+import os
+import shutil
+import tempfile
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest
+
+import numpy as np
+import quantities as pq
+
+from neo.io import RawBinarySignalIO
+from neo.io.resources import ResourcePool, resource_pool
+from neo.test.tools import assert_arrays_equal
+
+
+class BaseResourcesTest(unittest.TestCase):
+    def setUp(self):
+        self.dirname = tempfile.mkdtemp()
+        self.pool = ResourcePool(max_files=2, max_memmaps=2)
+
+    def tearDown(self):
+        self.pool.release()
+        shutil.rmtree(self.dirname)
+
+    def write(self, name, data):
+        filename = os.path.join(self.dirname, name)
+        data.tofile(filename)
+        return filename
+
+
+class TestMemmaps(BaseResourcesTest):
+    def test__views(self):
+        data = np.arange(100, dtype='i2')
+        filename = self.write('a.raw', data)
+        arr = self.pool.memmap(filename, 'i2', 'r', offset=20,
+                               shape=(10, 4))
+        assert_arrays_equal(arr, data[10:50].reshape(10, 4))
+        arr = self.pool.memmap(filename, np.dtype('i4'), offset=2, shape=49)
+        assert_arrays_equal(arr, data[1:99].view('i4'))
+        self.assertEqual(self.pool.n_memmaps, 1)
+        self.assertEqual(self.pool.memmap(filename, 'i2', shape=0).shape,
+                         (0,))
+        self.assertRaises(ValueError, self.pool.memmap, filename, 'i2',
+                          offset=190, shape=10)
+        self.assertRaises(ValueError, self.pool.memmap, filename, 'i2', 'r+')
+
+    def test__lru(self):
+        names = [self.write('%s.raw' % i, np.arange(10, dtype='f8') + i)
+                 for i in range(3)]
+        for filename in names:
+            self.pool.memmap(filename, 'f8')
+        self.assertEqual(self.pool.n_memmaps, 2)
+        self.assertNotIn(os.path.abspath(names[0]), self.pool._memmaps)
+        # reopened on demand
+        assert_arrays_equal(self.pool.memmap(names[0], 'f8'),
+                            np.arange(10.))
+        self.pool.release(names[0])
+        self.assertEqual(self.pool.n_memmaps, 1)
+
+    def test__replaced_file(self):
+        filename = self.write('a.raw', np.zeros(10, dtype='i4'))
+        self.pool.memmap(filename, 'i4')
+        os.remove(filename)
+        self.write('a.raw', np.ones(20, dtype='i4'))
+        assert_arrays_equal(self.pool.memmap(filename, 'i4'),
+                            np.ones(20, dtype='i4'))
+
+
+class TestFiles(BaseResourcesTest):
+    def test__open(self):
+        filename = self.write('a.raw', np.arange(10, dtype='u1'))
+        with self.pool.open(filename) as fobj:
+            first = fobj
+            with self.pool.open(filename) as other:
+                # lent to one caller at a time
+                self.assertIsNot(other, first)
+        self.assertEqual(self.pool.n_files, 2)
+        with self.pool.open(filename) as fobj:
+            fobj.seek(3)
+            self.assertEqual(fobj.read(2), b'\x03\x04')
+        self.assertFalse(first.closed)
+
+    def test__lru(self):
+        names = [self.write('%s.raw' % i, np.zeros(1, dtype='u1'))
+                 for i in range(3)]
+        fobjs = []
+        for filename in names:
+            with self.pool.open(filename) as fobj:
+                fobjs.append(fobj)
+        self.assertEqual(self.pool.n_files, 2)
+        self.assertEqual([fobj.closed for fobj in fobjs],
+                         [True, False, False])
+        self.pool.release()
+        self.assertEqual(self.pool.n_files, 0)
+        self.assertTrue(fobjs[2].closed)
+
+
+class TestCloseIO(BaseResourcesTest):
+    def test__context_manager(self):
+        data = np.arange(300, dtype='f4').reshape(100, 3)
+        filename = self.write('a.raw', data)
+        with RawBinarySignalIO(filename=filename) as reader:
+            seg = reader.read_segment(sampling_rate=1 * pq.kHz, nbchannel=3)
+            self.assertIn(os.path.abspath(filename), resource_pool._memmaps)
+        self.assertNotIn(os.path.abspath(filename), resource_pool._memmaps)
+        assert_arrays_equal(seg.analogsignals[2].magnitude, data[:, 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
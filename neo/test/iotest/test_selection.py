@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of neo.io.selection
+"""
+
+# needed for python 3 compatibility
+from __future__ import absolute_import, division
+
+import os
+import tempfile
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest
+
+import numpy as np
+import quantities as pq
+
+from neo.core import (AnalogSignal, AnalogSignalArray, Block, EventArray,
+                      RecordingChannelGroup, Segment, SpikeTrain, Unit)
+from neo.io import RawBinarySignalIO
+from neo.io.selection import DataSelection
+from neo.test.tools import assert_arrays_equal
+
+
+def make_block():
+    blk = Block()
+    seg = Segment()
+    blk.segments.append(seg)
+    seg.analogsignals = [AnalogSignal(np.arange(100.), units='mV',
+                                      sampling_rate=10 * pq.Hz,
+                                      channel_index=i) for i in range(3)]
+    seg.analogsignalarrays = [
+        AnalogSignalArray(np.arange(300.).reshape(100, 3), units='mV',
+                          sampling_rate=10 * pq.Hz,
+                          channel_index=np.array([0, 1, 2]), name='arr')]
+    seg.spiketrains = [SpikeTrain([1., 4., 8.], units='s', t_stop=10 * pq.s,
+                                  channel_index=chan, unit_id=unit)
+                       for chan in range(3) for unit in range(2)]
+    seg.eventarrays = [EventArray([1., 5., 9.] * pq.s,
+                                  labels=np.array(['a', 'b', 'c'],
+                                                  dtype='S'))]
+    rcg = RecordingChannelGroup(channel_indexes=np.array([0, 1, 2]))
+    rcg.analogsignalarrays = list(seg.analogsignalarrays)
+    for unit_id in range(2):
+        unit = Unit(unit_id=unit_id)
+        unit.spiketrains = [sptr for sptr in seg.spiketrains
+                            if sptr.annotations['unit_id'] == unit_id]
+        rcg.units.append(unit)
+    blk.recordingchannelgroups.append(rcg)
+    blk.create_many_to_one_relationship()
+    return blk
+
+
+class TestDataSelection(unittest.TestCase):
+    def test__selects_all(self):
+        self.assertTrue(DataSelection().selects_all)
+        self.assertTrue(DataSelection(time_range=(None, None)).selects_all)
+        kargs = {'channel_indexes': [1], 'other': 3}
+        selection = DataSelection.pop(kargs)
+        self.assertFalse(selection.selects_all)
+        self.assertEqual(kargs, {'other': 3})
+        native, others = selection.split(['time_range'])
+        self.assertEqual(native, {})
+        self.assertEqual(others.channel_indexes, [1])
+
+    def test__ranges(self):
+        selection = DataSelection(channel_indexes=[2, 0],
+                                  time_range=(1 * pq.s, 2500 * pq.ms))
+        self.assertEqual(selection.channels([0, 1, 2, 3]), [0, 2])
+        self.assertTrue(selection.keep_channel(None))
+        self.assertEqual(selection.sample_range(.5 * pq.s, 10 * pq.Hz, 100),
+                         (5, 20))
+        self.assertEqual(selection.time_bounds([0., 1., 2., 2.5, 3.] * pq.s),
+                         (1, 4))
+        self.assertEqual(selection.time_limits(pq.ms), (1000., 2500.))
+
+    def test__select_block(self):
+        blk = make_block()
+        selection = DataSelection(channel_indexes=[0, 2], unit_ids=[1],
+                                  time_range=(2 * pq.s, 5 * pq.s))
+        selection.select_block(blk)
+        seg = blk.segments[0]
+
+        self.assertEqual([sig.channel_index for sig in seg.analogsignals],
+                         [0, 2])
+        sig = seg.analogsignals[1]
+        self.assertEqual(len(sig), 30)
+        self.assertEqual(sig.t_start, 2 * pq.s)
+        self.assertEqual(sig[0], 20 * pq.mV)
+
+        sigarr = seg.analogsignalarrays[0]
+        self.assertEqual(sigarr.shape, (30, 2))
+        assert_arrays_equal(sigarr.channel_index, np.array([0, 2]))
+        assert_arrays_equal(sigarr.magnitude[0], np.array([60., 62.]))
+        self.assertEqual(sigarr.name, 'arr')
+        self.assertEqual(sigarr.t_start, 2 * pq.s)
+
+        self.assertEqual(len(seg.spiketrains), 2)
+        for sptr in seg.spiketrains:
+            self.assertEqual(sptr.annotations['unit_id'], 1)
+            assert_arrays_equal(sptr.magnitude, np.array([4.]))
+            self.assertIs(sptr.segment, seg)
+        self.assertEqual(list(seg.eventarrays[0].labels), [b'b'])
+
+        rcg = blk.recordingchannelgroups[0]
+        self.assertIs(rcg.analogsignalarrays[0], sigarr)
+        self.assertEqual(len(rcg.units[0].spiketrains), 0)
+        self.assertEqual(rcg.units[1].spiketrains, seg.spiketrains)
+
+    def test__select_lazy(self):
+        seg = make_block().segments[0]
+        DataSelection(channel_indexes=[1],
+                      time_range=(2 * pq.s, 5 * pq.s)).select_segment(
+                          seg, lazy=True)
+        self.assertEqual(len(seg.analogsignals), 1)
+        self.assertEqual(len(seg.analogsignals[0]), 100)
+        self.assertEqual(len(seg.spiketrains), 2)
+
+
+class TestRawBinarySignalIOSelection(unittest.TestCase):
+    def setUp(self):
+        fd, self.filename = tempfile.mkstemp()
+        os.close(fd)
+        self.data = np.arange(3000, dtype='f4').reshape(1000, 3)
+        self.data.tofile(self.filename)
+        self.kwargs = dict(sampling_rate=1 * pq.kHz, nbchannel=3)
+
+    def tearDown(self):
+        os.remove(self.filename)
+
+    def test__read_segment(self):
+        reader = RawBinarySignalIO(filename=self.filename)
+        seg = reader.read_segment(channel_indexes=[2, 0],
+                                  time_range=(.1 * pq.s, .2 * pq.s),
+                                  **self.kwargs)
+        self.assertEqual([sig.channel_index for sig in seg.analogsignals],
+                         [0, 2])
+        for sig in seg.analogsignals:
+            self.assertEqual(sig.t_start, .1 * pq.s)
+            assert_arrays_equal(sig.magnitude,
+                                self.data[100:200, sig.channel_index])
+
+    def test__read_lazy(self):
+        reader = RawBinarySignalIO(filename=self.filename)
+        seg = reader.read_segment(lazy=True, channel_indexes=[1],
+                                  time_range=(None, .5 * pq.s),
+                                  **self.kwargs)
+        self.assertEqual(len(seg.analogsignals), 1)
+        self.assertEqual(seg.analogsignals[0].lazy_shape, (500,))
+        sig = reader.load_lazy_object(seg.analogsignals[0])
+        assert_arrays_equal(sig.magnitude, self.data[:500, 1])
+
+    def test__read_fallback(self):
+        reader = RawBinarySignalIO(filename=self.filename)
+        blk = reader.read(channel_indexes=[1], unit_ids=[0],
+                          time_range=(.9 * pq.s, None), **self.kwargs)[0]
+        sigs = blk.segments[0].analogsignals
+        self.assertEqual(len(sigs), 1)
+        assert_arrays_equal(sigs[0].magnitude, self.data[900:, 1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of neo.io.summary
+"""
+
+# needed for python 3 compatibility
+from __future__ import absolute_import, division
+
+import os
+import shutil
+import tempfile
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest
+
+import numpy as np
+import quantities as pq
+
+from neo.core import (AnalogSignal, AnalogSignalArray, Block, EventArray,
+                      Segment, SpikeTrain)
+from neo.io import RawBinarySignalIO, TdtIO
+from neo.io.summary import FileSummary
+from neo.io.tdtio import tsq_dtype
+
+
+class TestFileSummary(unittest.TestCase):
+    def test__add_block(self):
+        blk = Block()
+        seg = Segment()
+        blk.segments.append(seg)
+        sig = AnalogSignal([], units='mV', sampling_rate=1 * pq.kHz,
+                           t_start=2 * pq.s, channel_index=3)
+        sig.lazy_shape = (1000,)
+        seg.analogsignals.append(sig)
+        seg.analogsignalarrays.append(
+            AnalogSignalArray(np.zeros((500, 2)), units='mV',
+                              sampling_rate=500 * pq.Hz,
+                              channel_index=np.array([1, 2])))
+        sptr = SpikeTrain([], units='s', t_stop=10 * pq.s, channel_index=3,
+                          unit_id=1)
+        sptr.lazy_shape = 42
+        seg.spiketrains.append(sptr)
+        seg.eventarrays.append(EventArray([1., 2.] * pq.s))
+
+        summary = FileSummary(file_origin='test')
+        summary.add_block(blk)
+        self.assertEqual(summary.n_segments, 1)
+        self.assertEqual(summary.channel_indexes, [1, 2, 3])
+        self.assertEqual(summary.n_samples, 2000)
+        self.assertEqual(summary.n_spikes, 42)
+        self.assertEqual(summary.spiketrains[0].unit_id, 1)
+        self.assertEqual(summary.eventarrays[0].n_events, 2)
+        self.assertEqual(len(summary.sampling_rates), 2)
+        self.assertEqual(summary.t_start, 0 * pq.s)
+        self.assertEqual(summary.t_stop, 3 * pq.s)
+        self.assertEqual(summary.duration, 3 * pq.s)
+
+    def test__empty(self):
+        summary = FileSummary()
+        self.assertIsNone(summary.duration)
+        self.assertEqual(summary.channel_indexes, [])
+        self.assertEqual(summary.n_spikes, 0)
+
+
+class TestRawBinarySignalIODescribe(unittest.TestCase):
+    def setUp(self):
+        fd, self.filename = tempfile.mkstemp()
+        os.close(fd)
+        np.zeros((1000, 4), dtype='i2').tofile(self.filename)
+
+    def tearDown(self):
+        os.remove(self.filename)
+
+    def test__describe(self):
+        reader = RawBinarySignalIO(filename=self.filename)
+        summary = reader.describe(sampling_rate=1 * pq.kHz, nbchannel=4,
+                                  dtype='i2')
+        self.assertEqual(summary.file_size, 8000)
+        self.assertEqual(summary.channel_indexes, [0, 1, 2, 3])
+        self.assertEqual([sig.n_samples for sig in summary.signals],
+                         [1000] * 4)
+        self.assertEqual(summary.duration, 1 * pq.s)
+
+
+class TestTdtIODescribe(unittest.TestCase):
+    def setUp(self):
+        self.dirname = tempfile.mkdtemp()
+        tankname = os.path.basename(self.dirname)
+        os.mkdir(os.path.join(self.dirname, 'Block-1'))
+        tsq = np.zeros(6, dtype=tsq_dtype)
+        tsq['evtype'] = [0x8801, 0x8101, 0x8101, 0x8201, 0x8201, 0x101]
+        tsq['code'] = [b'', b'Wave', b'Wave', b'eNeu', b'eNeu', b'Tick']
+        tsq['channel'] = [0, 1, 1, 2, 2, 0]
+        tsq['sortcode'] = [0, 0, 0, 1, 1, 0]
+        tsq['timestamp'] = [10., 10.5, 10.6, 11., 12., 13.]
+        tsq['size'] = [0, 266, 266, 40, 40, 0]
+        tsq['dataformat'] = [0, 2, 2, 0, 0, 0]
+        tsq['frequency'] = [0, 1000., 1000., 25000., 25000., 0]
+        tsq.tofile(os.path.join(self.dirname, 'Block-1',
+                                tankname + '_Block-1.tsq'))
+
+    def tearDown(self):
+        shutil.rmtree(self.dirname)
+
+    def test__describe(self):
+        summary = TdtIO(dirname=self.dirname).describe()
+        self.assertEqual(summary.n_segments, 1)
+        self.assertEqual(len(summary.signals), 1)
+        sig = summary.signals[0]
+        self.assertEqual(sig.channel_index, 1)
+        # 2 blocks of 256 words of 2 int16 samples
+        self.assertEqual(sig.n_samples, 1024)
+        self.assertEqual(sig.sampling_rate, 1 * pq.kHz)
+        self.assertAlmostEqual(float(sig.t_start), .5)
+        self.assertEqual(summary.spiketrains[0].n_spikes, 2)
+        self.assertEqual(summary.spiketrains[0].unit_id, 1)
+        self.assertEqual(summary.eventarrays[0].n_events, 1)
+
+    def test__describe_reading_parameters(self):
+        # the reading parameters of BaseIO.describe are accepted
+        summary = TdtIO(dirname=self.dirname).describe(cascade=True)
+        self.assertEqual(summary.n_segments, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
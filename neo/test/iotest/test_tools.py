@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of neo.io.tools
+"""
+
+# needed for python 3 compatibility
+from __future__ import absolute_import, division
+
+import os
+import tempfile
+
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest
+
+import numpy as np
+
+from neo.io.tools import read_chunks
+from neo.test.tools import assert_arrays_equal
+
+
+class TestReadChunks(unittest.TestCase):
+    def test__memmap(self):
+        fd, filename = tempfile.mkstemp()
+        os.close(fd)
+        try:
+            data = np.arange(100, dtype='i2')
+            data.tofile(filename)
+            raw = np.memmap(filename, dtype='u1', mode='r')
+            res = read_chunks(raw, [20, 4, 150], [6, 2, 10]).view('i2')
+            assert_arrays_equal(res, np.r_[data[10:13], data[2:3],
+                                           data[75:80]])
+            del raw
+        finally:
+            os.remove(filename)
+
+    def test__empty(self):
+        self.assertEqual(read_chunks(np.arange(5), [], []).size, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()